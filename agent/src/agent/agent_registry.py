@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any, cast
+
+from pydantic_ai import Agent
+
+
+@dataclass(frozen=True)
+class AgentKey:
+    """Identifies a cached agent.
+
+    `graphql_url` is empty for agents that receive their GraphQL client
+    through deps instead of a URL.
+    """
+
+    kind: str
+    model_name: str
+    graphql_url: str = ""
+
+
+@dataclass
+class AgentRegistry:
+    """Process-wide cache of constructed agents and their system prompts.
+
+    Agents are stateless between runs, so one instance per kind, model and
+    GraphQL URL is shared by every run; per-run toolsets such as the sandbox
+    MCP server are passed to `Agent.run` instead. Entries live until they are
+    invalidated.
+    """
+
+    agents: dict[AgentKey, Agent[Any, Any]] = field(
+        default_factory=dict[AgentKey, Agent[Any, Any]],
+    )
+    prompts: dict[str, str] = field(default_factory=dict[str, str])
+
+    def get_agent[DepsT, OutputT](
+        self,
+        key: AgentKey,
+        factory: Callable[[str], Agent[DepsT, OutputT]],
+    ) -> Agent[DepsT, OutputT]:
+        """Return the cached agent for `key`, building it with `factory(model_name)` once."""
+        agent = self.agents.get(key)
+        if agent is None:
+            agent = factory(key.model_name)
+            self.agents[key] = agent
+        return cast("Agent[DepsT, OutputT]", agent)
+
+    def get_prompt(self, kind: str, builder: Callable[[], str]) -> str:
+        """Return the cached system prompt of an agent kind, building it once."""
+        prompt = self.prompts.get(kind)
+        if prompt is None:
+            prompt = builder()
+            self.prompts[kind] = prompt
+        return prompt
+
+    def invalidate(
+        self,
+        kind: str | None = None,
+        model_name: str | None = None,
+        graphql_url: str | None = None,
+    ) -> int:
+        """Drop cached agents matching every given filter; return how many were dropped.
+
+        Without filters everything is dropped. Prompts only depend on the agent
+        kind, so they are dropped when no model or URL filter narrows the call.
+        """
+        stale = [
+            key
+            for key in self.agents
+            if (kind is None or key.kind == kind)
+            and (model_name is None or key.model_name == model_name)
+            and (graphql_url is None or key.graphql_url == graphql_url)
+        ]
+        for key in stale:
+            del self.agents[key]
+
+        if model_name is None and graphql_url is None:
+            if kind is None:
+                self.prompts.clear()
+            else:
+                self.prompts.pop(kind, None)
+        return len(stale)
+
+
+AGENT_REGISTRY = AgentRegistry()
@@ -1,5 +1,58 @@
 DROP_THRESHOLD_PERCENT = 30.0
 ANALYSIS_DATAPOINTS = 4
+# Snapshot distances compared by the full-history drop scan; 1 = consecutive pairs
+DROP_HISTORY_WINDOWS = (1,)
+# Statistical anomaly detection: trailing changes per rolling median/MAD, and
+# scores (in robust standard deviations) at which a change or trend is flagged
+ANOMALY_WINDOW = 20
+ANOMALY_Z_THRESHOLD = 3.5
+ANOMALY_EWMA_ALPHA = 0.1
+ANOMALY_EWMA_THRESHOLD = 3.0
+# Category movers: smallest move reported, as a percentage of the resource's
+# budget turnover, and how many of the strongest moves are returned
+CATEGORY_MOVER_MIN_IMPACT_PERCENT = 5.0
+CATEGORY_MOVERS_TOP = 20
+# Categories with the largest adverse move over a drop; a cheap model's leading
+# root cause contributor must be one of them or the analysis is escalated
+ROOT_CAUSE_CROSS_CHECK_TOP = 3
+# Planets listed by the planet-level drill-down of a drop
+PLANET_DRILLDOWN_TOP_K = 5
+# Snapshots over which power growth and rank changes are measured
+POWER_TREND_WINDOW = 10
+# Smallest opinion change between consecutive gamestates logged as a swing
+OPINION_SWING_THRESHOLD = 20.0
+# Contact graph: the player borders an empire when the `borderRange` of their
+# diplomatic relation, the game's measure of how far apart the two empires'
+# borders are, is at most CONTACT_BORDER_RANGE. Relations are stored from the
+# player's side only, so two rivals border one another when their closest
+# planets are at most CONTACT_PLANET_DISTANCE apart in galaxy coordinates.
+# RIVAL_BLOC_MIN_SIZE is the smallest rival bloc reported.
+CONTACT_BORDER_RANGE = 20.0
+CONTACT_PLANET_DISTANCE = 40.0
+RIVAL_BLOC_MIN_SIZE = 3
+# Depletion forecasting: trailing snapshots the trend models are fitted on,
+# how far ahead zero crossings are projected, the Holt smoothing factors, the
+# shortest piecewise segment, the share of a single line's error a breakpoint
+# must remove and the crossing interval in standard deviations
+FORECAST_WINDOW = 24
+FORECAST_HORIZON_YEARS = 20.0
+FORECAST_LEVEL_ALPHA = 0.3
+FORECAST_TREND_BETA = 0.1
+FORECAST_MIN_SEGMENT = 4
+FORECAST_MIN_SPLIT_GAIN = 0.5
+FORECAST_INTERVAL_SIGMAS = 1.96
+# Cross-save comparison: game years are binned from the start year; the
+# stacked series holds at most this many saves and years, saves are fetched
+# a few at a time, and bands need a minimum number of other saves. The
+# current save underperforms below the given fleet percentile.
+CROSS_SAVE_START_YEAR = 2200
+CROSS_SAVE_BIN_YEARS = 1
+CROSS_SAVE_MAX_YEARS = 400
+CROSS_SAVE_MAX_SAVES = 100
+CROSS_SAVE_CONCURRENCY = 4
+CROSS_SAVE_MIN_FLEET = 5
+CROSS_SAVE_PERCENTILES = (10, 25, 50, 75, 90)
+CROSS_SAVE_UNDERPERFORM_PERCENTILE = 10
 
 RESOURCE_FIELDS = [
     "energy",
@@ -0,0 +1,213 @@
+"""Statistical anomaly detection over the full resource history.
+
+The fixed percentage threshold of `compute_drop` misfires on volatile
+resources with small totals and misses slow bleeds. This engine scores each
+resource against its own history instead, with two detectors over the
+step-to-step changes of a column:
+
+- robust z-score: each change against the rolling median and MAD of the
+  changes before it, which flags sudden drops relative to the usual
+  volatility of the resource;
+- EWMA deviation: the exponentially weighted mean change in standard errors,
+  which flags sustained declines that no single step reveals. Changes are
+  clipped to the robust range first, so one sudden drop does not read as a
+  trend.
+
+Both detectors run in a single pass per column and need no model, which
+makes the engine cheap enough to pre-filter every save before an LLM is
+invoked.
+"""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_left, insort
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from agent.analysis_config import (
+    ANOMALY_EWMA_ALPHA,
+    ANOMALY_EWMA_THRESHOLD,
+    ANOMALY_WINDOW,
+    ANOMALY_Z_THRESHOLD,
+)
+from agent.drop_detection import MIN_BASELINE_VALUE, compute_drop
+from agent.models import AnomalyMethod, ResourceAnomaly
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+# Scale median and mean absolute deviations to the standard deviation of normal data
+MAD_TO_SIGMA = 1.4826
+MEAN_AD_TO_SIGMA = 1.2533
+# Spread floor as a fraction of the level, so a flat history does not turn
+# every later change into an infinite score
+MIN_RELATIVE_SPREAD = 0.01
+# Changes needed before a column is scored
+MIN_ANOMALY_HISTORY = 5
+
+
+@dataclass
+class _Flag:
+    start: int
+    end: int
+    score: float
+    confidence: float
+    methods: set[AnomalyMethod]
+
+
+def _median(ordered: Sequence[float]) -> float:
+    middle = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[middle]
+    return (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def _confidence(score: float, threshold: float) -> float:
+    """Map a score to (0, 1): 0.5 at the threshold, approaching 1 as it grows."""
+    return score / (score + threshold)
+
+
+def _score_column(
+    column: Sequence[float],
+    window: int,
+    z_threshold: float,
+    ewma_alpha: float,
+    ewma_threshold: float,
+) -> list[_Flag]:
+    """Flag declines of one column, in order of their start index."""
+    flags: list[_Flag] = []
+    recent: deque[float] = deque()
+    ordered: list[float] = []
+    ewma = 0.0
+    # Standard error of an EWMA of independent changes, per unit of spread
+    ewma_error = math.sqrt(ewma_alpha / (2 - ewma_alpha))
+    decline_start = 0
+    bleed: _Flag | None = None
+
+    for index in range(1, len(column)):
+        previous = column[index - 1]
+        change = column[index] - previous
+        clipped = change
+        ewma_score = 0.0
+        if len(ordered) >= MIN_ANOMALY_HISTORY:
+            median = _median(ordered)
+            deviations = sorted(abs(c - median) for c in ordered)
+            # The MAD collapses to zero when most changes are equal, such as a
+            # resource that alternates between a few values; the mean
+            # absolute deviation still sees the spread then
+            scale = max(
+                MAD_TO_SIGMA * _median(deviations),
+                MEAN_AD_TO_SIGMA * sum(deviations) / len(deviations),
+                MIN_RELATIVE_SPREAD * abs(previous),
+                MIN_BASELINE_VALUE,
+            )
+            z_score = (median - change) / scale
+            if z_score >= z_threshold:
+                flags.append(
+                    _Flag(
+                        index - 1,
+                        index,
+                        z_score,
+                        _confidence(z_score, z_threshold),
+                        {AnomalyMethod.ROBUST_Z},
+                    ),
+                )
+            limit = z_threshold * scale
+            clipped = min(max(change, median - limit), median + limit)
+            ewma = ewma_alpha * clipped + (1 - ewma_alpha) * ewma
+            ewma_score = -ewma / (scale * ewma_error)
+        else:
+            ewma = ewma_alpha * clipped + (1 - ewma_alpha) * ewma
+
+        if ewma >= 0:
+            decline_start = index
+        if ewma_score >= ewma_threshold:
+            if bleed is None:
+                bleed = _Flag(decline_start, index, 0.0, 0.0, {AnomalyMethod.EWMA})
+            bleed.end = index
+            if ewma_score > bleed.score:
+                bleed.score = ewma_score
+                bleed.confidence = _confidence(ewma_score, ewma_threshold)
+        elif bleed is not None:
+            flags.append(bleed)
+            bleed = None
+
+        insort(ordered, change)
+        recent.append(change)
+        if len(recent) > window:
+            del ordered[bisect_left(ordered, recent.popleft())]
+
+    if bleed is not None:
+        flags.append(bleed)
+    flags.sort(key=lambda flag: flag.start)
+    return flags
+
+
+def _merge_overlapping(flags: Sequence[_Flag]) -> list[_Flag]:
+    """Merge flags with overlapping spans; agreeing detectors raise the confidence."""
+    merged: list[_Flag] = []
+    for flag in flags:
+        last = merged[-1] if merged else None
+        if last is None or flag.start >= last.end:
+            merged.append(
+                _Flag(flag.start, flag.end, flag.score, flag.confidence, flag.methods),
+            )
+            continue
+        last.end = max(last.end, flag.end)
+        last.score = max(last.score, flag.score)
+        if not flag.methods <= last.methods:
+            last.confidence = 1 - (1 - last.confidence) * (1 - flag.confidence)
+        else:
+            last.confidence = max(last.confidence, flag.confidence)
+        last.methods = last.methods | flag.methods
+    return merged
+
+
+def detect_anomalies(
+    dates: Sequence[str],
+    columns: Mapping[str, Sequence[float]],
+    window: int = ANOMALY_WINDOW,
+    z_threshold: float = ANOMALY_Z_THRESHOLD,
+    ewma_alpha: float = ANOMALY_EWMA_ALPHA,
+    ewma_threshold: float = ANOMALY_EWMA_THRESHOLD,
+) -> list[ResourceAnomaly]:
+    """Find statistically unusual declines across a whole save history.
+
+    `columns` maps each resource to one total per date. Overlapping flags of
+    the same resource are reported as one anomaly, most confident first. As
+    with `compute_drop`, only declines from a positive value are reported.
+    """
+    if window < MIN_ANOMALY_HISTORY:
+        raise ValueError(
+            f"Window must hold at least {MIN_ANOMALY_HISTORY} changes, got {window}",
+        )
+    if not 0 < ewma_alpha <= 1:
+        raise ValueError(f"EWMA alpha must be in (0, 1], got {ewma_alpha}")
+
+    anomalies: list[ResourceAnomaly] = []
+    for resource, column in columns.items():
+        flags = _score_column(column, window, z_threshold, ewma_alpha, ewma_threshold)
+        for flag in _merge_overlapping(flags):
+            drop = compute_drop(
+                resource,
+                dates[flag.start],
+                dates[flag.end],
+                column[flag.start],
+                column[flag.end],
+                threshold_percent=0.0,
+            )
+            if drop is None:
+                continue
+            anomalies.append(
+                ResourceAnomaly(
+                    **drop.model_dump(),
+                    methods=sorted(flag.methods),
+                    score=flag.score,
+                    confidence=flag.confidence,
+                ),
+            )
+
+    anomalies.sort(key=lambda a: (-a.confidence, a.start_date, a.resource))
+    return anomalies
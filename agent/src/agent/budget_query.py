@@ -0,0 +1,147 @@
+"""Field-pruned budget queries.
+
+The generated `GetBudget` and `GetIncomeExpenses` operations select every
+resource of every budget category. Analyses that only look at a few columns
+build a minimal query from a `BudgetSelection` instead. Categories and
+resources are selected under short aliases, since their names would
+otherwise make up most of a pruned response. The response is mapped back to
+field names, completed with nulls for the pruned fields and parsed into the
+generated models, so callers keep working with typed results.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Literal, Protocol
+
+from agent.analysis_config import BUDGET_CATEGORIES, RESOURCE_FIELDS
+from agent.graphql_client import GetBudget, GetIncomeExpenses
+
+if TYPE_CHECKING:
+    import httpx
+
+type BudgetSection = Literal["balance", "income", "expenses"]
+
+BUDGET_SECTIONS: tuple[BudgetSection, ...] = ("balance", "income", "expenses")
+BUDGET_SELECTION_OPERATION = "GetBudgetSelection"
+
+CATEGORY_ALIASES = {name: f"c{index}" for index, name in enumerate(BUDGET_CATEGORIES)}
+RESOURCE_ALIASES = {name: f"r{index}" for index, name in enumerate(RESOURCE_FIELDS)}
+_CATEGORY_NAMES = {alias: name for name, alias in CATEGORY_ALIASES.items()}
+_RESOURCE_NAMES = {alias: name for name, alias in RESOURCE_ALIASES.items()}
+
+
+class GraphQLExecutor(Protocol):
+    """The part of the generated client that runs arbitrary operations."""
+
+    async def execute(
+        self,
+        query: str,
+        operation_name: str | None = None,
+        variables: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response: ...
+
+    def get_data(self, response: httpx.Response) -> dict[str, Any]: ...
+
+
+@dataclass(frozen=True)
+class BudgetSelection:
+    """Resources, categories and sections a budget query selects."""
+
+    resources: tuple[str, ...] = tuple(RESOURCE_FIELDS)
+    categories: tuple[str, ...] = tuple(BUDGET_CATEGORIES)
+    sections: tuple[BudgetSection, ...] = BUDGET_SECTIONS
+
+    def __post_init__(self) -> None:
+        for kind, names, known in (
+            ("resource", self.resources, RESOURCE_FIELDS),
+            ("category", self.categories, BUDGET_CATEGORIES),
+            ("section", self.sections, BUDGET_SECTIONS),
+        ):
+            if not names:
+                raise ValueError(f"Budget selection needs at least one {kind}")
+            unknown = [name for name in names if name not in known]
+            if unknown:
+                raise ValueError(f"Unknown budget {kind}: {', '.join(unknown)}")
+
+
+@dataclass(frozen=True)
+class BudgetSelectionResult:
+    """A pruned budget parsed into the generated models.
+
+    Fields outside the selection are null, which readers treat as zero.
+    """
+
+    balance: GetBudget
+    income_expenses: GetIncomeExpenses
+
+
+def build_budget_query(selection: BudgetSelection) -> str:
+    """Build a query that selects only the fields of `selection`."""
+    entry = " ".join(
+        f"{RESOURCE_ALIASES[name]}: {name}" for name in selection.resources
+    )
+    category = " ".join(
+        f"{CATEGORY_ALIASES[name]}: {name} {{ {entry} }}"
+        for name in selection.categories
+    )
+    sections = " ".join(f"{name} {{ {category} }}" for name in selection.sections)
+    return (
+        f"query {BUDGET_SELECTION_OPERATION}($filename: String!) {{ "
+        "save(filename: $filename) { gamestates { date "
+        f"budget {{ {sections} }} }} }} }}"
+    )
+
+
+def _complete_section(section: dict[str, Any] | None) -> dict[str, Any]:
+    completed: dict[str, Any] = dict.fromkeys(BUDGET_CATEGORIES)
+    for category_alias, entry in (section or {}).items():
+        if entry is None:
+            continue
+        values: dict[str, Any] = dict.fromkeys(RESOURCE_FIELDS)
+        for resource_alias, value in entry.items():
+            values[_RESOURCE_NAMES[resource_alias]] = value
+        completed[_CATEGORY_NAMES[category_alias]] = values
+    return completed
+
+
+def complete_budget_data(data: dict[str, Any]) -> dict[str, Any]:
+    """Map aliases of a selection response to field names and fill pruned fields with null."""
+    save = data.get("save")
+    if save is None:
+        return data
+    gamestates = [
+        {
+            "date": gamestate["date"],
+            "budget": {
+                section: _complete_section(gamestate["budget"].get(section))
+                for section in BUDGET_SECTIONS
+            },
+        }
+        for gamestate in save["gamestates"]
+    ]
+    return {"save": {"gamestates": gamestates}}
+
+
+def parse_budget_selection(data: dict[str, Any]) -> BudgetSelectionResult:
+    """Parse a selection response into the generated budget models."""
+    completed = complete_budget_data(data)
+    return BudgetSelectionResult(
+        balance=GetBudget.model_validate(completed),
+        income_expenses=GetIncomeExpenses.model_validate(completed),
+    )
+
+
+async def fetch_budget_selection(
+    client: GraphQLExecutor,
+    filename: str,
+    selection: BudgetSelection,
+) -> BudgetSelectionResult:
+    """Fetch the budget fields of `selection` in one request."""
+    response = await client.execute(
+        query=build_budget_query(selection),
+        operation_name=BUDGET_SELECTION_OPERATION,
+        variables={"filename": filename},
+    )
+    return parse_budget_selection(client.get_data(response))
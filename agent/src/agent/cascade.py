@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+
+from pydantic_ai.exceptions import UnexpectedModelBehavior, UsageLimitExceeded
+from pydantic_ai.usage import UsageLimits
+
+from agent.constants import (
+    CASCADE_STATS,
+    DEFAULT_CASCADE_POLICY,
+    CascadePolicy,
+    CascadeStats,
+    EscalationReason,
+)
+
+type CascadeRun[T] = Callable[[str, UsageLimits | None], Awaitable[T]]
+type CrossCheck[T] = Callable[[T], Awaitable[bool]]
+
+
+async def run_with_cascade[T](
+    run: CascadeRun[T],
+    cross_check: CrossCheck[T] | None = None,
+    policy: CascadePolicy = DEFAULT_CASCADE_POLICY,
+    stats: CascadeStats = CASCADE_STATS,
+) -> T:
+    """Run a task on the policy's cheap model, escalating to the strong model.
+
+    `run` receives the model name and the usage limits to apply. The cheap
+    attempt is bounded by the policy's tool-call limit; the strong attempt is
+    not, and its result is returned without a cross-check.
+    """
+    reason: EscalationReason | None = None
+    try:
+        output = await run(
+            policy.cheap_model,
+            UsageLimits(tool_calls_limit=policy.cheap_tool_calls_limit),
+        )
+    except UnexpectedModelBehavior:
+        reason = EscalationReason.VALIDATION_FAILED
+    except UsageLimitExceeded:
+        reason = EscalationReason.TOOL_CALL_BUDGET_EXCEEDED
+    else:
+        if cross_check is None or await cross_check(output):
+            stats.record(None)
+            return output
+        reason = EscalationReason.CROSS_CHECK_DISAGREED
+
+    stats.record(reason)
+    return await run(policy.strong_model, None)
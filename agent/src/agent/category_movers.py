@@ -0,0 +1,277 @@
+"""Deterministic scan of every budget category series for its largest move.
+
+Root cause agents explain one resource drop at a time, so offsetting changes
+inside categories stay hidden until a drop is analyzed. This scan treats each
+income and expense cell (category x resource) as its own time series and
+finds, for every series, the consecutive snapshots where it hurt the budget
+most: income falling or expenses rising. Moves are measured against the
+resource's budget turnover at the earlier snapshot, which makes them
+comparable across resources, and the strongest are returned as top movers.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Literal
+
+from agent.analysis_config import (
+    CATEGORY_MOVER_MIN_IMPACT_PERCENT,
+    CATEGORY_MOVERS_TOP,
+    ROOT_CAUSE_CROSS_CHECK_TOP,
+)
+from agent.drop_detection import MIN_BASELINE_VALUE
+from agent.models import CategoryMover, CategoryMoversResult, ContributorType
+from agent.sandbox_data import BudgetColumns, build_budget_columns
+from agent.settings import get_settings
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    from agent.graphql_client import GetIncomeExpenses
+    from agent.models import CategoryContributor, SuddenDrop
+    from agent.native_budget.tools import GraphQLClientProtocol
+    from agent.settings import Settings
+
+type BudgetFlow = Literal["income", "expenses"]
+
+# Turnover floor, so a resource without income does not turn every new
+# expense into an unbounded impact
+MIN_TURNOVER = 1.0
+
+
+def build_category_series(
+    income_expenses: GetIncomeExpenses,
+    save_filename: str,
+) -> tuple[list[str], dict[BudgetFlow, BudgetColumns]]:
+    """Pivot per-gamestate income and expenses into one series per category and resource.
+
+    Series that are zero in every gamestate are left out.
+    """
+    if income_expenses.save is None:
+        raise ValueError(f"Save '{save_filename}' not found")
+
+    gamestates = sorted(income_expenses.save.gamestates, key=lambda gs: gs.date)
+    dates = [str(gs.date) for gs in gamestates]
+    flows: dict[BudgetFlow, BudgetColumns] = {
+        "income": build_budget_columns(
+            [gs.budget.income.model_dump(by_alias=True) for gs in gamestates],
+        ),
+        "expenses": build_budget_columns(
+            [gs.budget.expenses.model_dump(by_alias=True) for gs in gamestates],
+        ),
+    }
+    return dates, flows
+
+
+def _turnover_scales(
+    flows: Mapping[BudgetFlow, BudgetColumns],
+    length: int,
+) -> dict[str, list[float]]:
+    """Per resource and snapshot, the factor that turns a change into percent of turnover."""
+    totals: dict[BudgetFlow, dict[str, list[float]]] = {}
+    for flow, columns in flows.items():
+        flow_totals = totals.setdefault(flow, {})
+        for resource_columns in columns.values():
+            for resource, column in resource_columns.items():
+                total = flow_totals.setdefault(resource, [0.0] * length)
+                for index, value in enumerate(column):
+                    total[index] += value
+
+    scales: dict[str, list[float]] = {}
+    for flow_totals in totals.values():
+        for resource in flow_totals:
+            if resource in scales:
+                continue
+            income = totals.get("income", {}).get(resource, [0.0] * length)
+            expenses = totals.get("expenses", {}).get(resource, [0.0] * length)
+            scales[resource] = [
+                100 / max(abs(i), abs(e), MIN_TURNOVER)
+                for i, e in zip(income, expenses, strict=True)
+            ]
+    return scales
+
+
+def _build_mover(
+    flow: BudgetFlow,
+    category: str,
+    resource: str,
+    dates: Sequence[str],
+    column: Sequence[float],
+    start: int,
+    impact_percent: float,
+    rank: int,
+) -> CategoryMover:
+    before_value = column[start]
+    after_value = column[start + 1]
+    if abs(before_value) >= MIN_BASELINE_VALUE:
+        change_percent = (after_value - before_value) / abs(before_value) * 100
+    else:
+        change_percent = 100.0
+    return CategoryMover(
+        category=category,
+        resource=resource,
+        contributor_type=(
+            ContributorType.INCOME_DECREASED
+            if flow == "income"
+            else ContributorType.EXPENSES_INCREASED
+        ),
+        before_value=before_value,
+        after_value=after_value,
+        change_absolute=abs(after_value - before_value),
+        change_percent=change_percent,
+        rank=rank,
+        start_date=dates[start],
+        end_date=dates[start + 1],
+        impact_percent=impact_percent,
+    )
+
+
+def find_category_movers(
+    dates: Sequence[str],
+    flows: Mapping[BudgetFlow, BudgetColumns],
+    top: int = CATEGORY_MOVERS_TOP,
+    min_impact_percent: float = CATEGORY_MOVER_MIN_IMPACT_PERCENT,
+) -> list[CategoryMover]:
+    """Return the `top` strongest adverse category moves, ranked from 1.
+
+    Each series contributes at most its single strongest move, the one
+    with the largest impact on its resource.
+    """
+    scales = _turnover_scales(flows, len(dates))
+    candidates: list[tuple[float, BudgetFlow, str, str, int]] = []
+    for flow, columns in flows.items():
+        # Income hurts when it falls, expenses when they rise
+        direction = -1.0 if flow == "income" else 1.0
+        for category, resource_columns in columns.items():
+            for resource, column in resource_columns.items():
+                scale = scales[resource]
+                best_impact = 0.0
+                best_start = -1
+                for start, (before, after, factor) in enumerate(
+                    zip(column, column[1:], scale, strict=False),
+                ):
+                    impact = (after - before) * direction * factor
+                    if impact > best_impact:
+                        best_impact = impact
+                        best_start = start
+                if best_start >= 0 and best_impact >= min_impact_percent:
+                    candidates.append(
+                        (best_impact, flow, category, resource, best_start),
+                    )
+
+    candidates.sort(key=lambda c: (-c[0], c[2], c[3], c[1]))
+    return [
+        _build_mover(
+            flow,
+            category,
+            resource,
+            dates,
+            flows[flow][category][resource],
+            start,
+            impact,
+            rank,
+        )
+        for rank, (impact, flow, category, resource, start) in enumerate(
+            candidates[:top],
+            start=1,
+        )
+    ]
+
+
+def rank_drop_categories(
+    dates: Sequence[str],
+    flows: Mapping[BudgetFlow, BudgetColumns],
+    drop: SuddenDrop,
+    top: int = ROOT_CAUSE_CROSS_CHECK_TOP,
+) -> list[str] | None:
+    """Return the `top` categories that hurt the dropped resource most over the drop.
+
+    A category's move is its income fall plus its expense rise between the
+    drop's dates. Returns None when either date is not in `dates`.
+    """
+    if drop.start_date not in dates or drop.end_date not in dates:
+        return None
+    start = dates.index(drop.start_date)
+    end = dates.index(drop.end_date)
+    moves: dict[str, float] = {}
+    for flow, columns in flows.items():
+        direction = -1.0 if flow == "income" else 1.0
+        for category, resource_columns in columns.items():
+            column = resource_columns.get(drop.resource)
+            if column is not None:
+                moves[category] = moves.get(category, 0.0) + (
+                    (column[end] - column[start]) * direction
+                )
+    ranked = sorted(
+        (category for category, move in moves.items() if move > 0),
+        key=lambda category: (-moves[category], category),
+    )
+    return ranked[:top]
+
+
+def contributors_agree(
+    expected: Sequence[str],
+    contributors: Sequence[CategoryContributor],
+) -> bool:
+    """Whether the leading reported contributor is one of the expected categories.
+
+    With no adverse category move there is nothing to contradict.
+    """
+    if not expected:
+        return True
+    if not contributors:
+        return False
+    leading = min(contributors, key=lambda c: c.rank)
+    return leading.category in expected
+
+
+async def run_category_movers_scan(
+    save_filename: str,
+    client: GraphQLClientProtocol | None = None,
+    top: int = CATEGORY_MOVERS_TOP,
+    min_impact_percent: float = CATEGORY_MOVER_MIN_IMPACT_PERCENT,
+    settings: Settings | None = None,
+) -> CategoryMoversResult:
+    """Fetch income and expenses of every gamestate and find the top category movers."""
+    if client is None:
+        if settings is None:
+            settings = get_settings()
+        async with settings.create_graphql_client() as graphql_client:
+            income_expenses = await graphql_client.get_income_expenses(
+                filename=save_filename,
+            )
+    else:
+        income_expenses = await client.get_income_expenses(filename=save_filename)
+
+    dates, flows = build_category_series(income_expenses, save_filename)
+    movers = find_category_movers(dates, flows, top, min_impact_percent)
+    return CategoryMoversResult(
+        save_filename=save_filename,
+        history_start=dates[0] if dates else "",
+        history_end=dates[-1] if dates else "",
+        gamestates_scanned=len(dates),
+        series_scanned=sum(
+            len(resource_columns)
+            for columns in flows.values()
+            for resource_columns in columns.values()
+        ),
+        min_impact_percent=min_impact_percent,
+        movers=movers,
+        summary=summarize_category_movers(movers),
+    )
+
+
+def summarize_category_movers(movers: Sequence[CategoryMover]) -> str:
+    if not movers:
+        return "No significant category moves detected."
+    strongest = movers[0]
+    direction = (
+        "income fell"
+        if strongest.contributor_type == "income_decreased"
+        else "expenses rose"
+    )
+    return (
+        f"Found {len(movers)} significant category move(s). Strongest: "
+        f"{strongest.category} {strongest.resource} {direction} by "
+        f"{strongest.change_absolute:.2f} ({strongest.impact_percent:.1f}% of turnover) "
+        f"between {strongest.start_date} and {strongest.end_date}."
+    )
@@ -2,17 +2,97 @@ import argparse
 import asyncio
 import json
 import sys
+from collections.abc import AsyncIterator
 
 import logfire
 
-from agent.constants import get_model_names
-from agent.models import MultiAgentAnalysisResult, SuddenDropAnalysisResult
+from agent.analysis_config import (
+    ANOMALY_EWMA_ALPHA,
+    ANOMALY_EWMA_THRESHOLD,
+    ANOMALY_WINDOW,
+    ANOMALY_Z_THRESHOLD,
+    CATEGORY_MOVER_MIN_IMPACT_PERCENT,
+    CATEGORY_MOVERS_TOP,
+    CROSS_SAVE_BIN_YEARS,
+    CROSS_SAVE_MAX_SAVES,
+    CROSS_SAVE_MAX_YEARS,
+    CROSS_SAVE_MIN_FLEET,
+    CROSS_SAVE_PERCENTILES,
+    CROSS_SAVE_START_YEAR,
+    CROSS_SAVE_UNDERPERFORM_PERCENTILE,
+    DROP_HISTORY_WINDOWS,
+    DROP_THRESHOLD_PERCENT,
+    FORECAST_HORIZON_YEARS,
+    FORECAST_INTERVAL_SIGMAS,
+    FORECAST_LEVEL_ALPHA,
+    FORECAST_MIN_SEGMENT,
+    FORECAST_MIN_SPLIT_GAIN,
+    FORECAST_TREND_BETA,
+    FORECAST_WINDOW,
+    POWER_TREND_WINDOW,
+)
+from agent.category_movers import run_category_movers_scan
+from agent.constants import (
+    CASCADE_STATS,
+    DEFAULT_CASCADE_POLICY,
+    PROMPT_CACHE_STATS,
+    get_model_names,
+)
+from agent.cross_save import fleet_gamestate_keys, run_cross_save_comparison
+from agent.drop_history import run_drop_history_scan
+from agent.forecast import run_depletion_forecast
+from agent.models import (
+    CategoryMoversResult,
+    CrossSaveComparisonResult,
+    DepletionForecastResult,
+    DropAnalyzedEvent,
+    DropDetectionEvent,
+    DropHistoryResult,
+    MultiAgentAnalysisCompleteEvent,
+    MultiAgentAnalysisEvent,
+    MultiAgentAnalysisResult,
+    PowerMetric,
+    PowerTrendsResult,
+    SuddenDropAnalysisResult,
+    SuddenDropWithRootCause,
+)
+from agent.native_budget import agent as native_budget_agent
 from agent.native_budget import run_native_budget_analysis
-from agent.neighbor import NeighborAnalysisResult
-from agent.neighbor_multi import run_neighbor_multi_agent_orchestration
+from agent.native_budget.tools import get_available_dates
+from agent.neighbor import (
+    EmpireDistanceMatrixResult,
+    KeyFinding,
+    NeighborAnalysisResult,
+    NeighborInfo,
+)
+from agent.neighbor.distance_matrix import (
+    DEFAULT_DISTANCE_LIMIT,
+    run_distance_matrix_analysis,
+)
+from agent.neighbor_multi import (
+    NeighborAnalysisCompleteEvent,
+    NeighborAnalysisEvent,
+    NeighborAnalyzedEvent,
+    NeighborDetectionEvent,
+    NeighborDetectionResult,
+    run_neighbor_multi_agent_orchestration,
+    stream_neighbor_multi_agent_orchestration,
+)
+from agent.neighbor_multi import prompts as neighbor_multi_prompts
+from agent.neighbor_single import prompts as neighbor_single_prompts
 from agent.neighbor_single import run_neighbor_single_agent_analysis
+from agent.power_trends import run_power_trends_analysis
+from agent.rate_limit import RATE_LIMITERS
+from agent.result_cache import ResultCache, build_cache_key
+from agent.root_cause_multi import prompts as root_cause_multi_prompts
+from agent.root_cause_multi import (
+    root_cause_prompts,
+    stream_root_cause_multi_agent_orchestration,
+)
 from agent.root_cause_multi.agent import run_root_cause_multi_agent_analysis
+from agent.root_cause_single import prompts as root_cause_single_prompts
 from agent.root_cause_single import run_root_cause_single_agent_analysis
+from agent.sandbox import prompts as sandbox_prompts
 from agent.sandbox import run_sandbox_drop_detection_analysis
 from agent.settings import Settings, get_settings
 from agent.validation import ValidationError, validate_save_filename
@@ -24,72 +104,149 @@ ANALYSIS_TYPES = [
     "sandbox",
     "neighbor-multi",
     "neighbor-single",
+    "drop-history",
+    "category-movers",
+    "power-trends",
+    "distance-matrix",
+    "depletion-forecast",
+    "cross-save",
 ]
 
-
-def print_multi_agent_result(result: MultiAgentAnalysisResult) -> None:
+# Computed from the data alone, without any model calls
+DETERMINISTIC_ANALYSIS_TYPES = frozenset(
+    {
+        "drop-history",
+        "category-movers",
+        "power-trends",
+        "distance-matrix",
+        "depletion-forecast",
+        "cross-save",
+    },
+)
+
+type AnalysisResult = (
+    MultiAgentAnalysisResult
+    | SuddenDropAnalysisResult
+    | NeighborAnalysisResult
+    | DropHistoryResult
+    | CategoryMoversResult
+    | PowerTrendsResult
+    | EmpireDistanceMatrixResult
+    | DepletionForecastResult
+    | CrossSaveComparisonResult
+)
+
+type AnalysisEvent = MultiAgentAnalysisEvent | NeighborAnalysisEvent
+
+# Multi-agent analyses that stream partial results as each phase completes
+STREAMING_ANALYSIS_TYPES = frozenset({"root-cause-multi", "neighbor-multi"})
+
+RESULT_TYPES: dict[str, type[AnalysisResult]] = {
+    "root-cause-multi": MultiAgentAnalysisResult,
+    "root-cause-single": MultiAgentAnalysisResult,
+    "native-budget": SuddenDropAnalysisResult,
+    "sandbox": SuddenDropAnalysisResult,
+    "neighbor-multi": NeighborAnalysisResult,
+    "neighbor-single": NeighborAnalysisResult,
+    "drop-history": DropHistoryResult,
+    "category-movers": CategoryMoversResult,
+    "power-trends": PowerTrendsResult,
+    "distance-matrix": EmpireDistanceMatrixResult,
+    "depletion-forecast": DepletionForecastResult,
+    "cross-save": CrossSaveComparisonResult,
+}
+
+
+def print_multi_agent_header(
+    analysis: MultiAgentAnalysisResult | SuddenDropAnalysisResult,
+) -> None:
     print("=" * 60)
     print("STELLARIS BUDGET ANALYSIS REPORT")
     print("=" * 60)
-    print(f"Save: {result.save_filename}")
-    print(f"Period: {result.analysis_period_start} to {result.analysis_period_end}")
-    print(f"Datapoints: {result.datapoints_analyzed}")
-    print(f"Threshold: {result.drop_threshold_percent}% drop")
+    print(f"Save: {analysis.save_filename}")
+    print(
+        f"Period: {analysis.analysis_period_start} to {analysis.analysis_period_end}",
+    )
+    print(f"Datapoints: {analysis.datapoints_analyzed}")
+    print(f"Threshold: {analysis.drop_threshold_percent}% drop")
     print("-" * 60)
-    print(f"\nSummary: {result.summary}")
 
-    for drop_with_cause in result.drops_with_root_causes:
-        drop = drop_with_cause.drop
-        print(f"\n{'=' * 60}")
-        print(f"[{drop.resource}]")
-        print("-" * 40)
 
-        color_start = ""
-        color_end = ""
-        if sys.stdout.isatty():
-            color_start = "\033[91m"
-            color_end = "\033[0m"
+def print_drop_with_root_cause(drop_with_cause: SuddenDropWithRootCause) -> None:
+    drop = drop_with_cause.drop
+    print(f"\n{'=' * 60}")
+    print(f"[{drop.resource}]")
+    print("-" * 40)
 
-        print(
-            f"  {color_start}Drop: {drop.drop_percent:.1f}% "
-            + f"({drop.drop_absolute:.2f}){color_end}",
-        )
-        print(f"    Start ({drop.start_date}): {drop.start_value:.2f}")
-        print(f"    End ({drop.end_date}): {drop.end_value:.2f}")
+    color_start = ""
+    color_end = ""
+    if sys.stdout.isatty():
+        color_start = "\033[91m"
+        color_end = "\033[0m"
 
-        if drop_with_cause.analysis_error:
-            print("\n  Root Cause Analysis: FAILED")
-            print(f"    Error: {drop_with_cause.analysis_error}")
-            continue
+    print(
+        f"  {color_start}Drop: {drop.drop_percent:.1f}% "
+        + f"({drop.drop_absolute:.2f}){color_end}",
+    )
+    print(f"    Start ({drop.start_date}): {drop.start_value:.2f}")
+    print(f"    End ({drop.end_date}): {drop.end_value:.2f}")
 
-        if drop_with_cause.root_cause:
-            print("\n  TOP 3 CONTRIBUTORS:")
-            for contrib in drop_with_cause.root_cause.top_contributors:
-                if contrib.contributor_type == "income_decreased":
-                    label = "INCOME DOWN"
-                    color = "\033[93m" if sys.stdout.isatty() else ""
-                else:
-                    label = "EXPENSES UP"
-                    color = "\033[91m" if sys.stdout.isatty() else ""
-                end_color = "\033[0m" if sys.stdout.isatty() else ""
-
-                print(
-                    f"    #{contrib.rank} {color}[{label}]{end_color} {contrib.category}",
-                )
-                change_line = (
-                    f"       {contrib.before_value:.2f} -> {contrib.after_value:.2f} "
-                    + f"({contrib.change_percent:+.1f}%)"
-                )
-                print(change_line)
-
-            print(f"\n  Analysis: {drop_with_cause.root_cause.explanation}")
+    if drop_with_cause.analysis_error:
+        print("\n  Root Cause Analysis: FAILED")
+        print(f"    Error: {drop_with_cause.analysis_error}")
+        return
+
+    if drop_with_cause.root_cause:
+        print("\n  TOP 3 CONTRIBUTORS:")
+        for contrib in drop_with_cause.root_cause.top_contributors:
+            if contrib.contributor_type == "income_decreased":
+                label = "INCOME DOWN"
+                color = "\033[93m" if sys.stdout.isatty() else ""
+            else:
+                label = "EXPENSES UP"
+                color = "\033[91m" if sys.stdout.isatty() else ""
+            end_color = "\033[0m" if sys.stdout.isatty() else ""
+
+            print(
+                f"    #{contrib.rank} {color}[{label}]{end_color} {contrib.category}",
+            )
+            change_line = (
+                f"       {contrib.before_value:.2f} -> {contrib.after_value:.2f} "
+                + f"({contrib.change_percent:+.1f}%)"
+            )
+            print(change_line)
+
+        print(f"\n  Analysis: {drop_with_cause.root_cause.explanation}")
 
+    drilldown = drop_with_cause.planet_drilldown
+    if drilldown and drilldown.top_planets:
+        print(f"\n  TOP PLANETS ({drilldown.planets_compared} compared):")
+        for planet in drilldown.top_planets:
+            print(
+                f"    #{planet.rank} {planet.planet_name}: "
+                + f"{planet.before_balance:.2f} -> {planet.after_balance:.2f} "
+                + f"(income {planet.income_change:+.2f}, "
+                + f"expenses {planet.expenses_change:+.2f})",
+            )
+
+
+def print_multi_agent_footer(result: MultiAgentAnalysisResult) -> None:
     if not result.drops_with_root_causes:
         print("\nNo sudden drops detected.")
 
     print("\n" + "=" * 60)
 
 
+def print_multi_agent_result(result: MultiAgentAnalysisResult) -> None:
+    print_multi_agent_header(result)
+    print(f"\nSummary: {result.summary}")
+
+    for drop_with_cause in result.drops_with_root_causes:
+        print_drop_with_root_cause(drop_with_cause)
+
+    print_multi_agent_footer(result)
+
+
 def print_sudden_drop_result(result: SuddenDropAnalysisResult) -> None:
     print("=" * 60)
     print("STELLARIS DROP DETECTION REPORT")
@@ -122,70 +279,296 @@ def print_sudden_drop_result(result: SuddenDropAnalysisResult) -> None:
     if not result.sudden_drops:
         print("\nNo sudden drops detected.")
 
+
+def print_drop_history_result(result: DropHistoryResult) -> None:
+    print("=" * 60)
+    print("STELLARIS DROP HISTORY REPORT")
+    print("=" * 60)
+    print(f"Save: {result.save_filename}")
+    print(f"Period: {result.history_start} to {result.history_end}")
+    print(f"Gamestates: {result.gamestates_scanned}")
+    print(f"Windows: {', '.join(str(w) for w in result.window_sizes)}")
+    print(f"Threshold: {result.drop_threshold_percent}% drop")
+    print("-" * 60)
+    print(f"\nSummary: {result.summary}\n")
+
+    for drop in result.drops:
+        print(
+            f"  {drop.resource:<22} {drop.drop_percent:6.1f}% "
+            + f"{drop.start_date} ({drop.start_value:.2f}) -> "
+            + f"{drop.end_date} ({drop.end_value:.2f})",
+        )
+
+    if not result.drops:
+        print("\nNo sudden drops detected.")
+
+    print("\nStatistical anomalies:\n")
+    for anomaly in result.anomalies:
+        methods = "+".join(anomaly.methods)
+        print(
+            f"  {anomaly.resource:<22} {anomaly.confidence:5.0%} {methods:<14} "
+            + f"{anomaly.start_date} ({anomaly.start_value:.2f}) -> "
+            + f"{anomaly.end_date} ({anomaly.end_value:.2f})",
+        )
+
+    if not result.anomalies:
+        print("  No statistical anomalies detected.")
+
     print("\n" + "=" * 60)
 
 
-def print_neighbor_result(result: NeighborAnalysisResult) -> None:
+def print_category_movers_result(result: CategoryMoversResult) -> None:
     print("=" * 60)
-    print("STELLARIS NEIGHBOR ANALYSIS REPORT")
+    print("STELLARIS CATEGORY MOVERS REPORT")
+    print("=" * 60)
+    print(f"Save: {result.save_filename}")
+    print(f"Period: {result.history_start} to {result.history_end}")
+    print(f"Gamestates: {result.gamestates_scanned}")
+    print(f"Series: {result.series_scanned}")
+    print(f"Threshold: {result.min_impact_percent}% of turnover")
+    print("-" * 60)
+    print(f"\nSummary: {result.summary}\n")
+
+    for mover in result.movers:
+        label = (
+            "INCOME DOWN"
+            if mover.contributor_type == "income_decreased"
+            else "EXPENSES UP"
+        )
+        print(
+            f"  #{mover.rank:<3} [{label}] {mover.category} / {mover.resource}: "
+            + f"{mover.before_value:.2f} -> {mover.after_value:.2f} "
+            + f"({mover.impact_percent:.1f}% of turnover, "
+            + f"{mover.start_date} -> {mover.end_date})",
+        )
+
+    if not result.movers:
+        print("No significant category moves detected.")
+
+    print("\n" + "=" * 60)
+
+
+def print_power_trends_result(result: PowerTrendsResult) -> None:
+    print("=" * 60)
+    print("STELLARIS POWER TRENDS REPORT")
     print("=" * 60)
     print(f"Save: {result.save_filename}")
-    print(f"Date: {result.analysis_date}")
-    print(f"Player: {result.player_empire_name}")
-    print(f"Owned Planets: {result.player_owned_planets}")
+    print(f"Period: {result.history_start} to {result.history_end}")
+    print(f"Gamestates: {result.gamestates_scanned}")
+    print(f"Empires: {result.empires_tracked}")
+    print(f"Window: {result.window} snapshots")
     print("-" * 60)
     print(f"\nSummary: {result.summary}")
 
-    if result.neighbors:
-        print("\n" + "-" * 60)
-        print("NEAREST NEIGHBORS (sorted by distance):")
-        print("-" * 60)
+    metric: PowerMetric | None = None
+    for trend in result.trends:
+        if trend.current_rank is None:
+            continue
+        if trend.metric != metric:
+            metric = trend.metric
+            print(f"\n  {metric.upper()} POWER:")
+        marker = "*" if trend.is_player else " "
+        rank_change = (
+            f"{trend.rank_change:+d}" if trend.rank_change is not None else "new"
+        )
+        growth = (
+            f"{trend.recent_growth_percent:+.1f}%"
+            if trend.recent_growth_percent is not None
+            else "n/a"
+        )
+        print(
+            f"   {marker}#{trend.current_rank:<3} {trend.name:<30} "
+            + f"{trend.current_value or 0.0:10.1f}  rank {rank_change:>4}  "
+            + f"growth {growth}",
+        )
 
-        for neighbor in result.neighbors:
-            hostile_marker = " [HOSTILE]" if neighbor.is_hostile else ""
-            opinion_str = (
-                f"{neighbor.opinion:+.0f}" if neighbor.opinion is not None else "N/A"
+    if result.outpacing_events:
+        print("\n  RIVALS OVERTAKING THE PLAYER:")
+        for event in result.outpacing_events:
+            print(
+                f"    {event.date} {event.name} in {event.metric}: "
+                + f"{event.rival_value:.1f} vs {event.player_value:.1f}",
             )
 
-            print(f"\n  {neighbor.name}{hostile_marker}")
-            print(f"    Distance: {neighbor.min_distance:.1f}")
-            print(f"    Planets: {neighbor.owned_planet_count}")
-            print(f"    Opinion: {opinion_str}")
-
-            if neighbor.trust is not None:
-                print(f"    Trust: {neighbor.trust:+.0f}")
-            if neighbor.threat is not None:
-                print(f"    Threat: {neighbor.threat:.0f}")
-
-            if neighbor.opinion_modifiers:
-                print("    Opinion Modifiers:")
-                for mod in neighbor.opinion_modifiers:
-                    print(f"      - {mod.modifier_type}: {mod.value:+.0f}")
-
-    if result.key_findings:
-        print("\n" + "-" * 60)
-        print("KEY FINDINGS:")
-        print("-" * 60)
-
-        for finding in result.key_findings:
-            color_start = ""
-            color_end = ""
-            if sys.stdout.isatty():
-                if finding.severity == "critical":
-                    color_start = "\033[91m"
-                elif finding.severity == "warning":
-                    color_start = "\033[93m"
-                else:
-                    color_start = "\033[94m"
-                color_end = "\033[0m"
+    print("\n" + "=" * 60)
+
+
+def print_distance_matrix_result(result: EmpireDistanceMatrixResult) -> None:
+    print("=" * 60)
+    print("STELLARIS EMPIRE DISTANCE REPORT")
+    print("=" * 60)
+    print(f"Save: {result.save_filename}")
+    print(f"Date: {result.date}")
+    print(f"Empires: {len(result.country_ids)}")
+    print("-" * 60)
+    print(f"\nSummary: {result.summary}")
 
+    if result.closest_pairs:
+        print("\n  CLOSEST EMPIRES:")
+        for pair in result.closest_pairs:
             print(
-                f"  {color_start}[{finding.severity.upper()}]{color_end} {finding.description}",
+                f"   {pair.name:<30} {pair.other_name:<30} "
+                + f"{pair.min_distance:8.1f}",
             )
 
     print("\n" + "=" * 60)
 
 
+def print_depletion_forecast_result(result: DepletionForecastResult) -> None:
+    print("=" * 60)
+    print("STELLARIS DEPLETION FORECAST")
+    print("=" * 60)
+    print(f"Save: {result.save_filename}")
+    print(f"Period: {result.history_start} to {result.history_end}")
+    print(f"Gamestates fitted: {result.gamestates_used}")
+    print(f"Horizon: {result.horizon_years:.0f} years")
+    print("-" * 60)
+    print(f"\nSummary: {result.summary}")
+
+    for forecast in result.forecasts:
+        print(f"\n  {forecast.resource.upper()}:")
+        print(
+            f"    Balance: {forecast.current_value:.1f} "
+            + f"({forecast.trend_per_year:+.1f}/year, {forecast.model} model)",
+        )
+        print(
+            f"    Negative around {forecast.zero_crossing_date} "
+            + f"({forecast.earliest_crossing_date} to "
+            + f"{forecast.latest_crossing_date})",
+        )
+
+    print("\n" + "=" * 60)
+
+
+def print_cross_save_result(result: CrossSaveComparisonResult) -> None:
+    print("=" * 60)
+    print("STELLARIS CROSS-SAVE COMPARISON")
+    print("=" * 60)
+    print(f"Save: {result.save_filename}")
+    print(f"Saves compared: {result.saves_compared}")
+    if result.saves_skipped:
+        print(f"Saves skipped: {result.saves_skipped}")
+    print(f"Year bins: {result.bin_years}")
+    print("-" * 60)
+    print(f"\nSummary: {result.summary}")
+
+    if result.underperformance:
+        print(
+            "\n  BELOW THE FLEET'S "
+            + f"{result.underperform_percentile}TH PERCENTILE:",
+        )
+        for period in result.underperformance:
+            print(
+                f"   {period.resource:<24} {period.start_year}-{period.end_year}  "
+                + f"current {period.current_mean:8.1f}  "
+                + f"fleet median {period.fleet_median_mean:8.1f}  "
+                + f"(p{period.mean_percentile:.0f})",
+            )
+
+    print("\n" + "=" * 60)
+
+
+def print_neighbor_header(
+    analysis: NeighborAnalysisResult | NeighborDetectionResult,
+) -> None:
+    print("=" * 60)
+    print("STELLARIS NEIGHBOR ANALYSIS REPORT")
+    print("=" * 60)
+    print(f"Save: {analysis.save_filename}")
+    print(f"Date: {analysis.analysis_date}")
+    print(f"Player: {analysis.player_empire_name}")
+    print(f"Owned Planets: {analysis.player_owned_planets}")
+    print("-" * 60)
+
+
+def print_neighbors_heading() -> None:
+    print("\n" + "-" * 60)
+    print("NEAREST NEIGHBORS (sorted by distance):")
+    print("-" * 60)
+
+
+def print_neighbor(neighbor: NeighborInfo) -> None:
+    hostile_marker = " [HOSTILE]" if neighbor.is_hostile else ""
+    opinion_str = f"{neighbor.opinion:+.0f}" if neighbor.opinion is not None else "N/A"
+
+    print(f"\n  {neighbor.name}{hostile_marker}")
+    print(f"    Distance: {neighbor.min_distance:.1f}")
+    print(f"    Planets: {neighbor.owned_planet_count}")
+    print(f"    Opinion: {opinion_str}")
+
+    if neighbor.trust is not None:
+        print(f"    Trust: {neighbor.trust:+.0f}")
+    if neighbor.threat is not None:
+        print(f"    Threat: {neighbor.threat:.0f}")
+
+    if neighbor.opinion_modifiers:
+        print("    Opinion Modifiers:")
+        for mod in neighbor.opinion_modifiers:
+            print(f"      - {mod.modifier_type}: {mod.value:+.0f}")
+
+
+def print_key_findings(findings: list[KeyFinding]) -> None:
+    if not findings:
+        return
+
+    print("\n" + "-" * 60)
+    print("KEY FINDINGS:")
+    print("-" * 60)
+
+    for finding in findings:
+        color_start = ""
+        color_end = ""
+        if sys.stdout.isatty():
+            if finding.severity == "critical":
+                color_start = "\033[91m"
+            elif finding.severity == "warning":
+                color_start = "\033[93m"
+            else:
+                color_start = "\033[94m"
+            color_end = "\033[0m"
+
+        print(
+            f"  {color_start}[{finding.severity.upper()}]{color_end} {finding.description}",
+        )
+
+
+def print_neighbor_result(result: NeighborAnalysisResult) -> None:
+    print_neighbor_header(result)
+    print(f"\nSummary: {result.summary}")
+
+    if result.neighbors:
+        print_neighbors_heading()
+        for neighbor in result.neighbors:
+            print_neighbor(neighbor)
+
+    print_key_findings(result.key_findings)
+
+    print("\n" + "=" * 60)
+
+
+def print_event(event: AnalysisEvent) -> None:
+    """Render one streamed orchestration event as part of the formatted report."""
+    if isinstance(event, DropDetectionEvent):
+        print_multi_agent_header(event.detection)
+        drop_count = len(event.detection.sudden_drops)
+        print(f"\nDetected {drop_count} sudden drop(s).")
+    elif isinstance(event, DropAnalyzedEvent):
+        print_drop_with_root_cause(event.drop)
+    elif isinstance(event, MultiAgentAnalysisCompleteEvent):
+        print(f"\nSummary: {event.result.summary}")
+        print_multi_agent_footer(event.result)
+    elif isinstance(event, NeighborDetectionEvent):
+        print_neighbor_header(event.detection)
+        if event.detection.detected_neighbors:
+            print_neighbors_heading()
+    elif isinstance(event, NeighborAnalyzedEvent):
+        print_neighbor(event.neighbor)
+    else:
+        print_key_findings(event.result.key_findings)
+        print(f"\nSummary: {event.result.summary}")
+        print("\n" + "=" * 60)
+
+
 def configure_logfire(settings: Settings) -> None:
     logfire.configure(
         service_name="stellaris-stats-agent",
@@ -209,55 +592,267 @@ async def run_list_saves_async(settings: Settings) -> None:
         print(f"  - {save.filename} ({save.name})")
 
 
-async def run_analysis_async(
+def build_analysis_prompts(analysis_type: str, save_filename: str) -> list[str]:
+    """Return the static prompts that drive an analysis type, used for cache keys.
+
+    Sub-agent user prompts of the multi-agent flows are built from intermediate
+    results, so only their system prompts are included.
+    """
+    if analysis_type == "root-cause-multi":
+        return [
+            root_cause_multi_prompts.build_system_prompt(),
+            root_cause_multi_prompts.build_analysis_prompt(save_filename),
+            root_cause_prompts.build_root_cause_system_prompt(),
+        ]
+    if analysis_type == "root-cause-single":
+        return [
+            root_cause_single_prompts.build_system_prompt(),
+            root_cause_single_prompts.build_analysis_prompt(save_filename),
+        ]
+    if analysis_type == "native-budget":
+        return [
+            native_budget_agent.build_system_prompt(),
+            native_budget_agent.build_analysis_prompt(save_filename),
+        ]
+    if analysis_type == "sandbox":
+        return [
+            sandbox_prompts.build_system_prompt(),
+            sandbox_prompts.build_analysis_prompt(save_filename),
+        ]
+    if analysis_type == "neighbor-multi":
+        return [
+            neighbor_multi_prompts.build_neighbor_detection_system_prompt(),
+            neighbor_multi_prompts.build_neighbor_detection_prompt(save_filename),
+            neighbor_multi_prompts.build_opinion_analysis_system_prompt(),
+        ]
+    if analysis_type == "neighbor-single":
+        return [
+            neighbor_single_prompts.build_system_prompt(),
+            neighbor_single_prompts.build_analysis_prompt(save_filename),
+        ]
+    if analysis_type == "drop-history":
+        return [
+            f"windows={DROP_HISTORY_WINDOWS} threshold={DROP_THRESHOLD_PERCENT}",
+            f"anomaly window={ANOMALY_WINDOW} z={ANOMALY_Z_THRESHOLD} "
+            + f"ewma={ANOMALY_EWMA_ALPHA}/{ANOMALY_EWMA_THRESHOLD}",
+        ]
+    if analysis_type == "power-trends":
+        return [f"window={POWER_TREND_WINDOW}"]
+    if analysis_type == "distance-matrix":
+        return [f"closest_pairs={DEFAULT_DISTANCE_LIMIT}"]
+    if analysis_type == "depletion-forecast":
+        return [
+            f"window={FORECAST_WINDOW} horizon={FORECAST_HORIZON_YEARS} "
+            + f"alpha={FORECAST_LEVEL_ALPHA} beta={FORECAST_TREND_BETA} "
+            + f"segment={FORECAST_MIN_SEGMENT}/{FORECAST_MIN_SPLIT_GAIN} "
+            + f"sigmas={FORECAST_INTERVAL_SIGMAS}",
+        ]
+    if analysis_type == "cross-save":
+        return [
+            f"start={CROSS_SAVE_START_YEAR} bin={CROSS_SAVE_BIN_YEARS} "
+            + f"years={CROSS_SAVE_MAX_YEARS} saves={CROSS_SAVE_MAX_SAVES} "
+            + f"fleet={CROSS_SAVE_MIN_FLEET} percentiles={CROSS_SAVE_PERCENTILES} "
+            + f"underperform={CROSS_SAVE_UNDERPERFORM_PERCENTILE}",
+        ]
+    if analysis_type == "category-movers":
+        return [
+            f"top={CATEGORY_MOVERS_TOP} "
+            + f"min_impact={CATEGORY_MOVER_MIN_IMPACT_PERCENT}",
+        ]
+    raise ValueError(f"Unknown analysis type: {analysis_type}")
+
+
+def is_cacheable(result: AnalysisResult) -> bool:
+    """Partial failures are not cached so that the next run retries them."""
+    if isinstance(result, MultiAgentAnalysisResult):
+        return all(d.analysis_error is None for d in result.drops_with_root_causes)
+    return True
+
+
+async def run_uncached_analysis(
+    analysis_type: str,
+    save_filename: str,
+) -> AnalysisResult:
+    if analysis_type == "root-cause-multi":
+        return await run_root_cause_multi_agent_analysis(save_filename)
+    if analysis_type == "root-cause-single":
+        return await run_root_cause_single_agent_analysis(save_filename)
+    if analysis_type == "native-budget":
+        return (await run_native_budget_analysis(save_filename)).output
+    if analysis_type == "sandbox":
+        return (await run_sandbox_drop_detection_analysis(save_filename)).output
+    if analysis_type == "neighbor-multi":
+        return await run_neighbor_multi_agent_orchestration(save_filename)
+    if analysis_type == "neighbor-single":
+        return await run_neighbor_single_agent_analysis(save_filename)
+    if analysis_type == "drop-history":
+        return await run_drop_history_scan(save_filename)
+    if analysis_type == "category-movers":
+        return await run_category_movers_scan(save_filename)
+    if analysis_type == "power-trends":
+        return await run_power_trends_analysis(save_filename)
+    if analysis_type == "distance-matrix":
+        return await run_distance_matrix_analysis(save_filename)
+    if analysis_type == "depletion-forecast":
+        return await run_depletion_forecast(save_filename)
+    if analysis_type == "cross-save":
+        return await run_cross_save_comparison(save_filename)
+    raise ValueError(f"Unknown analysis type: {analysis_type}")
+
+
+def stream_analysis(
     analysis_type: str,
     save_filename: str,
+) -> AsyncIterator[AnalysisEvent]:
+    if analysis_type == "root-cause-multi":
+        return stream_root_cause_multi_agent_orchestration(save_filename)
+    if analysis_type == "neighbor-multi":
+        return stream_neighbor_multi_agent_orchestration(save_filename)
+    raise ValueError(f"Analysis type {analysis_type} does not support streaming")
+
+
+async def render_stream(
+    events: AsyncIterator[AnalysisEvent],
     *,
     raw: bool = False,
-) -> None:
-    result: MultiAgentAnalysisResult | SuddenDropAnalysisResult | NeighborAnalysisResult
-
-    if analysis_type == "root-cause-multi":
-        result = await run_root_cause_multi_agent_analysis(save_filename)
+) -> AnalysisResult:
+    """Print events as they arrive, as NDJSON when raw, and return the result."""
+    result: AnalysisResult | None = None
+    async for event in events:
         if raw:
-            print(json.dumps(result.model_dump(), indent=2, default=str))
+            print(event.model_dump_json())
         else:
-            print_multi_agent_result(result)
+            print_event(event)
+        sys.stdout.flush()
+
+        if isinstance(
+            event,
+            MultiAgentAnalysisCompleteEvent | NeighborAnalysisCompleteEvent,
+        ):
+            result = event.result
+
+    if result is None:
+        raise RuntimeError("Analysis ended without a result")
+    return result
+
+
+def print_result(analysis_type: str, result: AnalysisResult, *, raw: bool) -> None:
+    if raw and analysis_type in STREAMING_ANALYSIS_TYPES:
+        # Keep the NDJSON format for cached results: a single completion event
+        if isinstance(result, MultiAgentAnalysisResult):
+            print(MultiAgentAnalysisCompleteEvent(result=result).model_dump_json())
+        elif isinstance(result, NeighborAnalysisResult):
+            print(NeighborAnalysisCompleteEvent(result=result).model_dump_json())
+    elif raw:
+        print(json.dumps(result.model_dump(), indent=2, default=str))
+    elif isinstance(result, MultiAgentAnalysisResult):
+        print_multi_agent_result(result)
+    elif isinstance(result, SuddenDropAnalysisResult):
+        print_sudden_drop_result(result)
+    elif isinstance(result, DropHistoryResult):
+        print_drop_history_result(result)
+    elif isinstance(result, CategoryMoversResult):
+        print_category_movers_result(result)
+    elif isinstance(result, PowerTrendsResult):
+        print_power_trends_result(result)
+    elif isinstance(result, EmpireDistanceMatrixResult):
+        print_distance_matrix_result(result)
+    elif isinstance(result, DepletionForecastResult):
+        print_depletion_forecast_result(result)
+    elif isinstance(result, CrossSaveComparisonResult):
+        print_cross_save_result(result)
+    else:
+        print_neighbor_result(result)
+
+
+async def build_analysis_cache_key(
+    analysis_type: str,
+    save_filename: str,
+    settings: Settings,
+) -> str:
+    async with settings.create_graphql_client() as client:
+        # A cross-save comparison changes when any save gets a new snapshot
+        dates = (
+            await fleet_gamestate_keys(client, save_filename)
+            if analysis_type == "cross-save"
+            else await get_available_dates(client, save_filename)
+        )
 
-    elif analysis_type == "root-cause-single":
-        result = await run_root_cause_single_agent_analysis(save_filename)
-        if raw:
-            print(json.dumps(result.model_dump(), indent=2, default=str))
-        else:
-            print_multi_agent_result(result)
+    models = (
+        "none"
+        if analysis_type in DETERMINISTIC_ANALYSIS_TYPES
+        else DEFAULT_CASCADE_POLICY.label
+    )
+    # Prompts do not name the data source, so the GraphQL URL is keyed explicitly
+    return build_cache_key(
+        analysis_type,
+        models,
+        [*build_analysis_prompts(analysis_type, save_filename), settings.graphql_url],
+        dates,
+    )
 
-    elif analysis_type == "native-budget":
-        native_result = await run_native_budget_analysis(save_filename)
-        if raw:
-            print(json.dumps(native_result.output.model_dump(), indent=2, default=str))
-        else:
-            print_sudden_drop_result(native_result.output)
 
-    elif analysis_type == "sandbox":
-        sandbox_result = await run_sandbox_drop_detection_analysis(save_filename)
-        if raw:
-            print(json.dumps(sandbox_result.output.model_dump(), indent=2, default=str))
-        else:
-            print_sudden_drop_result(sandbox_result.output)
+async def run_analysis_async(
+    analysis_type: str,
+    save_filename: str,
+    *,
+    raw: bool = False,
+    refresh: bool = False,
+) -> None:
+    """Run an analysis and print it, reusing cached results for unchanged saves.
 
-    elif analysis_type == "neighbor-multi":
-        result = await run_neighbor_multi_agent_orchestration(save_filename)
-        if raw:
-            print(json.dumps(result.model_dump(), indent=2, default=str))
+    Multi-agent analyses are rendered incrementally as each phase completes.
+    """
+    settings = get_settings()
+    cache = ResultCache(
+        settings.stellaris_stats_result_cache_path,
+        ttl_seconds=settings.stellaris_stats_result_cache_ttl_seconds,
+        max_entries=settings.stellaris_stats_result_cache_max_entries,
+    )
+    try:
+        key = await build_analysis_cache_key(analysis_type, save_filename, settings)
+        cached = None if refresh else cache.get(key, RESULT_TYPES[analysis_type])
+        if cached is not None:
+            print_result(analysis_type, cached, raw=raw)
+            return
+
+        if analysis_type in STREAMING_ANALYSIS_TYPES:
+            result = await render_stream(
+                stream_analysis(analysis_type, save_filename),
+                raw=raw,
+            )
         else:
-            print_neighbor_result(result)
+            result = await run_uncached_analysis(analysis_type, save_filename)
+            print_result(analysis_type, result, raw=raw)
 
-    elif analysis_type == "neighbor-single":
-        result = await run_neighbor_single_agent_analysis(save_filename)
-        if raw:
-            print(json.dumps(result.model_dump(), indent=2, default=str))
-        else:
-            print_neighbor_result(result)
+        if is_cacheable(result):
+            cache.put(key, result)
+    finally:
+        cache.close()
+
+    if CASCADE_STATS.runs:
+        print(
+            f"Model cascade: {CASCADE_STATS.escalation_count}/{CASCADE_STATS.runs} "
+            + f"runs escalated to {DEFAULT_CASCADE_POLICY.strong_model}",
+            file=sys.stderr,
+        )
+    if PROMPT_CACHE_STATS.requests:
+        print(
+            f"Prompt cache: {PROMPT_CACHE_STATS.hit_rate:.0%} of "
+            + f"{PROMPT_CACHE_STATS.input_tokens} input tokens read from cache "
+            + f"over {PROMPT_CACHE_STATS.requests} requests",
+            file=sys.stderr,
+        )
+    for model, limiter in RATE_LIMITERS.limiters.items():
+        stats = limiter.stats
+        if stats.delayed_requests or stats.rate_limited_responses:
+            print(
+                f"Rate limiter {model}: {stats.delayed_requests}/{stats.requests} "
+                + f"requests delayed {stats.total_wait_seconds:.1f}s in total, "
+                + f"max queue depth {stats.max_queue_depth}, "
+                + f"{stats.rate_limited_responses} rate-limited response(s)",
+                file=sys.stderr,
+            )
 
 
 def cmd_analyze(args: argparse.Namespace) -> None:
@@ -276,6 +871,7 @@ def cmd_analyze(args: argparse.Namespace) -> None:
                 args.type,
                 save_filename,
                 raw=args.raw,
+                refresh=args.refresh,
             ),
         )
     except Exception as e:
@@ -315,7 +911,15 @@ Examples:
   agent analyze --type sandbox --save commonwealthofman_1251622081
   agent analyze --type neighbor-multi --save commonwealthofman_1251622081
   agent analyze --type neighbor-single --save commonwealthofman_1251622081
+  agent analyze --type drop-history --save commonwealthofman_1251622081
+  agent analyze --type category-movers --save commonwealthofman_1251622081
+  agent analyze --type power-trends --save commonwealthofman_1251622081
+  agent analyze --type distance-matrix --save commonwealthofman_1251622081
+  agent analyze --type depletion-forecast --save commonwealthofman_1251622081
+  agent analyze --type cross-save --save commonwealthofman_1251622081
   agent analyze --type root-cause-multi --save commonwealthofman_1251622081 --raw
+  agent analyze --type neighbor-multi --save commonwealthofman_1251622081 --raw
+  agent analyze --type root-cause-multi --save commonwealthofman_1251622081 --refresh
         """,
     )
     analyze_parser.add_argument(
@@ -334,7 +938,13 @@ Examples:
     analyze_parser.add_argument(
         "--raw",
         action="store_true",
-        help="Print raw JSON output instead of formatted report",
+        help="Print raw JSON output instead of formatted report "
+        + "(NDJSON events for multi-agent analyses)",
+    )
+    analyze_parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached results and rerun the analysis",
     )
     analyze_parser.set_defaults(func=cmd_analyze)
 
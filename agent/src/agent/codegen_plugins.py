@@ -0,0 +1,65 @@
+"""ariadne-codegen plugins, configured in `[tool.ariadne-codegen]` of pyproject.toml.
+
+Only imported by the code generator, never at runtime.
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+from typing import override
+
+from ariadne_codegen.plugins.base import Plugin
+
+PERSISTED_QUERY_HASHES_NAME = "PERSISTED_QUERY_HASHES"
+
+
+def find_operation_documents(code: str) -> dict[str, str]:
+    """Map operation names to the query documents sent by the generated client methods."""
+    documents: dict[str, str] = {}
+    for method in ast.walk(ast.parse(code)):
+        if not isinstance(method, ast.AsyncFunctionDef):
+            continue
+        query: str | None = None
+        operation_name: str | None = None
+        for node in ast.walk(method):
+            if (
+                isinstance(node, ast.Assign)
+                and isinstance(node.value, ast.Call)
+                and isinstance(node.value.func, ast.Name)
+                and node.value.func.id == "gql"
+                and isinstance(node.value.args[0], ast.Constant)
+                and isinstance(node.value.args[0].value, str)
+            ):
+                query = node.value.args[0].value
+            elif (
+                isinstance(node, ast.keyword)
+                and node.arg == "operation_name"
+                and isinstance(node.value, ast.Constant)
+                and isinstance(node.value.value, str)
+            ):
+                operation_name = node.value.value
+        if query is not None and operation_name is not None:
+            documents[operation_name] = query
+    return documents
+
+
+class PersistedQueriesPlugin(Plugin):
+    """Append SHA-256 hashes of every operation document to the generated client module.
+
+    Hashes are taken from the final formatted code, so they match the exact
+    strings the client sends.
+    """
+
+    @override
+    def generate_client_code(self, generated_code: str) -> str:
+        documents = find_operation_documents(generated_code)
+        entries = "".join(
+            f'    "{name}": "{hashlib.sha256(query.encode()).hexdigest()}",\n'
+            for name, query in sorted(documents.items())
+        )
+        return (
+            f"{generated_code.rstrip()}\n\n\n"
+            "# SHA-256 hashes of the operation documents above, for automatic persisted queries\n"
+            f"{PERSISTED_QUERY_HASHES_NAME}: dict[str, str] = {{\n{entries}}}\n"
+        )
@@ -1,15 +1,49 @@
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any, override
 
 from pydantic_ai import ToolOutput
+from pydantic_ai.messages import ModelResponse
 from pydantic_ai.models import Model
-from pydantic_ai.models.anthropic import AnthropicModel
-from pydantic_ai.models.openai import OpenAIResponsesModel
+from pydantic_ai.models.anthropic import AnthropicModel, AnthropicModelSettings
+from pydantic_ai.models.openai import (
+    OpenAIResponsesModel,
+    OpenAIResponsesModelSettings,
+)
+from pydantic_ai.models.wrapper import WrapperModel
+from pydantic_ai.settings import ModelSettings
+from pydantic_ai.usage import RequestUsage
+
+from agent.rate_limit import RATE_LIMITERS, RateLimitedModel, RateLimits
+
+# Tier 1 limits of the providers; raise them to match the organization's tier
+ANTHROPIC_RATE_LIMITS = RateLimits(requests_per_minute=50, tokens_per_minute=50_000)
+OPENAI_RATE_LIMITS = RateLimits(requests_per_minute=500, tokens_per_minute=200_000)
+
+
+def anthropic_prompt_cache_settings(_cache_key: str) -> ModelSettings:
+    """Mark the system prompt and tool definitions as cacheable prefixes."""
+    return AnthropicModelSettings(
+        anthropic_cache_instructions=True,
+        anthropic_cache_tool_definitions=True,
+    )
+
+
+def openai_prompt_cache_settings(cache_key: str) -> ModelSettings:
+    """Route requests sharing a prefix to the same cache.
+
+    OpenAI caches prompt prefixes automatically; the key only improves hit
+    rates when many requests with the same prefix are sent concurrently.
+    """
+    return OpenAIResponsesModelSettings(openai_prompt_cache_key=cache_key)
 
 
 @dataclass
 class ModelConfig:
     factory: Callable[[], Model]
+    prompt_cache_settings: Callable[[str], ModelSettings]
+    rate_limits: RateLimits
 
 
 def create_claude_haiku() -> Model:
@@ -41,24 +75,161 @@ def create_gpt_5_1_codex_max() -> Model:
 
 
 AVAILABLE_MODELS: dict[str, ModelConfig] = {
-    "anthropic:claude-haiku-4-5-20251001": ModelConfig(create_claude_haiku),
-    "anthropic:claude-sonnet-4-5-20250929": ModelConfig(create_claude_sonnet),
-    "openai-responses:gpt-4.1-2025-04-14": ModelConfig(create_gpt_4_1),
-    "openai-responses:gpt-5.2-2025-12-11": ModelConfig(create_gpt_5_2),
-    "openai-responses:gpt-5-mini-2025-08-07": ModelConfig(create_gpt_5_mini),
-    "openai-responses:gpt-5-nano-2025-08-07": ModelConfig(create_gpt_5_nano),
-    "openai-responses:gpt-5.1-codex-max": ModelConfig(create_gpt_5_1_codex_max),
+    "anthropic:claude-haiku-4-5-20251001": ModelConfig(
+        create_claude_haiku,
+        anthropic_prompt_cache_settings,
+        ANTHROPIC_RATE_LIMITS,
+    ),
+    "anthropic:claude-sonnet-4-5-20250929": ModelConfig(
+        create_claude_sonnet,
+        anthropic_prompt_cache_settings,
+        ANTHROPIC_RATE_LIMITS,
+    ),
+    "openai-responses:gpt-4.1-2025-04-14": ModelConfig(
+        create_gpt_4_1,
+        openai_prompt_cache_settings,
+        OPENAI_RATE_LIMITS,
+    ),
+    "openai-responses:gpt-5.2-2025-12-11": ModelConfig(
+        create_gpt_5_2,
+        openai_prompt_cache_settings,
+        OPENAI_RATE_LIMITS,
+    ),
+    "openai-responses:gpt-5-mini-2025-08-07": ModelConfig(
+        create_gpt_5_mini,
+        openai_prompt_cache_settings,
+        OPENAI_RATE_LIMITS,
+    ),
+    "openai-responses:gpt-5-nano-2025-08-07": ModelConfig(
+        create_gpt_5_nano,
+        openai_prompt_cache_settings,
+        OPENAI_RATE_LIMITS,
+    ),
+    "openai-responses:gpt-5.1-codex-max": ModelConfig(
+        create_gpt_5_1_codex_max,
+        openai_prompt_cache_settings,
+        OPENAI_RATE_LIMITS,
+    ),
 }
 
 DEFAULT_MODEL = "openai-responses:gpt-5.2-2025-12-11"
 
 
+class EscalationReason(StrEnum):
+    VALIDATION_FAILED = "validation_failed"
+    TOOL_CALL_BUDGET_EXCEEDED = "tool_call_budget_exceeded"
+    CROSS_CHECK_DISAGREED = "cross_check_disagreed"
+
+
+@dataclass
+class CascadePolicy:
+    """Run a cheap model first and escalate to a strong model only when needed.
+
+    The cheap model is limited to `cheap_tool_calls_limit` tool calls; exceeding
+    it, failing output validation, or disagreeing with a deterministic cross-check
+    reruns the task on the strong model.
+    """
+
+    cheap_model: str
+    strong_model: str
+    cheap_tool_calls_limit: int
+
+    @property
+    def label(self) -> str:
+        return f"{self.cheap_model}>{self.strong_model}"
+
+
+@dataclass
+class CascadeStats:
+    """Counts cascade runs and escalations to track the escalation rate."""
+
+    runs: int = 0
+    escalations: dict[EscalationReason, int] = field(
+        default_factory=dict[EscalationReason, int],
+    )
+
+    def record(self, reason: EscalationReason | None) -> None:
+        self.runs += 1
+        if reason is not None:
+            self.escalations[reason] = self.escalations.get(reason, 0) + 1
+
+    @property
+    def escalation_count(self) -> int:
+        return sum(self.escalations.values())
+
+    @property
+    def escalation_rate(self) -> float:
+        return self.escalation_count / self.runs if self.runs else 0.0
+
+
+DEFAULT_CASCADE_POLICY = CascadePolicy(
+    cheap_model="openai-responses:gpt-5-nano-2025-08-07",
+    strong_model=DEFAULT_MODEL,
+    cheap_tool_calls_limit=6,
+)
+
+# Process-wide escalation counters, reported by the CLI after each analysis
+CASCADE_STATS = CascadeStats()
+
+
+@dataclass
+class PromptCacheStats:
+    """Sums input tokens and the share of them read from provider prompt caches."""
+
+    requests: int = 0
+    input_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+
+    def record(self, usage: RequestUsage) -> None:
+        self.requests += 1
+        self.input_tokens += usage.input_tokens
+        self.cache_read_tokens += usage.cache_read_tokens
+        self.cache_write_tokens += usage.cache_write_tokens
+
+    @property
+    def hit_rate(self) -> float:
+        return self.cache_read_tokens / self.input_tokens if self.input_tokens else 0.0
+
+
+# Process-wide prompt cache counters, reported by the CLI after each analysis
+PROMPT_CACHE_STATS = PromptCacheStats()
+
+
+class PromptCacheTrackingModel(WrapperModel):
+    """Record the prompt cache usage of every request made through a model."""
+
+    def __init__(
+        self,
+        wrapped: Model,
+        stats: PromptCacheStats = PROMPT_CACHE_STATS,
+    ) -> None:
+        super().__init__(wrapped)
+        self.stats = stats
+
+    @override
+    async def request(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        response = await super().request(*args, **kwargs)
+        self.stats.record(response.usage)
+        return response
+
+
 def wrap_output_type[T](output_type: type[T]) -> ToolOutput[T]:
     return ToolOutput(output_type)
 
 
 def create_model(name: str) -> Model:
-    return AVAILABLE_MODELS[name].factory()
+    config = AVAILABLE_MODELS[name]
+    limiter = RATE_LIMITERS.get(name, config.rate_limits)
+    return PromptCacheTrackingModel(RateLimitedModel(config.factory(), limiter))
+
+
+def create_prompt_cache_settings(name: str, cache_key: str) -> ModelSettings:
+    """Provider settings that let the static prefix of an agent's requests be cached.
+
+    `cache_key` identifies the agent kind, whose system prompt is the prefix.
+    """
+    return AVAILABLE_MODELS[name].prompt_cache_settings(cache_key)
 
 
 def get_model_names() -> list[str]:
@@ -0,0 +1,376 @@
+"""Comparison of one save's resource balances against every other save.
+
+Saves start and progress at different paces, so their series are aligned on
+game time: each gamestate falls into a bin of `CROSS_SAVE_BIN_YEARS` years
+counted from `CROSS_SAVE_START_YEAR`, and snapshots sharing a bin are
+averaged. Aligned rows go into one stacked float32 array of saves x
+resources x bins, allocated up front, so memory is fixed by
+`CROSS_SAVE_MAX_SAVES` and `CROSS_SAVE_MAX_YEARS` however long the saves
+are. Saves are streamed into it: at most `CROSS_SAVE_CONCURRENCY` responses
+are held at once, and each is dropped once aligned.
+
+For every bin the current save reached, the other saves give the fleet's
+percentile band; bins where the current save falls below
+`CROSS_SAVE_UNDERPERFORM_PERCENTILE` are merged into underperformance
+periods.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import aclosing
+from typing import TYPE_CHECKING
+
+from agent.analysis_config import (
+    CROSS_SAVE_BIN_YEARS,
+    CROSS_SAVE_CONCURRENCY,
+    CROSS_SAVE_MAX_SAVES,
+    CROSS_SAVE_MAX_YEARS,
+    CROSS_SAVE_MIN_FLEET,
+    CROSS_SAVE_PERCENTILES,
+    CROSS_SAVE_START_YEAR,
+    CROSS_SAVE_UNDERPERFORM_PERCENTILE,
+    RESOURCE_FIELDS,
+)
+from agent.dates import parse_gamestate_date
+from agent.drop_history import build_resource_columns
+from agent.models import (
+    CrossSaveComparisonResult,
+    PercentileBand,
+    UnderperformancePeriod,
+)
+from agent.native_budget.tools import get_available_dates
+from agent.settings import get_settings
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Mapping, Sequence
+
+    from agent.graphql_client import GetBalanceTotals, ListSaves
+    from agent.native_budget.tools import GraphQLClientProtocol
+    from agent.settings import Settings
+
+
+class StackedSeries:
+    """Year-binned resource balances of many saves in one preallocated array.
+
+    Row `r`, resource `k` and bin `b` live at `((r * resources) + k) * bins + b`;
+    bins a save never reached hold NaN.
+    """
+
+    def __init__(
+        self,
+        max_saves: int = CROSS_SAVE_MAX_SAVES,
+        resources: Sequence[str] = RESOURCE_FIELDS,
+        max_years: int = CROSS_SAVE_MAX_YEARS,
+        bin_years: int = CROSS_SAVE_BIN_YEARS,
+    ) -> None:
+        super().__init__()
+        self.max_saves = max_saves
+        self.resources = list(resources)
+        self.bin_years = bin_years
+        self.bins = max_years // bin_years
+        self.filenames: list[str] = []
+        self.values = array("f", [math.nan]) * (
+            max_saves * len(self.resources) * self.bins
+        )
+
+    def _offset(self, row: int, resource: int) -> int:
+        return (row * len(self.resources) + resource) * self.bins
+
+    def bin_of(self, date: str) -> int | None:
+        """Bin of a gamestate date, or None outside the tracked years."""
+        years = parse_gamestate_date(date).year - CROSS_SAVE_START_YEAR
+        if years < 0:
+            return None
+        index = years // self.bin_years
+        return index if index < self.bins else None
+
+    def year_of(self, index: int) -> int:
+        return CROSS_SAVE_START_YEAR + index * self.bin_years
+
+    def add(
+        self,
+        filename: str,
+        dates: Sequence[str],
+        columns: Mapping[str, Sequence[float]],
+    ) -> int:
+        """Average a save's snapshots per bin into the next free row."""
+        if len(self.filenames) >= self.max_saves:
+            raise ValueError(f"Stacked series is full ({self.max_saves} saves)")
+        row = len(self.filenames)
+        self.filenames.append(filename)
+        bins = [self.bin_of(date) for date in dates]
+        for k, resource in enumerate(self.resources):
+            sums: dict[int, float] = {}
+            counts: dict[int, int] = {}
+            for index, value in zip(bins, columns[resource], strict=True):
+                if index is not None:
+                    sums[index] = sums.get(index, 0.0) + value
+                    counts[index] = counts.get(index, 0) + 1
+            offset = self._offset(row, k)
+            for index, total in sums.items():
+                self.values[offset + index] = total / counts[index]
+        return row
+
+    def value(self, row: int, resource: int, index: int) -> float:
+        return self.values[self._offset(row, resource) + index]
+
+    def column(self, resource: int, index: int, excluded: int) -> list[float]:
+        """Sorted values of every other save in one bin."""
+        return sorted(
+            value
+            for row in range(len(self.filenames))
+            if row != excluded
+            and not math.isnan(value := self.value(row, resource, index))
+        )
+
+
+def percentile(values: Sequence[float], rank: float) -> float:
+    """Linearly interpolated percentile of sorted `values`."""
+    position = (len(values) - 1) * rank / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def percentile_rank(values: Sequence[float], value: float) -> float:
+    """Share of sorted `values` below `value`, in percent.
+
+    Ties count as half below, so matching the whole fleet ranks at the median.
+    """
+    below = bisect_left(values, value) + bisect_right(values, value)
+    return 50 * below / len(values)
+
+
+def compute_bands(
+    stacked: StackedSeries,
+    current: int,
+    percentiles: Sequence[int] = CROSS_SAVE_PERCENTILES,
+    min_fleet: int = CROSS_SAVE_MIN_FLEET,
+) -> list[PercentileBand]:
+    """Fleet percentile bands over every bin the current save reached."""
+    bands: list[PercentileBand] = []
+    for k, resource in enumerate(stacked.resources):
+        for index in range(stacked.bins):
+            value = stacked.value(current, k, index)
+            if math.isnan(value):
+                continue
+            fleet = stacked.column(k, index, excluded=current)
+            if len(fleet) < min_fleet:
+                continue
+            bands.append(
+                PercentileBand(
+                    resource=resource,
+                    year=stacked.year_of(index),
+                    fleet_saves=len(fleet),
+                    band=[percentile(fleet, rank) for rank in percentiles],
+                    fleet_median=percentile(fleet, 50),
+                    current=value,
+                    current_percentile=percentile_rank(fleet, value),
+                ),
+            )
+    return bands
+
+
+def find_underperformance(
+    bands: Sequence[PercentileBand],
+    bin_years: int = CROSS_SAVE_BIN_YEARS,
+    threshold: int = CROSS_SAVE_UNDERPERFORM_PERCENTILE,
+) -> list[UnderperformancePeriod]:
+    """Merge consecutive below-threshold bins of each resource, worst first.
+
+    `bands` must be ordered by resource and year, as `compute_bands` returns
+    them.
+    """
+    periods: list[UnderperformancePeriod] = []
+    run: list[PercentileBand] = []
+
+    def close() -> None:
+        if run:
+            periods.append(
+                UnderperformancePeriod(
+                    resource=run[0].resource,
+                    start_year=run[0].year,
+                    end_year=run[-1].year + bin_years - 1,
+                    mean_percentile=sum(b.current_percentile for b in run) / len(run),
+                    current_mean=sum(b.current for b in run) / len(run),
+                    fleet_median_mean=sum(b.fleet_median for b in run) / len(run),
+                ),
+            )
+            run.clear()
+
+    for band in bands:
+        if band.current_percentile >= threshold:
+            close()
+            continue
+        if run and (
+            run[-1].resource != band.resource or run[-1].year + bin_years != band.year
+        ):
+            close()
+        run.append(band)
+    close()
+    return sorted(
+        periods,
+        key=lambda p: (p.mean_percentile, p.start_year - p.end_year),
+    )
+
+
+async def stream_balance_totals(
+    client: GraphQLClientProtocol,
+    filenames: Sequence[str],
+    concurrency: int = CROSS_SAVE_CONCURRENCY,
+) -> AsyncGenerator[tuple[str, GetBalanceTotals]]:
+    """Yield the balance totals of each save as they arrive.
+
+    A slot is held from the start of a fetch until the consumer resumes the
+    iterator, so at most `concurrency` responses are in memory at once.
+    """
+    slots = asyncio.Semaphore(concurrency)
+
+    async def fetch(filename: str) -> tuple[str, GetBalanceTotals]:
+        await slots.acquire()
+        return filename, await client.get_balance_totals(filename=filename)
+
+    tasks = [asyncio.create_task(fetch(filename)) for filename in filenames]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            try:
+                yield result
+            finally:
+                slots.release()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def build_stacked_series(
+    client: GraphQLClientProtocol,
+    save_filename: str,
+    fleet: Sequence[str],
+    concurrency: int = CROSS_SAVE_CONCURRENCY,
+    max_saves: int = CROSS_SAVE_MAX_SAVES,
+) -> tuple[StackedSeries, int]:
+    """Stream the current save and `fleet` into a stacked series.
+
+    Returns the series and the row of the current save.
+    """
+    stacked = StackedSeries(max_saves=max_saves)
+    current: int | None = None
+    async with aclosing(
+        stream_balance_totals(client, [save_filename, *fleet], concurrency),
+    ) as stream:
+        async for filename, totals in stream:
+            if totals.save is None:
+                if filename == save_filename:
+                    raise ValueError(f"Save '{save_filename}' not found")
+                continue
+            row = stacked.add(filename, *build_resource_columns(totals, filename))
+            if filename == save_filename:
+                current = row
+    if current is None:
+        raise ValueError(f"Save '{save_filename}' not found")
+    return stacked, current
+
+
+def select_fleet(
+    saves: ListSaves,
+    save_filename: str,
+    max_saves: int = CROSS_SAVE_MAX_SAVES,
+) -> tuple[list[str], int]:
+    """The other saves compared against `save_filename`, and how many are skipped."""
+    others = [s.filename for s in saves.saves if s.filename != save_filename]
+    # One row is kept for the current save
+    fleet = others[: max_saves - 1]
+    return fleet, len(others) - len(fleet)
+
+
+async def fleet_gamestate_keys(
+    client: GraphQLClientProtocol,
+    save_filename: str,
+    concurrency: int = CROSS_SAVE_CONCURRENCY,
+    max_saves: int = CROSS_SAVE_MAX_SAVES,
+) -> list[str]:
+    """Gamestate dates of the compared saves, so a snapshot added to any changes them.
+
+    The skipped saves are counted rather than listed, as only their number
+    shows in the comparison.
+    """
+    fleet, skipped = select_fleet(await client.list_saves(), save_filename, max_saves)
+    filenames = [save_filename, *fleet]
+    slots = asyncio.Semaphore(concurrency)
+
+    async def dates_of(filename: str) -> list[str]:
+        async with slots:
+            return await get_available_dates(client, filename)
+
+    dates = await asyncio.gather(*(dates_of(filename) for filename in filenames))
+    return [
+        f"skipped:{skipped}",
+        *(
+            f"{filename}:{date}"
+            for filename, save_dates in zip(filenames, dates, strict=True)
+            for date in save_dates
+        ),
+    ]
+
+
+async def run_cross_save_comparison(
+    save_filename: str,
+    client: GraphQLClientProtocol | None = None,
+    settings: Settings | None = None,
+    max_saves: int = CROSS_SAVE_MAX_SAVES,
+) -> CrossSaveComparisonResult:
+    """Compare a save's resource balances against every other save."""
+    if client is None:
+        if settings is None:
+            settings = get_settings()
+        async with settings.create_graphql_client() as graphql_client:
+            return await compare_saves(graphql_client, save_filename, max_saves)
+    return await compare_saves(client, save_filename, max_saves)
+
+
+async def compare_saves(
+    client: GraphQLClientProtocol,
+    save_filename: str,
+    max_saves: int = CROSS_SAVE_MAX_SAVES,
+) -> CrossSaveComparisonResult:
+    fleet, skipped = select_fleet(await client.list_saves(), save_filename, max_saves)
+    stacked, current = await build_stacked_series(
+        client,
+        save_filename,
+        fleet,
+        max_saves=max_saves,
+    )
+    bands = compute_bands(stacked, current)
+    underperformance = find_underperformance(bands, stacked.bin_years)
+    return CrossSaveComparisonResult(
+        save_filename=save_filename,
+        saves_compared=len(stacked.filenames) - 1,
+        saves_skipped=skipped,
+        bin_years=stacked.bin_years,
+        percentiles=list(CROSS_SAVE_PERCENTILES),
+        underperform_percentile=CROSS_SAVE_UNDERPERFORM_PERCENTILE,
+        bands=bands,
+        underperformance=underperformance,
+        summary=summarize_comparison(stacked, underperformance),
+    )
+
+
+def summarize_comparison(
+    stacked: StackedSeries,
+    underperformance: Sequence[UnderperformancePeriod],
+) -> str:
+    summary = f"Compared against {len(stacked.filenames) - 1} other save(s)."
+    if not underperformance:
+        return summary + " No period below the fleet's band."
+    worst = underperformance[0]
+    return summary + (
+        f" Found {len(underperformance)} underperforming period(s). Worst: "
+        f"{worst.resource} in {worst.start_year}-{worst.end_year} at the "
+        f"{worst.mean_percentile:.0f}th percentile."
+    )
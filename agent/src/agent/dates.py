@@ -0,0 +1,8 @@
+"""Date helpers shared by the analyses."""
+
+from datetime import date, datetime
+
+
+def parse_gamestate_date(value: str) -> date:
+    """Calendar date of a gamestate, from a GraphQL timestamp or a drop date."""
+    return datetime.fromisoformat(value).date()
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from itertools import pairwise
+
+from agent.analysis_config import (
+    DROP_HISTORY_WINDOWS,
+    DROP_THRESHOLD_PERCENT,
+    RESOURCE_FIELDS,
+)
+from agent.models import SuddenDrop
+
+MIN_BASELINE_VALUE = 0.01
+
+
+def compute_drop(
+    resource: str,
+    start_date: str,
+    end_date: str,
+    start_value: float,
+    end_value: float,
+    threshold_percent: float = DROP_THRESHOLD_PERCENT,
+) -> SuddenDrop | None:
+    """Return a SuddenDrop if the value fell by at least the threshold.
+
+    Follows the rules given to the drop detection agents: the earlier value must
+    be positive (negative to more negative is not a drop) and above a near-zero
+    baseline.
+    """
+    if start_value < MIN_BASELINE_VALUE or end_value >= start_value:
+        return None
+
+    drop_absolute = start_value - end_value
+    drop_percent = drop_absolute / abs(start_value) * 100
+    if drop_percent < threshold_percent:
+        return None
+
+    return SuddenDrop(
+        resource=resource,
+        start_date=start_date,
+        end_date=end_date,
+        start_value=start_value,
+        end_value=end_value,
+        drop_percent=drop_percent,
+        drop_absolute=drop_absolute,
+    )
+
+
+def detect_sudden_drops(
+    snapshots: Sequence[tuple[str, Mapping[str, float]]],
+    threshold_percent: float = DROP_THRESHOLD_PERCENT,
+    resources: Sequence[str] = RESOURCE_FIELDS,
+) -> list[SuddenDrop]:
+    """Deterministically find drops between consecutive (date, totals) snapshots."""
+    drops: list[SuddenDrop] = []
+    for (start_date, start), (end_date, end) in pairwise(snapshots):
+        for resource in resources:
+            drop = compute_drop(
+                resource,
+                start_date,
+                end_date,
+                start.get(resource, 0.0),
+                end.get(resource, 0.0),
+                threshold_percent,
+            )
+            if drop is not None:
+                drops.append(drop)
+    return drops
+
+
+def scan_drop_history(
+    dates: Sequence[str],
+    columns: Mapping[str, Sequence[float]],
+    windows: Sequence[int] = DROP_HISTORY_WINDOWS,
+    threshold_percent: float = DROP_THRESHOLD_PERCENT,
+) -> list[SuddenDrop]:
+    """Find drops across a whole save history, strongest first.
+
+    `columns` maps each resource to one total per date. Every window size
+    compares each snapshot with the one `window` steps later, one resource
+    column at a time. Overlapping drops of the same resource, such as a
+    single collapse seen by several windows, are reported once: only the
+    strongest of them is kept.
+    """
+    candidates: list[tuple[int, int, SuddenDrop]] = []
+    for window in windows:
+        if window < 1:
+            raise ValueError(f"Window size must be at least 1, got {window}")
+        for resource, column in columns.items():
+            for start, (start_value, end_value) in enumerate(
+                zip(column, column[window:], strict=False),
+            ):
+                # Inlined pre-check so that only drops construct a SuddenDrop
+                if start_value < MIN_BASELINE_VALUE or end_value >= start_value:
+                    continue
+                drop = compute_drop(
+                    resource,
+                    dates[start],
+                    dates[start + window],
+                    start_value,
+                    end_value,
+                    threshold_percent,
+                )
+                if drop is not None:
+                    candidates.append((start, start + window, drop))
+
+    candidates.sort(key=lambda c: (-c[2].drop_percent, c[0], c[1]))
+    kept: dict[str, list[tuple[int, int]]] = {}
+    drops: list[SuddenDrop] = []
+    for start, end, drop in candidates:
+        spans = kept.setdefault(drop.resource, [])
+        if any(start < kept_end and kept_start < end for kept_start, kept_end in spans):
+            continue
+        spans.append((start, end))
+        drops.append(drop)
+    return drops
+
+
+def drops_agree(expected: Sequence[SuddenDrop], actual: Sequence[SuddenDrop]) -> bool:
+    """Check that two drop lists flag the same set of resources."""
+    return {d.resource for d in expected} == {d.resource for d in actual}
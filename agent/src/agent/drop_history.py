@@ -0,0 +1,90 @@
+"""Deterministic drop scan over the full history of a save."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from agent.analysis_config import (
+    DROP_HISTORY_WINDOWS,
+    DROP_THRESHOLD_PERCENT,
+    RESOURCE_FIELDS,
+)
+from agent.anomaly import detect_anomalies
+from agent.drop_detection import scan_drop_history
+from agent.models import DropHistoryResult, ResourceAnomaly, SuddenDrop
+from agent.settings import get_settings
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from agent.graphql_client import GetBalanceTotals
+    from agent.native_budget.tools import GraphQLClientProtocol
+    from agent.settings import Settings
+
+type ResourceColumns = dict[str, list[float]]
+
+
+def build_resource_columns(
+    totals: GetBalanceTotals,
+    save_filename: str,
+) -> tuple[list[str], ResourceColumns]:
+    """Pivot per-gamestate balance totals into dates and one column per resource."""
+    if totals.save is None:
+        raise ValueError(f"Save '{save_filename}' not found")
+
+    gamestates = sorted(totals.save.gamestates, key=lambda gs: gs.date)
+    dates = [str(gs.date) for gs in gamestates]
+    balances = [gs.budget.totals.balance.model_dump(by_alias=True) for gs in gamestates]
+    columns: ResourceColumns = {
+        resource: [balance[resource] or 0.0 for balance in balances]
+        for resource in RESOURCE_FIELDS
+    }
+    return dates, columns
+
+
+async def run_drop_history_scan(
+    save_filename: str,
+    client: GraphQLClientProtocol | None = None,
+    windows: Sequence[int] = DROP_HISTORY_WINDOWS,
+    threshold_percent: float = DROP_THRESHOLD_PERCENT,
+    settings: Settings | None = None,
+) -> DropHistoryResult:
+    """Fetch the balance totals of every gamestate and scan them for drops and anomalies."""
+    if client is None:
+        if settings is None:
+            settings = get_settings()
+        async with settings.create_graphql_client() as graphql_client:
+            totals = await graphql_client.get_balance_totals(filename=save_filename)
+    else:
+        totals = await client.get_balance_totals(filename=save_filename)
+
+    dates, columns = build_resource_columns(totals, save_filename)
+    drops = scan_drop_history(dates, columns, windows, threshold_percent)
+    anomalies = detect_anomalies(dates, columns)
+    return DropHistoryResult(
+        save_filename=save_filename,
+        history_start=dates[0] if dates else "",
+        history_end=dates[-1] if dates else "",
+        gamestates_scanned=len(dates),
+        window_sizes=list(windows),
+        drop_threshold_percent=threshold_percent,
+        drops=drops,
+        anomalies=anomalies,
+        summary=summarize_drop_history(drops, anomalies, len(dates)),
+    )
+
+
+def summarize_drop_history(
+    drops: Sequence[SuddenDrop],
+    anomalies: Sequence[ResourceAnomaly],
+    gamestates: int,
+) -> str:
+    summary = f"Detected {len(drops)} sudden drop(s) across {gamestates} gamestate(s)."
+    if drops:
+        strongest = drops[0]
+        summary += (
+            f" Strongest: {strongest.resource} fell {strongest.drop_percent:.1f}% "
+            f"between {strongest.start_date} and {strongest.end_date}."
+        )
+    summary += f" Flagged {len(anomalies)} statistical anomaly(ies)."
+    return summary
@@ -29,6 +29,14 @@ from agent.evals.root_cause_multi_runner import run_root_cause_multi_evals
 from agent.evals.root_cause_single_runner import run_root_cause_single_evals
 from agent.evals.sandbox_runner import run_sandbox_evals
 from agent.evals.test_database import destroy_test_template
+from agent.evals.warehouse import (
+    DEFAULT_LATENCY_TOLERANCE,
+    DEFAULT_PASS_RATE_TOLERANCE,
+    DEFAULT_TOKEN_TOLERANCE,
+    EvalRunSummary,
+    EvalWarehouse,
+    find_regressions,
+)
 from agent.settings import Settings, get_settings
 
 
@@ -83,6 +91,29 @@ def build_experiment_name(
     return f"{dataset_name}_{model_short}"
 
 
+async def run_and_record(
+    dataset_name: str,
+    dataset: Any,
+    model: str,
+    settings: Settings,
+) -> None:
+    config = AVAILABLE_DATASETS[dataset_name]
+    experiment_name = build_experiment_name(dataset_name, model)
+    report = await config.runner(
+        dataset,
+        model,
+        experiment_name,
+        settings,
+    )
+
+    warehouse = EvalWarehouse(settings.stellaris_stats_eval_results_path)
+    try:
+        run_id = warehouse.record_report(report, dataset=dataset_name, model=model)
+    finally:
+        warehouse.close()
+    print(f"Stored eval run {run_id} in {settings.stellaris_stats_eval_results_path}")
+
+
 async def run_evals_for_models(
     dataset_name: str,
     dataset: Any,
@@ -90,22 +121,126 @@ async def run_evals_for_models(
     settings: Settings,
 ) -> None:
     async with eval_session(settings):
-        config = AVAILABLE_DATASETS[dataset_name]
-        runner = config.runner
         for model in models:
             print(f"\n{'=' * 60}")
             print(f"Running evals with model: {model}")
             print("=" * 60)
-            experiment_name = build_experiment_name(dataset_name, model)
-            await runner(
-                dataset,
-                model,
-                experiment_name,
-                settings,
-            )
+            await run_and_record(dataset_name, dataset, model, settings)
+
+
+def print_run_summary(label: str, summary: EvalRunSummary) -> None:
+    print(f"{label}: run {summary.run_id} ({summary.experiment}, {summary.created_at})")
+    print(
+        f"  cases={summary.case_count} failures={summary.failure_count} "
+        + f"pass_rate={summary.pass_rate:.2%}",
+    )
+    print(
+        f"  p50={summary.p50_latency:.2f}s p95={summary.p95_latency:.2f}s "
+        + f"input_tokens={summary.mean_input_tokens:.0f} "
+        + f"output_tokens={summary.mean_output_tokens:.0f} "
+        + f"tool_calls={summary.mean_tool_calls:.1f}",
+    )
+
+
+def compare_main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="budget-evals compare",
+        description="Compare two stored eval runs and flag performance regressions",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  budget-evals compare --dataset root_cause_multi --model openai-responses:gpt-5.2-2025-12-11
+  budget-evals compare --baseline 12 --candidate 15
+        """,
+    )
+    parser.add_argument(
+        "--dataset",
+        type=str,
+        choices=list(AVAILABLE_DATASETS.keys()),
+        help="Dataset whose two latest runs are compared",
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        choices=get_model_names(),
+        help="Model whose two latest runs are compared",
+    )
+    parser.add_argument("--baseline", type=int, help="Baseline run id")
+    parser.add_argument("--candidate", type=int, help="Candidate run id")
+    parser.add_argument(
+        "--latency-tolerance",
+        type=float,
+        default=DEFAULT_LATENCY_TOLERANCE,
+        help="Allowed relative p50/p95 latency increase (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--token-tolerance",
+        type=float,
+        default=DEFAULT_TOKEN_TOLERANCE,
+        help="Allowed relative token usage increase (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--pass-rate-tolerance",
+        type=float,
+        default=DEFAULT_PASS_RATE_TOLERANCE,
+        help="Allowed absolute pass rate drop (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+
+    settings = get_settings()
+    warehouse = EvalWarehouse(settings.stellaris_stats_eval_results_path)
+    try:
+        if args.baseline is not None and args.candidate is not None:
+            baseline_id, candidate_id = args.baseline, args.candidate
+        elif args.dataset and args.model:
+            run_ids = warehouse.latest_run_ids(args.dataset, args.model, limit=2)
+            if len(run_ids) < 2:
+                print(
+                    f"Error: need two stored runs for {args.dataset} / {args.model}, "
+                    + f"found {len(run_ids)}",
+                )
+                sys.exit(1)
+            candidate_id, baseline_id = run_ids
+        else:
+            parser.error("provide --baseline and --candidate, or --dataset and --model")
+
+        try:
+            baseline = warehouse.summarize_run(baseline_id)
+            candidate = warehouse.summarize_run(candidate_id)
+        except KeyError as e:
+            print(f"Error: {e.args[0]}")
+            sys.exit(1)
+    finally:
+        warehouse.close()
+
+    print_run_summary("Baseline", baseline)
+    print_run_summary("Candidate", candidate)
+
+    regressions = find_regressions(
+        baseline,
+        candidate,
+        latency_tolerance=args.latency_tolerance,
+        token_tolerance=args.token_tolerance,
+        pass_rate_tolerance=args.pass_rate_tolerance,
+    )
+    if not regressions:
+        print("\nNo regressions detected.")
+        return
+
+    print("\nREGRESSIONS:")
+    for regression in regressions:
+        print(
+            f"  - {regression.metric}: {regression.baseline:.4g} -> "
+            + f"{regression.candidate:.4g} ({regression.change_percent:+.1f}%)",
+        )
+    sys.exit(1)
 
 
 def main() -> None:
+    if sys.argv[1:2] == ["compare"]:
+        compare_main(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(
         description="Run pydantic-ai evals for budget and neighbor agents",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -118,6 +253,7 @@ Examples:
   budget-evals --dataset neighbor_multi
   budget-evals --dataset neighbor_single
   budget-evals --list-datasets
+  budget-evals compare --dataset root_cause_multi --model openai-responses:gpt-5.2-2025-12-11
         """,
     )
 
@@ -179,16 +315,10 @@ Examples:
         print(f"Filtered to case '{args.case}' (1 of {original_count} cases)")
 
     if args.model:
-        experiment_name = build_experiment_name(dataset_name, args.model)
 
         async def run_single() -> None:
             async with eval_session(settings):
-                await config.runner(
-                    dataset,
-                    args.model,
-                    experiment_name,
-                    settings,
-                )
+                await run_and_record(dataset_name, dataset, args.model, settings)
 
         asyncio.run(run_single())
     else:
@@ -5,6 +5,7 @@ from agent.evals.evaluators.output_quality import (
     NoResourceDrop,
     ResourceDrop,
 )
+from agent.evals.evaluators.performance import performance_evaluators
 from agent.evals.types import EvalInputs, EvalMetadata
 from agent.models import SuddenDropAnalysisResult
 
@@ -87,7 +88,15 @@ def create_native_budget_dataset() -> Dataset[
         ),
     ]
 
-    global_evaluators = (IsInstance(type_name="SuddenDropAnalysisResult"),)
+    global_evaluators = (
+        IsInstance(type_name="SuddenDropAnalysisResult"),
+        *performance_evaluators(
+            max_seconds=180.0,
+            max_input_tokens=200_000,
+            max_output_tokens=20_000,
+            max_tool_calls=5,
+        ),
+    )
 
     return Dataset(
         name="native_budget",
@@ -10,6 +10,7 @@ from agent.evals.evaluators.neighbor_quality import (
     NeighborThreatRange,
     NoFindingType,
 )
+from agent.evals.evaluators.performance import performance_evaluators
 from agent.evals.types import EvalInputs, EvalMetadata
 from agent.neighbor import FindingSeverity, NeighborAnalysisResult
 
@@ -120,7 +121,16 @@ def create_neighbor_dataset() -> Dataset[
         ),
     ]
 
-    global_evaluators = (IsInstance(type_name="NeighborAnalysisResult"),)
+    global_evaluators = (
+        IsInstance(type_name="NeighborAnalysisResult"),
+        *performance_evaluators(
+            max_seconds=900.0,
+            max_input_tokens=400_000,
+            max_output_tokens=80_000,
+            max_tool_calls=30,
+            max_sandbox_executions=25,
+        ),
+    )
 
     return Dataset(
         name="neighbor_analysis",
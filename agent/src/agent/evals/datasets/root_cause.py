@@ -7,6 +7,7 @@ from agent.evals.evaluators.output_quality import (
     ResourceDrop,
     RootCauseAnalyzed,
 )
+from agent.evals.evaluators.performance import performance_evaluators
 from agent.evals.types import EvalInputs, EvalMetadata
 from agent.models import MultiAgentAnalysisResult
 
@@ -95,7 +96,16 @@ def create_root_cause_dataset() -> Dataset[
         ),
     ]
 
-    global_evaluators = (IsInstance(type_name="MultiAgentAnalysisResult"),)
+    global_evaluators = (
+        IsInstance(type_name="MultiAgentAnalysisResult"),
+        *performance_evaluators(
+            max_seconds=600.0,
+            max_input_tokens=400_000,
+            max_output_tokens=60_000,
+            max_tool_calls=15,
+            max_sandbox_executions=12,
+        ),
+    )
 
     return Dataset(
         name="root_cause_drop_detection",
@@ -5,6 +5,7 @@ from agent.evals.evaluators.output_quality import (
     NoResourceDrop,
     ResourceDrop,
 )
+from agent.evals.evaluators.performance import performance_evaluators
 from agent.evals.types import EvalInputs, EvalMetadata
 from agent.models import SuddenDropAnalysisResult
 
@@ -87,7 +88,16 @@ def create_sandbox_dataset() -> Dataset[
         ),
     ]
 
-    global_evaluators = (IsInstance(type_name="SuddenDropAnalysisResult"),)
+    global_evaluators = (
+        IsInstance(type_name="SuddenDropAnalysisResult"),
+        *performance_evaluators(
+            max_seconds=300.0,
+            max_input_tokens=150_000,
+            max_output_tokens=30_000,
+            max_tool_calls=6,
+            max_sandbox_executions=4,
+        ),
+    )
 
     return Dataset(
         name="sandbox",
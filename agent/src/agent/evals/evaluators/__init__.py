@@ -15,12 +15,21 @@ from agent.evals.evaluators.output_quality import (
     ResourceDrop,
     RootCauseAnalyzed,
 )
+from agent.evals.evaluators.performance import (
+    MaxDuration,
+    PromptCacheHitRate,
+    SandboxExecutionBudget,
+    TokenBudget,
+    ToolCallBudget,
+    performance_evaluators,
+)
 
 __all__ = [
     "HasFindingType",
     "HasOpinionModifier",
     "HasTopContributor",
     "HostileNeighborDetected",
+    "MaxDuration",
     "NeighborCount",
     "NeighborDetected",
     "NeighborDistanceOrder",
@@ -28,6 +37,11 @@ __all__ = [
     "NeighborThreatRange",
     "NoFindingType",
     "NoResourceDrop",
+    "PromptCacheHitRate",
     "ResourceDrop",
     "RootCauseAnalyzed",
+    "SandboxExecutionBudget",
+    "TokenBudget",
+    "ToolCallBudget",
+    "performance_evaluators",
 ]
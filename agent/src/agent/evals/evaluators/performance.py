@@ -0,0 +1,235 @@
+from collections.abc import Collection
+from dataclasses import dataclass
+from typing import Any, override
+
+from pydantic_evals.evaluators import (
+    EvaluationReason,
+    Evaluator,
+    EvaluatorContext,
+    EvaluatorOutput,
+)
+from pydantic_evals.otel import SpanNode, SpanTree
+
+from agent.evals.types import EvalInputs, EvalMetadata
+from agent.sandbox_scripts import RUN_PYTHON_CODE_TOOL, RUN_SANDBOX_SCRIPT_TOOL
+
+SANDBOX_TOOL_NAMES = frozenset({RUN_PYTHON_CODE_TOOL, RUN_SANDBOX_SCRIPT_TOOL})
+
+
+def _is_tool_call(node: SpanNode) -> bool:
+    """Match spans recorded by pydantic-ai for function and MCP tool executions.
+
+    Output tools (`final_result`) are recorded as output function spans and do not
+    count as tool calls.
+    """
+    message = node.attributes.get("logfire.msg")
+    return (
+        "gen_ai.tool.name" in node.attributes
+        and isinstance(message, str)
+        and message.startswith("running tool:")
+    )
+
+
+def _recorded_span_tree(
+    ctx: EvaluatorContext[EvalInputs, Any, EvalMetadata],
+) -> SpanTree | str:
+    """Return the task's span tree, or the reason it was not recorded.
+
+    pydantic-evals raises an error type it does not export when spans were not
+    captured, so any error from reading the tree is reported as the reason.
+    """
+    try:
+        return ctx.span_tree
+    except Exception as e:
+        return str(e)
+
+
+def _count_tool_calls(
+    span_tree: SpanTree,
+    tool_names: Collection[str] | None = None,
+) -> int:
+    return sum(
+        1
+        for node in span_tree.find(_is_tool_call)
+        if tool_names is None or node.attributes.get("gen_ai.tool.name") in tool_names
+    )
+
+
+@dataclass
+class MaxDuration(
+    Evaluator[EvalInputs, Any, EvalMetadata],
+):
+    """Evaluator that asserts the task finished within a wall-clock budget."""
+
+    max_seconds: float
+
+    @override
+    def evaluate(
+        self,
+        ctx: EvaluatorContext[EvalInputs, Any, EvalMetadata],
+    ) -> EvaluationReason:
+        if ctx.duration <= self.max_seconds:
+            return EvaluationReason(
+                value=True,
+                reason=f"Finished in {ctx.duration:.1f}s (<= {self.max_seconds:.1f}s)",
+            )
+        return EvaluationReason(
+            value=False,
+            reason=f"Took {ctx.duration:.1f}s, budget is {self.max_seconds:.1f}s",
+        )
+
+
+@dataclass
+class TokenBudget(
+    Evaluator[EvalInputs, Any, EvalMetadata],
+):
+    """Evaluator that asserts LLM token usage stayed within budget.
+
+    Token counts come from the `input_tokens`/`output_tokens` metrics that
+    pydantic-evals aggregates from instrumented model request spans.
+    """
+
+    max_input_tokens: int | None = None
+    max_output_tokens: int | None = None
+
+    @override
+    def evaluate(
+        self,
+        ctx: EvaluatorContext[EvalInputs, Any, EvalMetadata],
+    ) -> EvaluationReason:
+        input_tokens = int(ctx.metrics.get("input_tokens", 0))
+        output_tokens = int(ctx.metrics.get("output_tokens", 0))
+
+        if self.max_input_tokens is not None and input_tokens > self.max_input_tokens:
+            return EvaluationReason(
+                value=False,
+                reason=f"Used {input_tokens} input tokens, budget is {self.max_input_tokens}",
+            )
+
+        if (
+            self.max_output_tokens is not None
+            and output_tokens > self.max_output_tokens
+        ):
+            return EvaluationReason(
+                value=False,
+                reason=f"Used {output_tokens} output tokens, budget is {self.max_output_tokens}",
+            )
+
+        return EvaluationReason(
+            value=True,
+            reason=f"Used {input_tokens} input and {output_tokens} output tokens",
+        )
+
+
+@dataclass
+class ToolCallBudget(
+    Evaluator[EvalInputs, Any, EvalMetadata],
+):
+    """Evaluator that asserts the number of tool calls stayed within budget.
+
+    Also reports the count as a `tool_calls` score so it is stored with the run.
+    """
+
+    max_tool_calls: int
+
+    @override
+    def evaluate(
+        self,
+        ctx: EvaluatorContext[EvalInputs, Any, EvalMetadata],
+    ) -> EvaluatorOutput:
+        span_tree = _recorded_span_tree(ctx)
+        if not isinstance(span_tree, SpanTree):
+            return {
+                "tool_call_budget": EvaluationReason(
+                    value=False,
+                    reason=f"Cannot count tool calls: {span_tree}",
+                ),
+            }
+        count = _count_tool_calls(span_tree)
+
+        return {
+            "tool_calls": count,
+            "tool_call_budget": EvaluationReason(
+                value=count <= self.max_tool_calls,
+                reason=f"Made {count} tool calls (budget {self.max_tool_calls})",
+            ),
+        }
+
+
+@dataclass
+class SandboxExecutionBudget(
+    Evaluator[EvalInputs, Any, EvalMetadata],
+):
+    """Evaluator that asserts the agents used at most K sandbox code executions."""
+
+    max_executions: int
+
+    @override
+    def evaluate(
+        self,
+        ctx: EvaluatorContext[EvalInputs, Any, EvalMetadata],
+    ) -> EvaluatorOutput:
+        span_tree = _recorded_span_tree(ctx)
+        if not isinstance(span_tree, SpanTree):
+            return {
+                "sandbox_execution_budget": EvaluationReason(
+                    value=False,
+                    reason=f"Cannot count sandbox executions: {span_tree}",
+                ),
+            }
+        count = _count_tool_calls(span_tree, SANDBOX_TOOL_NAMES)
+
+        return {
+            "sandbox_executions": count,
+            "sandbox_execution_budget": EvaluationReason(
+                value=count <= self.max_executions,
+                reason=f"Ran {count} sandbox executions (budget {self.max_executions})",
+            ),
+        }
+
+
+@dataclass
+class PromptCacheHitRate(
+    Evaluator[EvalInputs, Any, EvalMetadata],
+):
+    """Evaluator that reports the share of input tokens read from provider prompt caches.
+
+    Uses the `cache_read_tokens` metric that pydantic-evals aggregates from
+    instrumented model request spans. It never fails a case; the score is
+    stored with the run so cache regressions show up in comparisons.
+    """
+
+    @override
+    def evaluate(
+        self,
+        ctx: EvaluatorContext[EvalInputs, Any, EvalMetadata],
+    ) -> EvaluatorOutput:
+        input_tokens = int(ctx.metrics.get("input_tokens", 0))
+        cache_read_tokens = int(ctx.metrics.get("cache_read_tokens", 0))
+        return {
+            "prompt_cache_hit_rate": (
+                cache_read_tokens / input_tokens if input_tokens else 0.0
+            ),
+        }
+
+
+def performance_evaluators(
+    max_seconds: float,
+    max_input_tokens: int,
+    max_output_tokens: int,
+    max_tool_calls: int,
+    max_sandbox_executions: int | None = None,
+) -> tuple[Evaluator[EvalInputs, Any, EvalMetadata], ...]:
+    """Build the standard set of performance evaluators attached to every dataset."""
+    evaluators: list[Evaluator[EvalInputs, Any, EvalMetadata]] = [
+        MaxDuration(max_seconds=max_seconds),
+        TokenBudget(
+            max_input_tokens=max_input_tokens,
+            max_output_tokens=max_output_tokens,
+        ),
+        ToolCallBudget(max_tool_calls=max_tool_calls),
+        PromptCacheHitRate(),
+    ]
+    if max_sandbox_executions is not None:
+        evaluators.append(SandboxExecutionBudget(max_executions=max_sandbox_executions))
+    return tuple(evaluators)
@@ -1,10 +1,12 @@
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
+from urllib.parse import urlparse
 
 import logfire
 from pydantic_evals import Dataset
 from pydantic_evals.reporting import EvaluationReport
 
+from agent.agent_registry import AGENT_REGISTRY, AgentKey
 from agent.constants import DEFAULT_MODEL
 from agent.evals.fixture_loader import load_fixture
 from agent.evals.server_manager import (
@@ -20,6 +22,7 @@ from agent.evals.test_database import (
 from agent.evals.types import EvalInputs, EvalMetadata, LegacyEvalTask
 from agent.models import SuddenDropAnalysisResult
 from agent.native_budget.agent import (
+    NATIVE_BUDGET_AGENT,
     build_analysis_prompt,
     create_native_budget_agent,
 )
@@ -60,23 +63,13 @@ async def run_native_budget_eval(
             inputs["fixture_path"],
             settings,
         ) as (_db_ctx, server):
-            if settings.stellaris_stats_eval_graphql_server_host:
-                graphql_url = (
-                    f"http://{settings.stellaris_stats_eval_graphql_server_host}"
-                    f":{server.port}/graphql"
-                )
-            else:
-                graphql_url = server.url
-
             # Create a custom GraphQL client pointing to the test server
             eval_settings = settings.model_copy(
                 update={
-                    "stellaris_stats_graphql_server_host": graphql_url.split("://")[
-                        1
-                    ].split(":")[0],
-                    "stellaris_stats_graphql_server_port": int(
-                        graphql_url.split(":")[-1].split("/")[0],
-                    ),
+                    "stellaris_stats_graphql_server_host": urlparse(
+                        server.url,
+                    ).hostname,
+                    "stellaris_stats_graphql_server_port": server.port,
                 },
             )
 
@@ -85,7 +78,10 @@ async def run_native_budget_eval(
 
             prompt = build_analysis_prompt(inputs["save_filename"])
             actual_model = model_name or DEFAULT_MODEL
-            agent = create_native_budget_agent(actual_model)
+            agent = AGENT_REGISTRY.get_agent(
+                AgentKey(NATIVE_BUDGET_AGENT, actual_model),
+                create_native_budget_agent,
+            )
 
             result = await agent.run(
                 prompt,
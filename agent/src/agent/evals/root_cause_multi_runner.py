@@ -1,5 +1,6 @@
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
+from urllib.parse import urlparse
 
 import logfire
 from pydantic_evals import Dataset
@@ -57,22 +58,12 @@ async def run_root_cause_multi_eval(
             inputs["fixture_path"],
             settings,
         ) as (_db_ctx, server):
-            if settings.stellaris_stats_eval_graphql_server_host:
-                graphql_url = (
-                    f"http://{settings.stellaris_stats_eval_graphql_server_host}"
-                    f":{server.port}/graphql"
-                )
-            else:
-                graphql_url = server.url
-
             eval_settings = settings.model_copy(
                 update={
-                    "stellaris_stats_graphql_server_host": graphql_url.split("://")[
-                        1
-                    ].split(":")[0],
-                    "stellaris_stats_graphql_server_port": int(
-                        graphql_url.split(":")[-1].split("/")[0],
-                    ),
+                    "stellaris_stats_graphql_server_host": urlparse(
+                        server.url,
+                    ).hostname,
+                    "stellaris_stats_graphql_server_port": server.port,
                 },
             )
 
@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from pydantic_evals.reporting import EvaluationReport, ReportCase
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS eval_runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    dataset TEXT NOT NULL,
+    model TEXT NOT NULL,
+    experiment TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS eval_cases (
+    run_id INTEGER NOT NULL REFERENCES eval_runs (run_id) ON DELETE CASCADE,
+    case_name TEXT NOT NULL,
+    succeeded INTEGER NOT NULL,
+    task_duration REAL,
+    total_duration REAL,
+    requests INTEGER NOT NULL,
+    input_tokens INTEGER NOT NULL,
+    output_tokens INTEGER NOT NULL,
+    cache_read_tokens INTEGER NOT NULL,
+    tool_calls INTEGER NOT NULL,
+    assertions_passed INTEGER NOT NULL,
+    assertions_total INTEGER NOT NULL,
+    error_message TEXT
+);
+
+CREATE TABLE IF NOT EXISTS eval_assertions (
+    run_id INTEGER NOT NULL REFERENCES eval_runs (run_id) ON DELETE CASCADE,
+    case_name TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    reason TEXT
+);
+
+CREATE INDEX IF NOT EXISTS eval_runs_dataset_model_idx
+    ON eval_runs (dataset, model, run_id);
+CREATE INDEX IF NOT EXISTS eval_cases_run_idx ON eval_cases (run_id);
+CREATE INDEX IF NOT EXISTS eval_assertions_run_idx ON eval_assertions (run_id);
+"""
+
+DEFAULT_LATENCY_TOLERANCE = 0.20
+DEFAULT_TOKEN_TOLERANCE = 0.10
+DEFAULT_PASS_RATE_TOLERANCE = 0.0
+
+
+@dataclass
+class EvalRunSummary:
+    """Aggregated performance and accuracy numbers for a single stored eval run."""
+
+    run_id: int
+    dataset: str
+    model: str
+    experiment: str
+    created_at: str
+    case_count: int
+    failure_count: int
+    p50_latency: float
+    p95_latency: float
+    mean_input_tokens: float
+    mean_output_tokens: float
+    mean_tool_calls: float
+    pass_rate: float
+
+
+@dataclass
+class Regression:
+    """A metric that got worse between a baseline and a candidate run."""
+
+    metric: str
+    baseline: float
+    candidate: float
+    change_percent: float
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Linearly interpolated percentile, matching numpy's default method."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    fraction = position - lower
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * fraction
+
+
+def _case_number(case: ReportCase[Any, Any, Any], name: str) -> int:
+    """Read a numeric value recorded either as a task metric or an evaluator score."""
+    if name in case.metrics:
+        return int(case.metrics[name])
+    score = case.scores.get(name)
+    return int(score.value) if score is not None else 0
+
+
+class EvalWarehouse:
+    """Local SQLite store for eval reports, used to compare runs over time."""
+
+    def __init__(self, path: str | Path) -> None:
+        super().__init__()
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def record_report(
+        self,
+        report: EvaluationReport[Any, Any, Any],
+        dataset: str,
+        model: str,
+        created_at: datetime | None = None,
+    ) -> int:
+        """Persist every case of an evaluation report and return the new run id."""
+        timestamp = (created_at or datetime.now(UTC)).isoformat()
+        with self._conn:
+            cursor = self._conn.execute(
+                """
+                INSERT INTO eval_runs (dataset, model, experiment, created_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (dataset, model, report.name, timestamp),
+            )
+            run_id = cursor.lastrowid
+            assert run_id is not None
+
+            case_rows: list[tuple[object, ...]] = []
+            assertion_rows: list[tuple[object, ...]] = []
+            for case in report.cases:
+                passed = sum(1 for a in case.assertions.values() if a.value)
+                case_rows.append(
+                    (
+                        run_id,
+                        case.name,
+                        1,
+                        case.task_duration,
+                        case.total_duration,
+                        _case_number(case, "requests"),
+                        _case_number(case, "input_tokens"),
+                        _case_number(case, "output_tokens"),
+                        _case_number(case, "cache_read_tokens"),
+                        _case_number(case, "tool_calls"),
+                        passed,
+                        len(case.assertions),
+                        None,
+                    ),
+                )
+                assertion_rows.extend(
+                    (run_id, case.name, name, int(result.value), result.reason)
+                    for name, result in case.assertions.items()
+                )
+            case_rows.extend(
+                (
+                    run_id,
+                    failure.name,
+                    0,
+                    None,
+                    None,
+                    0,
+                    0,
+                    0,
+                    0,
+                    0,
+                    0,
+                    0,
+                    failure.error_message,
+                )
+                for failure in report.failures
+            )
+
+            self._conn.executemany(
+                "INSERT INTO eval_cases VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                case_rows,
+            )
+            self._conn.executemany(
+                "INSERT INTO eval_assertions VALUES (?, ?, ?, ?, ?)",
+                assertion_rows,
+            )
+        return run_id
+
+    def latest_run_ids(self, dataset: str, model: str, limit: int = 2) -> list[int]:
+        """Return the most recent run ids for a dataset/model pair, newest first."""
+        rows = self._conn.execute(
+            """
+            SELECT run_id FROM eval_runs
+            WHERE dataset = ? AND model = ?
+            ORDER BY run_id DESC
+            LIMIT ?
+            """,
+            (dataset, model, limit),
+        ).fetchall()
+        return [int(row[0]) for row in rows]
+
+    def summarize_run(self, run_id: int) -> EvalRunSummary:
+        run = self._conn.execute(
+            "SELECT dataset, model, experiment, created_at FROM eval_runs WHERE run_id = ?",
+            (run_id,),
+        ).fetchone()
+        if run is None:
+            raise KeyError(f"Eval run {run_id} not found")
+
+        rows = self._conn.execute(
+            """
+            SELECT succeeded, task_duration, input_tokens, output_tokens,
+                   tool_calls, assertions_passed, assertions_total
+            FROM eval_cases
+            WHERE run_id = ?
+            """,
+            (run_id,),
+        ).fetchall()
+
+        succeeded = [row for row in rows if row[0]]
+        latencies = [float(row[1]) for row in succeeded]
+        case_pass_rates = [
+            (row[5] / row[6] if row[6] else 1.0) if row[0] else 0.0 for row in rows
+        ]
+
+        def mean(values: list[float]) -> float:
+            return sum(values) / len(values) if values else 0.0
+
+        return EvalRunSummary(
+            run_id=run_id,
+            dataset=str(run[0]),
+            model=str(run[1]),
+            experiment=str(run[2]),
+            created_at=str(run[3]),
+            case_count=len(rows),
+            failure_count=len(rows) - len(succeeded),
+            p50_latency=percentile(latencies, 50),
+            p95_latency=percentile(latencies, 95),
+            mean_input_tokens=mean([float(row[2]) for row in succeeded]),
+            mean_output_tokens=mean([float(row[3]) for row in succeeded]),
+            mean_tool_calls=mean([float(row[4]) for row in succeeded]),
+            pass_rate=mean(case_pass_rates),
+        )
+
+
+def _relative_change(baseline: float, candidate: float) -> float:
+    if baseline == 0:
+        return 0.0 if candidate == 0 else float("inf")
+    return (candidate - baseline) / abs(baseline)
+
+
+def find_regressions(
+    baseline: EvalRunSummary,
+    candidate: EvalRunSummary,
+    latency_tolerance: float = DEFAULT_LATENCY_TOLERANCE,
+    token_tolerance: float = DEFAULT_TOKEN_TOLERANCE,
+    pass_rate_tolerance: float = DEFAULT_PASS_RATE_TOLERANCE,
+) -> list[Regression]:
+    """Compare two run summaries and list every metric that regressed beyond tolerance.
+
+    Latency and token tolerances are relative increases (0.2 = 20% slower), the
+    pass rate tolerance is an absolute drop (0.05 = five percentage points).
+    """
+    regressions: list[Regression] = []
+
+    higher_is_worse = [
+        ("p50_latency", baseline.p50_latency, candidate.p50_latency, latency_tolerance),
+        ("p95_latency", baseline.p95_latency, candidate.p95_latency, latency_tolerance),
+        (
+            "mean_input_tokens",
+            baseline.mean_input_tokens,
+            candidate.mean_input_tokens,
+            token_tolerance,
+        ),
+        (
+            "mean_output_tokens",
+            baseline.mean_output_tokens,
+            candidate.mean_output_tokens,
+            token_tolerance,
+        ),
+    ]
+    for metric, before, after, tolerance in higher_is_worse:
+        change = _relative_change(before, after)
+        if change > tolerance:
+            regressions.append(
+                Regression(
+                    metric=metric,
+                    baseline=before,
+                    candidate=after,
+                    change_percent=change * 100,
+                ),
+            )
+
+    if baseline.pass_rate - candidate.pass_rate > pass_rate_tolerance:
+        regressions.append(
+            Regression(
+                metric="pass_rate",
+                baseline=baseline.pass_rate,
+                candidate=candidate.pass_rate,
+                change_percent=_relative_change(baseline.pass_rate, candidate.pass_rate)
+                * 100,
+            ),
+        )
+
+    return regressions
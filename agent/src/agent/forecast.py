@@ -0,0 +1,368 @@
+"""Depletion forecasting over the resource history of a save.
+
+Drop detection tells when a resource fell; this engine projects when its
+monthly balance turns negative. Three trend models are fitted to the
+trailing `FORECAST_WINDOW` snapshots of every resource:
+
+- linear: ordinary least squares. All columns share the time axis, so the
+  normal equations are solved once and every column's slope is a dot
+  product with the same weights;
+- EWMA: Holt's linear smoothing, an exponentially weighted level and trend,
+  which follows recent changes more closely than the line;
+- piecewise: two least-squares lines split at the breakpoint with the
+  smallest total error, projecting the segment after it. Segment errors come
+  from prefix sums, so every split is scored in constant time.
+
+The model with the smallest residual error, corrected for its number of
+parameters, gives the projected zero crossing. The crossing interval is
+where the projection plus or minus `FORECAST_INTERVAL_SIGMAS` residual
+standard deviations reaches zero. Fitting is linear in the window per
+resource, cheap enough to rerun whenever a gamestate is added.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import timedelta
+from itertools import accumulate
+from typing import TYPE_CHECKING, Any
+
+from pydantic_ai.toolsets import FunctionToolset
+
+from agent.analysis_config import (
+    FORECAST_HORIZON_YEARS,
+    FORECAST_INTERVAL_SIGMAS,
+    FORECAST_LEVEL_ALPHA,
+    FORECAST_MIN_SEGMENT,
+    FORECAST_MIN_SPLIT_GAIN,
+    FORECAST_TREND_BETA,
+    FORECAST_WINDOW,
+)
+from agent.dates import parse_gamestate_date
+from agent.drop_history import build_resource_columns
+from agent.models import DepletionForecastResult, ForecastModel, ResourceForecast
+from agent.settings import get_settings
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    from agent.native_budget.tools import GraphQLClientProtocol
+    from agent.settings import Settings
+
+GET_DEPLETION_FORECAST_TOOL = "get_depletion_forecast"
+DAYS_PER_YEAR = 365.25
+# Parameters of each model, subtracted from the residual degrees of freedom
+MODEL_PARAMETERS = {
+    ForecastModel.LINEAR: 2,
+    ForecastModel.EWMA: 2,
+    ForecastModel.PIECEWISE: 5,
+}
+
+
+@dataclass(frozen=True)
+class TrendFit:
+    """A fitted trend: its value at the latest snapshot and slope per day."""
+
+    model: ForecastModel
+    level: float
+    slope: float
+    residual_std: float
+
+
+def _residual_std(sse: float, points: int, model: ForecastModel) -> float:
+    dof = points - MODEL_PARAMETERS[model]
+    if dof <= 0:
+        return math.inf
+    return math.sqrt(max(sse, 0.0) / dof)
+
+
+def fit_linear(
+    times: Sequence[float],
+    columns: Mapping[str, Sequence[float]],
+) -> dict[str, TrendFit]:
+    """Least-squares line of every column, from one shared solve."""
+    n = len(times)
+    mean_t = sum(times) / n
+    centered = [t - mean_t for t in times]
+    sxx = sum(c * c for c in centered)
+    # slope = weights . y for every column
+    weights = [c / sxx for c in centered] if sxx > 0 else [0.0] * n
+
+    fits: dict[str, TrendFit] = {}
+    for resource, values in columns.items():
+        mean_y = sum(values) / n
+        slope = sum(w * y for w, y in zip(weights, values, strict=True))
+        sse = sum(
+            (y - mean_y - slope * c) ** 2 for y, c in zip(values, centered, strict=True)
+        )
+        fits[resource] = TrendFit(
+            model=ForecastModel.LINEAR,
+            level=mean_y + slope * centered[-1],
+            slope=slope,
+            residual_std=_residual_std(sse, n, ForecastModel.LINEAR),
+        )
+    return fits
+
+
+def fit_ewma(
+    times: Sequence[float],
+    columns: Mapping[str, Sequence[float]],
+    alpha: float = FORECAST_LEVEL_ALPHA,
+    beta: float = FORECAST_TREND_BETA,
+) -> dict[str, TrendFit]:
+    """Holt's linear smoothing of every column, scored by one-step-ahead errors."""
+    fits: dict[str, TrendFit] = {}
+    for resource, values in columns.items():
+        level, trend, sse = values[0], 0.0, 0.0
+        for i in range(1, len(values)):
+            step = times[i] - times[i - 1]
+            predicted = level + trend * step
+            sse += (values[i] - predicted) ** 2
+            previous = level
+            level = alpha * values[i] + (1 - alpha) * predicted
+            if step > 0:
+                trend = beta * (level - previous) / step + (1 - beta) * trend
+        fits[resource] = TrendFit(
+            model=ForecastModel.EWMA,
+            level=level,
+            slope=trend,
+            residual_std=_residual_std(sse, len(values), ForecastModel.EWMA),
+        )
+    return fits
+
+
+def _prefix(values: Sequence[float]) -> list[float]:
+    return [0.0, *accumulate(values)]
+
+
+@dataclass(frozen=True)
+class _SegmentSums:
+    """Prefix sums of one column and the time axis, for constant-time segment lines."""
+
+    times: Sequence[float]
+    t: list[float]
+    tt: list[float]
+    y: list[float]
+    ty: list[float]
+    yy: list[float]
+
+    def line(self, start: int, end: int) -> tuple[float, float, float]:
+        """Slope, value at the last time and error of the line over [start, end)."""
+        count = end - start
+        s_t, s_y = self.t[end] - self.t[start], self.y[end] - self.y[start]
+        sxx = self.tt[end] - self.tt[start] - s_t * s_t / count
+        sxy = self.ty[end] - self.ty[start] - s_t * s_y / count
+        syy = self.yy[end] - self.yy[start] - s_y * s_y / count
+        if sxx <= 0:
+            return 0.0, s_y / count, syy
+        slope = sxy / sxx
+        level = s_y / count + slope * (self.times[end - 1] - s_t / count)
+        return slope, level, syy - sxy * slope
+
+
+def fit_piecewise(
+    times: Sequence[float],
+    columns: Mapping[str, Sequence[float]],
+    min_segment: int = FORECAST_MIN_SEGMENT,
+    min_gain: float = FORECAST_MIN_SPLIT_GAIN,
+) -> dict[str, TrendFit]:
+    """Two-segment least-squares fit of every column, projecting the last segment.
+
+    A split must remove `min_gain` of a single line's error, so noise is not
+    read as a break. Columns too short to split, or without such a split,
+    are fitted with one line over the whole window.
+    """
+    n = len(times)
+    # Sums over the time axis are shared by every column
+    t_sums = _prefix(times)
+    tt_sums = _prefix([t * t for t in times])
+
+    fits: dict[str, TrendFit] = {}
+    for resource, values in columns.items():
+        sums = _SegmentSums(
+            times=times,
+            t=t_sums,
+            tt=tt_sums,
+            y=_prefix(values),
+            ty=_prefix([t * y for t, y in zip(times, values, strict=True)]),
+            yy=_prefix([y * y for y in values]),
+        )
+        split, (slope, level, sse) = 0, sums.line(0, n)
+        best = sse * (1 - min_gain)
+        for k in range(min_segment, n - min_segment + 1):
+            _, _, left = sums.line(0, k)
+            right_slope, right_level, right = sums.line(k, n)
+            if left + right < best:
+                split, slope, level, sse = k, right_slope, right_level, left + right
+                best = sse
+        fits[resource] = TrendFit(
+            model=ForecastModel.PIECEWISE,
+            level=level,
+            slope=slope,
+            residual_std=_residual_std(
+                sse,
+                n,
+                ForecastModel.PIECEWISE if split else ForecastModel.LINEAR,
+            ),
+        )
+    return fits
+
+
+def days_until_zero(level: float, slope: float) -> float | None:
+    """Days until a positive, falling trend reaches zero."""
+    if level <= 0 or slope >= 0:
+        return None
+    return level / -slope
+
+
+def forecast_depletion(
+    dates: Sequence[str],
+    columns: Mapping[str, Sequence[float]],
+    window: int = FORECAST_WINDOW,
+    horizon_years: float = FORECAST_HORIZON_YEARS,
+    sigmas: float = FORECAST_INTERVAL_SIGMAS,
+) -> list[ResourceForecast]:
+    """Project when each resource's balance turns negative, soonest first.
+
+    Only resources whose best model crosses zero within the horizon are
+    returned; resources already negative have nothing left to forecast.
+    """
+    if len(dates) < 2:
+        return []
+    calendar = [parse_gamestate_date(d) for d in dates[-window:]]
+    latest = calendar[-1]
+    times = [float((day - latest).days) for day in calendar]
+    recent = {resource: list(values[-window:]) for resource, values in columns.items()}
+    horizon_days = horizon_years * DAYS_PER_YEAR
+
+    def crossing_date(days: float | None) -> str | None:
+        if days is None or days > horizon_days:
+            return None
+        return (latest + timedelta(days=days)).isoformat()
+
+    fitted = [
+        fit_linear(times, recent),
+        fit_ewma(times, recent),
+        fit_piecewise(times, recent),
+    ]
+
+    forecasts: list[ResourceForecast] = []
+    for resource, values in recent.items():
+        fits = [fits[resource] for fits in fitted]
+        best = min(fits, key=lambda fit: fit.residual_std)
+        expected = crossing_date(days_until_zero(best.level, best.slope))
+        if expected is None or values[-1] <= 0:
+            continue
+        spread = sigmas * best.residual_std if math.isfinite(best.residual_std) else 0.0
+        earliest = max(best.level - spread, 0.0) / -best.slope
+        latest_days = (best.level + spread) / -best.slope
+        forecasts.append(
+            ResourceForecast(
+                resource=resource,
+                model=best.model,
+                current_value=values[-1],
+                trend_per_year=best.slope * DAYS_PER_YEAR,
+                zero_crossing_date=expected,
+                earliest_crossing_date=(latest + timedelta(days=earliest)).isoformat(),
+                latest_crossing_date=(latest + timedelta(days=latest_days)).isoformat(),
+                model_crossing_dates={
+                    fit.model: crossing_date(days_until_zero(fit.level, fit.slope))
+                    for fit in fits
+                },
+            ),
+        )
+    return sorted(forecasts, key=lambda f: f.zero_crossing_date)
+
+
+def create_forecast_toolset(
+    forecasts: Sequence[ResourceForecast],
+) -> FunctionToolset[Any]:
+    """Expose precomputed depletion forecasts to an agent as a query tool."""
+
+    async def get_depletion_forecast(
+        resource: str | None = None,
+    ) -> list[ResourceForecast]:
+        """Return when resources' monthly balances are projected to turn negative.
+
+        An empty list means the resource is not projected to turn negative
+        within the forecast horizon.
+
+        Args:
+            resource: Resource to forecast. When omitted, every resource
+                projected to turn negative is returned, soonest first.
+        """
+        return [f for f in forecasts if resource is None or f.resource == resource]
+
+    return FunctionToolset([get_depletion_forecast])
+
+
+def build_forecast_prompt_section() -> str:
+    return f"""## Depletion Forecast
+
+Call the `{GET_DEPLETION_FORECAST_TOOL}` tool with a `resource` to get the
+projected date its monthly balance turns negative, with an interval and the
+trend model behind it. Use it to say when a drop becomes a deficit instead of
+estimating it from the data yourself."""
+
+
+async def run_depletion_forecast(
+    save_filename: str,
+    client: GraphQLClientProtocol | None = None,
+    settings: Settings | None = None,
+) -> DepletionForecastResult:
+    """Fetch the balance totals of every gamestate and forecast depletion."""
+    if client is None:
+        if settings is None:
+            settings = get_settings()
+        async with settings.create_graphql_client() as graphql_client:
+            totals = await graphql_client.get_balance_totals(filename=save_filename)
+    else:
+        totals = await client.get_balance_totals(filename=save_filename)
+
+    dates, columns = build_resource_columns(totals, save_filename)
+    forecasts = forecast_depletion(dates, columns)
+    return DepletionForecastResult(
+        save_filename=save_filename,
+        history_start=dates[0] if dates else "",
+        history_end=dates[-1] if dates else "",
+        gamestates_used=min(len(dates), FORECAST_WINDOW),
+        horizon_years=FORECAST_HORIZON_YEARS,
+        forecasts=forecasts,
+        summary=summarize_forecasts(forecasts),
+    )
+
+
+async def fetch_depletion_forecasts(
+    client: GraphQLClientProtocol,
+    save_filename: str,
+) -> list[ResourceForecast]:
+    """Fetch the balance totals of every gamestate and forecast depletion."""
+    totals = await client.get_balance_totals(filename=save_filename)
+    return forecast_depletion(*build_resource_columns(totals, save_filename))
+
+
+async def fetch_optional_depletion_forecasts(
+    client: GraphQLClientProtocol,
+    save_filename: str,
+) -> list[ResourceForecast]:
+    """Like `fetch_depletion_forecasts`, but returns no forecasts on failure.
+
+    Forecasts only add context to a root cause analysis, so a failed fetch
+    must not stop the analysis.
+    """
+    try:
+        return await fetch_depletion_forecasts(client, save_filename)
+    except Exception:
+        return []
+
+
+def summarize_forecasts(forecasts: Sequence[ResourceForecast]) -> str:
+    if not forecasts:
+        return "No resource is projected to turn negative within the horizon."
+    soonest = forecasts[0]
+    return (
+        f"{len(forecasts)} resource(s) projected to turn negative. Soonest: "
+        f"{soonest.resource} around {soonest.zero_crossing_date} "
+        f"({soonest.earliest_crossing_date} to {soonest.latest_crossing_date})."
+    )
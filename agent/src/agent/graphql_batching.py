@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, cast, override
+
+import httpx
+
+from agent.graphql_client import Client
+from agent.graphql_client.client import PERSISTED_QUERY_HASHES
+from agent.graphql_client.exceptions import GraphQLClientInvalidResponseError
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+PERSISTED_QUERY_NOT_FOUND = "PERSISTED_QUERY_NOT_FOUND"
+PERSISTED_QUERY_NOT_SUPPORTED = "PERSISTED_QUERY_NOT_SUPPORTED"
+# Persisted query errors are tiny; larger responses are never parsed to look for one
+MAX_PERSISTED_QUERY_ERROR_BYTES = 1024
+
+
+@dataclass
+class _PendingOperation:
+    query: str
+    operation_name: str | None
+    variables: dict[str, Any]
+    future: asyncio.Future[httpx.Response]
+
+    def payload(self, *, persisted: bool, include_query: bool) -> dict[str, Any]:
+        """Build the request body.
+
+        When `persisted`, the query hash is attached; the query text is left
+        out unless `include_query`, in which case the server registers it
+        under the hash.
+        """
+        payload: dict[str, Any] = {
+            "operationName": self.operation_name,
+            "variables": self.variables,
+        }
+        query_hash = PERSISTED_QUERY_HASHES.get(self.operation_name or "")
+        if persisted and query_hash is not None:
+            payload["extensions"] = {
+                "persistedQuery": {"version": 1, "sha256Hash": query_hash},
+            }
+        else:
+            include_query = True
+        if include_query:
+            payload["query"] = self.query
+        return payload
+
+
+@dataclass
+class BatchingStats:
+    """Operations sent by a batching client and the HTTP requests that carried them."""
+
+    operations: int = 0
+    http_requests: int = 0
+    max_batch_size: int = 0
+    persisted_query_misses: int = 0
+
+
+class BatchingClient(Client):
+    """GraphQL client that sends operations issued within a short window as one request.
+
+    Operations are collected for `window_seconds` (or until `max_batch_size`
+    are queued) and posted as a JSON array, which the server answers with an
+    array of results in the same order. Each result is handed back to its
+    caller as its own response, so the generated query methods decode it
+    unchanged. A window holding a single operation is sent as a normal
+    request; uploads and calls with extra request options bypass batching.
+
+    With `persisted_queries`, operations are sent as the SHA-256 hash
+    generated at codegen time (automatic persisted queries). Operations the
+    server has not seen yet are resent once with their full text, which
+    registers the hash for later requests.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        http_client: httpx.AsyncClient,
+        window_seconds: float,
+        max_batch_size: int,
+        *,
+        persisted_queries: bool = True,
+    ) -> None:
+        super().__init__(url=url, http_client=http_client)
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self.persisted_queries = persisted_queries
+        self.stats = BatchingStats()
+        self._pending: list[_PendingOperation] = []
+        self._flush_task: asyncio.Task[None] | None = None
+        self._sending: set[asyncio.Task[None]] = set()
+
+    @override
+    async def execute(
+        self,
+        query: str,
+        operation_name: str | None = None,
+        variables: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        processed_variables, files, _ = self._process_variables(variables)
+        if kwargs or files:
+            self._record(1)
+            return await super().execute(query, operation_name, variables, **kwargs)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(
+            _PendingOperation(
+                query=query,
+                operation_name=operation_name,
+                variables=processed_variables,
+                future=future,
+            ),
+        )
+        if len(self._pending) >= self.max_batch_size:
+            self._send_pending()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+        return await future
+
+    def _record(self, size: int) -> None:
+        self.stats.operations += size
+        self.stats.http_requests += 1
+        self.stats.max_batch_size = max(self.stats.max_batch_size, size)
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self.window_seconds)
+        self._flush_task = None
+        self._send_pending()
+
+    def _send_pending(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        batch, self._pending = self._pending, []
+        if batch:
+            # Sent from its own task so a cancelled caller cannot abort the batch
+            task = asyncio.create_task(self._send_batch(batch))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _send_batch(self, batch: Sequence[_PendingOperation]) -> None:
+        try:
+            persisted = self.persisted_queries
+            responses = await self._send_payloads(
+                [
+                    operation.payload(persisted=persisted, include_query=not persisted)
+                    for operation in batch
+                ],
+            )
+            if persisted:
+                await self._resend_missed_queries(batch, responses)
+        except Exception as e:  # Handed to every waiting caller
+            for operation in batch:
+                if not operation.future.done():
+                    operation.future.set_exception(e)
+            return
+
+        for operation, response in zip(batch, responses, strict=True):
+            if not operation.future.done():
+                operation.future.set_result(response)
+
+    async def _resend_missed_queries(
+        self,
+        batch: Sequence[_PendingOperation],
+        responses: list[httpx.Response],
+    ) -> None:
+        missed: list[int] = []
+        for index, response in enumerate(responses):
+            code = persisted_query_error(response)
+            if code == PERSISTED_QUERY_NOT_SUPPORTED:
+                self.persisted_queries = False
+            if code is not None:
+                missed.append(index)
+        if not missed:
+            return
+
+        self.stats.persisted_query_misses += len(missed)
+        resent = await self._send_payloads(
+            [
+                batch[index].payload(
+                    persisted=self.persisted_queries,
+                    include_query=True,
+                )
+                for index in missed
+            ],
+        )
+        for index, response in zip(missed, resent, strict=True):
+            responses[index] = response
+
+    async def _send_payloads(
+        self,
+        payloads: list[dict[str, Any]],
+    ) -> list[httpx.Response]:
+        self._record(len(payloads))
+        if len(payloads) == 1:
+            return [await self._post(payloads[0])]
+        return split_batch_response(await self._post(payloads), len(payloads))
+
+    async def _post(self, content: object) -> httpx.Response:
+        return await self.http_client.post(
+            url=self.url,
+            json=content,
+            headers={"Content-Type": "application/json"},
+        )
+
+
+def persisted_query_error(response: httpx.Response) -> str | None:
+    """Return the persisted query error code of a response, if it carries one."""
+    content = response.content
+    if (
+        len(content) > MAX_PERSISTED_QUERY_ERROR_BYTES
+        or b"PERSISTED_QUERY" not in content
+    ):
+        return None
+    try:
+        body: object = json.loads(content)
+    except ValueError:
+        return None
+    if not isinstance(body, dict):
+        return None
+    errors: list[dict[str, Any]] = cast("dict[str, Any]", body).get("errors") or []
+    for error in errors:
+        extensions: dict[str, Any] = error.get("extensions") or {}
+        code = extensions.get("code")
+        if code in (PERSISTED_QUERY_NOT_FOUND, PERSISTED_QUERY_NOT_SUPPORTED):
+            return cast("str", code)
+    return None
+
+
+def split_batch_response(response: httpx.Response, size: int) -> list[httpx.Response]:
+    """Split an array-batched response into one response per operation.
+
+    Servers answer a whole batch with an error status when one operation
+    fails, e.g. Apollo's 404 for a persisted query miss, so an array of the
+    batch's size is split whatever the status; each result then carries its
+    own errors. A failed HTTP response without such an array is returned for
+    every operation, so each caller raises the usual HTTP error from
+    `get_data`.
+    """
+    try:
+        payload: object = response.json()
+    except ValueError as e:
+        if not response.is_success:
+            return [response] * size
+        raise GraphQLClientInvalidResponseError(response=response) from e
+    if not isinstance(payload, list) or len(cast("list[object]", payload)) != size:
+        if not response.is_success:
+            return [response] * size
+        raise GraphQLClientInvalidResponseError(response=response)
+    results = cast("list[object]", payload)
+    status_code = response.status_code if response.is_success else httpx.codes.OK
+    return [
+        httpx.Response(status_code, json=result, request=response.request)
+        for result in results
+    ]
@@ -90,6 +90,14 @@ from .fragments import (
     BudgetCategoryFieldsTradePolicy,
     BudgetEntryFields,
 )
+from .get_balance_totals import (
+    GetBalanceTotals,
+    GetBalanceTotalsSave,
+    GetBalanceTotalsSaveGamestates,
+    GetBalanceTotalsSaveGamestatesBudget,
+    GetBalanceTotalsSaveGamestatesBudgetTotals,
+    GetBalanceTotalsSaveGamestatesBudgetTotalsBalance,
+)
 from .get_budget import (
     GetBudget,
     GetBudgetSave,
@@ -98,6 +106,17 @@ from .get_budget import (
     GetBudgetSaveGamestatesBudgetBalance,
 )
 from .get_dates import GetDates, GetDatesSave, GetDatesSaveGamestates
+from .get_empire_power import (
+    GetEmpirePower,
+    GetEmpirePowerSave,
+    GetEmpirePowerSaveGamestates,
+    GetEmpirePowerSaveGamestatesEmpires,
+)
+from .get_gamestate_ids import (
+    GetGamestateIds,
+    GetGamestateIdsSave,
+    GetGamestateIdsSaveGamestates,
+)
 from .get_income_expenses import (
     GetIncomeExpenses,
     GetIncomeExpensesSave,
@@ -106,6 +125,16 @@ from .get_income_expenses import (
     GetIncomeExpensesSaveGamestatesBudgetExpenses,
     GetIncomeExpensesSaveGamestatesBudgetIncome,
 )
+from .get_neighbor_data import (
+    GetNeighborData,
+    GetNeighborDataSave,
+    GetNeighborDataSaveGamestates,
+    GetNeighborDataSaveGamestatesAllPlanetCoordinates,
+    GetNeighborDataSaveGamestatesDiplomaticRelations,
+    GetNeighborDataSaveGamestatesDiplomaticRelationsOpinionModifiers,
+    GetNeighborDataSaveGamestatesEmpires,
+    GetNeighborDataSaveGamestatesPlayerEmpire,
+)
 from .list_saves import ListSaves, ListSavesSaves
 
 __all__ = [
@@ -190,6 +219,12 @@ __all__ = [
     "BudgetEntryFields",
     "CacheControlScope",
     "Client",
+    "GetBalanceTotals",
+    "GetBalanceTotalsSave",
+    "GetBalanceTotalsSaveGamestates",
+    "GetBalanceTotalsSaveGamestatesBudget",
+    "GetBalanceTotalsSaveGamestatesBudgetTotals",
+    "GetBalanceTotalsSaveGamestatesBudgetTotalsBalance",
     "GetBudget",
     "GetBudgetSave",
     "GetBudgetSaveGamestates",
@@ -198,12 +233,27 @@ __all__ = [
     "GetDates",
     "GetDatesSave",
     "GetDatesSaveGamestates",
+    "GetEmpirePower",
+    "GetEmpirePowerSave",
+    "GetEmpirePowerSaveGamestates",
+    "GetEmpirePowerSaveGamestatesEmpires",
+    "GetGamestateIds",
+    "GetGamestateIdsSave",
+    "GetGamestateIdsSaveGamestates",
     "GetIncomeExpenses",
     "GetIncomeExpensesSave",
     "GetIncomeExpensesSaveGamestates",
     "GetIncomeExpensesSaveGamestatesBudget",
     "GetIncomeExpensesSaveGamestatesBudgetExpenses",
     "GetIncomeExpensesSaveGamestatesBudgetIncome",
+    "GetNeighborData",
+    "GetNeighborDataSave",
+    "GetNeighborDataSaveGamestates",
+    "GetNeighborDataSaveGamestatesAllPlanetCoordinates",
+    "GetNeighborDataSaveGamestatesDiplomaticRelations",
+    "GetNeighborDataSaveGamestatesDiplomaticRelationsOpinionModifiers",
+    "GetNeighborDataSaveGamestatesEmpires",
+    "GetNeighborDataSaveGamestatesPlayerEmpire",
     "GraphQLClientError",
     "GraphQLClientGraphQLError",
     "GraphQLClientGraphQLMultiError",
@@ -4,9 +4,13 @@
 from typing import Any
 
 from .async_base_client import AsyncBaseClient
+from .get_balance_totals import GetBalanceTotals
 from .get_budget import GetBudget
 from .get_dates import GetDates
+from .get_empire_power import GetEmpirePower
+from .get_gamestate_ids import GetGamestateIds
 from .get_income_expenses import GetIncomeExpenses
+from .get_neighbor_data import GetNeighborData
 from .list_saves import ListSaves
 
 
@@ -52,6 +56,26 @@ class Client(AsyncBaseClient):
         data = self.get_data(response)
         return GetDates.model_validate(data)
 
+    async def get_gamestate_ids(self, filename: str, **kwargs: Any) -> GetGamestateIds:
+        query = gql(
+            """
+            query GetGamestateIds($filename: String!) {
+              save(filename: $filename) {
+                gamestates {
+                  gamestateId
+                  date
+                }
+              }
+            }
+            """
+        )
+        variables: dict[str, object] = {"filename": filename}
+        response = await self.execute(
+            query=query, operation_name="GetGamestateIds", variables=variables, **kwargs
+        )
+        data = self.get_data(response)
+        return GetGamestateIds.model_validate(data)
+
     async def get_budget(self, filename: str, **kwargs: Any) -> GetBudget:
         query = gql(
             """
@@ -609,3 +633,151 @@ class Client(AsyncBaseClient):
         )
         data = self.get_data(response)
         return GetIncomeExpenses.model_validate(data)
+
+    async def get_balance_totals(
+        self, filename: str, **kwargs: Any
+    ) -> GetBalanceTotals:
+        query = gql(
+            """
+            query GetBalanceTotals($filename: String!) {
+              save(filename: $filename) {
+                gamestates {
+                  date
+                  budget {
+                    totals {
+                      balance {
+                        ...BudgetEntryFields
+                      }
+                    }
+                  }
+                }
+              }
+            }
+
+            fragment BudgetEntryFields on BudgetEntry {
+              alloys
+              astralThreads
+              consumerGoods
+              energy
+              engineeringResearch
+              exoticGases
+              food
+              influence
+              minerals
+              minorArtifacts
+              nanites
+              physicsResearch
+              rareCrystals
+              societyResearch
+              srDarkMatter
+              srLivingMetal
+              srZro
+              trade
+              unity
+              volatileMotes
+            }
+            """
+        )
+        variables: dict[str, object] = {"filename": filename}
+        response = await self.execute(
+            query=query,
+            operation_name="GetBalanceTotals",
+            variables=variables,
+            **kwargs
+        )
+        data = self.get_data(response)
+        return GetBalanceTotals.model_validate(data)
+
+    async def get_empire_power(self, filename: str, **kwargs: Any) -> GetEmpirePower:
+        query = gql(
+            """
+            query GetEmpirePower($filename: String!) {
+              save(filename: $filename) {
+                gamestates {
+                  date
+                  empires {
+                    countryId
+                    name
+                    isPlayer
+                    militaryPower
+                    economyPower
+                    techPower
+                  }
+                }
+              }
+            }
+            """
+        )
+        variables: dict[str, object] = {"filename": filename}
+        response = await self.execute(
+            query=query, operation_name="GetEmpirePower", variables=variables, **kwargs
+        )
+        data = self.get_data(response)
+        return GetEmpirePower.model_validate(data)
+
+    async def get_neighbor_data(self, filename: str, **kwargs: Any) -> GetNeighborData:
+        query = gql(
+            """
+            query GetNeighborData($filename: String!) {
+              save(filename: $filename) {
+                gamestates {
+                  date
+                  playerEmpire {
+                    countryId
+                    name
+                    ownedPlanetIds
+                    ownedPlanetCount
+                  }
+                  empires {
+                    countryId
+                    name
+                    ownedPlanetIds
+                    ownedPlanetCount
+                    militaryPower
+                    economyPower
+                    techPower
+                  }
+                  diplomaticRelations {
+                    targetCountryId
+                    targetEmpireName
+                    opinion
+                    trust
+                    threat
+                    isHostile
+                    borderRange
+                    hasContact
+                    hasCommunications
+                    opinionModifiers {
+                      modifierType
+                      value
+                    }
+                  }
+                  allPlanetCoordinates {
+                    planetId
+                    x
+                    y
+                  }
+                }
+              }
+            }
+            """
+        )
+        variables: dict[str, object] = {"filename": filename}
+        response = await self.execute(
+            query=query, operation_name="GetNeighborData", variables=variables, **kwargs
+        )
+        data = self.get_data(response)
+        return GetNeighborData.model_validate(data)
+
+
+# SHA-256 hashes of the operation documents above, for automatic persisted queries
+PERSISTED_QUERY_HASHES: dict[str, str] = {
+    "GetBalanceTotals": "2bef272fe69caaf99203d9b8f2a2c840eb9810503bb2b8e682acb155fd785a5d",
+    "GetBudget": "a56da53f1ae8c622d98002a58255e1b07ab41a5e3b6a0309d69b4102c9bc8c8a",
+    "GetDates": "871ee1518dc197d07831e39e800ad754afd2fc74fce4e275688ffc4beec8a638",
+    "GetEmpirePower": "1f4ed76b8d7c2e124919b71a6c3588938ac24bc8896525710c875129462afbc7",
+    "GetGamestateIds": "0eeda968f44d86106e4bd4a3a29e52d9d2a57932ce861fa4df94f71253ff8f1b",
+    "GetIncomeExpenses": "e3748ed82a23b3253e36f694c7dd68c303052b8626e1619db7d9be484e1cb5b1",
+    "GetNeighborData": "e1f8337f047cec37648a507a752987ab0687c48d83f5aa79b70f63a451134310",
+    "ListSaves": "3f8797e87d3e507b4f5421568fa036655e40c07a245c4e22450b68fe5c1edff8",
+}
@@ -0,0 +1,40 @@
+# Generated by ariadne-codegen
+# Source: queries.graphql
+
+from datetime import datetime
+from typing import Optional
+
+from .base_model import BaseModel
+from .fragments import BudgetEntryFields
+
+
+class GetBalanceTotals(BaseModel):
+    save: Optional["GetBalanceTotalsSave"]
+
+
+class GetBalanceTotalsSave(BaseModel):
+    gamestates: list["GetBalanceTotalsSaveGamestates"]
+
+
+class GetBalanceTotalsSaveGamestates(BaseModel):
+    date: datetime
+    budget: "GetBalanceTotalsSaveGamestatesBudget"
+
+
+class GetBalanceTotalsSaveGamestatesBudget(BaseModel):
+    totals: "GetBalanceTotalsSaveGamestatesBudgetTotals"
+
+
+class GetBalanceTotalsSaveGamestatesBudgetTotals(BaseModel):
+    balance: "GetBalanceTotalsSaveGamestatesBudgetTotalsBalance"
+
+
+class GetBalanceTotalsSaveGamestatesBudgetTotalsBalance(BudgetEntryFields):
+    pass
+
+
+GetBalanceTotals.model_rebuild()
+GetBalanceTotalsSave.model_rebuild()
+GetBalanceTotalsSaveGamestates.model_rebuild()
+GetBalanceTotalsSaveGamestatesBudget.model_rebuild()
+GetBalanceTotalsSaveGamestatesBudgetTotals.model_rebuild()
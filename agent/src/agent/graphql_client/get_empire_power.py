@@ -0,0 +1,36 @@
+# Generated by ariadne-codegen
+# Source: queries.graphql
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import Field
+
+from .base_model import BaseModel
+
+
+class GetEmpirePower(BaseModel):
+    save: Optional["GetEmpirePowerSave"]
+
+
+class GetEmpirePowerSave(BaseModel):
+    gamestates: list["GetEmpirePowerSaveGamestates"]
+
+
+class GetEmpirePowerSaveGamestates(BaseModel):
+    date: datetime
+    empires: list["GetEmpirePowerSaveGamestatesEmpires"]
+
+
+class GetEmpirePowerSaveGamestatesEmpires(BaseModel):
+    country_id: str = Field(alias="countryId")
+    name: str
+    is_player: bool = Field(alias="isPlayer")
+    military_power: Optional[float] = Field(alias="militaryPower")
+    economy_power: Optional[float] = Field(alias="economyPower")
+    tech_power: Optional[float] = Field(alias="techPower")
+
+
+GetEmpirePower.model_rebuild()
+GetEmpirePowerSave.model_rebuild()
+GetEmpirePowerSaveGamestates.model_rebuild()
@@ -0,0 +1,26 @@
+# Generated by ariadne-codegen
+# Source: queries.graphql
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import Field
+
+from .base_model import BaseModel
+
+
+class GetGamestateIds(BaseModel):
+    save: Optional["GetGamestateIdsSave"]
+
+
+class GetGamestateIdsSave(BaseModel):
+    gamestates: list["GetGamestateIdsSaveGamestates"]
+
+
+class GetGamestateIdsSaveGamestates(BaseModel):
+    gamestate_id: int = Field(alias="gamestateId")
+    date: datetime
+
+
+GetGamestateIds.model_rebuild()
+GetGamestateIdsSave.model_rebuild()
@@ -0,0 +1,80 @@
+# Generated by ariadne-codegen
+# Source: queries.graphql
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import Field
+
+from .base_model import BaseModel
+
+
+class GetNeighborData(BaseModel):
+    save: Optional["GetNeighborDataSave"]
+
+
+class GetNeighborDataSave(BaseModel):
+    gamestates: list["GetNeighborDataSaveGamestates"]
+
+
+class GetNeighborDataSaveGamestates(BaseModel):
+    date: datetime
+    player_empire: Optional["GetNeighborDataSaveGamestatesPlayerEmpire"] = Field(
+        alias="playerEmpire"
+    )
+    empires: list["GetNeighborDataSaveGamestatesEmpires"]
+    diplomatic_relations: list["GetNeighborDataSaveGamestatesDiplomaticRelations"] = (
+        Field(alias="diplomaticRelations")
+    )
+    all_planet_coordinates: list[
+        "GetNeighborDataSaveGamestatesAllPlanetCoordinates"
+    ] = Field(alias="allPlanetCoordinates")
+
+
+class GetNeighborDataSaveGamestatesPlayerEmpire(BaseModel):
+    country_id: str = Field(alias="countryId")
+    name: str
+    owned_planet_ids: list[int] = Field(alias="ownedPlanetIds")
+    owned_planet_count: int = Field(alias="ownedPlanetCount")
+
+
+class GetNeighborDataSaveGamestatesEmpires(BaseModel):
+    country_id: str = Field(alias="countryId")
+    name: str
+    owned_planet_ids: list[int] = Field(alias="ownedPlanetIds")
+    owned_planet_count: int = Field(alias="ownedPlanetCount")
+    military_power: Optional[float] = Field(alias="militaryPower")
+    economy_power: Optional[float] = Field(alias="economyPower")
+    tech_power: Optional[float] = Field(alias="techPower")
+
+
+class GetNeighborDataSaveGamestatesDiplomaticRelations(BaseModel):
+    target_country_id: str = Field(alias="targetCountryId")
+    target_empire_name: Optional[str] = Field(alias="targetEmpireName")
+    opinion: Optional[float]
+    trust: Optional[float]
+    threat: Optional[float]
+    is_hostile: bool = Field(alias="isHostile")
+    border_range: Optional[float] = Field(alias="borderRange")
+    has_contact: bool = Field(alias="hasContact")
+    has_communications: bool = Field(alias="hasCommunications")
+    opinion_modifiers: list[
+        "GetNeighborDataSaveGamestatesDiplomaticRelationsOpinionModifiers"
+    ] = Field(alias="opinionModifiers")
+
+
+class GetNeighborDataSaveGamestatesDiplomaticRelationsOpinionModifiers(BaseModel):
+    modifier_type: str = Field(alias="modifierType")
+    value: float
+
+
+class GetNeighborDataSaveGamestatesAllPlanetCoordinates(BaseModel):
+    planet_id: int = Field(alias="planetId")
+    x: float
+    y: float
+
+
+GetNeighborData.model_rebuild()
+GetNeighborDataSave.model_rebuild()
+GetNeighborDataSaveGamestates.model_rebuild()
+GetNeighborDataSaveGamestatesDiplomaticRelations.model_rebuild()
@@ -0,0 +1,260 @@
+"""Coalescing of identical concurrent GraphQL operations.
+
+`Settings.create_graphql_client` wraps every client in a `CoalescingSession`,
+so concurrent flows of one process (drops, neighbors, sandbox cross-checks)
+that request the same save share one request.
+"""
+
+import asyncio
+import hashlib
+import json
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any, Protocol, Self, cast
+
+import httpx
+
+from agent.budget_query import GraphQLExecutor
+from agent.graphql_client import (
+    GetBalanceTotals,
+    GetBudget,
+    GetDates,
+    GetEmpirePower,
+    GetIncomeExpenses,
+    GetNeighborData,
+    ListSaves,
+)
+
+
+class GraphQLClientProtocol(Protocol):
+    """Protocol defining the subset of GraphQL client methods used by the agent."""
+
+    async def list_saves(self, **kwargs: object) -> ListSaves: ...
+
+    async def get_dates(self, filename: str, **kwargs: object) -> GetDates: ...
+
+    async def get_budget(self, filename: str, **kwargs: object) -> GetBudget: ...
+
+    async def get_income_expenses(
+        self,
+        filename: str,
+        **kwargs: object,
+    ) -> GetIncomeExpenses: ...
+
+    async def get_balance_totals(
+        self,
+        filename: str,
+        **kwargs: object,
+    ) -> GetBalanceTotals: ...
+
+    async def get_empire_power(
+        self,
+        filename: str,
+        **kwargs: object,
+    ) -> GetEmpirePower: ...
+
+    async def get_neighbor_data(
+        self,
+        filename: str,
+        **kwargs: object,
+    ) -> GetNeighborData: ...
+
+
+@dataclass
+class OperationCounts:
+    hits: int = 0
+    misses: int = 0
+
+
+@dataclass
+class CoalescingStats:
+    """Per-operation counts of calls that joined an in-flight request (hits) or sent one."""
+
+    operations: dict[str, OperationCounts] = field(
+        default_factory=dict[str, OperationCounts],
+    )
+
+    def record(self, operation: str, *, hit: bool) -> None:
+        counts = self.operations.setdefault(operation, OperationCounts())
+        if hit:
+            counts.hits += 1
+        else:
+            counts.misses += 1
+
+
+# Process-wide coalescing counters of every CoalescingClient
+COALESCING_STATS = CoalescingStats()
+
+
+class CoalescingClient:
+    """GraphQL client wrapper that shares one request between identical concurrent calls.
+
+    Only calls that overlap in time are coalesced; once a request completes the
+    next identical call sends a new one, so results never go stale. Calls with
+    extra client keyword arguments are passed through unchanged.
+    """
+
+    def __init__(
+        self,
+        client: GraphQLClientProtocol,
+        stats: CoalescingStats = COALESCING_STATS,
+    ) -> None:
+        super().__init__()
+        self.client = client
+        self.stats = stats
+        self._in_flight: dict[tuple[str, str], asyncio.Future[Any]] = {}
+
+    async def _coalesce[T](
+        self,
+        operation: str,
+        argument: str,
+        call: Callable[[], Awaitable[T]],
+    ) -> T:
+        key = (operation, argument)
+        future = self._in_flight.get(key)
+        self.stats.record(operation, hit=future is not None)
+        if future is None:
+            future = asyncio.ensure_future(call())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # Shielded so that a cancelled caller does not cancel the shared request
+        return cast("T", await asyncio.shield(future))
+
+    async def list_saves(self, **kwargs: object) -> ListSaves:
+        if kwargs:
+            return await self.client.list_saves(**kwargs)
+        return await self._coalesce("list_saves", "", self.client.list_saves)
+
+    async def get_dates(self, filename: str, **kwargs: object) -> GetDates:
+        if kwargs:
+            return await self.client.get_dates(filename, **kwargs)
+        return await self._coalesce(
+            "get_dates",
+            filename,
+            lambda: self.client.get_dates(filename=filename),
+        )
+
+    async def get_budget(self, filename: str, **kwargs: object) -> GetBudget:
+        if kwargs:
+            return await self.client.get_budget(filename, **kwargs)
+        return await self._coalesce(
+            "get_budget",
+            filename,
+            lambda: self.client.get_budget(filename=filename),
+        )
+
+    async def get_income_expenses(
+        self,
+        filename: str,
+        **kwargs: object,
+    ) -> GetIncomeExpenses:
+        if kwargs:
+            return await self.client.get_income_expenses(filename, **kwargs)
+        return await self._coalesce(
+            "get_income_expenses",
+            filename,
+            lambda: self.client.get_income_expenses(filename=filename),
+        )
+
+    async def get_balance_totals(
+        self,
+        filename: str,
+        **kwargs: object,
+    ) -> GetBalanceTotals:
+        if kwargs:
+            return await self.client.get_balance_totals(filename, **kwargs)
+        return await self._coalesce(
+            "get_balance_totals",
+            filename,
+            lambda: self.client.get_balance_totals(filename=filename),
+        )
+
+    async def get_empire_power(
+        self,
+        filename: str,
+        **kwargs: object,
+    ) -> GetEmpirePower:
+        if kwargs:
+            return await self.client.get_empire_power(filename, **kwargs)
+        return await self._coalesce(
+            "get_empire_power",
+            filename,
+            lambda: self.client.get_empire_power(filename=filename),
+        )
+
+    async def get_neighbor_data(
+        self,
+        filename: str,
+        **kwargs: object,
+    ) -> GetNeighborData:
+        if kwargs:
+            return await self.client.get_neighbor_data(filename, **kwargs)
+        return await self._coalesce(
+            "get_neighbor_data",
+            filename,
+            lambda: self.client.get_neighbor_data(filename=filename),
+        )
+
+
+class GraphQLSession(GraphQLClientProtocol, GraphQLExecutor, Protocol):
+    """A full GraphQL client: typed operations, arbitrary operations and a lifetime."""
+
+    async def __aexit__(
+        self,
+        exc_type: object,
+        exc_val: object,
+        exc_tb: object,
+    ) -> None: ...
+
+
+class CoalescingSession(CoalescingClient):
+    """`CoalescingClient` over a full client, usable wherever the client itself is.
+
+    Arbitrary operations sent through `execute` are coalesced too, keyed by
+    their query text and variables.
+    """
+
+    def __init__(
+        self,
+        client: GraphQLSession,
+        stats: CoalescingStats = COALESCING_STATS,
+    ) -> None:
+        super().__init__(client, stats)
+        self.session = client
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: object,
+        exc_val: object,
+        exc_tb: object,
+    ) -> None:
+        await self.session.__aexit__(exc_type, exc_val, exc_tb)
+
+    async def execute(
+        self,
+        query: str,
+        operation_name: str | None = None,
+        variables: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        if kwargs:
+            return await self.session.execute(
+                query,
+                operation_name,
+                variables,
+                **kwargs,
+            )
+        key = hashlib.sha256(
+            json.dumps([query, variables], sort_keys=True).encode(),
+        ).hexdigest()
+        return await self._coalesce(
+            f"execute:{operation_name}",
+            key,
+            lambda: self.session.execute(query, operation_name, variables),
+        )
+
+    def get_data(self, response: httpx.Response) -> dict[str, Any]:
+        return self.session.get_data(response)
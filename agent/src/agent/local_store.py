@@ -0,0 +1,460 @@
+"""Local SQLite mirror of save data, read before the GraphQL server.
+
+Gamestates never change once a save has them, so each mirrored query stores
+them once, keyed by server, save filename and `gamestate_id`, and later calls
+rebuild the query result from disk. Before a read the client asks the server
+for the save's gamestate IDs, a few bytes per snapshot; the full query is
+sent only when the store lacks one of them, and only the new gamestates are
+written. When the server cannot be reached, whatever the store holds is
+served instead, so analyses of mirrored saves keep working offline.
+
+Rows are also keyed by a hash of the query: the persisted hash for the
+generated client methods and a hash of the query text for operations sent
+through `execute`, such as pruned budget selections and planet profits.
+Editing a query therefore starts a fresh mirror instead of decoding stale
+payloads.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Self
+
+import httpx
+
+from agent.graphql_client import (
+    Client,
+    GetBalanceTotals,
+    GetBudget,
+    GetDates,
+    GetEmpirePower,
+    GetGamestateIds,
+    GetIncomeExpenses,
+    GetNeighborData,
+    ListSaves,
+)
+from agent.graphql_client.client import PERSISTED_QUERY_HASHES
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable
+
+    from pydantic import BaseModel
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS saves (
+    source TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (source, filename)
+);
+
+CREATE TABLE IF NOT EXISTS gamestates (
+    source TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    query_hash TEXT NOT NULL,
+    gamestate_id INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (source, filename, query_hash, gamestate_id)
+);
+"""
+
+
+class LocalStore:
+    """SQLite file holding per-gamestate query payloads of one GraphQL server."""
+
+    def __init__(self, path: str | Path, source: str) -> None:
+        super().__init__()
+        self.path = Path(path)
+        self.source = source
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def load(self, filename: str, query_hash: str) -> dict[int, str]:
+        """Stored gamestate payloads of a save and query, by gamestate ID in date order."""
+        rows = self._conn.execute(
+            """
+            SELECT gamestate_id, payload
+            FROM gamestates
+            WHERE source = ? AND filename = ? AND query_hash = ?
+            ORDER BY date
+            """,
+            (self.source, filename, query_hash),
+        ).fetchall()
+        return {int(row[0]): str(row[1]) for row in rows}
+
+    def store(
+        self,
+        filename: str,
+        query_hash: str,
+        gamestates: Iterable[tuple[int, datetime, str]],
+    ) -> int:
+        """Insert `(gamestate_id, date, payload)` rows; returns how many were new."""
+        with self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                """
+                INSERT OR IGNORE INTO gamestates
+                    (source, filename, query_hash, gamestate_id, date, payload)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    (
+                        self.source,
+                        filename,
+                        query_hash,
+                        gamestate_id,
+                        date.isoformat(),
+                        payload,
+                    )
+                    for gamestate_id, date, payload in gamestates
+                ),
+            )
+            return self._conn.total_changes - before
+
+    def gamestate_dates(self, filename: str) -> dict[int, str]:
+        """Dates of every gamestate mirrored by any query of a save."""
+        rows = self._conn.execute(
+            """
+            SELECT DISTINCT gamestate_id, date
+            FROM gamestates
+            WHERE source = ? AND filename = ?
+            ORDER BY date
+            """,
+            (self.source, filename),
+        ).fetchall()
+        return {int(row[0]): str(row[1]) for row in rows}
+
+    def store_saves(self, saves: Iterable[tuple[str, str]]) -> None:
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO saves (source, filename, name) VALUES (?, ?, ?)",
+                ((self.source, filename, name) for filename, name in saves),
+            )
+
+    def saves(self) -> list[tuple[str, str]]:
+        rows = self._conn.execute(
+            "SELECT filename, name FROM saves WHERE source = ? ORDER BY filename",
+            (self.source,),
+        ).fetchall()
+        return [(str(row[0]), str(row[1])) for row in rows]
+
+
+@dataclass
+class LocalStoreStats:
+    """Mirrored query results served from the store (hits) or fetched (misses)."""
+
+    hits: int = 0
+    misses: int = 0
+    # Results served from the store because the server could not be reached
+    offline_hits: int = 0
+    gamestates_synced: int = 0
+
+
+# Process-wide counters of every LocalStoreClient
+LOCAL_STORE_STATS = LocalStoreStats()
+
+
+def _save_json(payloads: Iterable[str] | None) -> str:
+    if payloads is None:
+        return '{"save":null}'
+    return '{"save":{"gamestates":[' + ",".join(payloads) + "]}}"
+
+
+def _rebuild_model[T: BaseModel](
+    result_type: type[T],
+) -> Callable[[Iterable[str] | None], T]:
+    return lambda payloads: result_type.model_validate_json(_save_json(payloads))
+
+
+def _model_gamestates(result: BaseModel) -> list[dict[str, Any]] | None:
+    dumped: dict[str, Any] = result.model_dump(mode="json", by_alias=True)
+    if dumped["save"] is None:
+        return None
+    return dumped["save"]["gamestates"]
+
+
+def _rebuild_response(payloads: Iterable[str] | None) -> httpx.Response:
+    return httpx.Response(
+        200,
+        content='{"data":' + _save_json(payloads) + "}",
+        headers={"content-type": "application/json"},
+    )
+
+
+def _response_gamestates(response: httpx.Response) -> list[dict[str, Any]] | None:
+    """Gamestates of a successful `execute` response, or None to store nothing."""
+    if not response.is_success:
+        return None
+    body: dict[str, Any] = response.json()
+    data: dict[str, Any] | None = body.get("data")
+    if body.get("errors") or data is None or data.get("save") is None:
+        return None
+    gamestates: list[dict[str, Any]] = data["save"]["gamestates"]
+    return gamestates
+
+
+class LocalStoreClient:
+    """GraphQL client wrapper that reads save data from a `LocalStore` first.
+
+    Budget, income and expenses, budget totals, empire power and neighbor
+    queries are mirrored, as are operations sent through `execute` whose only
+    variable is the save filename; listing saves, dates and gamestate IDs
+    always asks the server and falls back to the store only when it is
+    unreachable. Calls with extra client keyword arguments are passed
+    through unchanged.
+    """
+
+    def __init__(
+        self,
+        client: Client,
+        store: LocalStore,
+        stats: LocalStoreStats = LOCAL_STORE_STATS,
+    ) -> None:
+        super().__init__()
+        self.client = client
+        self.store = store
+        self.stats = stats
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: object,
+        exc_val: object,
+        exc_tb: object,
+    ) -> None:
+        self.store.close()
+        await self.client.__aexit__(exc_type, exc_val, exc_tb)
+
+    async def execute(
+        self,
+        query: str,
+        operation_name: str | None = None,
+        variables: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        filename = (variables or {}).get("filename")
+        if kwargs or variables is None or len(variables) != 1 or filename is None:
+            return await self.client.execute(
+                query,
+                operation_name,
+                variables,
+                **kwargs,
+            )
+        return await self._mirror(
+            hashlib.sha256(query.encode()).hexdigest(),
+            str(filename),
+            _rebuild_response,
+            _response_gamestates,
+            lambda: self.client.execute(query, operation_name, variables),
+        )
+
+    def get_data(self, response: httpx.Response) -> dict[str, Any]:
+        return self.client.get_data(response)
+
+    async def _online_or[T](
+        self,
+        call: Awaitable[T],
+        fallback: Callable[[], T | None],
+    ) -> T:
+        try:
+            return await call
+        except httpx.TransportError:
+            result = fallback()
+            if result is None:
+                raise
+            self.stats.offline_hits += 1
+            return result
+
+    async def _mirror[T](
+        self,
+        query_hash: str,
+        filename: str,
+        rebuild: Callable[[Iterable[str] | None], T],
+        gamestates_of: Callable[[T], list[dict[str, Any]] | None],
+        fetch: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Serve a query from the store, fetching it when a gamestate is missing.
+
+        `rebuild` turns stored payloads, or None for a missing save, into a
+        result; `gamestates_of` returns the gamestates of a fetched result,
+        or None when nothing should be stored.
+        """
+        stored = self.store.load(filename, query_hash)
+        try:
+            probe = await self.client.get_gamestate_ids(filename=filename)
+        except httpx.TransportError:
+            if not stored:
+                raise
+            self.stats.offline_hits += 1
+            return rebuild(stored.values())
+        if probe.save is None:
+            return rebuild(None)
+
+        ids = {g.date: g.gamestate_id for g in probe.save.gamestates}
+        if all(gamestate_id in stored for gamestate_id in ids.values()):
+            self.stats.hits += 1
+            return rebuild(stored[gamestate_id] for gamestate_id in ids.values())
+
+        self.stats.misses += 1
+        result = await fetch()
+        gamestates = gamestates_of(result)
+        if gamestates is not None:
+            self.stats.gamestates_synced += self.store.store(
+                filename,
+                query_hash,
+                (
+                    (ids[date], date, json.dumps(gamestate))
+                    for gamestate in gamestates
+                    if (date := datetime.fromisoformat(gamestate["date"])) in ids
+                    and ids[date] not in stored
+                ),
+            )
+        return result
+
+    async def _mirror_model[T: BaseModel](
+        self,
+        operation: str,
+        filename: str,
+        result_type: type[T],
+        fetch: Callable[[], Awaitable[T]],
+    ) -> T:
+        return await self._mirror(
+            PERSISTED_QUERY_HASHES[operation],
+            filename,
+            _rebuild_model(result_type),
+            _model_gamestates,
+            fetch,
+        )
+
+    async def list_saves(self, **kwargs: object) -> ListSaves:
+        if kwargs:
+            return await self.client.list_saves(**kwargs)
+        stored = self.store.saves()
+        result = await self._online_or(
+            self.client.list_saves(),
+            lambda: (
+                ListSaves.model_validate({
+                    "saves": [{"filename": f, "name": n} for f, n in stored],
+                })
+                if stored
+                else None
+            ),
+        )
+        self.store.store_saves((save.filename, save.name) for save in result.saves)
+        return result
+
+    async def get_dates(self, filename: str, **kwargs: object) -> GetDates:
+        if kwargs:
+            return await self.client.get_dates(filename, **kwargs)
+        stored = self.store.gamestate_dates(filename)
+        return await self._online_or(
+            self.client.get_dates(filename=filename),
+            lambda: (
+                GetDates.model_validate({
+                    "save": {"gamestates": [{"date": d} for d in stored.values()]},
+                })
+                if stored
+                else None
+            ),
+        )
+
+    async def get_gamestate_ids(
+        self,
+        filename: str,
+        **kwargs: object,
+    ) -> GetGamestateIds:
+        if kwargs:
+            return await self.client.get_gamestate_ids(filename, **kwargs)
+        stored = self.store.gamestate_dates(filename)
+        return await self._online_or(
+            self.client.get_gamestate_ids(filename=filename),
+            lambda: (
+                GetGamestateIds.model_validate({
+                    "save": {
+                        "gamestates": [
+                            {"gamestateId": i, "date": d} for i, d in stored.items()
+                        ],
+                    },
+                })
+                if stored
+                else None
+            ),
+        )
+
+    async def get_budget(self, filename: str, **kwargs: object) -> GetBudget:
+        if kwargs:
+            return await self.client.get_budget(filename, **kwargs)
+        return await self._mirror_model(
+            "GetBudget",
+            filename,
+            GetBudget,
+            lambda: self.client.get_budget(filename=filename),
+        )
+
+    async def get_income_expenses(
+        self,
+        filename: str,
+        **kwargs: object,
+    ) -> GetIncomeExpenses:
+        if kwargs:
+            return await self.client.get_income_expenses(filename, **kwargs)
+        return await self._mirror_model(
+            "GetIncomeExpenses",
+            filename,
+            GetIncomeExpenses,
+            lambda: self.client.get_income_expenses(filename=filename),
+        )
+
+    async def get_balance_totals(
+        self,
+        filename: str,
+        **kwargs: object,
+    ) -> GetBalanceTotals:
+        if kwargs:
+            return await self.client.get_balance_totals(filename, **kwargs)
+        return await self._mirror_model(
+            "GetBalanceTotals",
+            filename,
+            GetBalanceTotals,
+            lambda: self.client.get_balance_totals(filename=filename),
+        )
+
+    async def get_empire_power(
+        self,
+        filename: str,
+        **kwargs: object,
+    ) -> GetEmpirePower:
+        if kwargs:
+            return await self.client.get_empire_power(filename, **kwargs)
+        return await self._mirror_model(
+            "GetEmpirePower",
+            filename,
+            GetEmpirePower,
+            lambda: self.client.get_empire_power(filename=filename),
+        )
+
+    async def get_neighbor_data(
+        self,
+        filename: str,
+        **kwargs: object,
+    ) -> GetNeighborData:
+        if kwargs:
+            return await self.client.get_neighbor_data(filename, **kwargs)
+        return await self._mirror_model(
+            "GetNeighborData",
+            filename,
+            GetNeighborData,
+            lambda: self.client.get_neighbor_data(filename=filename),
+        )
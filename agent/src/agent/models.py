@@ -1,4 +1,5 @@
 from enum import StrEnum
+from typing import Literal
 
 from pydantic import BaseModel
 
@@ -8,6 +9,23 @@ class ContributorType(StrEnum):
     EXPENSES_INCREASED = "expenses_increased"
 
 
+class PowerMetric(StrEnum):
+    MILITARY = "military"
+    ECONOMY = "economy"
+    TECH = "tech"
+
+
+class AnomalyMethod(StrEnum):
+    ROBUST_Z = "robust_z"
+    EWMA = "ewma"
+
+
+class ForecastModel(StrEnum):
+    LINEAR = "linear"
+    EWMA = "ewma"
+    PIECEWISE = "piecewise"
+
+
 class SuddenDrop(BaseModel):
     """A sudden drop in a resource between first and last datapoint in analysis window."""
 
@@ -20,6 +38,14 @@ class SuddenDrop(BaseModel):
     drop_absolute: float
 
 
+class ResourceAnomaly(SuddenDrop):
+    """A statistically unusual decline, scored against the resource's own history."""
+
+    methods: list[AnomalyMethod]
+    score: float
+    confidence: float
+
+
 class SuddenDropAnalysisResult(BaseModel):
     """Result of analyzing sudden resource drops."""
 
@@ -32,6 +58,141 @@ class SuddenDropAnalysisResult(BaseModel):
     summary: str
 
 
+class DropHistoryResult(BaseModel):
+    """Drops found by scanning every gamestate of a save, strongest first.
+
+    `anomalies` are declines scored against each resource's own history,
+    most confident first.
+    """
+
+    save_filename: str
+    history_start: str
+    history_end: str
+    gamestates_scanned: int
+    window_sizes: list[int]
+    drop_threshold_percent: float
+    drops: list[SuddenDrop]
+    anomalies: list[ResourceAnomaly]
+    summary: str
+
+
+class ResourceForecast(BaseModel):
+    """Projected date at which a resource's monthly balance turns negative.
+
+    `model` is the trend model with the smallest residual error; the
+    crossing interval spans its projection plus and minus the interval
+    width in residual standard deviations. `model_crossing_dates` holds the
+    projection of every fitted model, None when it stays positive within the
+    forecast horizon.
+    """
+
+    resource: str
+    model: ForecastModel
+    current_value: float
+    trend_per_year: float
+    zero_crossing_date: str
+    earliest_crossing_date: str
+    latest_crossing_date: str
+    model_crossing_dates: dict[ForecastModel, str | None]
+
+
+class DepletionForecastResult(BaseModel):
+    """Resources projected to turn negative within the horizon, soonest first."""
+
+    save_filename: str
+    history_start: str
+    history_end: str
+    gamestates_used: int
+    horizon_years: float
+    forecasts: list[ResourceForecast]
+    summary: str
+
+
+class PercentileBand(BaseModel):
+    """Fleet percentiles of one resource in one year bin, with the current save's value.
+
+    `band` holds the fleet values at the result's `percentiles`;
+    `current_percentile` is the share of fleet values below the current one.
+    """
+
+    resource: str
+    year: int
+    fleet_saves: int
+    band: list[float]
+    fleet_median: float
+    current: float
+    current_percentile: float
+
+
+class UnderperformancePeriod(BaseModel):
+    """Consecutive year bins where the current save fell below the fleet band."""
+
+    resource: str
+    start_year: int
+    end_year: int
+    mean_percentile: float
+    current_mean: float
+    fleet_median_mean: float
+
+
+class CrossSaveComparisonResult(BaseModel):
+    """The current save's resource balances against every other save at the same game year."""
+
+    save_filename: str
+    saves_compared: int
+    saves_skipped: int
+    bin_years: int
+    percentiles: list[int]
+    underperform_percentile: int
+    bands: list[PercentileBand]
+    underperformance: list[UnderperformancePeriod]
+    summary: str
+
+
+class EmpirePowerTrend(BaseModel):
+    """One empire's trajectory in one power metric.
+
+    Growth and rank change are measured over the trend window ending at the
+    latest snapshot; a positive `rank_change` means the empire climbed.
+    """
+
+    country_id: str
+    name: str
+    is_player: bool
+    metric: PowerMetric
+    current_value: float | None
+    current_rank: int | None
+    rank_change: int | None
+    recent_growth_percent: float | None
+    total_growth_percent: float | None
+
+
+class OutpacingEvent(BaseModel):
+    """A rival overtaking the player in a power metric."""
+
+    date: str
+    country_id: str
+    name: str
+    metric: PowerMetric
+    rival_value: float
+    player_value: float
+
+
+class PowerTrendsResult(BaseModel):
+    """Power trajectories of every empire across the history of a save."""
+
+    save_filename: str
+    history_start: str
+    history_end: str
+    gamestates_scanned: int
+    empires_tracked: int
+    player_country_id: str | None
+    window: int
+    trends: list[EmpirePowerTrend]
+    outpacing_events: list[OutpacingEvent]
+    summary: str
+
+
 class CategoryContributor(BaseModel):
     """A budget category that contributed to a resource drop."""
 
@@ -45,6 +206,31 @@ class CategoryContributor(BaseModel):
     rank: int
 
 
+class CategoryMover(CategoryContributor):
+    """A budget category whose income fell or expenses rose between two snapshots.
+
+    `impact_percent` is the change as a percentage of the resource's budget
+    turnover (the larger of gross income and gross expenses) at `start_date`.
+    """
+
+    start_date: str
+    end_date: str
+    impact_percent: float
+
+
+class CategoryMoversResult(BaseModel):
+    """The strongest category moves found by scanning every budget series of a save."""
+
+    save_filename: str
+    history_start: str
+    history_end: str
+    gamestates_scanned: int
+    series_scanned: int
+    min_impact_percent: float
+    movers: list[CategoryMover]
+    summary: str
+
+
 class RootCauseAnalysisResult(BaseModel):
     """Root cause analysis for a single sudden drop."""
 
@@ -56,12 +242,36 @@ class RootCauseAnalysisResult(BaseModel):
     explanation: str
 
 
+class PlanetImpact(BaseModel):
+    """A planet whose balance of the dropped resource fell between the drop's dates."""
+
+    planet_id: int
+    planet_name: str
+    before_balance: float
+    after_balance: float
+    change_absolute: float
+    income_change: float
+    expenses_change: float
+    rank: int
+
+
+class PlanetDrillDown(BaseModel):
+    """The planets that contributed most to a resource drop."""
+
+    resource: str
+    start_date: str
+    end_date: str
+    planets_compared: int
+    top_planets: list[PlanetImpact]
+
+
 class SuddenDropWithRootCause(BaseModel):
     """A sudden drop enriched with root cause analysis."""
 
     drop: SuddenDrop
     root_cause: RootCauseAnalysisResult | None
     analysis_error: str | None
+    planet_drilldown: PlanetDrillDown | None = None
 
 
 class MultiAgentAnalysisResult(BaseModel):
@@ -76,3 +286,29 @@ class MultiAgentAnalysisResult(BaseModel):
     total_drops_detected: int
     successful_root_cause_analyses: int
     summary: str
+
+
+class DropDetectionEvent(BaseModel):
+    """Streamed once drop detection finishes, before any root cause analysis."""
+
+    event: Literal["detection"] = "detection"
+    detection: SuddenDropAnalysisResult
+
+
+class DropAnalyzedEvent(BaseModel):
+    """Streamed as the root cause analysis of each drop completes."""
+
+    event: Literal["drop_analyzed"] = "drop_analyzed"
+    drop: SuddenDropWithRootCause
+
+
+class MultiAgentAnalysisCompleteEvent(BaseModel):
+    """Final streamed event carrying the complete analysis result."""
+
+    event: Literal["complete"] = "complete"
+    result: MultiAgentAnalysisResult
+
+
+type MultiAgentAnalysisEvent = (
+    DropDetectionEvent | DropAnalyzedEvent | MultiAgentAnalysisCompleteEvent
+)
@@ -1,3 +1,10 @@
+from agent.graphql_coalescing import (
+    COALESCING_STATS,
+    CoalescingClient,
+    CoalescingStats,
+    GraphQLClientProtocol,
+    OperationCounts,
+)
 from agent.models import SuddenDrop, SuddenDropAnalysisResult
 from agent.native_budget.agent import (
     ANALYSIS_DATAPOINTS,
@@ -14,20 +21,20 @@ from agent.native_budget.models import (
     SaveInfo,
     SnapshotResourceTotals,
 )
-from agent.native_budget.tools import (
-    AgentDeps,
-    GraphQLClientProtocol,
-    create_deps,
-)
+from agent.native_budget.tools import AgentDeps, create_deps
 
 __all__ = [
     "ANALYSIS_DATAPOINTS",
+    "COALESCING_STATS",
     "DROP_THRESHOLD_PERCENT",
     "RESOURCE_FIELDS",
     "AgentDeps",
     "BudgetSnapshot",
     "BudgetTimeSeries",
+    "CoalescingClient",
+    "CoalescingStats",
     "GraphQLClientProtocol",
+    "OperationCounts",
     "SaveInfo",
     "SnapshotResourceTotals",
     "SuddenDrop",
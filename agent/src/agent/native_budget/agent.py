@@ -1,13 +1,17 @@
 from pydantic_ai import Agent, RunContext
 from pydantic_ai.agent import AgentRunResult
+from pydantic_ai.usage import UsageLimits
 
+from agent.agent_registry import AGENT_REGISTRY, AgentKey
 from agent.analysis_config import (
     ANALYSIS_DATAPOINTS,
     DROP_THRESHOLD_PERCENT,
     RESOURCE_FIELDS,
 )
-from agent.constants import DEFAULT_MODEL, create_model, wrap_output_type
-from agent.models import SuddenDropAnalysisResult
+from agent.cascade import run_with_cascade
+from agent.constants import create_model, create_prompt_cache_settings, wrap_output_type
+from agent.drop_detection import detect_sudden_drops, drops_agree
+from agent.models import SuddenDrop, SuddenDropAnalysisResult
 from agent.native_budget.models import (
     BudgetSnapshot,
     BudgetTimeSeries,
@@ -16,6 +20,7 @@ from agent.native_budget.models import (
 )
 from agent.native_budget.tools import (
     AgentDeps,
+    GraphQLClientProtocol,
     create_deps,
     fetch_budget_data,
     get_available_dates,
@@ -24,6 +29,8 @@ from agent.native_budget.tools import (
     select_latest_dates,
 )
 
+NATIVE_BUDGET_AGENT = "native_budget_agent"
+
 
 def sum_resources_for_snapshot(snapshot: BudgetSnapshot) -> dict[str, float]:
     """Sum each resource across all budget categories for a single snapshot."""
@@ -89,8 +96,12 @@ def create_native_budget_agent(
         create_model(model_name),
         deps_type=AgentDeps,
         output_type=wrap_output_type(SuddenDropAnalysisResult),
-        system_prompt=build_system_prompt(),
-        name="native_budget_agent",
+        system_prompt=AGENT_REGISTRY.get_prompt(
+            NATIVE_BUDGET_AGENT,
+            build_system_prompt,
+        ),
+        model_settings=create_prompt_cache_settings(model_name, NATIVE_BUDGET_AGENT),
+        name=NATIVE_BUDGET_AGENT,
     )
     _register_tools(agent)
     return agent
@@ -102,21 +113,11 @@ async def _get_available_saves(ctx: RunContext[AgentDeps]) -> list[SaveInfo]:
     return [SaveInfo(filename=s.filename, name=s.name) for s in saves]
 
 
-async def _get_budget_time_series(
-    ctx: RunContext[AgentDeps],
+async def build_budget_time_series(
+    client: GraphQLClientProtocol,
     save_filename: str,
 ) -> BudgetTimeSeries | str:
-    """Fetch budget time series data with summed resource totals for the latest datapoints.
-
-    Returns budget balance data with resource totals summed across all categories.
-    Use the resource_totals to identify sudden drops by comparing D1 (first) to D4 (last).
-
-    Args:
-        ctx: The run context containing dependencies.
-        save_filename: The filename of the save to analyze (without .sav extension).
-    """
-    client = ctx.deps.client
-
+    """Build the latest budget snapshots with summed totals, or an error message."""
     dates = await get_available_dates(client, save_filename)
     if not dates:
         return f"No gamestates found for save '{save_filename}'. Please check the filename."
@@ -156,6 +157,38 @@ async def _get_budget_time_series(
     )
 
 
+async def compute_expected_drops(
+    client: GraphQLClientProtocol,
+    save_filename: str,
+) -> list[SuddenDrop] | None:
+    """Detect drops deterministically, for cross-checking agent output.
+
+    Returns None when the save has no usable budget data.
+    """
+    time_series = await build_budget_time_series(client, save_filename)
+    if isinstance(time_series, str) or time_series.resource_totals is None:
+        return None
+    return detect_sudden_drops(
+        [(t.date, t.totals) for t in time_series.resource_totals],
+    )
+
+
+async def _get_budget_time_series(
+    ctx: RunContext[AgentDeps],
+    save_filename: str,
+) -> BudgetTimeSeries | str:
+    """Fetch budget time series data with summed resource totals for the latest datapoints.
+
+    Returns budget balance data with resource totals summed across all categories.
+    Use the resource_totals to identify sudden drops by comparing D1 (first) to D4 (last).
+
+    Args:
+        ctx: The run context containing dependencies.
+        save_filename: The filename of the save to analyze (without .sav extension).
+    """
+    return await build_budget_time_series(ctx.deps.client, save_filename)
+
+
 def _register_tools(agent: Agent[AgentDeps, SuddenDropAnalysisResult]) -> None:
     agent.tool(_get_available_saves)
     agent.tool(_get_budget_time_series)
@@ -175,9 +208,30 @@ async def run_native_budget_analysis(
     deps: AgentDeps | None = None,
     model_name: str | None = None,
 ) -> AgentRunResult[SuddenDropAnalysisResult]:
+    """Run the native budget agent.
+
+    Without an explicit model the default cascade policy is used, with the
+    deterministic drop detection as cross-check.
+    """
     if deps is None:
         deps = create_deps()
     prompt = build_analysis_prompt(save_filename)
-    actual_model = model_name or DEFAULT_MODEL
-    agent = create_native_budget_agent(actual_model)
-    return await agent.run(prompt, deps=deps)
+
+    async def run(
+        model: str,
+        usage_limits: UsageLimits | None,
+    ) -> AgentRunResult[SuddenDropAnalysisResult]:
+        agent = AGENT_REGISTRY.get_agent(
+            AgentKey(NATIVE_BUDGET_AGENT, model),
+            create_native_budget_agent,
+        )
+        return await agent.run(prompt, deps=deps, usage_limits=usage_limits)
+
+    if model_name is not None:
+        return await run(model_name, None)
+
+    async def cross_check(result: AgentRunResult[SuddenDropAnalysisResult]) -> bool:
+        expected = await compute_expected_drops(deps.client, save_filename)
+        return expected is None or drops_agree(expected, result.output.sudden_drops)
+
+    return await run_with_cascade(run, cross_check)
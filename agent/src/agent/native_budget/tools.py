@@ -1,26 +1,14 @@
 from dataclasses import dataclass
-from typing import Protocol
 
 from agent.graphql_client import (
     GetBudget,
     GetBudgetSaveGamestates,
-    GetDates,
-    ListSaves,
     ListSavesSaves,
 )
+from agent.graphql_coalescing import CoalescingClient, GraphQLClientProtocol
 from agent.settings import Settings, get_settings
 
 
-class GraphQLClientProtocol(Protocol):
-    """Protocol defining the subset of GraphQL client methods used by the agent."""
-
-    async def list_saves(self, **kwargs: object) -> ListSaves: ...
-
-    async def get_dates(self, filename: str, **kwargs: object) -> GetDates: ...
-
-    async def get_budget(self, filename: str, **kwargs: object) -> GetBudget: ...
-
-
 @dataclass
 class AgentDeps:
     """Dependencies injected into the budget analysis agent."""
@@ -36,6 +24,10 @@ def create_deps(
         settings = get_settings()
     if client is None:
         client = settings.create_graphql_client()
+    # Parallel tool calls of one run often request the same save; clients
+    # from `Settings.create_graphql_client` already coalesce
+    if not isinstance(client, CoalescingClient):
+        client = CoalescingClient(client)
     return AgentDeps(client=client)
 
 
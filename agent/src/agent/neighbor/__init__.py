@@ -1,4 +1,8 @@
 from .models import (
+    DiplomaticEvent,
+    DiplomaticEventType,
+    EmpireDistance,
+    EmpireDistanceMatrixResult,
     FindingSeverity,
     KeyFinding,
     NeighborAnalysisResult,
@@ -7,6 +11,10 @@ from .models import (
 )
 
 __all__ = [
+    "DiplomaticEvent",
+    "DiplomaticEventType",
+    "EmpireDistance",
+    "EmpireDistanceMatrixResult",
     "FindingSeverity",
     "KeyFinding",
     "NeighborAnalysisResult",
@@ -0,0 +1,274 @@
+"""Border and contact graph of the empires in a gamestate.
+
+Diplomatic relations are stored from the player's side only, so the
+player's contact, communications and border range give the edges around the
+player; the player's border edges come from border range alone. Rivals
+count as bordering one another when their planets lie within
+`CONTACT_PLANET_DISTANCE` in the distance matrix. The graph is kept as
+compressed sparse rows in flat integer arrays, and components, hop counts and
+bordering clusters are found by breadth-first search over them. The findings
+derived from the graph are added to neighbor results without a model call.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from enum import IntFlag
+from typing import TYPE_CHECKING
+
+from agent.analysis_config import (
+    CONTACT_BORDER_RANGE,
+    CONTACT_PLANET_DISTANCE,
+    RIVAL_BLOC_MIN_SIZE,
+)
+from agent.neighbor.distance_matrix import latest_gamestate
+from agent.neighbor.models import FindingSeverity, KeyFinding
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from agent.graphql_client import GetNeighborData, GetNeighborDataSaveGamestates
+    from agent.neighbor.distance_matrix import DistanceMatrix
+
+UNREACHABLE = -1
+
+
+class EdgeKind(IntFlag):
+    CONTACT = 1
+    COMMUNICATIONS = 2
+    BORDER = 4
+
+
+ANY_EDGE = EdgeKind.CONTACT | EdgeKind.COMMUNICATIONS | EdgeKind.BORDER
+
+
+@dataclass(frozen=True)
+class ContactGraph:
+    """Undirected empire graph in compressed sparse row form.
+
+    The neighbors of node `i` are `targets[offsets[i]:offsets[i + 1]]`, and
+    the same slice of `kinds` holds the `EdgeKind` bits of each edge.
+    """
+
+    country_ids: list[str]
+    names: list[str]
+    player: int | None
+    offsets: array[int]
+    targets: array[int]
+    kinds: array[int]
+
+    def neighbors(self, node: int, kind: EdgeKind = ANY_EDGE) -> Iterator[int]:
+        """Nodes joined to `node` by an edge with any of the `kind` bits."""
+        for edge in range(self.offsets[node], self.offsets[node + 1]):
+            if self.kinds[edge] & kind:
+                yield self.targets[edge]
+
+    def edge_kind(self, node: int, other: int) -> EdgeKind:
+        for edge in range(self.offsets[node], self.offsets[node + 1]):
+            if self.targets[edge] == other:
+                return EdgeKind(self.kinds[edge])
+        return EdgeKind(0)
+
+
+def build_graph(
+    country_ids: list[str],
+    names: list[str],
+    edges: dict[tuple[int, int], int],
+    player: int | None = None,
+) -> ContactGraph:
+    """Pack undirected `edges`, keyed by (lower, higher) node, into sparse rows."""
+    degrees = [0] * len(country_ids)
+    for a, b in edges:
+        degrees[a] += 1
+        degrees[b] += 1
+    offsets = array("i", [0])
+    for degree in degrees:
+        offsets.append(offsets[-1] + degree)
+
+    targets = array("i", bytes(offsets[-1] * offsets.itemsize))
+    kinds = array("B", bytes(offsets[-1]))
+    fill = array("i", offsets[:-1])
+    for (a, b), kind in edges.items():
+        for node, other in ((a, b), (b, a)):
+            targets[fill[node]] = other
+            kinds[fill[node]] = kind
+            fill[node] += 1
+    return ContactGraph(
+        country_ids=country_ids,
+        names=names,
+        player=player,
+        offsets=offsets,
+        targets=targets,
+        kinds=kinds,
+    )
+
+
+def build_contact_graph(
+    gamestate: GetNeighborDataSaveGamestates,
+    distances: DistanceMatrix,
+    border_range: float = CONTACT_BORDER_RANGE,
+    planet_distance: float = CONTACT_PLANET_DISTANCE,
+) -> ContactGraph:
+    """Graph of the player's relations and the planet proximity of all empires."""
+    country_ids = list(distances.country_ids)
+    names = list(distances.names)
+    index = {country_id: i for i, country_id in enumerate(country_ids)}
+
+    def node(country_id: str, name: str | None) -> int:
+        if country_id not in index:
+            index[country_id] = len(country_ids)
+            country_ids.append(country_id)
+            names.append(name or country_id)
+        return index[country_id]
+
+    edges: dict[tuple[int, int], int] = {}
+
+    def add_edge(a: int, b: int, kind: EdgeKind) -> None:
+        if a != b:
+            key = (min(a, b), max(a, b))
+            edges[key] = edges.get(key, 0) | kind
+
+    player_id = gamestate.player_empire.country_id if gamestate.player_empire else None
+    # Planet proximity joins rivals only; the player's borders come from
+    # the border range of its relations below
+    for a, row in enumerate(distances.distances):
+        if country_ids[a] == player_id:
+            continue
+        for b in range(a + 1, len(row)):
+            if row[b] <= planet_distance and country_ids[b] != player_id:
+                add_edge(a, b, EdgeKind.BORDER)
+
+    player: int | None = None
+    if gamestate.player_empire is not None:
+        player = node(gamestate.player_empire.country_id, gamestate.player_empire.name)
+        for relation in gamestate.diplomatic_relations:
+            target = node(relation.target_country_id, relation.target_empire_name)
+            if relation.has_contact:
+                add_edge(player, target, EdgeKind.CONTACT)
+            if relation.has_communications:
+                add_edge(player, target, EdgeKind.COMMUNICATIONS)
+            if (
+                relation.border_range is not None
+                and relation.border_range <= border_range
+            ):
+                add_edge(player, target, EdgeKind.BORDER)
+
+    return build_graph(country_ids, names, edges, player)
+
+
+def _search(
+    graph: ContactGraph,
+    source: int,
+    kind: EdgeKind,
+    hops: array[int],
+    excluded: int | None = None,
+) -> list[int]:
+    """Breadth-first search writing hop counts from `source` into `hops`.
+
+    Nodes already holding a count are not visited again. Returns the nodes
+    reached, in visiting order.
+    """
+    hops[source] = 0
+    reached = [source]
+    queue = deque([source])
+    while queue:
+        node = queue.popleft()
+        for other in graph.neighbors(node, kind):
+            if hops[other] == UNREACHABLE and other != excluded:
+                hops[other] = hops[node] + 1
+                reached.append(other)
+                queue.append(other)
+    return reached
+
+
+def connected_components(
+    graph: ContactGraph,
+    kind: EdgeKind = ANY_EDGE,
+    excluded: int | None = None,
+) -> list[list[int]]:
+    """Components over edges of `kind`, largest first; `excluded` is left out."""
+    hops = array("i", [UNREACHABLE]) * len(graph.country_ids)
+    components = [
+        _search(graph, node, kind, hops, excluded)
+        for node in range(len(graph.country_ids))
+        if hops[node] == UNREACHABLE and node != excluded
+    ]
+    return sorted(components, key=len, reverse=True)
+
+
+def hops_from(
+    graph: ContactGraph,
+    source: int,
+    kind: EdgeKind = ANY_EDGE,
+) -> array[int]:
+    """Fewest edges of `kind` from `source` to every node; `UNREACHABLE` if none."""
+    hops = array("i", [UNREACHABLE]) * len(graph.country_ids)
+    _search(graph, source, kind, hops)
+    return hops
+
+
+def bordering_clusters(
+    graph: ContactGraph,
+    excluded: int | None = None,
+) -> list[list[int]]:
+    """Groups of two or more empires joined by borders, largest first."""
+    return [
+        component
+        for component in connected_components(graph, EdgeKind.BORDER, excluded)
+        if len(component) > 1
+    ]
+
+
+def build_contact_findings(
+    graph: ContactGraph,
+    min_bloc_size: int = RIVAL_BLOC_MIN_SIZE,
+) -> list[KeyFinding]:
+    """Findings about the player's position in the graph.
+
+    Reports rival blocs, clusters of empires bordering one another that
+    also border the player, and bordering empires the player has no contact
+    with.
+    """
+    player = graph.player
+    if player is None:
+        return []
+
+    hops = hops_from(graph, player, EdgeKind.BORDER)
+    border_neighbors = {node for node, count in enumerate(hops) if count == 1}
+    findings: list[KeyFinding] = []
+    for cluster in bordering_clusters(graph, excluded=player):
+        if len(cluster) < min_bloc_size or border_neighbors.isdisjoint(cluster):
+            continue
+        names = ", ".join(sorted(graph.names[node] for node in cluster))
+        findings.append(
+            KeyFinding(
+                finding_type="rival_bloc",
+                description=f"{len(cluster)} empires border each other and "
+                + f"your territory: {names}",
+                severity=FindingSeverity.WARNING,
+            ),
+        )
+
+    findings.extend(
+        KeyFinding(
+            finding_type="uncontacted_neighbor",
+            description=f"{graph.names[node]} borders your territory "
+            + "but has not been contacted",
+            severity=FindingSeverity.INFO,
+        )
+        for node in sorted(border_neighbors, key=lambda n: graph.names[n])
+        if not graph.edge_kind(player, node) & EdgeKind.CONTACT
+    )
+    return findings
+
+
+def latest_contact_findings(
+    result: GetNeighborData,
+    save_filename: str,
+    distances: DistanceMatrix,
+) -> list[KeyFinding]:
+    """Contact graph findings of the latest gamestate of a neighbor data fetch."""
+    graph = build_contact_graph(latest_gamestate(result, save_filename), distances)
+    return build_contact_findings(graph)
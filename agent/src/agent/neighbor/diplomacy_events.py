@@ -0,0 +1,273 @@
+"""Diplomatic event log built by diffing consecutive gamestates.
+
+Neighbor analysis reads only the latest gamestate. This log records how the
+player's relations got there: every gamestate's relations are keyed by
+(source, target) and its opinion modifiers by (source, target,
+modifier_type), and each snapshot is joined with the previous one on those
+keys. The resulting events can be appended one gamestate at a time and are
+exposed to the neighbor agents as a tool.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from pydantic_ai.toolsets import FunctionToolset
+
+from agent.analysis_config import OPINION_SWING_THRESHOLD
+from agent.neighbor.models import DiplomaticEvent, DiplomaticEventType
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Sequence
+
+    from agent.graphql_client import (
+        GetNeighborData,
+        GetNeighborDataSaveGamestatesDiplomaticRelations,
+    )
+
+QUERY_DIPLOMATIC_EVENTS_TOOL = "query_diplomatic_events"
+# Events returned by one tool call, newest first
+MAX_TOOL_EVENTS = 50
+
+type RelationKey = tuple[str, str]
+type ModifierKey = tuple[str, str, str]
+
+
+@dataclass(frozen=True)
+class RelationState:
+    target_name: str | None
+    opinion: float | None
+    is_hostile: bool
+
+
+@dataclass
+class DiplomacySnapshot:
+    """Relations and opinion modifiers of one gamestate, keyed for joining."""
+
+    relations: dict[RelationKey, RelationState] = field(
+        default_factory=dict[RelationKey, RelationState],
+    )
+    modifiers: dict[ModifierKey, float] = field(
+        default_factory=dict[ModifierKey, float],
+    )
+
+
+def build_snapshot(
+    source_country_id: str,
+    relations: Sequence[GetNeighborDataSaveGamestatesDiplomaticRelations],
+) -> DiplomacySnapshot:
+    """Key the relations of `source_country_id`; repeated modifiers are summed."""
+    snapshot = DiplomacySnapshot()
+    for relation in relations:
+        target = relation.target_country_id
+        snapshot.relations[source_country_id, target] = RelationState(
+            target_name=relation.target_empire_name,
+            opinion=relation.opinion,
+            is_hostile=relation.is_hostile,
+        )
+        for modifier in relation.opinion_modifiers:
+            key = (source_country_id, target, modifier.modifier_type)
+            snapshot.modifiers[key] = snapshot.modifiers.get(key, 0.0) + modifier.value
+    return snapshot
+
+
+def diff_snapshots(
+    date: str,
+    previous: DiplomacySnapshot,
+    current: DiplomacySnapshot,
+    opinion_swing_threshold: float = OPINION_SWING_THRESHOLD,
+) -> list[DiplomaticEvent]:
+    """Events that turn `previous` into `current`."""
+    events: list[DiplomaticEvent] = []
+
+    def target_name(source: str, target: str) -> str | None:
+        state = current.relations.get((source, target)) or previous.relations.get(
+            (source, target),
+        )
+        return state.target_name if state is not None else None
+
+    for key, now in current.relations.items():
+        before = previous.relations.get(key)
+        if before is None:
+            continue
+        source, target = key
+        if now.is_hostile != before.is_hostile:
+            events.append(
+                DiplomaticEvent(
+                    date=date,
+                    event_type=DiplomaticEventType.HOSTILITY_CHANGED,
+                    source_country_id=source,
+                    target_country_id=target,
+                    target_name=now.target_name,
+                    is_hostile=now.is_hostile,
+                ),
+            )
+        if (
+            now.opinion is not None
+            and before.opinion is not None
+            and abs(now.opinion - before.opinion) >= opinion_swing_threshold
+        ):
+            events.append(
+                DiplomaticEvent(
+                    date=date,
+                    event_type=DiplomaticEventType.OPINION_SWING,
+                    source_country_id=source,
+                    target_country_id=target,
+                    target_name=now.target_name,
+                    before=before.opinion,
+                    after=now.opinion,
+                ),
+            )
+
+    for key in current.modifiers.keys() - previous.modifiers.keys():
+        source, target, modifier_type = key
+        events.append(
+            DiplomaticEvent(
+                date=date,
+                event_type=DiplomaticEventType.MODIFIER_ADDED,
+                source_country_id=source,
+                target_country_id=target,
+                target_name=target_name(source, target),
+                modifier_type=modifier_type,
+                after=current.modifiers[key],
+            ),
+        )
+    for key in previous.modifiers.keys() - current.modifiers.keys():
+        source, target, modifier_type = key
+        events.append(
+            DiplomaticEvent(
+                date=date,
+                event_type=DiplomaticEventType.MODIFIER_REMOVED,
+                source_country_id=source,
+                target_country_id=target,
+                target_name=target_name(source, target),
+                modifier_type=modifier_type,
+                before=previous.modifiers[key],
+            ),
+        )
+
+    events.sort(
+        key=lambda e: (e.target_country_id, e.event_type, e.modifier_type or ""),
+    )
+    return events
+
+
+class DiplomacyEventLog:
+    """Append-only log of diplomatic events, one gamestate at a time."""
+
+    def __init__(
+        self,
+        opinion_swing_threshold: float = OPINION_SWING_THRESHOLD,
+    ) -> None:
+        super().__init__()
+        self.opinion_swing_threshold = opinion_swing_threshold
+        self.events: list[DiplomaticEvent] = []
+        self.last_date: str | None = None
+        self._snapshot: DiplomacySnapshot | None = None
+
+    def append(self, date: str, snapshot: DiplomacySnapshot) -> list[DiplomaticEvent]:
+        """Diff `snapshot` against the previous gamestate and log the changes.
+
+        The first gamestate is the baseline and logs nothing. Returns the
+        events added.
+        """
+        if self.last_date is not None and date <= self.last_date:
+            raise ValueError(
+                f"Gamestate {date} is not after the last logged one ({self.last_date})",
+            )
+        events = (
+            diff_snapshots(
+                date,
+                self._snapshot,
+                snapshot,
+                self.opinion_swing_threshold,
+            )
+            if self._snapshot is not None
+            else []
+        )
+        self.events.extend(events)
+        self.last_date = date
+        self._snapshot = snapshot
+        return events
+
+    def query(
+        self,
+        target_country_id: str | None = None,
+        event_types: Collection[DiplomaticEventType] | None = None,
+        since: str | None = None,
+        limit: int | None = None,
+    ) -> list[DiplomaticEvent]:
+        """Matching events, newest first."""
+        matches = [
+            event
+            for event in reversed(self.events)
+            if (
+                target_country_id is None
+                or event.target_country_id == target_country_id
+            )
+            and (event_types is None or event.event_type in event_types)
+            and (since is None or event.date >= since)
+        ]
+        return matches[:limit] if limit is not None else matches
+
+
+def build_diplomacy_event_log(
+    neighbor_data: GetNeighborData,
+    opinion_swing_threshold: float = OPINION_SWING_THRESHOLD,
+) -> DiplomacyEventLog:
+    """Log the player's diplomatic events across every gamestate of a save."""
+    log = DiplomacyEventLog(opinion_swing_threshold)
+    if neighbor_data.save is None:
+        return log
+    for gamestate in sorted(neighbor_data.save.gamestates, key=lambda gs: gs.date):
+        if gamestate.player_empire is None:
+            continue
+        log.append(
+            str(gamestate.date),
+            build_snapshot(
+                gamestate.player_empire.country_id,
+                gamestate.diplomatic_relations,
+            ),
+        )
+    return log
+
+
+def create_diplomacy_toolset(log: DiplomacyEventLog) -> FunctionToolset[Any]:
+    """Expose the event log to an agent as a query tool."""
+
+    async def query_diplomatic_events(
+        target_country_id: str | None = None,
+        event_type: DiplomaticEventType | None = None,
+        since: str | None = None,
+    ) -> list[DiplomaticEvent]:
+        """Return how the player's diplomatic relations changed over the save, newest first.
+
+        Args:
+            target_country_id: Only events of the relation with this empire.
+            event_type: Only events of this kind.
+            since: Only events on or after this date (YYYY-MM-DD).
+        """
+        return log.query(
+            target_country_id=target_country_id,
+            event_types=[event_type] if event_type is not None else None,
+            since=since,
+            limit=MAX_TOOL_EVENTS,
+        )
+
+    return FunctionToolset([query_diplomatic_events])
+
+
+def build_diplomacy_events_prompt_section() -> str:
+    return f"""## Diplomatic History
+
+The sandbox data holds only the latest gamestate. To see how relations changed
+over the save, call the `{QUERY_DIPLOMATIC_EVENTS_TOOL}` tool. It returns events
+between consecutive gamestates, newest first:
+
+- `opinion_swing`: opinion changed by at least {OPINION_SWING_THRESHOLD:g} (`before` -> `after`)
+- `hostility_changed`: the relation turned hostile or peaceful (`is_hostile`)
+- `modifier_added` / `modifier_removed`: an opinion modifier appeared or expired
+
+Filter by `target_country_id`, `event_type` and `since` (YYYY-MM-DD) to answer
+questions like when an empire turned hostile or which modifier lowered its opinion."""
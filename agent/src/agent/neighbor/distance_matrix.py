@@ -0,0 +1,331 @@
+"""Minimum planet-to-planet distances between every pair of empires.
+
+The neighbor prompts measure distances from the player only, comparing every
+planet pair. For rival-to-rival proximity this module puts each empire's
+planets into a uniform grid and answers nearest-planet queries by searching
+rings of cells outward from the query point, clipped to the other empire's
+cells. No planet x planet array is ever built, so memory grows with the
+number of planets and the empire x empire matrix only. Matrices are cached
+per gamestate, as every agent and tool call of a run reads the same one.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from pydantic_ai.toolsets import FunctionToolset
+
+from agent.neighbor.models import EmpireDistance, EmpireDistanceMatrixResult
+from agent.settings import get_settings
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping, Sequence
+
+    from agent.graphql_client import GetNeighborData, GetNeighborDataSaveGamestates
+    from agent.native_budget.tools import GraphQLClientProtocol
+    from agent.settings import Settings
+
+GET_EMPIRE_DISTANCES_TOOL = "get_empire_distances"
+DEFAULT_DISTANCE_LIMIT = 10
+DISTANCE_MATRIX_CACHE_SIZE = 32
+# Smallest grid cell, so planets at one spot do not make the grid unbounded
+MIN_CELL_SIZE = 1.0
+
+type Point = tuple[float, float]
+type Cell = tuple[int, int]
+
+
+class PlanetGrid:
+    """Uniform grid over one empire's planets for nearest-planet queries."""
+
+    def __init__(self, points: Sequence[Point], cell_size: float) -> None:
+        super().__init__()
+        if not points:
+            raise ValueError("A planet grid needs at least one planet")
+        self.cell_size = cell_size
+        self.size = len(points)
+        self.cells: dict[Cell, list[Point]] = {}
+        for point in points:
+            self.cells.setdefault(self._cell(point), []).append(point)
+        xs = [x for x, _ in self.cells]
+        ys = [y for _, y in self.cells]
+        self.min_cell = (min(xs), min(ys))
+        self.max_cell = (max(xs), max(ys))
+
+    def _cell(self, point: Point) -> Cell:
+        return (
+            math.floor(point[0] / self.cell_size),
+            math.floor(point[1] / self.cell_size),
+        )
+
+    def _ring(self, center: Cell, ring: int) -> Iterator[Cell]:
+        """Cells at Chebyshev distance `ring` from `center` that lie within the grid."""
+        (cx, cy), (min_x, min_y), (max_x, max_y) = center, self.min_cell, self.max_cell
+        if ring == 0:
+            yield center
+            return
+        for y in (cy - ring, cy + ring):
+            if min_y <= y <= max_y:
+                for x in range(max(cx - ring, min_x), min(cx + ring, max_x) + 1):
+                    yield x, y
+        for x in (cx - ring, cx + ring):
+            if min_x <= x <= max_x:
+                for y in range(
+                    max(cy - ring + 1, min_y),
+                    min(cy + ring - 1, max_y) + 1,
+                ):
+                    yield x, y
+
+    def nearest_distance(self, point: Point, limit: float = math.inf) -> float:
+        """Distance from `point` to the nearest planet, or `limit` if none is closer."""
+        cx, cy = center = self._cell(point)
+        (min_x, min_y), (max_x, max_y) = self.min_cell, self.max_cell
+        first_ring = max(min_x - cx, cx - max_x, min_y - cy, cy - max_y, 0)
+        last_ring = max(cx - min_x, max_x - cx, cy - min_y, max_y - cy)
+        best = limit
+        for ring in range(first_ring, last_ring + 1):
+            # Every planet in this ring or beyond is at least this far away
+            if (ring - 1) * self.cell_size >= best:
+                break
+            for cell in self._ring(center, ring):
+                for planet in self.cells.get(cell, ()):
+                    distance = math.dist(point, planet)
+                    if distance < best:
+                        best = distance
+        return best
+
+
+@dataclass(frozen=True)
+class DistanceMatrix:
+    """Symmetric empire x empire minimum distances, indexed like `country_ids`."""
+
+    country_ids: list[str]
+    names: list[str]
+    distances: list[list[float]]
+
+    def _distance(self, row: int, column: int) -> EmpireDistance:
+        return EmpireDistance(
+            country_id=self.country_ids[row],
+            name=self.names[row],
+            other_country_id=self.country_ids[column],
+            other_name=self.names[column],
+            min_distance=self.distances[row][column],
+        )
+
+    def nearest(
+        self,
+        country_id: str,
+        limit: int = DEFAULT_DISTANCE_LIMIT,
+    ) -> list[EmpireDistance]:
+        """The empires closest to `country_id`, nearest first."""
+        if country_id not in self.country_ids:
+            return []
+        row = self.country_ids.index(country_id)
+        columns = sorted(
+            (column for column in range(len(self.country_ids)) if column != row),
+            key=lambda column: self.distances[row][column],
+        )
+        return [self._distance(row, column) for column in columns[:limit]]
+
+    def closest_pairs(
+        self,
+        limit: int = DEFAULT_DISTANCE_LIMIT,
+    ) -> list[EmpireDistance]:
+        """The closest pairs of distinct empires, nearest first."""
+        pairs = sorted(
+            (
+                (self.distances[row][column], row, column)
+                for row in range(len(self.country_ids))
+                for column in range(row + 1, len(self.country_ids))
+            ),
+        )
+        return [self._distance(row, column) for _, row, column in pairs[:limit]]
+
+
+def _cell_size(points: Sequence[Point]) -> float:
+    """Cell size that puts about one planet in each cell of the bounding box."""
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    extent = max(max(xs) - min(xs), max(ys) - min(ys))
+    return max(extent / math.sqrt(len(points)), MIN_CELL_SIZE)
+
+
+def compute_distance_matrix(
+    empire_planets: Mapping[str, Sequence[Point]],
+    names: Mapping[str, str],
+) -> DistanceMatrix:
+    """Minimum planet-to-planet distance between every pair of empires.
+
+    Empires without planets are left out.
+    """
+    country_ids = [c for c, points in empire_planets.items() if points]
+    all_points = [p for c in country_ids for p in empire_planets[c]]
+    if not all_points:
+        return DistanceMatrix(country_ids=[], names=[], distances=[])
+
+    cell_size = _cell_size(all_points)
+    grids = [PlanetGrid(empire_planets[c], cell_size) for c in country_ids]
+    distances = [[0.0] * len(country_ids) for _ in country_ids]
+    for row, grid in enumerate(grids):
+        for column in range(row + 1, len(grids)):
+            other = grids[column]
+            # Query the smaller empire against the larger one's grid
+            queries, target = (
+                (empire_planets[country_ids[row]], other)
+                if grid.size <= other.size
+                else (empire_planets[country_ids[column]], grid)
+            )
+            best = math.inf
+            for point in queries:
+                best = target.nearest_distance(point, best)
+            distances[row][column] = distances[column][row] = best
+
+    return DistanceMatrix(
+        country_ids=country_ids,
+        names=[names.get(c, c) for c in country_ids],
+        distances=distances,
+    )
+
+
+def gamestate_distance_matrix(
+    gamestate: GetNeighborDataSaveGamestates,
+) -> DistanceMatrix:
+    """Distance matrix of the player and every other empire in one gamestate."""
+    coordinates = {c.planet_id: (c.x, c.y) for c in gamestate.all_planet_coordinates}
+    player = gamestate.player_empire
+    empires = [*([player] if player is not None else []), *gamestate.empires]
+    empire_planets: dict[str, list[Point]] = {}
+    names: dict[str, str] = {}
+    for empire in empires:
+        if empire.country_id in empire_planets:
+            continue
+        empire_planets[empire.country_id] = [
+            coordinates[planet_id]
+            for planet_id in empire.owned_planet_ids
+            if planet_id in coordinates
+        ]
+        names[empire.country_id] = empire.name
+    return compute_distance_matrix(empire_planets, names)
+
+
+def latest_gamestate(
+    result: GetNeighborData,
+    save_filename: str,
+) -> GetNeighborDataSaveGamestates:
+    if result.save is None or not result.save.gamestates:
+        raise ValueError(f"No gamestates found for save '{save_filename}'")
+    return max(result.save.gamestates, key=lambda gs: gs.date)
+
+
+class DistanceMatrixCache:
+    """Least recently used distance matrices, keyed by save and gamestate date."""
+
+    def __init__(self, max_size: int = DISTANCE_MATRIX_CACHE_SIZE) -> None:
+        super().__init__()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._matrices: OrderedDict[tuple[str, str], DistanceMatrix] = OrderedDict()
+
+    def get(
+        self,
+        save_filename: str,
+        gamestate: GetNeighborDataSaveGamestates,
+    ) -> DistanceMatrix:
+        key = (save_filename, str(gamestate.date))
+        matrix = self._matrices.get(key)
+        if matrix is not None:
+            self.hits += 1
+            self._matrices.move_to_end(key)
+            return matrix
+
+        self.misses += 1
+        matrix = gamestate_distance_matrix(gamestate)
+        self._matrices[key] = matrix
+        if len(self._matrices) > self.max_size:
+            self._matrices.popitem(last=False)
+        return matrix
+
+
+# Shared by every agent and analysis in this process
+DISTANCE_MATRIX_CACHE = DistanceMatrixCache()
+
+
+def latest_distance_matrix(
+    result: GetNeighborData,
+    save_filename: str,
+    cache: DistanceMatrixCache = DISTANCE_MATRIX_CACHE,
+) -> DistanceMatrix:
+    """Distance matrix of the latest gamestate of a neighbor data fetch."""
+    return cache.get(save_filename, latest_gamestate(result, save_filename))
+
+
+def create_distance_toolset(matrix: DistanceMatrix) -> FunctionToolset[Any]:
+    """Expose the distance matrix to an agent as a query tool."""
+
+    async def get_empire_distances(
+        country_id: str | None = None,
+        limit: int = DEFAULT_DISTANCE_LIMIT,
+    ) -> list[EmpireDistance]:
+        """Return minimum planet-to-planet distances between empires, nearest first.
+
+        Args:
+            country_id: Empire whose nearest empires to list. When omitted,
+                the closest pairs of empires in the galaxy are listed.
+            limit: Maximum number of distances to return.
+        """
+        if country_id is None:
+            return matrix.closest_pairs(limit)
+        return matrix.nearest(country_id, limit)
+
+    return FunctionToolset([get_empire_distances])
+
+
+def build_distance_prompt_section() -> str:
+    return f"""## Empire Distances
+
+Call the `{GET_EMPIRE_DISTANCES_TOOL}` tool for precomputed minimum
+planet-to-planet distances between any two empires, not just from the player.
+Pass `country_id` to list the empires nearest to that empire, or omit it for
+the closest pairs in the galaxy. Use it to judge rival-to-rival proximity,
+such as neighbors that could threaten each other or form a coalition."""
+
+
+async def run_distance_matrix_analysis(
+    save_filename: str,
+    client: GraphQLClientProtocol | None = None,
+    settings: Settings | None = None,
+    cache: DistanceMatrixCache = DISTANCE_MATRIX_CACHE,
+) -> EmpireDistanceMatrixResult:
+    """Compute the distance matrix of the latest gamestate of a save."""
+    if client is None:
+        if settings is None:
+            settings = get_settings()
+        async with settings.create_graphql_client() as graphql_client:
+            neighbor_data = await graphql_client.get_neighbor_data(
+                filename=save_filename,
+            )
+    else:
+        neighbor_data = await client.get_neighbor_data(filename=save_filename)
+
+    latest = latest_gamestate(neighbor_data, save_filename)
+    matrix = cache.get(save_filename, latest)
+    closest = matrix.closest_pairs()
+    summary = f"Computed distances between {len(matrix.country_ids)} empires."
+    if closest:
+        summary += (
+            f" Closest pair: {closest[0].name} and {closest[0].other_name} "
+            f"at {closest[0].min_distance:.1f}."
+        )
+    return EmpireDistanceMatrixResult(
+        save_filename=save_filename,
+        date=str(latest.date),
+        country_ids=matrix.country_ids,
+        names=matrix.names,
+        distances=matrix.distances,
+        closest_pairs=closest,
+        summary=summary,
+    )
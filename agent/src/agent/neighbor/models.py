@@ -11,6 +11,33 @@ class FindingSeverity(StrEnum):
     INFO = "info"
 
 
+class DiplomaticEventType(StrEnum):
+    """Kinds of change logged between consecutive gamestates."""
+
+    OPINION_SWING = "opinion_swing"
+    HOSTILITY_CHANGED = "hostility_changed"
+    MODIFIER_ADDED = "modifier_added"
+    MODIFIER_REMOVED = "modifier_removed"
+
+
+class DiplomaticEvent(BaseModel):
+    """A change in one diplomatic relation since the previous gamestate.
+
+    `before` and `after` hold the opinion of a swing or the value of an
+    added or removed modifier; `is_hostile` is set on hostility changes.
+    """
+
+    date: str
+    event_type: DiplomaticEventType
+    source_country_id: str
+    target_country_id: str
+    target_name: str | None
+    modifier_type: str | None = None
+    before: float | None = None
+    after: float | None = None
+    is_hostile: bool | None = None
+
+
 class OpinionModifier(BaseModel):
     """A diplomatic opinion modifier between empires."""
 
@@ -32,6 +59,32 @@ class NeighborInfo(BaseModel):
     opinion_modifiers: list[OpinionModifier]
 
 
+class EmpireDistance(BaseModel):
+    """Minimum planet-to-planet distance between two empires."""
+
+    country_id: str
+    name: str
+    other_country_id: str
+    other_name: str
+    min_distance: float
+
+
+class EmpireDistanceMatrixResult(BaseModel):
+    """Minimum planet-to-planet distances between every pair of empires.
+
+    `distances` is symmetric and indexed like `country_ids`; only empires
+    owning planets with known coordinates are included.
+    """
+
+    save_filename: str
+    date: str
+    country_ids: list[str]
+    names: list[str]
+    distances: list[list[float]]
+    closest_pairs: list[EmpireDistance]
+    summary: str
+
+
 class KeyFinding(BaseModel):
     """A notable finding from the neighbor analysis such as hostile relations."""
 
@@ -1,5 +1,9 @@
 from .models import (
     DetectedNeighbor,
+    NeighborAnalysisCompleteEvent,
+    NeighborAnalysisEvent,
+    NeighborAnalyzedEvent,
+    NeighborDetectionEvent,
     NeighborDetectionResult,
     NeighborFinding,
     OpinionAnalysisResult,
@@ -10,6 +14,7 @@ from .orchestrator import (
     create_neighbor_detection_agent,
     create_opinion_analysis_agent,
     run_neighbor_multi_agent_orchestration,
+    stream_neighbor_multi_agent_orchestration,
 )
 from .prompts import (
     build_neighbor_detection_prompt,
@@ -20,6 +25,10 @@ from .prompts import (
 
 __all__ = [
     "DetectedNeighbor",
+    "NeighborAnalysisCompleteEvent",
+    "NeighborAnalysisEvent",
+    "NeighborAnalyzedEvent",
+    "NeighborDetectionEvent",
     "NeighborDetectionResult",
     "NeighborFinding",
     "NeighborMultiAgentDeps",
@@ -32,4 +41,5 @@ __all__ = [
     "create_neighbor_detection_agent",
     "create_opinion_analysis_agent",
     "run_neighbor_multi_agent_orchestration",
+    "stream_neighbor_multi_agent_orchestration",
 ]
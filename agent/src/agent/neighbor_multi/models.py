@@ -1,6 +1,14 @@
+from typing import Literal
+
 from pydantic import BaseModel
 
-from agent.neighbor import FindingSeverity, OpinionModifier
+from agent.neighbor import (
+    FindingSeverity,
+    KeyFinding,
+    NeighborAnalysisResult,
+    NeighborInfo,
+    OpinionModifier,
+)
 
 
 class DetectedNeighbor(BaseModel):
@@ -41,3 +49,31 @@ class OpinionAnalysisResult(BaseModel):
     is_hostile: bool
     opinion_modifiers: list[OpinionModifier]
     findings: list[NeighborFinding]
+
+
+class NeighborDetectionEvent(BaseModel):
+    """Streamed once neighbor detection finishes, before any opinion analysis."""
+
+    event: Literal["detection"] = "detection"
+    detection: NeighborDetectionResult
+
+
+class NeighborAnalyzedEvent(BaseModel):
+    """Streamed as the opinion analysis of each neighbor completes."""
+
+    event: Literal["neighbor_analyzed"] = "neighbor_analyzed"
+    neighbor: NeighborInfo
+    findings: list[KeyFinding]
+    analysis_error: str | None
+
+
+class NeighborAnalysisCompleteEvent(BaseModel):
+    """Final streamed event carrying the complete analysis result."""
+
+    event: Literal["complete"] = "complete"
+    result: NeighborAnalysisResult
+
+
+type NeighborAnalysisEvent = (
+    NeighborDetectionEvent | NeighborAnalyzedEvent | NeighborAnalysisCompleteEvent
+)
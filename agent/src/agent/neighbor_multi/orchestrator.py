@@ -1,19 +1,40 @@
 from __future__ import annotations
 
+from collections.abc import AsyncGenerator
+from contextlib import aclosing
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 from pydantic_ai import Agent
-from pydantic_ai.mcp import MCPServerStreamableHTTP
 
-from agent.constants import DEFAULT_MODEL, create_model, wrap_output_type
+from agent.agent_registry import AGENT_REGISTRY, AgentKey
+from agent.constants import (
+    DEFAULT_MODEL,
+    create_model,
+    create_prompt_cache_settings,
+    wrap_output_type,
+)
 from agent.neighbor import (
     KeyFinding,
     NeighborAnalysisResult,
     NeighborInfo,
     OpinionModifier,
 )
+from agent.neighbor.contact_graph import latest_contact_findings
+from agent.neighbor.diplomacy_events import (
+    build_diplomacy_event_log,
+    create_diplomacy_toolset,
+)
+from agent.neighbor.distance_matrix import (
+    create_distance_toolset,
+    latest_distance_matrix,
+)
 from agent.neighbor_multi.models import (
     DetectedNeighbor,
+    NeighborAnalysisCompleteEvent,
+    NeighborAnalysisEvent,
+    NeighborAnalyzedEvent,
+    NeighborDetectionEvent,
     NeighborDetectionResult,
     OpinionAnalysisResult,
 )
@@ -23,15 +44,20 @@ from agent.neighbor_multi.prompts import (
     build_opinion_analysis_prompt,
     build_opinion_analysis_system_prompt,
 )
-from agent.settings import (
-    MCP_TIMEOUT_SECONDS,
-    Settings,
-    create_resilient_http_client,
-    get_settings,
-)
+from agent.sandbox_data import build_neighbor_data, create_sandbox_server
+from agent.settings import Settings, get_settings
+
+if TYPE_CHECKING:
+    from pydantic_ai.mcp import MCPServerStreamableHTTP
+
+    from agent.neighbor.diplomacy_events import DiplomacyEventLog
+    from agent.neighbor.distance_matrix import DistanceMatrix
 
 AnalysisResultTuple = tuple[DetectedNeighbor, OpinionAnalysisResult | None, str | None]
 
+NEIGHBOR_DETECTION_AGENT = "neighbor_detection_agent"
+OPINION_ANALYSIS_AGENT = "opinion_analysis_agent"
+
 
 @dataclass
 class NeighborMultiAgentDeps:
@@ -41,36 +67,37 @@ class NeighborMultiAgentDeps:
 
 
 def create_neighbor_detection_agent(
-    mcp_server: MCPServerStreamableHTTP,
     model_name: str,
-    settings: Settings | None = None,
 ) -> Agent[NeighborMultiAgentDeps, NeighborDetectionResult]:
-    if settings is None:
-        settings = get_settings()
     return Agent(
         create_model(model_name),
         deps_type=NeighborMultiAgentDeps,
         output_type=wrap_output_type(NeighborDetectionResult),
-        system_prompt=build_neighbor_detection_system_prompt(settings.graphql_url),
-        toolsets=[mcp_server],
-        name="neighbor_detection_agent",
+        system_prompt=AGENT_REGISTRY.get_prompt(
+            NEIGHBOR_DETECTION_AGENT,
+            build_neighbor_detection_system_prompt,
+        ),
+        model_settings=create_prompt_cache_settings(
+            model_name,
+            NEIGHBOR_DETECTION_AGENT,
+        ),
+        name=NEIGHBOR_DETECTION_AGENT,
     )
 
 
 def create_opinion_analysis_agent(
-    mcp_server: MCPServerStreamableHTTP,
     model_name: str,
-    settings: Settings | None = None,
 ) -> Agent[NeighborMultiAgentDeps, OpinionAnalysisResult]:
-    if settings is None:
-        settings = get_settings()
     return Agent(
         create_model(model_name),
         deps_type=NeighborMultiAgentDeps,
         output_type=wrap_output_type(OpinionAnalysisResult),
-        system_prompt=build_opinion_analysis_system_prompt(settings.graphql_url),
-        toolsets=[mcp_server],
-        name="opinion_analysis_agent",
+        system_prompt=AGENT_REGISTRY.get_prompt(
+            OPINION_ANALYSIS_AGENT,
+            build_opinion_analysis_system_prompt,
+        ),
+        model_settings=create_prompt_cache_settings(model_name, OPINION_ANALYSIS_AGENT),
+        name=OPINION_ANALYSIS_AGENT,
     )
 
 
@@ -84,138 +111,198 @@ async def analyze_single_neighbor(
     neighbor: DetectedNeighbor,
     save_filename: str,
     mcp_server: MCPServerStreamableHTTP,
+    diplomacy_events: DiplomacyEventLog,
+    distances: DistanceMatrix,
     deps: NeighborMultiAgentDeps,
     model_name: str,
-    settings: Settings,
-) -> tuple[DetectedNeighbor, OpinionAnalysisResult | None, str | None]:
+) -> AnalysisResultTuple:
     try:
-        agent = create_opinion_analysis_agent(mcp_server, model_name, settings)
+        agent = AGENT_REGISTRY.get_agent(
+            AgentKey(OPINION_ANALYSIS_AGENT, model_name, deps.graphql_url),
+            create_opinion_analysis_agent,
+        )
         prompt = build_opinion_analysis_prompt(
             save_filename,
             neighbor.country_id,
             neighbor.name,
-            deps.graphql_url,
         )
-        result = await agent.run(prompt, deps=deps)
+        result = await agent.run(
+            prompt,
+            deps=deps,
+            toolsets=[
+                mcp_server,
+                create_diplomacy_toolset(diplomacy_events),
+                create_distance_toolset(distances),
+            ],
+        )
         return (neighbor, result.output, None)
     except Exception as e:
         return (neighbor, None, str(e))
 
 
-async def run_neighbor_multi_agent_orchestration(
+def build_neighbor_info(
+    neighbor: DetectedNeighbor,
+    opinion_result: OpinionAnalysisResult | None,
+) -> tuple[NeighborInfo, list[KeyFinding]]:
+    if opinion_result is None:
+        return (
+            NeighborInfo(
+                country_id=neighbor.country_id,
+                name=neighbor.name,
+                min_distance=neighbor.min_distance,
+                owned_planet_count=neighbor.owned_planet_count,
+                opinion=None,
+                trust=None,
+                threat=None,
+                is_hostile=None,
+                opinion_modifiers=[],
+            ),
+            [],
+        )
+
+    info = NeighborInfo(
+        country_id=neighbor.country_id,
+        name=neighbor.name,
+        min_distance=neighbor.min_distance,
+        owned_planet_count=neighbor.owned_planet_count,
+        opinion=opinion_result.opinion,
+        trust=opinion_result.trust,
+        threat=opinion_result.threat,
+        is_hostile=opinion_result.is_hostile,
+        opinion_modifiers=[
+            OpinionModifier(
+                modifier_type=m.modifier_type,
+                value=m.value,
+            )
+            for m in opinion_result.opinion_modifiers
+        ],
+    )
+    findings = [
+        KeyFinding(
+            finding_type=finding.finding_type,
+            description=finding.description,
+            severity=finding.severity,
+        )
+        for finding in opinion_result.findings
+    ]
+    return info, findings
+
+
+def build_neighbor_analysis_result(
+    detection: NeighborDetectionResult,
+    neighbors: list[NeighborInfo],
+    findings: list[KeyFinding],
+) -> NeighborAnalysisResult:
+    summary_parts: list[str] = []
+    if neighbors:
+        closest = neighbors[0]
+        opinion_str = (
+            f"with {closest.opinion:+.0f} opinion"
+            if closest.opinion is not None
+            else ""
+        )
+        summary_parts.append(
+            f"Your closest neighbor is {closest.name} at {closest.min_distance:.1f} distance {opinion_str}.",
+        )
+
+    hostile_count = sum(1 for n in neighbors if n.is_hostile)
+    if hostile_count > 0:
+        summary_parts.append(
+            f"You have {hostile_count} hostile neighbor(s) that pose a threat.",
+        )
+
+    if not summary_parts:
+        summary_parts.append("No neighbors detected with owned planets.")
+
+    return NeighborAnalysisResult(
+        save_filename=detection.save_filename,
+        analysis_date=detection.analysis_date,
+        player_empire_name=detection.player_empire_name,
+        player_owned_planets=detection.player_owned_planets,
+        neighbors=neighbors,
+        key_findings=findings,
+        summary=" ".join(summary_parts),
+    )
+
+
+async def stream_neighbor_multi_agent_orchestration(
     save_filename: str,
     settings: Settings | None = None,
     model_name: str | None = None,
-) -> NeighborAnalysisResult:
+) -> AsyncGenerator[NeighborAnalysisEvent]:
+    """Yield the neighbor detection result, then each analyzed neighbor, then the result."""
     if settings is None:
         settings = get_settings()
 
     actual_model = model_name or DEFAULT_MODEL
 
-    http_client = create_resilient_http_client(MCP_TIMEOUT_SECONDS)
-    mcp_server = MCPServerStreamableHTTP(settings.sandbox_url, http_client=http_client)
+    # Fetch the gamestates once; every sandbox run of this orchestration reuses them
+    async with settings.create_graphql_client() as client:
+        neighbor_data = await client.get_neighbor_data(filename=save_filename)
+    data = build_neighbor_data(neighbor_data, save_filename)
+    diplomacy_events = build_diplomacy_event_log(neighbor_data)
+    distances = latest_distance_matrix(neighbor_data, save_filename)
+    contact_findings = latest_contact_findings(neighbor_data, save_filename, distances)
+    mcp_server = create_sandbox_server(settings, data)
 
     async with mcp_server:
         # Phase 1: Run neighbor detection agent
         deps = create_deps(settings)
-        prompt = build_neighbor_detection_prompt(save_filename, deps.graphql_url)
-        detection_agent = create_neighbor_detection_agent(
-            mcp_server,
-            actual_model,
-            settings,
+        prompt = build_neighbor_detection_prompt(save_filename)
+        detection_agent = AGENT_REGISTRY.get_agent(
+            AgentKey(NEIGHBOR_DETECTION_AGENT, actual_model, deps.graphql_url),
+            create_neighbor_detection_agent,
         )
 
-        detection_result = await detection_agent.run(prompt, deps=deps)
+        detection_result = await detection_agent.run(
+            prompt,
+            deps=deps,
+            toolsets=[mcp_server],
+        )
         detection = detection_result.output
+        yield NeighborDetectionEvent(detection=detection)
 
         # Phase 2: Run opinion analysis for each neighbor
         neighbors: list[NeighborInfo] = []
         all_findings: list[KeyFinding] = []
 
-        results: list[AnalysisResultTuple] = []
-        for neighbor in detection.detected_neighbors:
-            result = await analyze_single_neighbor(
-                neighbor=neighbor,
+        for detected in detection.detected_neighbors:
+            _, opinion_result, error = await analyze_single_neighbor(
+                neighbor=detected,
                 save_filename=save_filename,
                 mcp_server=mcp_server,
+                diplomacy_events=diplomacy_events,
+                distances=distances,
                 deps=deps,
                 model_name=actual_model,
-                settings=settings,
-            )
-            results.append(result)
-
-        for neighbor, opinion_result, _error in results:
-            if opinion_result:
-                neighbors.append(
-                    NeighborInfo(
-                        country_id=neighbor.country_id,
-                        name=neighbor.name,
-                        min_distance=neighbor.min_distance,
-                        owned_planet_count=neighbor.owned_planet_count,
-                        opinion=opinion_result.opinion,
-                        trust=opinion_result.trust,
-                        threat=opinion_result.threat,
-                        is_hostile=opinion_result.is_hostile,
-                        opinion_modifiers=[
-                            OpinionModifier(
-                                modifier_type=m.modifier_type,
-                                value=m.value,
-                            )
-                            for m in opinion_result.opinion_modifiers
-                        ],
-                    ),
-                )
-                all_findings.extend(
-                    KeyFinding(
-                        finding_type=finding.finding_type,
-                        description=finding.description,
-                        severity=finding.severity,
-                    )
-                    for finding in opinion_result.findings
-                )
-            else:
-                neighbors.append(
-                    NeighborInfo(
-                        country_id=neighbor.country_id,
-                        name=neighbor.name,
-                        min_distance=neighbor.min_distance,
-                        owned_planet_count=neighbor.owned_planet_count,
-                        opinion=None,
-                        trust=None,
-                        threat=None,
-                        is_hostile=None,
-                        opinion_modifiers=[],
-                    ),
-                )
-
-        # Build summary
-        summary_parts: list[str] = []
-        if neighbors:
-            closest = neighbors[0]
-            opinion_str = (
-                f"with {closest.opinion:+.0f} opinion"
-                if closest.opinion is not None
-                else ""
             )
-            summary_parts.append(
-                f"Your closest neighbor is {closest.name} at {closest.min_distance:.1f} distance {opinion_str}.",
+            info, findings = build_neighbor_info(detected, opinion_result)
+            neighbors.append(info)
+            all_findings.extend(findings)
+            yield NeighborAnalyzedEvent(
+                neighbor=info,
+                findings=findings,
+                analysis_error=error,
             )
 
-        hostile_count = sum(1 for n in neighbors if n.is_hostile)
-        if hostile_count > 0:
-            summary_parts.append(
-                f"You have {hostile_count} hostile neighbor(s) that pose a threat.",
-            )
-
-        if not summary_parts:
-            summary_parts.append("No neighbors detected with owned planets.")
-
-        return NeighborAnalysisResult(
-            save_filename=save_filename,
-            analysis_date=detection.analysis_date,
-            player_empire_name=detection.player_empire_name,
-            player_owned_planets=detection.player_owned_planets,
-            neighbors=neighbors,
-            key_findings=all_findings,
-            summary=" ".join(summary_parts),
+        # Graph findings are computed, not left to the opinion agents
+        all_findings.extend(contact_findings)
+        yield NeighborAnalysisCompleteEvent(
+            result=build_neighbor_analysis_result(detection, neighbors, all_findings),
         )
+
+
+async def run_neighbor_multi_agent_orchestration(
+    save_filename: str,
+    settings: Settings | None = None,
+    model_name: str | None = None,
+) -> NeighborAnalysisResult:
+    # Closed here rather than when garbage collected, so the MCP server
+    # context is exited on this task
+    async with aclosing(
+        stream_neighbor_multi_agent_orchestration(save_filename, settings, model_name),
+    ) as events:
+        async for event in events:
+            if isinstance(event, NeighborAnalysisCompleteEvent):
+                return event.result
+    raise RuntimeError("Orchestration ended without a result")
@@ -1,4 +1,14 @@
-def build_neighbor_detection_system_prompt(graphql_url: str) -> str:
+from agent.neighbor.diplomacy_events import build_diplomacy_events_prompt_section
+from agent.neighbor.distance_matrix import build_distance_prompt_section
+from agent.sandbox_data import (
+    SANDBOX_DATA_VARIABLE,
+    build_neighbor_data_prompt_section,
+)
+
+
+def build_neighbor_detection_system_prompt() -> str:
+    data_section = build_neighbor_data_prompt_section()
+
     return f"""You are a Stellaris game statistics analyst specializing in detecting nearby empires.
 
 Your task is to identify the player's closest neighbors by calculating planet-to-planet distances.
@@ -6,44 +16,14 @@ Your task is to identify the player's closest neighbors by calculating planet-to
 ## Your Workflow
 
 1. Call the `run_python_code` tool with a single argument named `python_code` containing your Python code
-2. The code must fetch data from the GraphQL API and calculate distances
-3. Return ONLY the final JSON result (never print raw API data)
+2. The code must read the data from `{SANDBOX_DATA_VARIABLE}` and calculate distances
+3. Return ONLY the final JSON result (never print raw data)
 
 IMPORTANT: When calling the tool, you MUST provide the `python_code` argument. Example tool call format:
 - Tool: run_python_code
-- Argument: python_code = "import httpx; print('hello')"
-
-## GraphQL API
-
-URL: {graphql_url}
-
-### Query: Get Empire and Planet Data
-```graphql
-query GetNeighborData($filename: String!) {{
-  save(filename: $filename) {{
-    gamestates {{
-      date
-      playerEmpire {{
-        countryId
-        name
-        ownedPlanetIds
-        ownedPlanetCount
-      }}
-      empires {{
-        countryId
-        name
-        ownedPlanetIds
-        ownedPlanetCount
-      }}
-      allPlanetCoordinates {{
-        planetId
-        x
-        y
-      }}
-    }}
-  }}
-}}
-```
+- Argument: python_code = "print({SANDBOX_DATA_VARIABLE}['neighbors']['date'])"
+
+{data_section}
 
 ## Distance Calculation
 
@@ -54,11 +34,11 @@ For each empire (excluding player):
    ```python
    min_distance = float('inf')
    for player_planet_id in player_planet_ids:
-       player_coords = coord_lookup.get(str(player_planet_id))
+       player_coords = coord_lookup.get(player_planet_id)
        if not player_coords:
            continue
        for target_planet_id in target_planet_ids:
-           target_coords = coord_lookup.get(str(target_planet_id))
+           target_coords = coord_lookup.get(target_planet_id)
            if not target_coords:
                continue
            distance = sqrt((player_coords[0] - target_coords[0])**2 +
@@ -89,40 +69,18 @@ For each empire (excluding player):
 
 1. Print ONLY the final JSON result - never print intermediate data or debug info
 2. Sort neighbors by min_distance ascending
-3. Include only empires with ownedPlanetCount > 0
+3. Include only empires with owned_planet_count > 0
 4. Include up to 10 closest neighbors
-5. Use httpx for HTTP requests (available in sandbox)
+5. Do not make HTTP requests - all data is already preloaded
 6. Handle null/missing values gracefully
 
 ## Example Code Structure
 
 ```python
-import httpx
 import json
 from math import sqrt
 
-GRAPHQL_URL = "{graphql_url}"
-SAVE_FILENAME = "{{save_filename}}"  # Will be provided in the prompt
-
-query = '''
-query GetNeighborData($filename: String!) {{
-  save(filename: $filename) {{
-    gamestates {{
-      date
-      playerEmpire {{ countryId name ownedPlanetIds ownedPlanetCount }}
-      empires {{ countryId name ownedPlanetIds ownedPlanetCount }}
-      allPlanetCoordinates {{ planetId x y }}
-    }}
-  }}
-}}
-'''
-
-with httpx.Client(timeout=180.0) as client:
-    resp = client.post(GRAPHQL_URL, json={{
-        "query": query,
-        "variables": {{"filename": SAVE_FILENAME}}
-    }})
-    data = resp.json()
+data = {SANDBOX_DATA_VARIABLE}["neighbors"]
 
 # Process data and calculate distances...
 # Build result JSON and print it
@@ -130,16 +88,20 @@ with httpx.Client(timeout=180.0) as client:
 """
 
 
-def build_neighbor_detection_prompt(save_filename: str, graphql_url: str) -> str:
+def build_neighbor_detection_prompt(save_filename: str) -> str:
     return f"""Detect neighbors for save '{save_filename}'.
 
-GraphQL API URL: {graphql_url}
+The latest gamestate is preloaded in `{SANDBOX_DATA_VARIABLE}`.
 
 Calculate minimum planet-to-planet distances to each empire and return the 10 closest.
 Print ONLY the final JSON result."""
 
 
-def build_opinion_analysis_system_prompt(graphql_url: str) -> str:
+def build_opinion_analysis_system_prompt() -> str:
+    data_section = build_neighbor_data_prompt_section()
+    history_section = build_diplomacy_events_prompt_section()
+    distance_section = build_distance_prompt_section()
+
     return f"""You are a Stellaris diplomatic relations analyst.
 
 Your task is to analyze the opinion and diplomatic status between the player and a specific neighbor.
@@ -147,38 +109,21 @@ Your task is to analyze the opinion and diplomatic status between the player and
 ## Your Workflow
 
 1. Call the `run_python_code` tool with a single argument named `python_code`
-2. Fetch diplomatic relation data and analyze the relationship
+2. Read the diplomatic relation from `{SANDBOX_DATA_VARIABLE}` and analyze the relationship
 3. Return ONLY the final JSON result
 
 IMPORTANT: When calling the tool, you MUST provide the `python_code` argument. Example tool call format:
 - Tool: run_python_code
-- Argument: python_code = "import httpx; print('hello')"
-
-## GraphQL API
-
-URL: {graphql_url}
-
-### Query: Get Diplomatic Relations
-```graphql
-query GetDiplomaticData($filename: String!) {{
-  save(filename: $filename) {{
-    gamestates {{
-      diplomaticRelations {{
-        targetCountryId
-        targetEmpireName
-        opinion
-        trust
-        threat
-        isHostile
-        opinionModifiers {{
-          modifierType
-          value
-        }}
-      }}
-    }}
-  }}
-}}
-```
+- Argument: python_code = "print({SANDBOX_DATA_VARIABLE}['neighbors']['date'])"
+
+{data_section}
+
+{history_section}
+
+{distance_section}
+
+Mention recent history in the findings when it explains the current
+relation, e.g. a removed modifier behind a drop in opinion.
 
 ## Required Output Format
 
@@ -206,7 +151,7 @@ query GetDiplomaticData($filename: String!) {{
 
 ## Finding Types
 
-- `hostile_neighbor`: isHostile=true → severity: critical
+- `hostile_neighbor`: is_hostile=true → severity: critical
 - `genocidal_reputation`: modifier contains "genocidal" → severity: warning
 - `low_opinion`: opinion < -50 → severity: warning
 - `high_threat`: threat > 50 → severity: info
@@ -214,37 +159,16 @@ query GetDiplomaticData($filename: String!) {{
 ## CRITICAL RULES
 
 1. Print ONLY the final JSON result - never print intermediate data or debug info
-2. Use httpx for HTTP requests (available in sandbox)
+2. Do not make HTTP requests - all data is already preloaded
 3. Handle null/missing values gracefully
 
 ## Example Code Structure
 
 ```python
-import httpx
 import json
 
-GRAPHQL_URL = "{graphql_url}"
-SAVE_FILENAME = "{{save_filename}}"
-
-query = '''
-query GetDiplomaticData($filename: String!) {{
-  save(filename: $filename) {{
-    gamestates {{
-      diplomaticRelations {{
-        targetCountryId targetEmpireName opinion trust threat isHostile
-        opinionModifiers {{ modifierType value }}
-      }}
-    }}
-  }}
-}}
-'''
-
-with httpx.Client(timeout=180.0) as client:
-    resp = client.post(GRAPHQL_URL, json={{
-        "query": query,
-        "variables": {{"filename": SAVE_FILENAME}}
-    }})
-    data = resp.json()
+relations = {SANDBOX_DATA_VARIABLE}["neighbors"]["diplomatic_relations"]
+index = relations["target_country_id"].index("<target country id>")
 
 # Find the target relation and build result JSON
 ```
@@ -255,12 +179,9 @@ def build_opinion_analysis_prompt(
     save_filename: str,
     target_country_id: str,
     target_name: str,
-    graphql_url: str,
 ) -> str:
     return f"""Analyze diplomatic relations with empire '{target_name}' (country_id: {target_country_id}) for save '{save_filename}'.
 
-GraphQL API URL: {graphql_url}
-
 Find the diplomatic relation for this specific empire and analyze:
 1. Opinion, trust, and threat values
 2. Opinion modifiers and their impact
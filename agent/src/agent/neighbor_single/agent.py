@@ -3,20 +3,33 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 from pydantic_ai import Agent
-from pydantic_ai.mcp import MCPServerStreamableHTTP
 
-from agent.constants import DEFAULT_MODEL, create_model, wrap_output_type
+from agent.agent_registry import AGENT_REGISTRY, AgentKey
+from agent.constants import (
+    DEFAULT_MODEL,
+    create_model,
+    create_prompt_cache_settings,
+    wrap_output_type,
+)
 from agent.neighbor import NeighborAnalysisResult
+from agent.neighbor.contact_graph import latest_contact_findings
+from agent.neighbor.diplomacy_events import (
+    build_diplomacy_event_log,
+    create_diplomacy_toolset,
+)
+from agent.neighbor.distance_matrix import (
+    create_distance_toolset,
+    latest_distance_matrix,
+)
 from agent.neighbor_single.prompts import (
     build_analysis_prompt,
     build_system_prompt,
 )
-from agent.settings import (
-    MCP_TIMEOUT_SECONDS,
-    Settings,
-    create_resilient_http_client,
-    get_settings,
-)
+from agent.sandbox_data import build_neighbor_data, create_sandbox_server
+from agent.sandbox_scripts.tools import create_script_toolset
+from agent.settings import Settings, get_settings
+
+NEIGHBOR_SINGLE_AGENT = "neighbor_single_agent"
 
 
 @dataclass
@@ -27,19 +40,18 @@ class NeighborSingleAgentDeps:
 
 
 def create_single_agent(
-    mcp_server: MCPServerStreamableHTTP,
     model_name: str,
-    settings: Settings | None = None,
 ) -> Agent[NeighborSingleAgentDeps, NeighborAnalysisResult]:
-    if settings is None:
-        settings = get_settings()
     return Agent(
         create_model(model_name),
         deps_type=NeighborSingleAgentDeps,
         output_type=wrap_output_type(NeighborAnalysisResult),
-        system_prompt=build_system_prompt(settings.graphql_url),
-        toolsets=[mcp_server],
-        name="neighbor_single_agent",
+        system_prompt=AGENT_REGISTRY.get_prompt(
+            NEIGHBOR_SINGLE_AGENT,
+            build_system_prompt,
+        ),
+        model_settings=create_prompt_cache_settings(model_name, NEIGHBOR_SINGLE_AGENT),
+        name=NEIGHBOR_SINGLE_AGENT,
     )
 
 
@@ -63,21 +75,47 @@ async def run_neighbor_single_agent_analysis(
 
     actual_model = model_name or DEFAULT_MODEL
 
-    http_client = create_resilient_http_client(MCP_TIMEOUT_SECONDS)
-    mcp_server = MCPServerStreamableHTTP(settings.sandbox_url, http_client=http_client)
-
     try:
+        async with settings.create_graphql_client() as client:
+            neighbor_data = await client.get_neighbor_data(filename=save_filename)
+        data = build_neighbor_data(neighbor_data, save_filename)
+        diplomacy_events = build_diplomacy_event_log(neighbor_data)
+        distances = latest_distance_matrix(neighbor_data, save_filename)
+        contact_findings = latest_contact_findings(
+            neighbor_data,
+            save_filename,
+            distances,
+        )
+        mcp_server = create_sandbox_server(settings, data)
+
         async with mcp_server:
             deps = create_deps(settings)
-            prompt = build_analysis_prompt(save_filename, deps.graphql_url)
-            agent = create_single_agent(mcp_server, actual_model, settings)
+            prompt = build_analysis_prompt(save_filename)
+            agent = AGENT_REGISTRY.get_agent(
+                AgentKey(NEIGHBOR_SINGLE_AGENT, actual_model, deps.graphql_url),
+                create_single_agent,
+            )
 
             result = await agent.run(
                 prompt,
                 deps=deps,
+                toolsets=[
+                    mcp_server,
+                    create_script_toolset(mcp_server, data),
+                    create_diplomacy_toolset(diplomacy_events),
+                    create_distance_toolset(distances),
+                ],
             )
 
-            return result.output
+            # Graph findings are computed, not left to the model
+            return result.output.model_copy(
+                update={
+                    "key_findings": [
+                        *result.output.key_findings,
+                        *contact_findings,
+                    ],
+                },
+            )
     except Exception as e:
         raise NeighborAnalysisError(
             f"Failed to analyze neighbors for save '{save_filename}': {e}",
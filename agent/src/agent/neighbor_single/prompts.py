@@ -1,4 +1,18 @@
-def build_system_prompt(graphql_url: str) -> str:
+from agent.neighbor.diplomacy_events import build_diplomacy_events_prompt_section
+from agent.neighbor.distance_matrix import build_distance_prompt_section
+from agent.sandbox_data import (
+    SANDBOX_DATA_VARIABLE,
+    build_neighbor_data_prompt_section,
+)
+from agent.sandbox_scripts import build_script_prompt_section
+
+
+def build_system_prompt() -> str:
+    script_section = build_script_prompt_section(["neighbor_distances"])
+    data_section = build_neighbor_data_prompt_section()
+    history_section = build_diplomacy_events_prompt_section()
+    distance_section = build_distance_prompt_section()
+
     return f"""You are a Stellaris game statistics analyst specializing in diplomatic relations and neighbor analysis.
 
 Your task is to analyze a save file and identify:
@@ -6,74 +20,32 @@ Your task is to analyze a save file and identify:
 2. Each neighbor's opinion of the player
 3. Key diplomatic findings (hostile neighbors, genocidal reputation, etc.)
 
-## Your Workflow
+{script_section}
+
+## Your Workflow for Custom Code
 
 1. Call the `run_python_code` tool with a single argument named `python_code` containing your Python code as a string
-2. The code must fetch data from the GraphQL API and perform all analysis
-3. Return ONLY the final JSON result (never print raw API data)
+2. The code must read the data from `{SANDBOX_DATA_VARIABLE}` and perform all analysis
+3. Return ONLY the final JSON result (never print raw data)
 
 IMPORTANT: When calling the tool, you MUST provide the `python_code` argument. Example tool call format:
 - Tool: run_python_code
-- Argument: python_code = "import httpx; print('hello')"
-
-## GraphQL API
-
-URL: {graphql_url}
-
-### Query: Get Neighbor Analysis Data
-```graphql
-query GetNeighborData($filename: String!) {{
-  save(filename: $filename) {{
-    gamestates {{
-      date
-      playerEmpire {{
-        countryId
-        name
-        ownedPlanetIds
-        ownedPlanetCount
-      }}
-      empires {{
-        countryId
-        name
-        ownedPlanetIds
-        ownedPlanetCount
-        militaryPower
-        economyPower
-        techPower
-      }}
-      diplomaticRelations {{
-        targetCountryId
-        targetEmpireName
-        opinion
-        trust
-        threat
-        isHostile
-        borderRange
-        hasContact
-        hasCommunications
-        opinionModifiers {{
-          modifierType
-          value
-        }}
-      }}
-      allPlanetCoordinates {{
-        planetId
-        x
-        y
-      }}
-    }}
-  }}
-}}
-```
+- Argument: python_code = "print({SANDBOX_DATA_VARIABLE}['neighbors']['date'])"
+
+{data_section}
+
+{history_section}
+
+{distance_section}
 
 ## Analysis Algorithm
 
-### Step 1: Fetch Data
-- Fetch the latest gamestate for the save file
+### Step 1: Read Data
+- Read the latest gamestate from `{SANDBOX_DATA_VARIABLE}["neighbors"]`
 - Extract player empire, all empires, diplomatic relations, and planet coordinates
 
 ### Step 2: Build Planet Coordinate Lookup
-Create a dictionary mapping planet_id → (x, y) from allPlanetCoordinates
+Create a dictionary mapping planet_id → (x, y) from planet_coordinates
 
 ### Step 3: Calculate Distances to Each Empire
 For each empire (excluding player):
@@ -83,11 +55,11 @@ For each empire (excluding player):
    ```python
    min_distance = float('inf')
    for player_planet_id in player_planet_ids:
-       player_coords = coord_lookup.get(str(player_planet_id))
+       player_coords = coord_lookup.get(player_planet_id)
        if not player_coords:
            continue
        for target_planet_id in target_planet_ids:
-           target_coords = coord_lookup.get(str(target_planet_id))
+           target_coords = coord_lookup.get(target_planet_id)
            if not target_coords:
                continue
            distance = sqrt((player_coords[0] - target_coords[0])**2 +
@@ -96,7 +68,7 @@ For each empire (excluding player):
    ```
 
 ### Step 4: Get Diplomatic Relation for Each Empire
-Match each empire by countryId with diplomaticRelations (targetCountryId)
+Match each empire by country_id with diplomatic_relations (target_country_id)
 
 ### Step 5: Sort by Distance and Build Neighbor List
 - Sort empires by minimum distance (ascending)
@@ -105,7 +77,7 @@ Match each empire by countryId with diplomaticRelations (targetCountryId)
 ### Step 6: Detect Key Findings
 
 #### Finding Types:
-- `hostile_neighbor`: Any neighbor with isHostile=true
+- `hostile_neighbor`: Any neighbor with is_hostile=true
   - Severity: CRITICAL
 - `genocidal_reputation`: Player has "genocidal" modifier with any neighbor
   - Severity: WARNING
@@ -153,24 +125,22 @@ Your code MUST print exactly ONE JSON object matching this structure:
 ## CRITICAL RULES
 
 1. Print ONLY the final JSON result - never print intermediate data or debug info
-2. The GraphQL response can be large - process it in memory, do not print it
-3. Use httpx for HTTP requests (available in sandbox)
+2. Process `{SANDBOX_DATA_VARIABLE}` in memory, do not print it
+3. Do not make HTTP requests - all data is already preloaded
 4. Handle null/missing values gracefully (use None or default values)
 5. Sort neighbors by min_distance ascending
-6. Include only empires that have at least one planet (ownedPlanetCount > 0)
+6. Include only empires that have at least one planet (owned_planet_count > 0)
 7. If player has no planets, return empty neighbors list
 
 ## Example Code Structure
 
 ```python
-import httpx
 import json
 from math import sqrt
 
-GRAPHQL_URL = "{graphql_url}"
-SAVE_FILENAME = "{{save_filename}}"  # Will be provided in the prompt
+data = {SANDBOX_DATA_VARIABLE}["neighbors"]
 
-# 1. Fetch data from GraphQL
+# 1. Turn the column-oriented tables into rows
 # 2. Build planet coordinate lookup
 # 3. Calculate distances to each empire
 # 4. Match with diplomatic relations
@@ -180,13 +150,13 @@ SAVE_FILENAME = "{{save_filename}}"  # Will be provided in the prompt
 """
 
 
-def build_analysis_prompt(save_filename: str, graphql_url: str) -> str:
+def build_analysis_prompt(save_filename: str) -> str:
     return f"""Analyze the neighbors for save '{save_filename}'.
 
-GraphQL API URL: {graphql_url}
+The latest gamestate is preloaded in `{SANDBOX_DATA_VARIABLE}`.
 
 Instructions:
-1. Fetch the latest gamestate data using the GraphQL API
+1. Read the latest gamestate data
 2. Calculate minimum planet-to-planet distances to each empire
 3. Get diplomatic relations (opinion, trust, threat, modifiers) for each neighbor
 4. Sort neighbors by distance (closest first)
@@ -0,0 +1,188 @@
+"""Planet-level drill-down of a resource drop.
+
+Root cause analysis explains a drop by budget category. This breaks the
+same drop down by planet, from the per-planet `profits` of the two
+gamestates the drop spans. Gamestates cannot be selected by date, so one
+query pruned to the dropped resources fetches every gamestate's planets for
+all drops of an analysis, and only the drops' dates are kept while parsing.
+"""
+
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+from datetime import date
+from typing import TYPE_CHECKING, Any
+
+from agent.analysis_config import PLANET_DRILLDOWN_TOP_K, RESOURCE_FIELDS
+from agent.dates import parse_gamestate_date
+from agent.models import PlanetDrillDown, PlanetImpact
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterator, Mapping, Sequence
+
+    from agent.budget_query import GraphQLExecutor
+    from agent.models import SuddenDrop
+
+PLANET_PROFITS_OPERATION = "GetPlanetProfits"
+
+
+@dataclass(frozen=True)
+class PlanetBalance:
+    """One planet's income, expenses and balance of a single resource."""
+
+    planet_name: str
+    income: float
+    expenses: float
+    balance: float
+
+
+_NO_PLANET = PlanetBalance(planet_name="", income=0.0, expenses=0.0, balance=0.0)
+
+type PlanetBalances = dict[int, PlanetBalance]
+# Planet balances by resource, then by gamestate date
+type PlanetProfits = dict[str, dict[date, PlanetBalances]]
+
+
+def build_planet_profits_query(resources: Sequence[str]) -> str:
+    """Build a query for the profits of every planet in the given resources."""
+    for resource in resources:
+        if resource not in RESOURCE_FIELDS:
+            raise ValueError(f"Unknown budget resource: {resource}")
+    fields = " ".join(resources)
+    sections = " ".join(
+        f"{section} {{ {fields} }}" for section in ("income", "expenses", "balance")
+    )
+    return (
+        f"query {PLANET_PROFITS_OPERATION}($filename: String!) {{ "
+        "save(filename: $filename) { gamestates { date "
+        f"planets {{ planetId planetName profits {{ {sections} }} }} }} }} }}"
+    )
+
+
+def _value(entry: Mapping[str, Any] | None, resource: str) -> float:
+    if entry is None:
+        return 0.0
+    return float(entry.get(resource) or 0.0)
+
+
+def parse_planet_profits(
+    data: Mapping[str, Any],
+    resources: Collection[str],
+    dates: Collection[date],
+) -> PlanetProfits:
+    """Parse a planet profits response, keeping only the gamestates on `dates`."""
+    save: dict[str, Any] | None = data.get("save")
+    if save is None:
+        raise ValueError("Save not found")
+
+    profits: PlanetProfits = {resource: {} for resource in resources}
+    gamestates: list[dict[str, Any]] = save["gamestates"]
+    for gamestate in gamestates:
+        gamestate_date = parse_gamestate_date(gamestate["date"])
+        if gamestate_date not in dates:
+            continue
+        planets: list[dict[str, Any]] = gamestate["planets"]
+        for resource, balances in profits.items():
+            balances[gamestate_date] = {
+                planet["planetId"]: PlanetBalance(
+                    planet_name=planet["planetName"],
+                    income=_value(planet["profits"]["income"], resource),
+                    expenses=_value(planet["profits"]["expenses"], resource),
+                    balance=_value(planet["profits"]["balance"], resource),
+                )
+                for planet in planets
+            }
+    return profits
+
+
+def rank_planet_impacts(
+    before: Mapping[int, PlanetBalance],
+    after: Mapping[int, PlanetBalance],
+    top_k: int = PLANET_DRILLDOWN_TOP_K,
+) -> list[PlanetImpact]:
+    """Return the `top_k` planets whose balance fell the most, ranked from 1.
+
+    Planets present on only one date count as zero on the other, so lost
+    planets show up with their whole former balance. The planets are
+    selected with a heap instead of sorting every planet of the empire.
+    """
+
+    def declines() -> Iterator[tuple[float, int]]:
+        for planet_id in before.keys() | after.keys():
+            change = (
+                after.get(planet_id, _NO_PLANET).balance
+                - before.get(planet_id, _NO_PLANET).balance
+            )
+            if change < 0:
+                yield change, planet_id
+
+    impacts: list[PlanetImpact] = []
+    for rank, (change, planet_id) in enumerate(
+        heapq.nsmallest(top_k, declines()),
+        start=1,
+    ):
+        start = before.get(planet_id, _NO_PLANET)
+        end = after.get(planet_id, _NO_PLANET)
+        impacts.append(
+            PlanetImpact(
+                planet_id=planet_id,
+                planet_name=end.planet_name or start.planet_name,
+                before_balance=start.balance,
+                after_balance=end.balance,
+                change_absolute=-change,
+                income_change=end.income - start.income,
+                expenses_change=end.expenses - start.expenses,
+                rank=rank,
+            ),
+        )
+    return impacts
+
+
+async def fetch_planet_profits(
+    client: GraphQLExecutor,
+    save_filename: str,
+    drops: Sequence[SuddenDrop],
+) -> PlanetProfits:
+    """Fetch the planet profits every budget drop of an analysis needs.
+
+    The schema has no gamestate filter, so this downloads every planet of
+    every gamestate; it is meant to be called once per analysis and shared
+    by its drops.
+    """
+    resources = sorted({d.resource for d in drops if d.resource in RESOURCE_FIELDS})
+    if not resources:
+        return {}
+    dates = {
+        parse_gamestate_date(value)
+        for drop in drops
+        for value in (drop.start_date, drop.end_date)
+    }
+    response = await client.execute(
+        query=build_planet_profits_query(resources),
+        operation_name=PLANET_PROFITS_OPERATION,
+        variables={"filename": save_filename},
+    )
+    return parse_planet_profits(client.get_data(response), resources, dates)
+
+
+def drill_down_drop(
+    profits: PlanetProfits,
+    drop: SuddenDrop,
+    top_k: int = PLANET_DRILLDOWN_TOP_K,
+) -> PlanetDrillDown:
+    """Find the planets that contributed most to `drop`."""
+    start = parse_gamestate_date(drop.start_date)
+    end = parse_gamestate_date(drop.end_date)
+    balances = profits.get(drop.resource, {})
+    for missing in (start, end):
+        if missing not in balances:
+            raise ValueError(f"No {drop.resource} profits on {missing}")
+
+    return PlanetDrillDown(
+        resource=drop.resource,
+        start_date=drop.start_date,
+        end_date=drop.end_date,
+        planets_compared=len(balances[start].keys() | balances[end].keys()),
+        top_planets=rank_planet_impacts(balances[start], balances[end], top_k),
+    )
@@ -0,0 +1,265 @@
+"""Power trajectories of every empire across the history of a save.
+
+Military, economy and tech power are loaded into one dense empire x date
+matrix per metric, with NaN where an empire did not exist yet or had no
+value. Growth rates, rank changes and the snapshots where a rival overtook
+the player are then read from the matrices without any model calls.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from agent.analysis_config import POWER_TREND_WINDOW
+from agent.drop_detection import MIN_BASELINE_VALUE
+from agent.models import (
+    EmpirePowerTrend,
+    OutpacingEvent,
+    PowerMetric,
+    PowerTrendsResult,
+)
+from agent.settings import get_settings
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from agent.graphql_client import GetEmpirePower
+    from agent.native_budget.tools import GraphQLClientProtocol
+    from agent.settings import Settings
+
+type PowerRow = list[float]
+
+_METRIC_FIELDS: dict[PowerMetric, str] = {
+    PowerMetric.MILITARY: "military_power",
+    PowerMetric.ECONOMY: "economy_power",
+    PowerMetric.TECH: "tech_power",
+}
+
+
+@dataclass
+class PowerMatrix:
+    """Power of every empire at every date; rows follow `country_ids`."""
+
+    dates: list[str]
+    country_ids: list[str]
+    names: list[str]
+    player_index: int | None
+    values: dict[PowerMetric, list[PowerRow]]
+
+
+def build_power_matrix(power: GetEmpirePower, save_filename: str) -> PowerMatrix:
+    """Pivot per-gamestate empire lists into one empire x date matrix per metric."""
+    if power.save is None:
+        raise ValueError(f"Save '{save_filename}' not found")
+
+    gamestates = sorted(power.save.gamestates, key=lambda gs: gs.date)
+    rows: dict[str, int] = {}
+    names: list[str] = []
+    player_index: int | None = None
+    for gamestate in gamestates:
+        for empire in gamestate.empires:
+            index = rows.setdefault(empire.country_id, len(rows))
+            # Latest name wins, empires can be renamed
+            if index == len(names):
+                names.append(empire.name)
+            else:
+                names[index] = empire.name
+            if empire.is_player:
+                player_index = index
+
+    values: dict[PowerMetric, list[PowerRow]] = {
+        metric: [[math.nan] * len(gamestates) for _ in rows] for metric in PowerMetric
+    }
+    for column, gamestate in enumerate(gamestates):
+        for empire in gamestate.empires:
+            row = rows[empire.country_id]
+            for metric, field in _METRIC_FIELDS.items():
+                value: float | None = getattr(empire, field)
+                if value is not None:
+                    values[metric][row][column] = value
+
+    return PowerMatrix(
+        dates=[str(gs.date) for gs in gamestates],
+        country_ids=list(rows),
+        names=names,
+        player_index=player_index,
+        values=values,
+    )
+
+
+def _first_valid(row: PowerRow) -> float | None:
+    for value in row:
+        if not math.isnan(value):
+            return value
+    return None
+
+
+def _growth_percent(start: float, end: float) -> float | None:
+    if abs(start) < MIN_BASELINE_VALUE:
+        return None
+    return (end - start) / abs(start) * 100
+
+
+def rank_empires(rows: Sequence[PowerRow], column: int) -> list[int | None]:
+    """Rank of every empire at `column`, 1 being the strongest; None without a value."""
+    present = [index for index, row in enumerate(rows) if not math.isnan(row[column])]
+    present.sort(key=lambda index: -rows[index][column])
+    ranks: list[int | None] = [None] * len(rows)
+    for rank, index in enumerate(present, start=1):
+        ranks[index] = rank
+    return ranks
+
+
+def compute_power_trends(
+    matrix: PowerMatrix,
+    window: int = POWER_TREND_WINDOW,
+) -> list[EmpirePowerTrend]:
+    """Growth and rank change of every empire in every metric over the last `window` snapshots."""
+    if window < 1:
+        raise ValueError(f"Window must be at least 1, got {window}")
+    if not matrix.dates:
+        return []
+
+    end = len(matrix.dates) - 1
+    start = max(end - window, 0)
+    trends: list[EmpirePowerTrend] = []
+    for metric, rows in matrix.values.items():
+        end_ranks = rank_empires(rows, end)
+        start_ranks = rank_empires(rows, start)
+        for index, row in enumerate(rows):
+            current = None if math.isnan(row[end]) else row[end]
+            first = _first_valid(row)
+            window_start = None if math.isnan(row[start]) else row[start]
+            end_rank = end_ranks[index]
+            start_rank = start_ranks[index]
+            trends.append(
+                EmpirePowerTrend(
+                    country_id=matrix.country_ids[index],
+                    name=matrix.names[index],
+                    is_player=index == matrix.player_index,
+                    metric=metric,
+                    current_value=current,
+                    current_rank=end_rank,
+                    rank_change=(
+                        start_rank - end_rank
+                        if start_rank is not None and end_rank is not None
+                        else None
+                    ),
+                    recent_growth_percent=(
+                        _growth_percent(window_start, current)
+                        if window_start is not None and current is not None
+                        else None
+                    ),
+                    total_growth_percent=(
+                        _growth_percent(first, current)
+                        if first is not None and current is not None
+                        else None
+                    ),
+                ),
+            )
+
+    trends.sort(
+        key=lambda t: (
+            list(PowerMetric).index(t.metric),
+            t.current_rank is None,
+            t.current_rank or 0,
+        ),
+    )
+    return trends
+
+
+def find_outpacing_events(matrix: PowerMatrix) -> list[OutpacingEvent]:
+    """Snapshots where a rival went from at most the player's power to above it, newest first."""
+    player = matrix.player_index
+    if player is None:
+        return []
+
+    events: list[OutpacingEvent] = []
+    for metric, rows in matrix.values.items():
+        player_row = rows[player]
+        for index, row in enumerate(rows):
+            if index == player:
+                continue
+            previous_ahead: bool | None = None
+            for column, (rival_value, player_value) in enumerate(
+                zip(row, player_row, strict=True),
+            ):
+                # NaN comparisons are always False, so gaps reset the crossing
+                if math.isnan(rival_value) or math.isnan(player_value):
+                    previous_ahead = None
+                    continue
+                ahead = rival_value > player_value
+                if ahead and previous_ahead is False:
+                    events.append(
+                        OutpacingEvent(
+                            date=matrix.dates[column],
+                            country_id=matrix.country_ids[index],
+                            name=matrix.names[index],
+                            metric=metric,
+                            rival_value=rival_value,
+                            player_value=player_value,
+                        ),
+                    )
+                previous_ahead = ahead
+
+    events.sort(key=lambda e: (e.date, e.metric, e.country_id), reverse=True)
+    return events
+
+
+async def run_power_trends_analysis(
+    save_filename: str,
+    client: GraphQLClientProtocol | None = None,
+    window: int = POWER_TREND_WINDOW,
+    settings: Settings | None = None,
+) -> PowerTrendsResult:
+    """Fetch empire power of every gamestate and compute the trajectories."""
+    if client is None:
+        if settings is None:
+            settings = get_settings()
+        async with settings.create_graphql_client() as graphql_client:
+            power = await graphql_client.get_empire_power(filename=save_filename)
+    else:
+        power = await client.get_empire_power(filename=save_filename)
+
+    matrix = build_power_matrix(power, save_filename)
+    trends = compute_power_trends(matrix, window)
+    events = find_outpacing_events(matrix)
+    return PowerTrendsResult(
+        save_filename=save_filename,
+        history_start=matrix.dates[0] if matrix.dates else "",
+        history_end=matrix.dates[-1] if matrix.dates else "",
+        gamestates_scanned=len(matrix.dates),
+        empires_tracked=len(matrix.country_ids),
+        player_country_id=(
+            matrix.country_ids[matrix.player_index]
+            if matrix.player_index is not None
+            else None
+        ),
+        window=window,
+        trends=trends,
+        outpacing_events=events,
+        summary=summarize_power_trends(trends, events),
+    )
+
+
+def summarize_power_trends(
+    trends: Sequence[EmpirePowerTrend],
+    events: Sequence[OutpacingEvent],
+) -> str:
+    player_ranks = [
+        f"{t.metric} #{t.current_rank}"
+        for t in trends
+        if t.is_player and t.current_rank is not None
+    ]
+    summary = (
+        f"Player ranks: {', '.join(player_ranks)}."
+        if player_ranks
+        else "No player empire found."
+    )
+    summary += f" {len(events)} time(s) a rival overtook the player."
+    if events:
+        latest = events[0]
+        summary += f" Latest: {latest.name} in {latest.metric} power on {latest.date}."
+    return summary
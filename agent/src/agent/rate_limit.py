@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, override
+
+import httpx
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_ai.messages import ModelMessagesTypeAdapter
+from pydantic_ai.models.wrapper import WrapperModel
+
+if TYPE_CHECKING:
+    from pydantic_ai.messages import ModelMessage, ModelResponse
+    from pydantic_ai.models import Model, ModelRequestParameters
+    from pydantic_ai.settings import ModelSettings
+
+type Clock = Callable[[], float]
+type Sleep = Callable[[float], Awaitable[None]]
+
+# Rough characters-per-token ratio used to reserve tokens before a request
+CHARS_PER_TOKEN = 4
+MAX_RATE_LIMIT_RETRIES = 3
+DEFAULT_RETRY_AFTER_SECONDS = 10.0
+
+
+@dataclass(frozen=True)
+class RateLimits:
+    requests_per_minute: int
+    tokens_per_minute: int
+
+
+class TokenBucket:
+    """Bucket that refills its full capacity once per minute.
+
+    The level may go negative when actual usage exceeds the reservation; the
+    debt is paid back before the next reservation is admitted.
+    """
+
+    def __init__(self, per_minute: int, clock: Clock) -> None:
+        super().__init__()
+        self.capacity = float(per_minute)
+        self.level = self.capacity
+        self.refill_per_second = self.capacity / 60
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated
+        self.level = min(self.capacity, self.level + elapsed * self.refill_per_second)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` can be consumed; amounts above capacity wait for a full bucket."""
+        self._refill()
+        missing = min(amount, self.capacity) - self.level
+        return max(missing, 0.0) / self.refill_per_second
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self.level -= amount
+
+
+@dataclass
+class RateLimiterStats:
+    """Queue metrics of one rate limiter."""
+
+    requests: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    delayed_requests: int = 0
+    total_wait_seconds: float = 0.0
+    rate_limited_responses: int = 0
+
+
+class RateLimiter:
+    """Admit model requests in arrival order within RPM and TPM limits.
+
+    Waiters queue on a FIFO lock, so a request that has to wait for capacity
+    holds back later requests instead of being starved by smaller ones.
+    """
+
+    def __init__(
+        self,
+        limits: RateLimits,
+        clock: Clock = time.monotonic,
+        sleep: Sleep = asyncio.sleep,
+    ) -> None:
+        super().__init__()
+        self.limits = limits
+        self.stats = RateLimiterStats()
+        self._requests = TokenBucket(limits.requests_per_minute, clock)
+        self._tokens = TokenBucket(limits.tokens_per_minute, clock)
+        self._lock = asyncio.Lock()
+        self._clock = clock
+        self._sleep = sleep
+        self._paused_until = 0.0
+
+    def _wait_time(self, tokens: int) -> float:
+        return max(
+            self._paused_until - self._clock(),
+            self._requests.wait_time(1),
+            self._tokens.wait_time(tokens),
+        )
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait for a request slot and reserve `tokens` tokens."""
+        stats = self.stats
+        stats.requests += 1
+        stats.queue_depth += 1
+        stats.max_queue_depth = max(stats.max_queue_depth, stats.queue_depth)
+        started = self._clock()
+        # Only requests that had to sleep count as delayed; the lock and the
+        # bookkeeping always take a little time on a real clock
+        slept = False
+        try:
+            async with self._lock:
+                while (wait := self._wait_time(tokens)) > 0:
+                    slept = True
+                    await self._sleep(wait)
+                self._requests.consume(1)
+                self._tokens.consume(tokens)
+        finally:
+            stats.queue_depth -= 1
+
+        if slept:
+            stats.delayed_requests += 1
+            stats.total_wait_seconds += self._clock() - started
+
+    def settle(self, reserved: int, used: int) -> None:
+        """Correct a reservation once the actual token usage is known."""
+        self._tokens.consume(used - reserved)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every queued request back after the provider rejected one."""
+        self.stats.rate_limited_responses += 1
+        self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+@dataclass
+class RateLimiterRegistry:
+    """Process-wide rate limiters, one per model."""
+
+    limiters: dict[str, RateLimiter] = field(
+        default_factory=dict[str, RateLimiter],
+    )
+
+    def get(self, model_name: str, limits: RateLimits) -> RateLimiter:
+        limiter = self.limiters.get(model_name)
+        if limiter is None:
+            limiter = RateLimiter(limits)
+            self.limiters[model_name] = limiter
+        return limiter
+
+
+# Shared by every model created in this process, reported by the CLI
+RATE_LIMITERS = RateLimiterRegistry()
+
+
+def estimate_tokens(messages: list[ModelMessage]) -> int:
+    """Estimate the input tokens of a request from its serialized messages."""
+    return len(ModelMessagesTypeAdapter.dump_json(messages)) // CHARS_PER_TOKEN
+
+
+def retry_after_seconds(error: ModelHTTPError) -> float | None:
+    """Read `retry-after-ms` or `Retry-After` from the provider's error response."""
+    response = getattr(error.__cause__, "response", None)
+    if not isinstance(response, httpx.Response):
+        return None
+
+    retry_after_ms: str | None = response.headers.get("retry-after-ms")
+    if retry_after_ms is not None:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    value: str | None = response.headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except ValueError:
+        return None
+    return max((retry_at - datetime.now(UTC)).total_seconds(), 0.0)
+
+
+class RateLimitedModel(WrapperModel):
+    """Send requests through a rate limiter and retry after provider 429s."""
+
+    def __init__(self, wrapped: Model, limiter: RateLimiter) -> None:
+        super().__init__(wrapped)
+        self.limiter = limiter
+
+    @override
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        reserved = estimate_tokens(messages)
+        attempt = 0
+        while True:
+            await self.limiter.acquire(reserved)
+            try:
+                response = await super().request(
+                    messages,
+                    model_settings,
+                    model_request_parameters,
+                )
+            except ModelHTTPError as e:
+                self.limiter.settle(reserved, 0)
+                if e.status_code != 429 or attempt >= MAX_RATE_LIMIT_RETRIES:
+                    raise
+                attempt += 1
+                delay = retry_after_seconds(e)
+                self.limiter.pause(
+                    delay if delay is not None else DEFAULT_RETRY_AFTER_SECONDS,
+                )
+                continue
+
+            usage = response.usage
+            self.limiter.settle(reserved, usage.input_tokens + usage.output_tokens)
+            return response
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+from pydantic import BaseModel, ValidationError
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 256
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analysis_results (
+    cache_key TEXT PRIMARY KEY,
+    result_type TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS analysis_results_accessed_idx
+    ON analysis_results (accessed_at);
+"""
+
+
+def build_cache_key(
+    analysis_type: str,
+    model_name: str,
+    prompts: Sequence[str],
+    gamestate_keys: Sequence[str],
+) -> str:
+    """Hash everything that determines an analysis result into a cache key.
+
+    Prompts are hashed in order, so any change to a prompt builder's output
+    invalidates previously cached results. Gamestate keys (dates or IDs) are
+    sorted, so a new snapshot in the save also produces a new key.
+    """
+    prompt_hash = hashlib.sha256()
+    for prompt in prompts:
+        prompt_hash.update(prompt.encode())
+        prompt_hash.update(b"\0")
+
+    material = json.dumps(
+        {
+            "analysis_type": analysis_type,
+            "model": model_name,
+            "prompts": prompt_hash.hexdigest(),
+            "gamestates": sorted(gamestate_keys),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+class ResultCache:
+    """Persistent SQLite cache for analysis results with TTL and LRU eviction."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        super().__init__()
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def get[T: BaseModel](self, key: str, result_type: type[T]) -> T | None:
+        """Return the cached result for a key, or None if missing or expired."""
+        row = self._conn.execute(
+            """
+            SELECT result_type, payload, created_at
+            FROM analysis_results
+            WHERE cache_key = ?
+            """,
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        now = self._clock()
+        if row[0] != result_type.__name__ or now - float(row[2]) > self.ttl_seconds:
+            self.invalidate(key)
+            return None
+
+        try:
+            result = result_type.model_validate_json(str(row[1]))
+        except ValidationError:
+            # Stored payload predates a model change
+            self.invalidate(key)
+            return None
+
+        with self._conn:
+            self._conn.execute(
+                "UPDATE analysis_results SET accessed_at = ? WHERE cache_key = ?",
+                (now, key),
+            )
+        return result
+
+    def put(self, key: str, result: BaseModel) -> None:
+        """Store a result, then evict expired and least recently used entries."""
+        now = self._clock()
+        with self._conn:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO analysis_results
+                    (cache_key, result_type, payload, created_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (key, type(result).__name__, result.model_dump_json(), now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM analysis_results WHERE created_at < ?",
+                (now - self.ttl_seconds,),
+            )
+            self._conn.execute(
+                """
+                DELETE FROM analysis_results
+                WHERE cache_key NOT IN (
+                    SELECT cache_key FROM analysis_results
+                    ORDER BY accessed_at DESC
+                    LIMIT ?
+                )
+                """,
+                (self.max_entries,),
+            )
+
+    def invalidate(self, key: str) -> None:
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM analysis_results WHERE cache_key = ?",
+                (key,),
+            )
+
+    def __len__(self) -> int:
+        row = self._conn.execute("SELECT COUNT(*) FROM analysis_results").fetchone()
+        return int(row[0])
@@ -11,6 +11,7 @@ from agent.root_cause_multi.agent import (
 from agent.root_cause_multi.orchestrator import (
     create_drop_detection_agent,
     run_root_cause_multi_agent_orchestration,
+    stream_root_cause_multi_agent_orchestration,
 )
 from agent.root_cause_multi.root_cause_agent import (
     RootCauseAgentDeps,
@@ -32,4 +33,5 @@ __all__ = [
     "run_root_cause_analysis",
     "run_root_cause_multi_agent_analysis",
     "run_root_cause_multi_agent_orchestration",
+    "stream_root_cause_multi_agent_orchestration",
 ]
@@ -1,17 +1,41 @@
 from __future__ import annotations
 
+import asyncio
+from collections.abc import AsyncGenerator, Sequence
+from contextlib import aclosing
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 from pydantic_ai import Agent
-from pydantic_ai.mcp import MCPServerStreamableHTTP
 
-from agent.constants import DEFAULT_MODEL, create_model, wrap_output_type
+from agent.agent_registry import AGENT_REGISTRY, AgentKey
+from agent.analysis_config import RESOURCE_FIELDS
+from agent.budget_query import BudgetSection, BudgetSelection, GraphQLExecutor
+from agent.category_movers import rank_drop_categories
+from agent.constants import (
+    DEFAULT_MODEL,
+    create_model,
+    create_prompt_cache_settings,
+    wrap_output_type,
+)
+from agent.forecast import fetch_optional_depletion_forecasts
 from agent.models import (
+    DropAnalyzedEvent,
+    DropDetectionEvent,
+    MultiAgentAnalysisCompleteEvent,
+    MultiAgentAnalysisEvent,
     MultiAgentAnalysisResult,
+    PlanetDrillDown,
+    ResourceForecast,
     SuddenDrop,
     SuddenDropAnalysisResult,
     SuddenDropWithRootCause,
 )
+from agent.planet_drilldown import (
+    PlanetProfits,
+    drill_down_drop,
+    fetch_planet_profits,
+)
 from agent.root_cause_multi.prompts import (
     build_analysis_prompt,
     build_system_prompt,
@@ -20,12 +44,20 @@ from agent.root_cause_multi.root_cause_agent import (
     create_root_cause_deps,
     run_root_cause_analysis,
 )
-from agent.settings import (
-    MCP_TIMEOUT_SECONDS,
-    Settings,
-    create_resilient_http_client,
-    get_settings,
+from agent.sandbox_data import (
+    SandboxData,
+    create_sandbox_server,
+    fetch_budget_data,
+    fetch_selected_budget_data,
 )
+from agent.settings import Settings, get_settings
+
+if TYPE_CHECKING:
+    from pydantic_ai.mcp import MCPServerStreamableHTTP
+
+DROP_DETECTION_AGENT = "drop_detection_agent"
+# Root cause analysis compares income and expenses of the dropped resource only
+ROOT_CAUSE_SECTIONS: tuple[BudgetSection, ...] = ("income", "expenses")
 
 
 @dataclass
@@ -34,19 +66,18 @@ class RootCauseMultiAgentDeps:
 
 
 def create_drop_detection_agent(
-    mcp_server: MCPServerStreamableHTTP,
     model_name: str,
-    settings: Settings | None = None,
 ) -> Agent[RootCauseMultiAgentDeps, SuddenDropAnalysisResult]:
-    if settings is None:
-        settings = get_settings()
     return Agent(
         create_model(model_name),
         deps_type=RootCauseMultiAgentDeps,
         output_type=wrap_output_type(SuddenDropAnalysisResult),
-        system_prompt=build_system_prompt(settings.graphql_url),
-        toolsets=[mcp_server],
-        name="drop_detection_agent",
+        system_prompt=AGENT_REGISTRY.get_prompt(
+            DROP_DETECTION_AGENT,
+            build_system_prompt,
+        ),
+        model_settings=create_prompt_cache_settings(model_name, DROP_DETECTION_AGENT),
+        name=DROP_DETECTION_AGENT,
     )
 
 
@@ -56,105 +87,231 @@ def create_deps(settings: Settings | None = None) -> RootCauseMultiAgentDeps:
     return RootCauseMultiAgentDeps(graphql_url=settings.graphql_url)
 
 
+async def fetch_drop_budget_data(
+    client: GraphQLExecutor,
+    drop: SuddenDrop,
+    save_filename: str,
+) -> SandboxData | None:
+    """Fetch only the dropped resource's income and expenses.
+
+    Returns None when the resource is not a budget field, in which case the
+    shared sandbox is used.
+    """
+    if drop.resource not in RESOURCE_FIELDS:
+        return None
+    selection = BudgetSelection(
+        resources=(drop.resource,),
+        sections=ROOT_CAUSE_SECTIONS,
+    )
+    return await fetch_selected_budget_data(client, save_filename, selection)
+
+
+def expected_drop_categories(
+    data: SandboxData | None,
+    drop: SuddenDrop,
+) -> list[str] | None:
+    """Categories the budget data blames for a drop, used to cross-check a cheap model."""
+    if data is None:
+        return None
+    budget = data["budget"]
+    return rank_drop_categories(
+        budget["dates"],
+        {"income": budget["income"], "expenses": budget["expenses"]},
+        drop,
+    )
+
+
+async def fetch_drop_planet_profits(
+    client: GraphQLExecutor,
+    save_filename: str,
+    drops: Sequence[SuddenDrop],
+) -> PlanetProfits | None:
+    """Fetch the planet profits of every drop at once.
+
+    Returns None when the fetch fails; drill-downs are optional, so the
+    drops are still analyzed.
+    """
+    try:
+        return await fetch_planet_profits(client, save_filename, drops)
+    except Exception:
+        return None
+
+
+def planet_drilldown(
+    profits: PlanetProfits | None,
+    drop: SuddenDrop,
+) -> PlanetDrillDown | None:
+    """Break a drop down by planet.
+
+    Returns None when the profits could not be fetched, the resource is not
+    a budget field or the drop's dates do not match a gamestate.
+    """
+    if profits is None or drop.resource not in RESOURCE_FIELDS:
+        return None
+    try:
+        return drill_down_drop(profits, drop)
+    except ValueError:
+        return None
+
+
 async def analyze_single_drop(
     drop: SuddenDrop,
     save_filename: str,
+    client: GraphQLExecutor,
     mcp_server: MCPServerStreamableHTTP,
+    forecasts: list[ResourceForecast],
+    planet_profits: PlanetProfits | None,
     settings: Settings,
     model_name: str | None = None,
 ) -> SuddenDropWithRootCause:
     try:
-        result = await run_root_cause_analysis(
-            drop=drop,
-            save_filename=save_filename,
-            mcp_server=mcp_server,
-            deps=create_root_cause_deps(settings),
-            model_name=model_name,
-            settings=settings,
-        )
-        return SuddenDropWithRootCause(
-            drop=drop,
-            root_cause=result.output,
-            analysis_error=None,
+        data = await fetch_drop_budget_data(client, drop, save_filename)
+        drop_server = (
+            mcp_server if data is None else create_sandbox_server(settings, data)
         )
+        async with drop_server:
+            result = await run_root_cause_analysis(
+                drop=drop,
+                save_filename=save_filename,
+                mcp_server=drop_server,
+                forecasts=forecasts,
+                expected_categories=expected_drop_categories(data, drop),
+                deps=create_root_cause_deps(settings),
+                model_name=model_name,
+                settings=settings,
+            )
+        root_cause, analysis_error = result.output, None
     except Exception as e:
-        return SuddenDropWithRootCause(
-            drop=drop,
-            root_cause=None,
-            analysis_error=str(e),
+        root_cause, analysis_error = None, str(e)
+
+    return SuddenDropWithRootCause(
+        drop=drop,
+        root_cause=root_cause,
+        analysis_error=analysis_error,
+        planet_drilldown=planet_drilldown(planet_profits, drop),
+    )
+
+
+def build_multi_agent_result(
+    save_filename: str,
+    drop_analysis: SuddenDropAnalysisResult,
+    drops_with_causes: list[SuddenDropWithRootCause],
+) -> MultiAgentAnalysisResult:
+    successful_analyses = sum(1 for d in drops_with_causes if d.root_cause is not None)
+
+    summary_parts = [
+        f"Detected {len(drop_analysis.sudden_drops)} sudden drop(s).",
+    ]
+
+    if drop_analysis.sudden_drops:
+        summary_parts.append(
+            f"Successfully analyzed root causes for {successful_analyses}.",
         )
+        resources = [d.drop.resource for d in drops_with_causes]
+        summary_parts.append(f"Resources affected: {', '.join(resources)}")
+    else:
+        summary_parts.append("No drops to analyze.")
 
+    return MultiAgentAnalysisResult(
+        save_filename=save_filename,
+        analysis_period_start=drop_analysis.analysis_period_start,
+        analysis_period_end=drop_analysis.analysis_period_end,
+        datapoints_analyzed=drop_analysis.datapoints_analyzed,
+        drop_threshold_percent=drop_analysis.drop_threshold_percent,
+        drops_with_root_causes=drops_with_causes,
+        total_drops_detected=len(drop_analysis.sudden_drops),
+        successful_root_cause_analyses=successful_analyses,
+        summary=" ".join(summary_parts),
+    )
 
-async def run_root_cause_multi_agent_orchestration(
+
+async def stream_root_cause_multi_agent_orchestration(
     save_filename: str,
     settings: Settings | None = None,
     model_name: str | None = None,
-) -> MultiAgentAnalysisResult:
+) -> AsyncGenerator[MultiAgentAnalysisEvent]:
+    """Yield the drop detection result, then each analyzed drop, then the result."""
     if settings is None:
         settings = get_settings()
 
     actual_model = model_name or DEFAULT_MODEL
 
-    # Create a fresh MCP server for each analysis run to avoid stale connection issues
-    http_client = create_resilient_http_client(MCP_TIMEOUT_SECONDS)
-    mcp_server = MCPServerStreamableHTTP(settings.sandbox_url, http_client=http_client)
-
-    async with mcp_server:
-        # Phase 1: Run drop detection agent
-        deps = create_deps(settings)
-        prompt = build_analysis_prompt(save_filename, deps.graphql_url)
-        agent = create_drop_detection_agent(
-            mcp_server,
-            actual_model,
-            settings,
-        )
-
-        drop_result = await agent.run(
-            prompt,
-            deps=deps,
+    # One client serves the whole orchestration, so every drop shares its
+    # connections and coalesced requests
+    async with settings.create_graphql_client() as client:
+        # Fetch the budget once; every sandbox run of this orchestration reuses it
+        data, forecasts = await asyncio.gather(
+            fetch_budget_data(client, save_filename),
+            fetch_optional_depletion_forecasts(client, save_filename),
         )
 
-        drop_analysis = drop_result.output
+        # Create a fresh MCP server for each analysis run to avoid stale connection issues
+        mcp_server = create_sandbox_server(settings, data)
 
-        # Phase 2: Run root cause analysis for each drop
-        drops_with_causes: list[SuddenDropWithRootCause] = []
+        async with mcp_server:
+            # Phase 1: Run drop detection agent
+            deps = create_deps(settings)
+            prompt = build_analysis_prompt(save_filename)
+            agent = AGENT_REGISTRY.get_agent(
+                AgentKey(DROP_DETECTION_AGENT, actual_model, deps.graphql_url),
+                create_drop_detection_agent,
+            )
 
-        for drop in drop_analysis.sudden_drops:
-            result = await analyze_single_drop(
-                drop=drop,
-                save_filename=save_filename,
-                mcp_server=mcp_server,
-                settings=settings,
-                model_name=model_name,
+            drop_result = await agent.run(
+                prompt,
+                deps=deps,
+                toolsets=[mcp_server],
             )
-            drops_with_causes.append(result)
 
-        # Build final result
-        successful_analyses = sum(
-            1 for d in drops_with_causes if d.root_cause is not None
-        )
+            drop_analysis = drop_result.output
+            yield DropDetectionEvent(detection=drop_analysis)
+
+            # Phase 2: Run root cause analysis for each drop
+            planet_profits = await fetch_drop_planet_profits(
+                client,
+                save_filename,
+                drop_analysis.sudden_drops,
+            )
+            drops_with_causes: list[SuddenDropWithRootCause] = []
 
-        summary_parts = [
-            f"Detected {len(drop_analysis.sudden_drops)} sudden drop(s).",
-        ]
+            for drop in drop_analysis.sudden_drops:
+                result = await analyze_single_drop(
+                    drop=drop,
+                    save_filename=save_filename,
+                    client=client,
+                    mcp_server=mcp_server,
+                    forecasts=forecasts,
+                    planet_profits=planet_profits,
+                    settings=settings,
+                    model_name=model_name,
+                )
+                drops_with_causes.append(result)
+                yield DropAnalyzedEvent(drop=result)
 
-        if drop_analysis.sudden_drops:
-            summary_parts.append(
-                f"Successfully analyzed root causes for {successful_analyses}.",
+            yield MultiAgentAnalysisCompleteEvent(
+                result=build_multi_agent_result(
+                    save_filename,
+                    drop_analysis,
+                    drops_with_causes,
+                ),
             )
-            resources = [d.drop.resource for d in drops_with_causes]
-            summary_parts.append(f"Resources affected: {', '.join(resources)}")
-        else:
-            summary_parts.append("No drops to analyze.")
-
-        return MultiAgentAnalysisResult(
-            save_filename=save_filename,
-            analysis_period_start=drop_analysis.analysis_period_start,
-            analysis_period_end=drop_analysis.analysis_period_end,
-            datapoints_analyzed=drop_analysis.datapoints_analyzed,
-            drop_threshold_percent=drop_analysis.drop_threshold_percent,
-            drops_with_root_causes=drops_with_causes,
-            total_drops_detected=len(drop_analysis.sudden_drops),
-            successful_root_cause_analyses=successful_analyses,
-            summary=" ".join(summary_parts),
-        )
+
+
+async def run_root_cause_multi_agent_orchestration(
+    save_filename: str,
+    settings: Settings | None = None,
+    model_name: str | None = None,
+) -> MultiAgentAnalysisResult:
+    # Closed here rather than when garbage collected, so the MCP server
+    # context is exited on this task
+    async with aclosing(
+        stream_root_cause_multi_agent_orchestration(
+            save_filename,
+            settings,
+            model_name,
+        ),
+    ) as events:
+        async for event in events:
+            if isinstance(event, MultiAgentAnalysisCompleteEvent):
+                return event.result
+    raise RuntimeError("Orchestration ended without a result")
@@ -4,9 +4,13 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from pydantic_ai import Agent
-from pydantic_ai.mcp import MCPServerStreamableHTTP
 
-from agent.constants import DEFAULT_MODEL, create_model, wrap_output_type
+from agent.agent_registry import AGENT_REGISTRY, AgentKey
+from agent.analysis_config import BUDGET_CATEGORIES
+from agent.cascade import run_with_cascade
+from agent.category_movers import contributors_agree
+from agent.constants import create_model, create_prompt_cache_settings, wrap_output_type
+from agent.forecast import create_forecast_toolset
 from agent.models import RootCauseAnalysisResult, SuddenDrop
 from agent.root_cause_multi.root_cause_prompts import (
     build_root_cause_analysis_prompt,
@@ -15,7 +19,15 @@ from agent.root_cause_multi.root_cause_prompts import (
 from agent.settings import Settings, get_settings
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from pydantic_ai.agent import AgentRunResult
+    from pydantic_ai.mcp import MCPServerStreamableHTTP
+    from pydantic_ai.usage import UsageLimits
+
+    from agent.models import ResourceForecast
+
+ROOT_CAUSE_AGENT = "root_cause_agent"
 
 
 @dataclass
@@ -24,19 +36,18 @@ class RootCauseAgentDeps:
 
 
 def create_root_cause_agent(
-    mcp_server: MCPServerStreamableHTTP,
     model_name: str,
-    settings: Settings | None = None,
 ) -> Agent[RootCauseAgentDeps, RootCauseAnalysisResult]:
-    if settings is None:
-        settings = get_settings()
     return Agent(
         create_model(model_name),
         deps_type=RootCauseAgentDeps,
         output_type=wrap_output_type(RootCauseAnalysisResult),
-        system_prompt=build_root_cause_system_prompt(settings.graphql_url),
-        toolsets=[mcp_server],
-        name="root_cause_agent",
+        system_prompt=AGENT_REGISTRY.get_prompt(
+            ROOT_CAUSE_AGENT,
+            build_root_cause_system_prompt,
+        ),
+        model_settings=create_prompt_cache_settings(model_name, ROOT_CAUSE_AGENT),
+        name=ROOT_CAUSE_AGENT,
     )
 
 
@@ -50,6 +61,8 @@ async def run_root_cause_analysis(
     drop: SuddenDrop,
     save_filename: str,
     mcp_server: MCPServerStreamableHTTP,
+    forecasts: Sequence[ResourceForecast],
+    expected_categories: Sequence[str] | None = None,
     deps: RootCauseAgentDeps | None = None,
     model_name: str | None = None,
     settings: Settings | None = None,
@@ -59,8 +72,34 @@ async def run_root_cause_analysis(
     if deps is None:
         deps = create_root_cause_deps(settings)
 
-    actual_model = model_name or DEFAULT_MODEL
-    prompt = build_root_cause_analysis_prompt(drop, save_filename, settings.graphql_url)
-    agent = create_root_cause_agent(mcp_server, actual_model, settings)
+    prompt = build_root_cause_analysis_prompt(drop, save_filename)
+    forecast_toolset = create_forecast_toolset(forecasts)
+
+    async def run(
+        model: str,
+        usage_limits: UsageLimits | None,
+    ) -> AgentRunResult[RootCauseAnalysisResult]:
+        agent = AGENT_REGISTRY.get_agent(
+            AgentKey(ROOT_CAUSE_AGENT, model, deps.graphql_url),
+            create_root_cause_agent,
+        )
+        return await agent.run(
+            prompt,
+            deps=deps,
+            usage_limits=usage_limits,
+            toolsets=[mcp_server, forecast_toolset],
+        )
+
+    if model_name is not None:
+        return await run(model_name, None)
+
+    async def cross_check(result: AgentRunResult[RootCauseAnalysisResult]) -> bool:
+        contributors = result.output.top_contributors
+        if not all(c.category in BUDGET_CATEGORIES for c in contributors):
+            return False
+        return expected_categories is None or contributors_agree(
+            expected_categories,
+            contributors,
+        )
 
-    return await agent.run(prompt, deps=deps)
+    return await run_with_cascade(run, cross_check)
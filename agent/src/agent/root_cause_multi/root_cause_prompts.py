@@ -2,26 +2,19 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from agent.analysis_config import BUDGET_CATEGORIES, RESOURCE_FIELDS
+from agent.forecast import build_forecast_prompt_section
+from agent.sandbox_data import (
+    SANDBOX_DATA_VARIABLE,
+    build_budget_data_prompt_section,
+)
 
 if TYPE_CHECKING:
     from agent.models import SuddenDrop
 
 
-def _build_budget_entry_fields() -> str:
-    return " ".join(RESOURCE_FIELDS)
-
-
-def _build_budget_category_fields() -> str:
-    entry_fields = _build_budget_entry_fields()
-    return "\n".join(f"      {cat} {{ {entry_fields} }}" for cat in BUDGET_CATEGORIES)
-
-
-def build_root_cause_system_prompt(graphql_url: str) -> str:
-    budget_category_fields = _build_budget_category_fields()
-    category_list = (
-        ", ".join(BUDGET_CATEGORIES[:10]) + f", ... ({len(BUDGET_CATEGORIES)} total)"
-    )
+def build_root_cause_system_prompt() -> str:
+    data_section = build_budget_data_prompt_section()
+    forecast_section = build_forecast_prompt_section()
 
     return f"""You are a Stellaris budget analyst specializing in root cause analysis.
 
@@ -32,43 +25,21 @@ Given a detected sudden drop in a resource, identify the TOP 3 budget categories
 ## Your Workflow
 
 1. Call the `run_python_code` tool with a single argument named `python_code` containing your Python code
-2. The code must fetch income and expenses data from the GraphQL API
+2. The code must read income and expenses data from `{SANDBOX_DATA_VARIABLE}`
 3. Analyze which categories caused the drop
-4. Return ONLY the final JSON result (never print raw API data)
+4. Return ONLY the final JSON result (never print raw data)
 
 IMPORTANT: When calling the tool, you MUST provide the `python_code` argument.
 
-## GraphQL API
-
-URL: {graphql_url}
-
-### Query to fetch income and expenses:
-```graphql
-query GetIncomeExpenses($filename: String!) {{
-  save(filename: $filename) {{
-    gamestates {{
-      date
-      budget {{
-        income {{
-{budget_category_fields}
-        }}
-        expenses {{
-{budget_category_fields}
-        }}
-      }}
-    }}
-  }}
-}}
-```
+{data_section}
 
-## Budget Categories
-{category_list}
+{forecast_section}
 
 ## Analysis Algorithm
 
 For a given resource drop from start_date to end_date:
 
-1. Fetch income and expenses for both dates
+1. Look up the indexes of start_date and end_date in `dates`
 2. For each budget category, calculate the change in the dropped resource:
    - income_change = income[end_date][category][resource] - income[start_date][category][resource]
    - expenses_change = expenses[end_date][category][resource] - expenses[start_date][category][resource]
@@ -87,13 +58,14 @@ For a given resource drop from start_date to end_date:
 - Consider BOTH income decreases AND expense increases
 - The sum of contributors may not equal the total drop (other factors exist)
 - Handle null/missing values as 0
-- Filter dates to only include the start_date and end_date (not all gamestates)
+- Compare only the start_date and end_date snapshots
+- The preloaded data may hold only the income and expenses columns of the dropped resource
 
 ## CRITICAL RULES
 
 1. Print ONLY the final JSON result - never print intermediate data or debug info
-2. The GraphQL response is very large - process it in memory, do not print it
-3. Use httpx for HTTP requests (available in sandbox)
+2. Process `{SANDBOX_DATA_VARIABLE}` in memory, do not print it
+3. Do not make HTTP requests - all data is already preloaded
 4. Handle errors gracefully and return valid JSON even on failure
 
 ## Required Output Format
@@ -146,7 +118,6 @@ Your code MUST print exactly ONE JSON object:
 def build_root_cause_analysis_prompt(
     drop: SuddenDrop,
     save_filename: str,
-    graphql_url: str,
 ) -> str:
     return f"""Analyze the root cause of this sudden drop:
 
@@ -156,13 +127,11 @@ Start date: {drop.start_date}
 End date: {drop.end_date}
 Drop: {drop.drop_percent:.1f}% (from {drop.start_value:.2f} to {drop.end_value:.2f})
 
-GraphQL URL: {graphql_url}
-
 Instructions:
-1. Fetch income and expenses for ONLY the start_date and end_date using the GraphQL API
+1. Read income and expenses for ONLY the start_date and end_date from `{SANDBOX_DATA_VARIABLE}`
 2. For the '{drop.resource}' resource, compare each budget category between the two dates
 3. Find categories where income decreased OR expenses increased
 4. Rank by absolute impact and return the TOP 3 contributors
 5. Label each as "income_decreased" or "expenses_increased"
 
-IMPORTANT: Print ONLY the final JSON result. Never print raw API data or intermediate results."""
+IMPORTANT: Print ONLY the final JSON result. Never print raw data or intermediate results."""
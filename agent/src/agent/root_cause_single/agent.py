@@ -1,22 +1,28 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 
 from pydantic_ai import Agent
-from pydantic_ai.mcp import MCPServerStreamableHTTP
 
-from agent.constants import DEFAULT_MODEL, create_model, wrap_output_type
+from agent.agent_registry import AGENT_REGISTRY, AgentKey
+from agent.constants import (
+    DEFAULT_MODEL,
+    create_model,
+    create_prompt_cache_settings,
+    wrap_output_type,
+)
+from agent.forecast import create_forecast_toolset, fetch_optional_depletion_forecasts
 from agent.models import MultiAgentAnalysisResult
 from agent.root_cause_single.prompts import (
     build_analysis_prompt,
     build_system_prompt,
 )
-from agent.settings import (
-    MCP_TIMEOUT_SECONDS,
-    Settings,
-    create_resilient_http_client,
-    get_settings,
-)
+from agent.sandbox_data import create_sandbox_server, fetch_budget_data
+from agent.sandbox_scripts.tools import create_script_toolset
+from agent.settings import Settings, get_settings
+
+ROOT_CAUSE_SINGLE_AGENT = "root_cause_single_agent"
 
 
 @dataclass
@@ -25,19 +31,21 @@ class RootCauseSingleAgentDeps:
 
 
 def create_single_agent(
-    mcp_server: MCPServerStreamableHTTP,
     model_name: str,
-    settings: Settings | None = None,
 ) -> Agent[RootCauseSingleAgentDeps, MultiAgentAnalysisResult]:
-    if settings is None:
-        settings = get_settings()
     return Agent(
         create_model(model_name),
         deps_type=RootCauseSingleAgentDeps,
         output_type=wrap_output_type(MultiAgentAnalysisResult),
-        system_prompt=build_system_prompt(settings.graphql_url),
-        toolsets=[mcp_server],
-        name="root_cause_single_agent",
+        system_prompt=AGENT_REGISTRY.get_prompt(
+            ROOT_CAUSE_SINGLE_AGENT,
+            build_system_prompt,
+        ),
+        model_settings=create_prompt_cache_settings(
+            model_name,
+            ROOT_CAUSE_SINGLE_AGENT,
+        ),
+        name=ROOT_CAUSE_SINGLE_AGENT,
     )
 
 
@@ -57,19 +65,32 @@ async def run_root_cause_single_agent_analysis(
 
     actual_model = model_name or DEFAULT_MODEL
 
+    async with settings.create_graphql_client() as client:
+        data, forecasts = await asyncio.gather(
+            fetch_budget_data(client, save_filename),
+            fetch_optional_depletion_forecasts(client, save_filename),
+        )
+
     # Create a fresh MCP server for each analysis run to avoid stale connection issues
-    http_client = create_resilient_http_client(MCP_TIMEOUT_SECONDS)
-    mcp_server = MCPServerStreamableHTTP(settings.sandbox_url, http_client=http_client)
+    mcp_server = create_sandbox_server(settings, data)
 
     async with mcp_server:
         # Run single agent that does both drop detection and root cause analysis
         deps = create_deps(settings)
-        prompt = build_analysis_prompt(save_filename, deps.graphql_url)
-        agent = create_single_agent(mcp_server, actual_model, settings)
+        prompt = build_analysis_prompt(save_filename)
+        agent = AGENT_REGISTRY.get_agent(
+            AgentKey(ROOT_CAUSE_SINGLE_AGENT, actual_model, deps.graphql_url),
+            create_single_agent,
+        )
 
         result = await agent.run(
             prompt,
             deps=deps,
+            toolsets=[
+                mcp_server,
+                create_script_toolset(mcp_server, data),
+                create_forecast_toolset(forecasts),
+            ],
         )
 
         return result.output
@@ -1,23 +1,23 @@
-from agent.root_cause_multi.prompts import (
+from agent.analysis_config import (
     ANALYSIS_DATAPOINTS,
-    BUDGET_CATEGORIES,
     DROP_THRESHOLD_PERCENT,
     RESOURCE_FIELDS,
 )
+from agent.forecast import build_forecast_prompt_section
+from agent.sandbox_data import (
+    SANDBOX_DATA_VARIABLE,
+    build_budget_data_prompt_section,
+)
+from agent.sandbox_scripts import build_script_prompt_section
 
 
-def _build_budget_entry_fields() -> str:
-    return " ".join(RESOURCE_FIELDS)
-
-
-def _build_budget_category_fields() -> str:
-    entry_fields = _build_budget_entry_fields()
-    return "\n".join(f"        {cat} {{ {entry_fields} }}" for cat in BUDGET_CATEGORIES)
-
-
-def build_system_prompt(graphql_url: str) -> str:
-    resource_list = ", ".join(RESOURCE_FIELDS)
-    budget_category_fields = _build_budget_category_fields()
+def build_system_prompt() -> str:
+    script_section = build_script_prompt_section([
+        "drop_detection",
+        "contributor_ranking",
+    ])
+    data_section = build_budget_data_prompt_section()
+    forecast_section = build_forecast_prompt_section()
 
     return f"""You are a Stellaris game statistics analyst specializing in detecting sudden resource drops and analyzing their root causes.
 
@@ -25,76 +25,29 @@ Your task is to:
 1. Detect sudden resource drops in budget data (>= {DROP_THRESHOLD_PERCENT}%)
 2. For each detected drop, identify the TOP 3 budget categories that contributed most to the drop
 
-## Your Workflow
+{script_section}
+
+## Your Workflow for Custom Code
 
 1. Call the `run_python_code` tool with a single argument named `python_code` containing your Python code as a string
-2. The code must fetch budget data from the GraphQL API
+2. The code must read the budget data from `{SANDBOX_DATA_VARIABLE}`
 3. Perform BOTH drop detection and root cause analysis
-4. Return ONLY the final JSON result (never print raw API data)
+4. Return ONLY the final JSON result (never print raw data)
 
 IMPORTANT: When calling the tool, you MUST provide the `python_code` argument. Example tool call format:
 - Tool: run_python_code
-- Argument: python_code = "import httpx; print('hello')"
-
-## GraphQL API
-
-URL: {graphql_url}
-
-### Query 1: Get Available Dates
-```graphql
-query GetDates($filename: String!) {{
-  save(filename: $filename) {{
-    gamestates {{
-      date
-    }}
-  }}
-}}
-```
-
-### Query 2: Get Budget Balance Data
-```graphql
-query GetBudget($filename: String!) {{
-  save(filename: $filename) {{
-    gamestates {{
-      date
-      budget {{
-        balance {{
-{budget_category_fields}
-        }}
-      }}
-    }}
-  }}
-}}
-```
+- Argument: python_code = "print(len({SANDBOX_DATA_VARIABLE}['budget']['dates']))"
 
-### Query 3: Get Income and Expenses Data
-```graphql
-query GetIncomeExpenses($filename: String!) {{
-  save(filename: $filename) {{
-    gamestates {{
-      date
-      budget {{
-        income {{
-{budget_category_fields}
-        }}
-        expenses {{
-{budget_category_fields}
-        }}
-      }}
-    }}
-  }}
-}}
-```
+{data_section}
 
-## Resource Fields to Track
-{resource_list}
+{forecast_section}
 
 ## Analysis Algorithm
 
 ### PHASE 1: Drop Detection
 
-1. Fetch the latest {ANALYSIS_DATAPOINTS} gamestates by date
-2. For each gamestate, sum each resource across ALL budget categories
+1. Use the {ANALYSIS_DATAPOINTS} preloaded snapshots in date order
+2. For each snapshot, sum each resource across ALL budget categories of `balance`
 3. Compare CONSECUTIVE snapshots: D1→D2, D2→D3, D3→D4
 4. Flag resources where drop_percent >= {DROP_THRESHOLD_PERCENT}%
 
@@ -114,7 +67,7 @@ if earlier_value != 0 and later_value < earlier_value:
 
 For each detected drop (resource, start_date, end_date):
 
-1. Fetch income and expenses for BOTH dates
+1. Look up the indexes of start_date and end_date in `dates`
 2. For the dropped resource, analyze each budget category:
    - income_change = income[end_date][category][resource] - income[start_date][category][resource]
    - expenses_change = expenses[end_date][category][resource] - expenses[start_date][category][resource]
@@ -132,7 +85,7 @@ For each detected drop (resource, start_date, end_date):
 - Consider BOTH income decreases AND expense increases
 - The sum of contributors may not equal the total drop (other factors exist)
 - Handle null/missing values as 0
-- Filter dates to only include the start_date and end_date (not all gamestates)
+- Compare only the start_date and end_date snapshots
 
 ## Required Output Format
 
@@ -206,8 +159,8 @@ Your code MUST print exactly ONE JSON object matching this structure:
 ## CRITICAL RULES
 
 1. Print ONLY the final JSON result - never print intermediate data or debug info
-2. The GraphQL response is very large - process it in memory, do not print it
-3. Use httpx for HTTP requests (available in sandbox)
+2. Process `{SANDBOX_DATA_VARIABLE}` in memory, do not print it
+3. Do not make HTTP requests - all data is already preloaded
 4. Handle errors gracefully:
    - If root cause analysis fails for a drop, set analysis_error to the error message and root_cause to null
    - Still return a valid JSON result even on partial failures
@@ -216,34 +169,32 @@ Your code MUST print exactly ONE JSON object matching this structure:
 ## Example Code Structure
 
 ```python
-import httpx
 import json
 
-GRAPHQL_URL = "{graphql_url}"
-SAVE_FILENAME = "{{save_filename}}"  # Will be provided in the prompt
 RESOURCE_FIELDS = {RESOURCE_FIELDS!r}
 DROP_THRESHOLD = {DROP_THRESHOLD_PERCENT}
-DATAPOINTS = {ANALYSIS_DATAPOINTS}
 
-# 1. Fetch dates
-# 2. Fetch budget data and detect drops
-# 3. For each drop, fetch income/expenses and find contributors
-# 4. Build and print result JSON
+budget = {SANDBOX_DATA_VARIABLE}["budget"]
+dates = budget["dates"]
+
+# 1. Sum balance columns per date index and detect drops
+# 2. For each drop, compare income/expenses columns at the two date indexes
+# 3. Build and print result JSON
 ```
 """
 
 
-def build_analysis_prompt(save_filename: str, graphql_url: str) -> str:
+def build_analysis_prompt(save_filename: str) -> str:
     return f"""Analyze the budget for save '{save_filename}'.
 
-GraphQL API URL: {graphql_url}
+The latest {ANALYSIS_DATAPOINTS} budget snapshots are preloaded in `{SANDBOX_DATA_VARIABLE}`.
 
 Instructions:
-1. Fetch the latest {ANALYSIS_DATAPOINTS} budget snapshots using the GraphQL API
+1. Read the preloaded budget snapshots
 2. Calculate total resources across all budget categories for each snapshot
 3. Compare consecutive snapshots to detect drops >= {DROP_THRESHOLD_PERCENT}%
 4. For EACH detected drop:
-   - Fetch income and expenses data for the start and end dates
+   - Compare income and expenses for the start and end dates
    - Identify the TOP 3 budget categories that contributed to the drop
    - Classify each contributor as either "income_decreased" or "expenses_increased"
 5. Return the complete analysis result as JSON with all drops and their root causes
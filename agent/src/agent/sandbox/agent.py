@@ -4,23 +4,26 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from pydantic_ai import Agent
-from pydantic_ai.mcp import MCPServerStreamableHTTP
 
-from agent.constants import DEFAULT_MODEL, create_model, wrap_output_type
+from agent.agent_registry import AGENT_REGISTRY, AgentKey
+from agent.cascade import run_with_cascade
+from agent.constants import create_model, create_prompt_cache_settings, wrap_output_type
+from agent.drop_detection import drops_agree
 from agent.models import SuddenDropAnalysisResult
+from agent.native_budget.agent import compute_expected_drops
 from agent.sandbox.prompts import (
     build_analysis_prompt,
     build_system_prompt,
 )
-from agent.settings import (
-    MCP_TIMEOUT_SECONDS,
-    Settings,
-    create_resilient_http_client,
-    get_settings,
-)
+from agent.sandbox_data import create_sandbox_server, fetch_budget_data
+from agent.sandbox_scripts.tools import create_script_toolset
+from agent.settings import Settings, get_settings
 
 if TYPE_CHECKING:
     from pydantic_ai.agent import AgentRunResult
+    from pydantic_ai.usage import UsageLimits
+
+SANDBOX_DROP_DETECTION_AGENT = "sandbox_drop_detection_agent"
 
 
 @dataclass
@@ -29,19 +32,21 @@ class SandboxDropDetectionDeps:
 
 
 def create_sandbox_drop_detection_agent(
-    mcp_server: MCPServerStreamableHTTP,
     model_name: str,
-    settings: Settings | None = None,
 ) -> Agent[SandboxDropDetectionDeps, SuddenDropAnalysisResult]:
-    if settings is None:
-        settings = get_settings()
     return Agent(
         create_model(model_name),
         deps_type=SandboxDropDetectionDeps,
         output_type=wrap_output_type(SuddenDropAnalysisResult),
-        system_prompt=build_system_prompt(settings.graphql_url),
-        toolsets=[mcp_server],
-        name="sandbox_drop_detection_agent",
+        system_prompt=AGENT_REGISTRY.get_prompt(
+            SANDBOX_DROP_DETECTION_AGENT,
+            build_system_prompt,
+        ),
+        model_settings=create_prompt_cache_settings(
+            model_name,
+            SANDBOX_DROP_DETECTION_AGENT,
+        ),
+        name=SANDBOX_DROP_DETECTION_AGENT,
     )
 
 
@@ -62,17 +67,36 @@ async def run_sandbox_drop_detection_analysis(
     if deps is None:
         deps = create_deps(settings)
 
-    prompt = build_analysis_prompt(save_filename, deps.graphql_url)
-    actual_model = model_name or DEFAULT_MODEL
+    prompt = build_analysis_prompt(save_filename)
+
+    async with settings.create_graphql_client() as client:
+        data = await fetch_budget_data(client, save_filename)
 
     # Create a fresh MCP server for each analysis run to avoid stale connection issues
-    http_client = create_resilient_http_client(MCP_TIMEOUT_SECONDS)
-    mcp_server = MCPServerStreamableHTTP(settings.sandbox_url, http_client=http_client)
+    mcp_server = create_sandbox_server(settings, data)
+    toolsets = [mcp_server, create_script_toolset(mcp_server, data)]
 
-    async with mcp_server:
-        agent = create_sandbox_drop_detection_agent(
-            mcp_server,
-            actual_model,
-            settings,
+    async def run(
+        model: str,
+        usage_limits: UsageLimits | None,
+    ) -> AgentRunResult[SuddenDropAnalysisResult]:
+        agent = AGENT_REGISTRY.get_agent(
+            AgentKey(SANDBOX_DROP_DETECTION_AGENT, model, deps.graphql_url),
+            create_sandbox_drop_detection_agent,
+        )
+        return await agent.run(
+            prompt,
+            deps=deps,
+            usage_limits=usage_limits,
+            toolsets=toolsets,
         )
-        return await agent.run(prompt, deps=deps)
+
+    async def cross_check(result: AgentRunResult[SuddenDropAnalysisResult]) -> bool:
+        async with settings.create_graphql_client() as client:
+            expected = await compute_expected_drops(client, save_filename)
+        return expected is None or drops_agree(expected, result.output.sudden_drops)
+
+    async with mcp_server:
+        if model_name is not None:
+            return await run(model_name, None)
+        return await run_with_cascade(run, cross_check)
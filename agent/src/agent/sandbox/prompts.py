@@ -1,3 +1,9 @@
+from agent.sandbox_data import (
+    SANDBOX_DATA_VARIABLE,
+    build_budget_data_prompt_section,
+)
+from agent.sandbox_scripts import build_script_prompt_section
+
 DROP_THRESHOLD_PERCENT = 30.0
 ANALYSIS_DATAPOINTS = 4
 
@@ -103,69 +109,30 @@ BUDGET_CATEGORIES = [
 ]
 
 
-def _build_budget_entry_fields() -> str:
-    return " ".join(RESOURCE_FIELDS)
-
-
-def _build_budget_category_fields() -> str:
-    entry_fields = _build_budget_entry_fields()
-    return "\n".join(f"  {cat} {{ {entry_fields} }}" for cat in BUDGET_CATEGORIES)
-
-
-def build_system_prompt(graphql_url: str) -> str:
-    resource_list = ", ".join(RESOURCE_FIELDS)
-    budget_category_fields = _build_budget_category_fields()
+def build_system_prompt() -> str:
+    script_section = build_script_prompt_section(["drop_detection"])
+    data_section = build_budget_data_prompt_section()
 
     return f"""You are a Stellaris game statistics analyst. Your task is to detect sudden resource drops in budget data.
 
-## Your Workflow
+{script_section}
+
+## Your Workflow for Custom Code
 
 1. Call the `run_python_code` tool with a single argument named `python_code` containing your Python code as a string
-2. The code must fetch budget data from the GraphQL API and analyze it
-3. Return ONLY the final JSON result (never print raw API data)
+2. The code must read the budget data from `{SANDBOX_DATA_VARIABLE}` and analyze it
+3. Return ONLY the final JSON result (never print raw data)
 
 IMPORTANT: When calling the tool, you MUST provide the `python_code` argument. Example tool call format:
 - Tool: run_python_code
-- Argument: python_code = "import httpx; print('hello')"
-
-## GraphQL API
-
-URL: {graphql_url}
-
-### Query 1: Get Available Dates
-```graphql
-query GetDates($filename: String!) {{
-  save(filename: $filename) {{
-    gamestates {{
-      date
-    }}
-  }}
-}}
-```
+- Argument: python_code = "print(len({SANDBOX_DATA_VARIABLE}['budget']['dates']))"
 
-### Query 2: Get Budget Data
-```graphql
-query GetBudget($filename: String!) {{
-  save(filename: $filename) {{
-    gamestates {{
-      date
-      budget {{
-        balance {{
-{budget_category_fields}
-        }}
-      }}
-    }}
-  }}
-}}
-```
-
-## Resource Fields to Track
-{resource_list}
+{data_section}
 
 ## Analysis Algorithm
 
-1. Fetch the latest {ANALYSIS_DATAPOINTS} gamestates by date
-2. For each gamestate, sum each resource across ALL budget categories
+1. Use the {ANALYSIS_DATAPOINTS} preloaded snapshots in date order
+2. For each snapshot, sum each resource across ALL budget categories of `balance`
 3. Compare CONSECUTIVE snapshots: D1->D2, D2->D3, D3->D4
 4. Flag resources where drop_percent >= {DROP_THRESHOLD_PERCENT}%
 
@@ -209,43 +176,30 @@ Your code MUST print exactly ONE JSON object matching this structure:
 ## CRITICAL RULES
 
 1. Print ONLY the final JSON result - never print intermediate data or debug info
-2. The GraphQL response is very large - process it in memory, do not print it
-3. Use httpx for HTTP requests (available in sandbox)
+2. Process `{SANDBOX_DATA_VARIABLE}` in memory, do not print it
+3. Do not make HTTP requests - all data is already preloaded
 4. Handle errors gracefully and return a valid JSON result even on failure
 
 ## Example Code Structure
 
 ```python
-import httpx
 import json
 
-GRAPHQL_URL = "{graphql_url}"
-SAVE_FILENAME = "{{save_filename}}"  # Will be provided in the prompt
 RESOURCE_FIELDS = {RESOURCE_FIELDS!r}
 DROP_THRESHOLD = {DROP_THRESHOLD_PERCENT}
-DATAPOINTS = {ANALYSIS_DATAPOINTS}
-
-# 1. Fetch dates
-dates_query = '''
-query GetDates($filename: String!) {{
-  save(filename: $filename) {{ gamestates {{ date }} }}
-}}
-'''
 
-with httpx.Client(timeout=180.0) as client:
-    resp = client.post(GRAPHQL_URL, json={{
-        "query": dates_query,
-        "variables": {{"filename": SAVE_FILENAME}}
-    }})
-    dates_data = resp.json()
+budget = {SANDBOX_DATA_VARIABLE}["budget"]
+dates = budget["dates"]
 
-all_dates = sorted([gs["date"] for gs in dates_data["data"]["save"]["gamestates"]])
-selected_dates = all_dates[-DATAPOINTS:]
+# 1. Sum each resource across all balance categories for every date index
+totals = [dict.fromkeys(RESOURCE_FIELDS, 0.0) for _ in dates]
+for columns in budget["balance"].values():
+    for resource, values in columns.items():
+        for i, value in enumerate(values):
+            totals[i][resource] += value
 
-# 2. Fetch budget data (use the full query from above)
-# 3. Sum resources per snapshot
-# 4. Detect drops between consecutive snapshots
-# 5. Build and print result JSON
+# 2. Detect drops between consecutive snapshots
+# 3. Build and print result JSON
 
 result = {{...}}
 print(json.dumps(result))
@@ -253,13 +207,13 @@ print(json.dumps(result))
 """
 
 
-def build_analysis_prompt(save_filename: str, graphql_url: str) -> str:
+def build_analysis_prompt(save_filename: str) -> str:
     return f"""Analyze the budget for save '{save_filename}'.
 
-GraphQL API URL: {graphql_url}
+The latest {ANALYSIS_DATAPOINTS} budget snapshots are preloaded in `{SANDBOX_DATA_VARIABLE}`.
 
 Instructions:
-1. Fetch the latest {ANALYSIS_DATAPOINTS} budget snapshots using the GraphQL API
+1. Read the preloaded budget snapshots
 2. Calculate total resources across all budget categories for each snapshot
 3. Compare consecutive snapshots to detect drops >= {DROP_THRESHOLD_PERCENT}%
 4. Return the analysis result as JSON
@@ -0,0 +1,294 @@
+"""Host-side data loading for sandbox analyses.
+
+Orchestrators fetch the data an analysis needs once, encode it as compact
+column-oriented JSON and prepend it to every sandbox program as the
+`SANDBOX_DATA` variable, so code running in the sandbox never calls the
+GraphQL API.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import Mapping, Sequence
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel
+from pydantic_ai.mcp import MCPServerStreamableHTTP
+
+from agent.analysis_config import (
+    ANALYSIS_DATAPOINTS,
+    BUDGET_CATEGORIES,
+    RESOURCE_FIELDS,
+)
+from agent.budget_query import (
+    BUDGET_SECTIONS,
+    BudgetSection,
+    BudgetSelection,
+    GraphQLExecutor,
+    fetch_budget_selection,
+)
+from agent.graphql_client import (
+    GetBudget,
+    GetIncomeExpenses,
+    GetNeighborData,
+    GetNeighborDataSaveGamestatesAllPlanetCoordinates,
+    GetNeighborDataSaveGamestatesDiplomaticRelations,
+    GetNeighborDataSaveGamestatesEmpires,
+)
+from agent.native_budget.tools import select_latest_dates
+from agent.settings import MCP_TIMEOUT_SECONDS, create_resilient_http_client
+
+if TYPE_CHECKING:
+    from pydantic_ai import RunContext
+    from pydantic_ai.mcp import CallToolFunc, ToolResult
+
+    from agent.native_budget.tools import GraphQLClientProtocol
+    from agent.settings import Settings
+
+RUN_PYTHON_CODE_TOOL = "run_python_code"
+SANDBOX_DATA_VARIABLE = "SANDBOX_DATA"
+
+type SandboxData = dict[str, Any]
+type BudgetColumns = dict[str, dict[str, list[float]]]
+
+
+def build_budget_columns(
+    rows: Sequence[Mapping[str, Mapping[str, float | None] | None]],
+) -> BudgetColumns:
+    """Pivot per-date budget rows into `category -> resource -> values` columns.
+
+    Each column holds one value per row. Columns that are zero or missing in
+    every row are omitted; readers treat absent columns as zeros.
+    """
+    columns: BudgetColumns = {}
+    for index, row in enumerate(rows):
+        for category, entry in row.items():
+            if not entry:
+                continue
+            for resource, value in entry.items():
+                if not value:
+                    continue
+                column = columns.setdefault(category, {}).setdefault(
+                    resource,
+                    [0.0] * len(rows),
+                )
+                column[index] = value
+    return columns
+
+
+def build_table_columns(
+    model_type: type[BaseModel],
+    rows: Sequence[BaseModel],
+) -> dict[str, list[Any]]:
+    """Turn a list of models into one list per field, keyed by snake_case name."""
+    dumped = [row.model_dump() for row in rows]
+    return {field: [row[field] for row in dumped] for field in model_type.model_fields}
+
+
+async def fetch_budget_data(
+    client: GraphQLClientProtocol,
+    save_filename: str,
+    datapoints: int = ANALYSIS_DATAPOINTS,
+) -> SandboxData:
+    """Fetch balance, income and expenses of the latest budget snapshots."""
+    # Issued together so a batching client sends both in one request
+    budget, income_expenses = await asyncio.gather(
+        client.get_budget(filename=save_filename),
+        client.get_income_expenses(filename=save_filename),
+    )
+    return build_budget_data(
+        save_filename,
+        budget,
+        income_expenses,
+        BUDGET_SECTIONS,
+        datapoints,
+    )
+
+
+async def fetch_selected_budget_data(
+    client: GraphQLExecutor,
+    save_filename: str,
+    selection: BudgetSelection,
+    datapoints: int = ANALYSIS_DATAPOINTS,
+) -> SandboxData:
+    """Fetch only the resources, categories and sections of `selection`.
+
+    Sections outside the selection are left out of the data.
+    """
+    result = await fetch_budget_selection(client, save_filename, selection)
+    return build_budget_data(
+        save_filename,
+        result.balance,
+        result.income_expenses,
+        selection.sections,
+        datapoints,
+    )
+
+
+def build_budget_data(
+    save_filename: str,
+    budget: GetBudget,
+    income_expenses: GetIncomeExpenses,
+    sections: Sequence[BudgetSection],
+    datapoints: int = ANALYSIS_DATAPOINTS,
+) -> SandboxData:
+    """Build the budget `SANDBOX_DATA` of the latest snapshots present in both results."""
+    if budget.save is None or income_expenses.save is None:
+        raise ValueError(f"Save '{save_filename}' not found")
+
+    balances = {str(gs.date): gs.budget.balance for gs in budget.save.gamestates}
+    flows = {str(gs.date): gs.budget for gs in income_expenses.save.gamestates}
+    dates = select_latest_dates(sorted(balances.keys() & flows.keys()), datapoints)
+
+    rows: dict[BudgetSection, list[BaseModel]] = {
+        "balance": [balances[d] for d in dates],
+        "income": [flows[d].income for d in dates],
+        "expenses": [flows[d].expenses for d in dates],
+    }
+    return {
+        "save_filename": save_filename,
+        "budget": {
+            "dates": dates,
+            **{
+                section: build_budget_columns(
+                    [row.model_dump(by_alias=True) for row in rows[section]],
+                )
+                for section in sections
+            },
+        },
+    }
+
+
+async def fetch_neighbor_data(
+    client: GraphQLClientProtocol,
+    save_filename: str,
+) -> SandboxData:
+    """Fetch empires, diplomatic relations and planet coordinates of the latest gamestate."""
+    result = await client.get_neighbor_data(filename=save_filename)
+    return build_neighbor_data(result, save_filename)
+
+
+def build_neighbor_data(result: GetNeighborData, save_filename: str) -> SandboxData:
+    """Build the neighbor `SANDBOX_DATA` of the latest gamestate."""
+    if result.save is None or not result.save.gamestates:
+        raise ValueError(f"No gamestates found for save '{save_filename}'")
+
+    latest = max(result.save.gamestates, key=lambda gs: gs.date)
+    player = latest.player_empire
+    return {
+        "save_filename": save_filename,
+        "neighbors": {
+            "date": str(latest.date),
+            "player_empire": player.model_dump() if player is not None else None,
+            "empires": build_table_columns(
+                GetNeighborDataSaveGamestatesEmpires,
+                latest.empires,
+            ),
+            "diplomatic_relations": build_table_columns(
+                GetNeighborDataSaveGamestatesDiplomaticRelations,
+                latest.diplomatic_relations,
+            ),
+            "planet_coordinates": build_table_columns(
+                GetNeighborDataSaveGamestatesAllPlanetCoordinates,
+                latest.all_planet_coordinates,
+            ),
+        },
+    }
+
+
+def render_preload(data: SandboxData) -> str:
+    """Build the program prefix that defines `SANDBOX_DATA` in the sandbox."""
+    payload = json.dumps(data, separators=(",", ":"))
+    return (
+        "import json as _json\n"
+        + f"{SANDBOX_DATA_VARIABLE} = _json.loads({payload!r})\n\n"
+    )
+
+
+def build_budget_data_prompt_section() -> str:
+    """Describe the preloaded budget layout for a system prompt."""
+    category_list = ", ".join(BUDGET_CATEGORIES)
+    resource_list = ", ".join(RESOURCE_FIELDS)
+
+    return f"""## Preloaded Data
+
+Every program you run starts with a global `{SANDBOX_DATA_VARIABLE}` dict that holds the latest {ANALYSIS_DATAPOINTS} budget snapshots of the save in a column-oriented layout. Read from it; do not make HTTP requests and do not redefine it.
+
+```python
+{SANDBOX_DATA_VARIABLE} = {{
+    "save_filename": "<the save filename>",
+    "budget": {{
+        "dates": ["2307-01-01 00:00:00+00:00", ...],  # ascending, one per snapshot
+        "balance": {{"<category>": {{"<resource>": [<value per date>, ...]}}}},
+        "income": {{...same layout as balance...}},
+        "expenses": {{...same layout as balance...}},
+    }},
+}}
+```
+
+- Value `i` of every column belongs to `dates[i]`
+- Categories and resources that are zero in every snapshot are omitted; treat a missing column as 0
+
+Budget categories: {category_list}
+
+Resources: {resource_list}"""
+
+
+def build_neighbor_data_prompt_section() -> str:
+    """Describe the preloaded neighbor layout for a system prompt."""
+    return f"""## Preloaded Data
+
+Every program you run starts with a global `{SANDBOX_DATA_VARIABLE}` dict that holds the latest gamestate of the save. Tables are column-oriented: row `i` is made of element `i` of every column. Read from it; do not make HTTP requests and do not redefine it.
+
+```python
+{SANDBOX_DATA_VARIABLE} = {{
+    "save_filename": "<the save filename>",
+    "neighbors": {{
+        "date": "<gamestate date>",
+        "player_empire": {{"country_id": "0", "name": "...", "owned_planet_ids": [1, 2], "owned_planet_count": 2}},  # or None
+        "empires": {{
+            "country_id": [...], "name": [...], "owned_planet_ids": [[...], ...],
+            "owned_planet_count": [...], "military_power": [...], "economy_power": [...], "tech_power": [...],
+        }},
+        "diplomatic_relations": {{
+            "target_country_id": [...], "target_empire_name": [...], "opinion": [...], "trust": [...],
+            "threat": [...], "is_hostile": [...], "border_range": [...], "has_contact": [...],
+            "has_communications": [...],
+            "opinion_modifiers": [[{{"modifier_type": "opinion_genocidal", "value": -100.0}}], ...],
+        }},
+        "planet_coordinates": {{"planet_id": [...], "x": [...], "y": [...]}},
+    }},
+}}
+```
+
+Planet IDs are integers. To iterate a table as dicts:
+```python
+def rows(table):
+    return [dict(zip(table, values)) for values in zip(*table.values())]
+```"""
+
+
+def create_sandbox_server(
+    settings: Settings,
+    data: SandboxData,
+) -> MCPServerStreamableHTTP:
+    """Create a sandbox MCP server whose programs start with the preloaded data."""
+    preload = render_preload(data)
+
+    async def inject_data(
+        _ctx: RunContext[Any],
+        call_tool: CallToolFunc,
+        name: str,
+        tool_args: dict[str, Any],
+    ) -> ToolResult:
+        if name == RUN_PYTHON_CODE_TOOL:
+            code = str(tool_args.get("python_code", ""))
+            tool_args = {**tool_args, "python_code": preload + code}
+        return await call_tool(name, tool_args, None)
+
+    return MCPServerStreamableHTTP(
+        settings.sandbox_url,
+        http_client=create_resilient_http_client(MCP_TIMEOUT_SECONDS),
+        process_tool_call=inject_data,
+    )
@@ -0,0 +1,122 @@
+"""Versioned library of vetted analysis scripts run in the Python sandbox.
+
+Each script module is sent verbatim to the sandbox, so it must be self-contained
+(standard library only) and expose `VERSION`, `DESCRIPTION`, `PARAMETERS` and a
+`main(params, data) -> dict` entry point that reads the preloaded sandbox data.
+"""
+
+import inspect
+import json
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any
+
+from agent.analysis_config import (
+    BUDGET_CATEGORIES,
+    DROP_THRESHOLD_PERCENT,
+    RESOURCE_FIELDS,
+)
+from agent.sandbox_data import RUN_PYTHON_CODE_TOOL, SANDBOX_DATA_VARIABLE
+from agent.sandbox_scripts import (
+    contributor_ranking,
+    drop_detection,
+    neighbor_distances,
+)
+
+RUN_SANDBOX_SCRIPT_TOOL = "run_sandbox_script"
+
+
+@dataclass(frozen=True)
+class SandboxScript:
+    """A named analysis script backed by a self-contained module."""
+
+    name: str
+    module: ModuleType
+
+    @property
+    def version(self) -> int:
+        return int(self.module.VERSION)
+
+    @property
+    def description(self) -> str:
+        return str(self.module.DESCRIPTION)
+
+    @property
+    def parameters(self) -> dict[str, str]:
+        return dict(self.module.PARAMETERS)
+
+    @property
+    def source(self) -> str:
+        return inspect.getsource(self.module)
+
+
+SCRIPTS: dict[str, SandboxScript] = {
+    script.name: script
+    for script in (
+        SandboxScript("drop_detection", drop_detection),
+        SandboxScript("contributor_ranking", contributor_ranking),
+        SandboxScript("neighbor_distances", neighbor_distances),
+    )
+}
+
+
+def build_host_params() -> dict[str, Any]:
+    """Parameters filled in by the host so the model never has to send them."""
+    return {
+        "resource_fields": RESOURCE_FIELDS,
+        "budget_categories": BUDGET_CATEGORIES,
+        "drop_threshold_percent": DROP_THRESHOLD_PERCENT,
+    }
+
+
+def render_script(name: str, params: Mapping[str, Any]) -> str:
+    """Build the sandbox program that runs a script and prints its JSON result.
+
+    The program expects `SANDBOX_DATA` to be defined by the preloaded prefix.
+    """
+    script = SCRIPTS[name]
+    params_json = json.dumps(dict(params))
+    return (
+        f"# {script.name} v{script.version}\n"
+        + script.source
+        + "\n\nimport json as _json\n\n"
+        + f"print(_json.dumps(main(_json.loads({params_json!r}), {SANDBOX_DATA_VARIABLE})))\n"
+    )
+
+
+def build_script_prompt_section(names: Sequence[str]) -> str:
+    """Describe the given scripts for a system prompt."""
+    entries: list[str] = []
+    for name in names:
+        script = SCRIPTS[name]
+        parameters = "\n".join(
+            f"  - `{param}`: {description}"
+            for param, description in script.parameters.items()
+        )
+        if not parameters:
+            parameters = "  - none (pass an empty object)"
+        entries.append(
+            f"- `{script.name}` (v{script.version}): {script.description}\n"
+            + f"  Parameters:\n{parameters}",
+        )
+    catalog = "\n".join(entries)
+
+    return f"""## Pre-built Analysis Scripts
+
+Prefer the `{RUN_SANDBOX_SCRIPT_TOOL}` tool over writing code. It runs a vetted script in the sandbox by name against the preloaded data, fills in the analysis settings, and returns the script's printed JSON output. Call it with `script_name` and a `params` object:
+
+{catalog}
+
+Only write your own code with `{RUN_PYTHON_CODE_TOOL}` when no script answers the question or a script fails."""
+
+
+__all__ = [
+    "RUN_PYTHON_CODE_TOOL",
+    "RUN_SANDBOX_SCRIPT_TOOL",
+    "SCRIPTS",
+    "SandboxScript",
+    "build_host_params",
+    "build_script_prompt_section",
+    "render_script",
+]
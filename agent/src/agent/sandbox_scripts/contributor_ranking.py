@@ -0,0 +1,111 @@
+"""Rank the budget categories that contributed most to a resource drop."""
+
+from typing import Any
+
+VERSION = 2
+DESCRIPTION = (
+    "Compare income and expenses of one resource per budget category between "
+    "two preloaded dates and rank categories by impact (income decreases and "
+    "expense increases). Returns resource, dates and top_contributors; write "
+    "the explanation yourself."
+)
+PARAMETERS = {
+    "resource": "Resource that dropped, e.g. energy",
+    "start_date": "Date before the drop, exactly as reported by drop detection",
+    "end_date": "Date after the drop, exactly as reported by drop detection",
+}
+
+DEFAULT_TOP_N = 3
+MIN_BASELINE_VALUE = 0.01
+
+
+def category_value(
+    section: dict[str, dict[str, list[float]]],
+    category: str,
+    resource: str,
+    index: int,
+) -> float:
+    columns = section.get(category, {})
+    return columns[resource][index] if resource in columns else 0.0
+
+
+def change_percent(before: float, after: float) -> float:
+    if abs(before) < MIN_BASELINE_VALUE:
+        return 100.0 if after else 0.0
+    return (after - before) / abs(before) * 100
+
+
+def rank_contributors(
+    budget: dict[str, Any],
+    before: int,
+    after: int,
+    resource: str,
+    categories: list[str],
+    top_n: int,
+) -> list[dict[str, Any]]:
+    """Rank categories by how much they pushed the resource balance down."""
+    contributors: list[dict[str, Any]] = []
+    for category in categories:
+        income_before = category_value(budget["income"], category, resource, before)
+        income_after = category_value(budget["income"], category, resource, after)
+        if income_after < income_before:
+            contributors.append(
+                {
+                    "category": category,
+                    "resource": resource,
+                    "contributor_type": "income_decreased",
+                    "before_value": income_before,
+                    "after_value": income_after,
+                    "change_absolute": income_before - income_after,
+                    "change_percent": change_percent(income_before, income_after),
+                },
+            )
+
+        expenses_before = category_value(budget["expenses"], category, resource, before)
+        expenses_after = category_value(budget["expenses"], category, resource, after)
+        if expenses_after > expenses_before:
+            contributors.append(
+                {
+                    "category": category,
+                    "resource": resource,
+                    "contributor_type": "expenses_increased",
+                    "before_value": expenses_before,
+                    "after_value": expenses_after,
+                    "change_absolute": expenses_after - expenses_before,
+                    "change_percent": change_percent(expenses_before, expenses_after),
+                },
+            )
+
+    contributors.sort(key=lambda c: c["change_absolute"], reverse=True)
+    top = contributors[:top_n]
+    for rank, contributor in enumerate(top, start=1):
+        contributor["rank"] = rank
+    return top
+
+
+def main(params: dict[str, Any], data: dict[str, Any]) -> dict[str, Any]:
+    resource: str = params["resource"]
+    start_date: str = params["start_date"]
+    end_date: str = params["end_date"]
+    categories: list[str] = params["budget_categories"]
+    top_n: int = params.get("top_n", DEFAULT_TOP_N)
+    budget: dict[str, Any] = data["budget"]
+    dates: list[str] = budget["dates"]
+
+    missing = [d for d in (start_date, end_date) if d not in dates]
+    if missing:
+        raise ValueError(f"No preloaded snapshot for date(s): {', '.join(missing)}")
+
+    return {
+        "resource": resource,
+        "start_date": start_date,
+        "end_date": end_date,
+        "top_contributors": rank_contributors(
+            budget,
+            dates.index(start_date),
+            dates.index(end_date),
+            resource,
+            categories,
+            top_n,
+        ),
+    }
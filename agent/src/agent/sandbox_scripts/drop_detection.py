@@ -0,0 +1,85 @@
+"""Detect sudden drops in summed budget balances between consecutive snapshots."""
+
+from itertools import pairwise
+from typing import Any
+
+VERSION = 2
+DESCRIPTION = (
+    "Sum each resource across all budget categories for every preloaded "
+    "snapshot and report drops between consecutive snapshots. Returns a "
+    "SuddenDropAnalysisResult JSON object."
+)
+PARAMETERS: dict[str, str] = {}
+
+MIN_BASELINE_VALUE = 0.01
+
+
+def sum_resources(
+    balance: dict[str, dict[str, list[float]]],
+    index: int,
+    resource_fields: list[str],
+) -> dict[str, float]:
+    totals = dict.fromkeys(resource_fields, 0.0)
+    for columns in balance.values():
+        for resource in resource_fields:
+            if resource in columns:
+                totals[resource] += columns[resource][index]
+    return totals
+
+
+def find_drops(
+    snapshots: list[tuple[str, dict[str, float]]],
+    resource_fields: list[str],
+    threshold: float,
+) -> list[dict[str, Any]]:
+    drops: list[dict[str, Any]] = []
+    for (start_date, start), (end_date, end) in pairwise(snapshots):
+        for resource in resource_fields:
+            before = start[resource]
+            after = end[resource]
+            if before < MIN_BASELINE_VALUE or after >= before:
+                continue
+            drop_percent = (before - after) / abs(before) * 100
+            if drop_percent >= threshold:
+                drops.append(
+                    {
+                        "resource": resource,
+                        "start_date": start_date,
+                        "end_date": end_date,
+                        "start_value": before,
+                        "end_value": after,
+                        "drop_percent": drop_percent,
+                        "drop_absolute": before - after,
+                    },
+                )
+    return drops
+
+
+def main(params: dict[str, Any], data: dict[str, Any]) -> dict[str, Any]:
+    resource_fields: list[str] = params["resource_fields"]
+    threshold: float = params["drop_threshold_percent"]
+    budget: dict[str, Any] = data["budget"]
+    dates: list[str] = budget["dates"]
+
+    snapshots = [
+        (date, sum_resources(budget["balance"], index, resource_fields))
+        for index, date in enumerate(dates)
+    ]
+    drops = find_drops(snapshots, resource_fields, threshold)
+
+    if drops:
+        summary = f"Found {len(drops)} sudden drop(s): " + ", ".join(
+            d["resource"] for d in drops
+        )
+    else:
+        summary = "No sudden drops detected."
+
+    return {
+        "save_filename": data["save_filename"],
+        "analysis_period_start": dates[0] if dates else "",
+        "analysis_period_end": dates[-1] if dates else "",
+        "datapoints_analyzed": len(dates),
+        "drop_threshold_percent": threshold,
+        "sudden_drops": drops,
+        "summary": summary,
+    }
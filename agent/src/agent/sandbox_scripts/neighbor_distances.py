@@ -0,0 +1,149 @@
+"""Find the player's nearest neighbors and their diplomatic standing."""
+
+from math import dist, inf
+from typing import Any
+
+VERSION = 2
+DESCRIPTION = (
+    "Compute the minimum planet-to-planet distance from the player to every "
+    "other empire in the preloaded gamestate, attach diplomatic relations and "
+    "detect key findings. Returns every NeighborAnalysisResult field except "
+    "summary; write the summary yourself."
+)
+PARAMETERS: dict[str, str] = {}
+
+DEFAULT_MAX_NEIGHBORS = 10
+LOW_OPINION_THRESHOLD = -50.0
+HIGH_THREAT_THRESHOLD = 50.0
+
+
+def rows(columns: dict[str, list[Any]]) -> list[dict[str, Any]]:
+    names = list(columns)
+    return [
+        dict(zip(names, values, strict=True))
+        for values in zip(*columns.values(), strict=True)
+    ]
+
+
+def min_distance(
+    player_coords: list[tuple[float, float]],
+    target_coords: list[tuple[float, float]],
+) -> float:
+    return min(
+        (dist(p, t) for p in player_coords for t in target_coords),
+        default=inf,
+    )
+
+
+def detect_findings(neighbors: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    findings: list[dict[str, Any]] = []
+    for neighbor in neighbors:
+        name = neighbor["name"]
+        distance = neighbor["min_distance"]
+        if neighbor["is_hostile"]:
+            findings.append(
+                {
+                    "finding_type": "hostile_neighbor",
+                    "description": f"Hostile relationship with {name} (distance: {distance:.1f})",
+                    "severity": "critical",
+                },
+            )
+        if any(
+            "genocid" in m["modifier_type"].lower()
+            for m in neighbor["opinion_modifiers"]
+        ):
+            findings.append(
+                {
+                    "finding_type": "genocidal_reputation",
+                    "description": f"{name} considers the player genocidal",
+                    "severity": "warning",
+                },
+            )
+        opinion = neighbor["opinion"]
+        if opinion is not None and opinion < LOW_OPINION_THRESHOLD:
+            findings.append(
+                {
+                    "finding_type": "low_opinion",
+                    "description": f"{name} has a low opinion of the player ({opinion:+.0f})",
+                    "severity": "warning",
+                },
+            )
+        threat = neighbor["threat"]
+        if threat is not None and threat > HIGH_THREAT_THRESHOLD:
+            findings.append(
+                {
+                    "finding_type": "high_threat",
+                    "description": f"{name} perceives a high threat ({threat:.0f})",
+                    "severity": "info",
+                },
+            )
+    return findings
+
+
+def main(params: dict[str, Any], data: dict[str, Any]) -> dict[str, Any]:
+    max_neighbors: int = params.get("max_neighbors", DEFAULT_MAX_NEIGHBORS)
+    snapshot: dict[str, Any] = data["neighbors"]
+
+    planets: dict[str, list[Any]] = snapshot["planet_coordinates"]
+    coords = {
+        planet_id: (float(x), float(y))
+        for planet_id, x, y in zip(
+            planets["planet_id"],
+            planets["x"],
+            planets["y"],
+            strict=True,
+        )
+    }
+    relations = {
+        str(r["target_country_id"]): r for r in rows(snapshot["diplomatic_relations"])
+    }
+
+    def planet_coords(empire: dict[str, Any]) -> list[tuple[float, float]]:
+        planet_ids: list[int] = empire["owned_planet_ids"]
+        return [coords[p] for p in planet_ids if p in coords]
+
+    player: dict[str, Any] = snapshot["player_empire"] or {
+        "country_id": None,
+        "name": "",
+        "owned_planet_ids": [],
+        "owned_planet_count": 0,
+    }
+    player_coords = planet_coords(player)
+
+    neighbors: list[dict[str, Any]] = []
+    for empire in rows(snapshot["empires"]):
+        country_id = str(empire["country_id"])
+        if country_id == str(player["country_id"]):
+            continue
+        if not empire["owned_planet_count"]:
+            continue
+        distance = min_distance(player_coords, planet_coords(empire))
+        if distance == inf:
+            continue
+
+        relation: dict[str, Any] = relations.get(country_id, {})
+        neighbors.append(
+            {
+                "country_id": country_id,
+                "name": empire["name"],
+                "min_distance": distance,
+                "owned_planet_count": empire["owned_planet_count"],
+                "opinion": relation.get("opinion"),
+                "trust": relation.get("trust"),
+                "threat": relation.get("threat"),
+                "is_hostile": relation.get("is_hostile"),
+                "opinion_modifiers": relation.get("opinion_modifiers", []),
+            },
+        )
+
+    neighbors.sort(key=lambda n: n["min_distance"])
+    neighbors = neighbors[:max_neighbors]
+
+    return {
+        "save_filename": data["save_filename"],
+        "analysis_date": snapshot["date"],
+        "player_empire_name": player["name"],
+        "player_owned_planets": player["owned_planet_count"],
+        "neighbors": neighbors,
+        "key_findings": detect_findings(neighbors),
+    }
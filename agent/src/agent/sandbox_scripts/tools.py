@@ -0,0 +1,36 @@
+from typing import Any
+
+from pydantic_ai import ModelRetry
+from pydantic_ai.mcp import MCPServer
+from pydantic_ai.toolsets import FunctionToolset
+
+from agent.sandbox_data import RUN_PYTHON_CODE_TOOL, SandboxData, render_preload
+from agent.sandbox_scripts import SCRIPTS, build_host_params, render_script
+
+
+def create_script_toolset(
+    mcp_server: MCPServer,
+    data: SandboxData,
+) -> FunctionToolset[Any]:
+    """Expose the script library as a tool that executes through the MCP sandbox."""
+    preload = render_preload(data)
+
+    async def run_sandbox_script(script_name: str, params: dict[str, Any]) -> Any:
+        """Run a pre-built analysis script in the sandbox and return its output.
+
+        Args:
+            script_name: Name of the script from the pre-built script catalog.
+            params: Script parameters as listed in the catalog.
+        """
+        if script_name not in SCRIPTS:
+            available = ", ".join(SCRIPTS)
+            raise ModelRetry(
+                f"Unknown script '{script_name}'. Available scripts: {available}",
+            )
+        code = render_script(script_name, {**build_host_params(), **params})
+        return await mcp_server.direct_call_tool(
+            RUN_PYTHON_CODE_TOOL,
+            {"python_code": preload + code},
+        )
+
+    return FunctionToolset([run_sandbox_script])
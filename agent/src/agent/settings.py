@@ -9,9 +9,11 @@ from pydantic_settings import BaseSettings
 from tenacity import retry_if_exception_type, stop_after_attempt, wait_exponential
 
 if TYPE_CHECKING:
-    from agent.graphql_client import Client
+    from agent.graphql_coalescing import CoalescingSession
 
 GRAPHQL_TIMEOUT_SECONDS = 180.0
+DEFAULT_BATCH_WINDOW_SECONDS = 0.005
+DEFAULT_MAX_BATCH_SIZE = 32
 MCP_TIMEOUT_SECONDS = 180.0
 
 
@@ -49,9 +51,21 @@ class Settings(BaseSettings):
     stellaris_stats_db_user: str
     stellaris_stats_db_password: str
 
-    # Eval GraphQL server host (for sandbox to reach the test server)
-    # Optional: only needed when running evals
-    stellaris_stats_eval_graphql_server_host: str = ""
+    # Local SQLite file where eval reports are stored for regression comparison
+    stellaris_stats_eval_results_path: str = ".eval-results.sqlite3"
+
+    # Local SQLite cache for analysis results, reused until the save or prompts change
+    stellaris_stats_result_cache_path: str = ".analysis-cache.sqlite3"
+    stellaris_stats_result_cache_ttl_seconds: float = 7 * 24 * 60 * 60
+    stellaris_stats_result_cache_max_entries: int = 256
+
+    # GraphQL operations issued within this window share one batched request; 0 disables
+    stellaris_stats_graphql_batch_window_seconds: float = DEFAULT_BATCH_WINDOW_SECONDS
+    # Send operations as codegen-time SHA-256 hashes (automatic persisted queries)
+    stellaris_stats_graphql_persisted_queries: bool = True
+
+    # Local SQLite mirror of save data, read before the GraphQL server; unset disables
+    stellaris_stats_local_store_path: str | None = None
 
     @property
     def graphql_url(self) -> str:
@@ -63,12 +77,38 @@ class Settings(BaseSettings):
         """Get the Python sandbox MCP server URL."""
         return self.stellaris_stats_python_sandbox_url
 
-    def create_graphql_client(self) -> Client:
-        """Create a GraphQL client with retry logic and timeout configuration."""
-        from agent.graphql_client import Client
+    def create_graphql_client(self) -> CoalescingSession:
+        """Create a GraphQL client with retry logic, timeout, batching and persisted queries.
+
+        Identical concurrent operations share one request. With a local store
+        path set, the client reads save data from the local mirror first and
+        syncs new gamestates into it.
+        """
+        from agent.graphql_batching import BatchingClient
+        from agent.graphql_coalescing import CoalescingSession
+        from agent.local_store import LocalStore, LocalStoreClient
 
         http_client = create_resilient_http_client(GRAPHQL_TIMEOUT_SECONDS)
-        return Client(url=self.graphql_url, http_client=http_client)
+        window = self.stellaris_stats_graphql_batch_window_seconds
+        client = BatchingClient(
+            url=self.graphql_url,
+            http_client=http_client,
+            window_seconds=max(window, 0.0),
+            # A batch of one is sent as soon as it is queued
+            max_batch_size=DEFAULT_MAX_BATCH_SIZE if window > 0 else 1,
+            persisted_queries=self.stellaris_stats_graphql_persisted_queries,
+        )
+        if self.stellaris_stats_local_store_path is None:
+            return CoalescingSession(client)
+        return CoalescingSession(
+            LocalStoreClient(
+                client,
+                LocalStore(
+                    self.stellaris_stats_local_store_path,
+                    source=self.graphql_url,
+                ),
+            ),
+        )
 
 
 @lru_cache(maxsize=1)
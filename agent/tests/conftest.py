@@ -3,8 +3,12 @@ from pathlib import Path
 import pytest
 
 from agent.graphql_client import (
+    GetBalanceTotals,
     GetBudget,
     GetDates,
+    GetEmpirePower,
+    GetIncomeExpenses,
+    GetNeighborData,
     ListSaves,
     ListSavesSaves,
 )
@@ -19,11 +23,27 @@ class MockClient:
         saves: list[ListSavesSaves] | None = None,
         budgets: dict[str, GetBudget] | None = None,
         dates: dict[str, GetDates] | None = None,
+        income_expenses: dict[str, GetIncomeExpenses] | None = None,
+        neighbor_data: dict[str, GetNeighborData] | None = None,
+        balance_totals: dict[str, GetBalanceTotals] | None = None,
+        empire_power: dict[str, GetEmpirePower] | None = None,
     ) -> None:
         super().__init__()
         self.saves: list[ListSavesSaves] = saves if saves is not None else []
         self.budgets: dict[str, GetBudget] = budgets if budgets is not None else {}
         self.dates: dict[str, GetDates] = dates if dates is not None else {}
+        self.income_expenses: dict[str, GetIncomeExpenses] = (
+            income_expenses if income_expenses is not None else {}
+        )
+        self.neighbor_data: dict[str, GetNeighborData] = (
+            neighbor_data if neighbor_data is not None else {}
+        )
+        self.balance_totals: dict[str, GetBalanceTotals] = (
+            balance_totals if balance_totals is not None else {}
+        )
+        self.empire_power: dict[str, GetEmpirePower] = (
+            empire_power if empire_power is not None else {}
+        )
 
     async def list_saves(self, **kwargs: object) -> ListSaves:
         return ListSaves(saves=self.saves)
@@ -34,6 +54,34 @@ class MockClient:
     async def get_budget(self, filename: str, **kwargs: object) -> GetBudget:
         return self.budgets.get(filename, GetBudget(save=None))
 
+    async def get_income_expenses(
+        self,
+        filename: str,
+        **kwargs: object,
+    ) -> GetIncomeExpenses:
+        return self.income_expenses.get(filename, GetIncomeExpenses(save=None))
+
+    async def get_balance_totals(
+        self,
+        filename: str,
+        **kwargs: object,
+    ) -> GetBalanceTotals:
+        return self.balance_totals.get(filename, GetBalanceTotals(save=None))
+
+    async def get_empire_power(
+        self,
+        filename: str,
+        **kwargs: object,
+    ) -> GetEmpirePower:
+        return self.empire_power.get(filename, GetEmpirePower(save=None))
+
+    async def get_neighbor_data(
+        self,
+        filename: str,
+        **kwargs: object,
+    ) -> GetNeighborData:
+        return self.neighbor_data.get(filename, GetNeighborData(save=None))
+
 
 @pytest.fixture
 def empty_mock_client() -> MockClient:
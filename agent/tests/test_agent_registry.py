@@ -0,0 +1,112 @@
+from pydantic_ai import Agent
+from pydantic_ai.models.test import TestModel
+
+from agent.agent_registry import AgentKey, AgentRegistry
+
+
+class _CountingFactory:
+    def __init__(self) -> None:
+        super().__init__()
+        self.models: list[str] = []
+
+    def __call__(self, model_name: str) -> Agent[None, str]:
+        self.models.append(model_name)
+        return Agent(TestModel(), name=model_name)
+
+
+class TestGetAgent:
+    def test_builds_once_per_key(self) -> None:
+        registry = AgentRegistry()
+        factory = _CountingFactory()
+        key = AgentKey("kind", "model-a", "http://a/graphql")
+
+        first = registry.get_agent(key, factory)
+        second = registry.get_agent(key, factory)
+
+        assert first is second
+        assert factory.models == ["model-a"]
+
+    def test_every_key_part_separates_agents(self) -> None:
+        registry = AgentRegistry()
+        factory = _CountingFactory()
+
+        agents = {
+            id(registry.get_agent(key, factory))
+            for key in (
+                AgentKey("kind", "model-a", "http://a/graphql"),
+                AgentKey("other", "model-a", "http://a/graphql"),
+                AgentKey("kind", "model-b", "http://a/graphql"),
+                AgentKey("kind", "model-a", "http://b/graphql"),
+            )
+        }
+
+        assert len(agents) == 4
+        assert factory.models == ["model-a", "model-a", "model-b", "model-a"]
+
+
+class TestGetPrompt:
+    def test_builds_once_per_kind(self) -> None:
+        registry = AgentRegistry()
+        calls: list[str] = []
+
+        def builder() -> str:
+            calls.append("built")
+            return "system prompt"
+
+        assert registry.get_prompt("kind", builder) == "system prompt"
+        assert registry.get_prompt("kind", builder) == "system prompt"
+        assert calls == ["built"]
+
+
+class TestInvalidate:
+    def _populated(self) -> AgentRegistry:
+        registry = AgentRegistry()
+        factory = _CountingFactory()
+        for key in (
+            AgentKey("kind", "model-a", "http://a/graphql"),
+            AgentKey("kind", "model-b", "http://a/graphql"),
+            AgentKey("other", "model-a", "http://b/graphql"),
+        ):
+            registry.get_agent(key, factory)
+        registry.get_prompt("kind", lambda: "kind prompt")
+        registry.get_prompt("other", lambda: "other prompt")
+        return registry
+
+    def test_by_model(self) -> None:
+        registry = self._populated()
+
+        assert registry.invalidate(model_name="model-a") == 2
+        assert list(registry.agents) == [
+            AgentKey("kind", "model-b", "http://a/graphql"),
+        ]
+        assert set(registry.prompts) == {"kind", "other"}
+
+    def test_by_kind_drops_prompt(self) -> None:
+        registry = self._populated()
+
+        assert registry.invalidate(kind="kind") == 2
+        assert set(registry.prompts) == {"other"}
+
+    def test_by_graphql_url(self) -> None:
+        registry = self._populated()
+
+        assert registry.invalidate(graphql_url="http://b/graphql") == 1
+        assert len(registry.agents) == 2
+
+    def test_everything(self) -> None:
+        registry = self._populated()
+
+        assert registry.invalidate() == 3
+        assert registry.agents == {}
+        assert registry.prompts == {}
+
+    def test_rebuilds_after_invalidation(self) -> None:
+        registry = AgentRegistry()
+        factory = _CountingFactory()
+        key = AgentKey("kind", "model-a")
+
+        first = registry.get_agent(key, factory)
+        registry.invalidate(kind="kind")
+
+        assert registry.get_agent(key, factory) is not first
+        assert factory.models == ["model-a", "model-a"]
@@ -0,0 +1,93 @@
+import random
+import time
+
+import pytest
+
+from agent.analysis_config import RESOURCE_FIELDS
+from agent.anomaly import detect_anomalies
+from agent.drop_detection import scan_drop_history
+from agent.models import AnomalyMethod
+
+
+def _dates(count: int) -> list[str]:
+    return [f"d{index:04d}" for index in range(count)]
+
+
+def _noisy(count: int, level: float, spread: float, seed: int) -> list[float]:
+    rng = random.Random(seed)
+    return [level + rng.gauss(0, spread) for _ in range(count)]
+
+
+class TestDetectAnomalies:
+    def test_sudden_drop_scored_against_own_history(self) -> None:
+        column = [100.0 + index % 3 for index in range(30)] + [40.0] * 10
+
+        anomalies = detect_anomalies(_dates(40), {"energy": column})
+
+        assert len(anomalies) == 1
+        anomaly = anomalies[0]
+        assert (anomaly.start_date, anomaly.end_date) == ("d0029", "d0030")
+        assert anomaly.methods == [AnomalyMethod.ROBUST_Z]
+        assert 0.5 < anomaly.confidence < 1
+        assert anomaly.drop_absolute == 62.0
+
+    def test_slow_bleed_below_percentage_threshold(self) -> None:
+        column = [100.0] * 30 + [100.0 - 2 * step for step in range(1, 21)]
+        dates = _dates(50)
+
+        assert scan_drop_history(dates, {"energy": column}) == []
+        anomalies = detect_anomalies(dates, {"energy": column})
+
+        assert [a.methods for a in anomalies] == [[AnomalyMethod.EWMA]]
+        assert anomalies[0].start_date == "d0029"
+        assert anomalies[0].end_value == 60.0
+
+    def test_volatile_small_resource_is_rarely_flagged(self) -> None:
+        rng = random.Random(7)
+        column = [5.0 + rng.choice((-3.0, 3.0)) for _ in range(200)]
+        dates = _dates(200)
+
+        assert len(scan_drop_history(dates, {"influence": column})) > 20
+        assert len(detect_anomalies(dates, {"influence": column})) <= 2
+
+    def test_few_false_positives_on_noise(self) -> None:
+        columns = {
+            resource: _noisy(1000, 100.0, 5.0, seed)
+            for seed, resource in enumerate(RESOURCE_FIELDS)
+        }
+
+        anomalies = detect_anomalies(_dates(1000), columns)
+
+        assert len(anomalies) < 50
+
+    def test_rises_and_negative_values_are_ignored(self) -> None:
+        rising = [float(index) for index in range(40)]
+        deficit = [-10.0] * 30 + [-100.0] * 10
+
+        assert detect_anomalies(_dates(40), {"a": rising, "b": deficit}) == []
+
+    def test_agreeing_detectors_raise_confidence(self) -> None:
+        column = [100.0] * 30 + [97.0, 94.0, 91.0, 88.0, 20.0, 20.0]
+
+        anomalies = detect_anomalies(_dates(36), {"energy": column})
+
+        assert len(anomalies) == 1
+        assert anomalies[0].methods == [AnomalyMethod.EWMA, AnomalyMethod.ROBUST_Z]
+        assert anomalies[0].confidence > 0.9
+
+    def test_rejects_invalid_parameters(self) -> None:
+        with pytest.raises(ValueError, match="Window"):
+            detect_anomalies([], {}, window=2)
+        with pytest.raises(ValueError, match="alpha"):
+            detect_anomalies([], {}, ewma_alpha=0.0)
+
+    def test_thousand_gamestates_fast_enough_for_every_ingest(self) -> None:
+        columns = {
+            resource: _noisy(1000, 1000.0, 20.0, seed)
+            for seed, resource in enumerate(RESOURCE_FIELDS)
+        }
+
+        started = time.perf_counter()
+        detect_anomalies(_dates(1000), columns)
+
+        assert time.perf_counter() - started < 1.0
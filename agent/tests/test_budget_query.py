@@ -0,0 +1,160 @@
+import json
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+from graphql import build_schema, parse, validate
+
+from agent.analysis_config import BUDGET_CATEGORIES, RESOURCE_FIELDS
+from agent.budget_query import (
+    CATEGORY_ALIASES,
+    RESOURCE_ALIASES,
+    BudgetSelection,
+    build_budget_query,
+    complete_budget_data,
+    parse_budget_selection,
+)
+from agent.sandbox_data import fetch_selected_budget_data
+
+SCHEMA = build_schema(
+    (Path(__file__).parents[2] / "graphql" / "schema.graphql").read_text(),
+)
+SINGLE_RESOURCE = BudgetSelection(
+    resources=("energy",),
+    sections=("income", "expenses"),
+)
+
+
+def _fake_response(
+    selection: BudgetSelection,
+    gamestates: int = 2,
+    *,
+    aliased: bool = True,
+) -> dict[str, Any]:
+    """Build a response like the server's to `build_budget_query(selection)`."""
+    section = {
+        CATEGORY_ALIASES[category] if aliased else category: {
+            RESOURCE_ALIASES[resource] if aliased else resource: 1.5
+            for resource in selection.resources
+        }
+        for category in selection.categories
+    }
+    return {
+        "save": {
+            "gamestates": [
+                {
+                    "date": f"2200-0{month + 1}-01T00:00:00Z",
+                    "budget": dict.fromkeys(selection.sections, section),
+                }
+                for month in range(gamestates)
+            ],
+        },
+    }
+
+
+class _Executor:
+    def __init__(self, data: dict[str, Any]) -> None:
+        super().__init__()
+        self.data = data
+        self.queries: list[str] = []
+
+    async def execute(
+        self,
+        query: str,
+        operation_name: str | None = None,
+        variables: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        self.queries.append(query)
+        return httpx.Response(200, json={"data": self.data})
+
+    def get_data(self, response: httpx.Response) -> dict[str, Any]:
+        data: dict[str, Any] = response.json()["data"]
+        return data
+
+
+class TestBudgetSelection:
+    def test_rejects_unknown_names(self) -> None:
+        with pytest.raises(ValueError, match="resource: gold"):
+            BudgetSelection(resources=("gold",))
+        with pytest.raises(ValueError, match="category: ships2"):
+            BudgetSelection(categories=("ships2",))
+
+    def test_rejects_empty_selection(self) -> None:
+        with pytest.raises(ValueError, match="at least one section"):
+            BudgetSelection(sections=())
+
+    def test_known_names_match_schema(self) -> None:
+        entry = SCHEMA.get_type("BudgetEntry")
+        category = SCHEMA.get_type("BudgetCategory")
+        assert entry is not None and category is not None
+        assert set(RESOURCE_FIELDS) == set(getattr(entry, "fields", {}))
+        assert set(BUDGET_CATEGORIES) == set(getattr(category, "fields", {}))
+
+
+class TestBuildBudgetQuery:
+    @pytest.mark.parametrize(
+        "selection",
+        [
+            BudgetSelection(),
+            SINGLE_RESOURCE,
+            BudgetSelection(resources=("alloys", "unity"), categories=("ships",)),
+        ],
+    )
+    def test_validates_against_schema(self, selection: BudgetSelection) -> None:
+        assert validate(SCHEMA, parse(build_budget_query(selection))) == []
+
+    def test_selects_only_requested_fields(self) -> None:
+        query = build_budget_query(SINGLE_RESOURCE)
+
+        assert "balance" not in query
+        assert "minerals" not in query
+        assert query.count(": energy") == 2 * len(BUDGET_CATEGORIES)
+
+    def test_single_resource_payload_is_much_smaller(self) -> None:
+        # The generated GetBudget and GetIncomeExpenses queries select everything
+        full = len(json.dumps(_fake_response(BudgetSelection(), aliased=False)))
+        single = len(json.dumps(_fake_response(SINGLE_RESOURCE)))
+
+        assert full / single > 20
+
+
+class TestParseBudgetSelection:
+    def test_fills_pruned_fields_with_null(self) -> None:
+        selection = BudgetSelection(resources=("energy",), categories=("ships",))
+        completed = complete_budget_data(_fake_response(selection))
+
+        budget = completed["save"]["gamestates"][0]["budget"]
+        assert budget["income"]["ships"]["energy"] == 1.5
+        assert budget["income"]["ships"]["minerals"] is None
+        assert budget["income"]["armies"] is None
+
+    def test_parses_into_generated_models(self) -> None:
+        result = parse_budget_selection(_fake_response(SINGLE_RESOURCE))
+
+        assert result.income_expenses.save is not None
+        flows = result.income_expenses.save.gamestates[0].budget
+        assert flows.income.ships is not None
+        assert flows.income.ships.energy == 1.5
+        assert flows.income.ships.alloys is None
+        assert result.balance.save is not None
+        assert result.balance.save.gamestates[0].budget.balance.ships is None
+
+    def test_missing_save_parses_to_none(self) -> None:
+        result = parse_budget_selection({"save": None})
+
+        assert result.balance.save is None
+        assert result.income_expenses.save is None
+
+
+class TestFetchSelectedBudgetData:
+    async def test_includes_only_selected_columns(self) -> None:
+        executor = _Executor(_fake_response(SINGLE_RESOURCE))
+
+        data = await fetch_selected_budget_data(executor, "a.sav", SINGLE_RESOURCE)
+
+        budget = data["budget"]
+        assert set(budget) == {"dates", "income", "expenses"}
+        assert set(budget["income"]["ships"]) == {"energy"}
+        assert len(executor.queries) == 1
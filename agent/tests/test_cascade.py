@@ -0,0 +1,105 @@
+import pytest
+from pydantic_ai.exceptions import UnexpectedModelBehavior, UsageLimitExceeded
+from pydantic_ai.usage import UsageLimits
+
+from agent.cascade import run_with_cascade
+from agent.constants import CascadePolicy, CascadeStats, EscalationReason
+
+POLICY = CascadePolicy(
+    cheap_model="cheap",
+    strong_model="strong",
+    cheap_tool_calls_limit=3,
+)
+
+
+class RecordingRun:
+    def __init__(self, cheap_error: Exception | None = None) -> None:
+        super().__init__()
+        self.cheap_error = cheap_error
+        self.calls: list[tuple[str, UsageLimits | None]] = []
+
+    async def __call__(self, model: str, usage_limits: UsageLimits | None) -> str:
+        self.calls.append((model, usage_limits))
+        if model == "cheap" and self.cheap_error is not None:
+            raise self.cheap_error
+        return f"{model} output"
+
+
+class TestRunWithCascade:
+    async def test_cheap_model_success(self) -> None:
+        run = RecordingRun()
+        stats = CascadeStats()
+
+        output = await run_with_cascade(run, policy=POLICY, stats=stats)
+
+        assert output == "cheap output"
+        assert [model for model, _ in run.calls] == ["cheap"]
+        limits = run.calls[0][1]
+        assert limits is not None
+        assert limits.tool_calls_limit == 3
+        assert stats.runs == 1
+        assert stats.escalation_rate == 0.0
+
+    @pytest.mark.parametrize(
+        ("error", "reason"),
+        [
+            (
+                UnexpectedModelBehavior("bad output"),
+                EscalationReason.VALIDATION_FAILED,
+            ),
+            (
+                UsageLimitExceeded("too many tool calls"),
+                EscalationReason.TOOL_CALL_BUDGET_EXCEEDED,
+            ),
+        ],
+    )
+    async def test_escalates_on_cheap_failure(
+        self,
+        error: Exception,
+        reason: EscalationReason,
+    ) -> None:
+        run = RecordingRun(cheap_error=error)
+        stats = CascadeStats()
+
+        output = await run_with_cascade(run, policy=POLICY, stats=stats)
+
+        assert output == "strong output"
+        assert run.calls[1] == ("strong", None)
+        assert stats.escalations == {reason: 1}
+
+    async def test_escalates_when_cross_check_disagrees(self) -> None:
+        run = RecordingRun()
+        stats = CascadeStats()
+        checked: list[str] = []
+
+        async def cross_check(output: str) -> bool:
+            checked.append(output)
+            return False
+
+        output = await run_with_cascade(run, cross_check, POLICY, stats)
+
+        assert output == "strong output"
+        assert checked == ["cheap output"]
+        assert stats.escalations == {EscalationReason.CROSS_CHECK_DISAGREED: 1}
+
+    async def test_other_errors_propagate(self) -> None:
+        run = RecordingRun(cheap_error=ValueError("boom"))
+
+        with pytest.raises(ValueError, match="boom"):
+            await run_with_cascade(run, policy=POLICY, stats=CascadeStats())
+
+
+class TestCascadeStats:
+    def test_escalation_rate(self) -> None:
+        stats = CascadeStats()
+        stats.record(None)
+        stats.record(None)
+        stats.record(EscalationReason.VALIDATION_FAILED)
+        stats.record(EscalationReason.VALIDATION_FAILED)
+
+        assert stats.runs == 4
+        assert stats.escalation_count == 2
+        assert stats.escalation_rate == 0.5
+
+    def test_empty_stats(self) -> None:
+        assert CascadeStats().escalation_rate == 0.0
@@ -0,0 +1,238 @@
+import time
+from typing import Any
+
+import pytest
+
+from agent.analysis_config import BUDGET_CATEGORIES, RESOURCE_FIELDS
+from agent.category_movers import (
+    BudgetFlow,
+    build_category_series,
+    contributors_agree,
+    find_category_movers,
+    rank_drop_categories,
+    run_category_movers_scan,
+)
+from agent.graphql_client import GetIncomeExpenses
+from agent.models import CategoryContributor, ContributorType, SuddenDrop
+from agent.sandbox_data import BudgetColumns
+
+from .conftest import MockClient
+
+DATES = ["d0", "d1", "d2", "d3"]
+
+
+def _section(values: dict[str, dict[str, float]]) -> dict[str, Any]:
+    section: dict[str, Any] = dict.fromkeys(BUDGET_CATEGORIES)
+    for category, entry in values.items():
+        section[category] = {**dict.fromkeys(RESOURCE_FIELDS), **entry}
+    return section
+
+
+def _income_expenses(
+    income: list[dict[str, dict[str, float]]],
+    expenses: list[dict[str, dict[str, float]]],
+) -> GetIncomeExpenses:
+    gamestates = [
+        {
+            "date": f"22{index:02d}-01-01T00:00:00Z",
+            "budget": {"income": _section(inc), "expenses": _section(exp)},
+        }
+        for index, (inc, exp) in enumerate(zip(income, expenses, strict=True))
+    ]
+    return GetIncomeExpenses.model_validate({"save": {"gamestates": gamestates}})
+
+
+def _flows(
+    income: BudgetColumns,
+    expenses: BudgetColumns,
+) -> dict[BudgetFlow, BudgetColumns]:
+    return {"income": income, "expenses": expenses}
+
+
+def _drop(start: str = "d0", end: str = "d3") -> SuddenDrop:
+    return SuddenDrop(
+        resource="energy",
+        start_date=start,
+        end_date=end,
+        start_value=100.0,
+        end_value=10.0,
+        drop_percent=90.0,
+        drop_absolute=90.0,
+    )
+
+
+def _contributor(category: str, rank: int) -> CategoryContributor:
+    return CategoryContributor(
+        category=category,
+        resource="energy",
+        contributor_type=ContributorType.INCOME_DECREASED,
+        before_value=10.0,
+        after_value=0.0,
+        change_absolute=10.0,
+        change_percent=-100.0,
+        rank=rank,
+    )
+
+
+class TestFindCategoryMovers:
+    def test_income_fall_and_expense_rise_are_ranked_by_impact(self) -> None:
+        flows = _flows(
+            {
+                "planetJobs": {"energy": [100.0, 100.0, 60.0, 60.0]},
+                "planetMiners": {"minerals": [50.0, 50.0, 50.0, 45.0]},
+            },
+            {"ships": {"energy": [20.0, 30.0, 30.0, 30.0]}},
+        )
+
+        movers = find_category_movers(DATES, flows)
+
+        assert [(m.category, m.rank) for m in movers] == [
+            ("planetJobs", 1),
+            ("planetMiners", 2),
+            ("ships", 3),
+        ]
+        jobs, miners, ships = movers
+        assert jobs.contributor_type == ContributorType.INCOME_DECREASED
+        assert (jobs.start_date, jobs.end_date) == ("d1", "d2")
+        assert jobs.change_absolute == 40.0
+        assert jobs.change_percent == -40.0
+        assert jobs.impact_percent == 40.0
+        assert miners.impact_percent == 10.0
+        assert ships.contributor_type == ContributorType.EXPENSES_INCREASED
+        assert ships.change_percent == 50.0
+
+    def test_offsetting_moves_inside_a_stable_total_are_found(self) -> None:
+        flows = _flows(
+            {
+                "planetJobs": {"energy": [100.0, 100.0, 50.0, 50.0]},
+                "tradePolicy": {"energy": [0.0, 0.0, 50.0, 50.0]},
+            },
+            {},
+        )
+
+        movers = find_category_movers(DATES, flows)
+
+        assert [m.category for m in movers] == ["planetJobs"]
+
+    def test_small_moves_and_improvements_are_ignored(self) -> None:
+        flows = _flows(
+            {"planetJobs": {"energy": [100.0, 98.0, 120.0, 130.0]}},
+            {"ships": {"energy": [40.0, 20.0, 10.0, 10.0]}},
+        )
+
+        assert find_category_movers(DATES, flows) == []
+
+    def test_new_expense_without_income_has_bounded_impact(self) -> None:
+        flows = _flows({}, {"edicts": {"influence": [0.0, 0.0, 2.0, 2.0]}})
+
+        (mover,) = find_category_movers(DATES, flows)
+
+        assert mover.change_percent == 100.0
+        assert mover.impact_percent == 200.0
+
+    def test_top_limits_the_result(self) -> None:
+        flows = _flows(
+            {
+                category: {"energy": [10.0, 10.0, 5.0, 5.0]}
+                for category in BUDGET_CATEGORIES
+            },
+            {},
+        )
+
+        movers = find_category_movers(DATES, flows, top=3, min_impact_percent=0.0)
+
+        assert [m.rank for m in movers] == [1, 2, 3]
+
+    def test_every_series_of_a_long_history_in_well_under_a_second(self) -> None:
+        count = 300
+        dates = [str(index) for index in range(count)]
+        column = [10.0 + index % 7 for index in range(count)]
+        flows = _flows(
+            {c: dict.fromkeys(RESOURCE_FIELDS, column) for c in BUDGET_CATEGORIES},
+            {c: dict.fromkeys(RESOURCE_FIELDS, column) for c in BUDGET_CATEGORIES},
+        )
+
+        started = time.perf_counter()
+        find_category_movers(dates, flows)
+
+        assert time.perf_counter() - started < 1.0
+
+
+class TestRunCategoryMoversScan:
+    async def test_scans_income_and_expenses(self) -> None:
+        income_expenses = _income_expenses(
+            [
+                {"planetJobs": {"energy": 100.0}},
+                {"planetJobs": {"energy": 100.0}},
+                {"planetJobs": {"energy": 70.0}},
+            ],
+            [
+                {"ships": {"energy": 10.0}},
+                {"ships": {"energy": 30.0}},
+                {"ships": {"energy": 30.0}},
+            ],
+        )
+        client = MockClient(income_expenses={"save": income_expenses})
+
+        result = await run_category_movers_scan("save", client=client)
+
+        assert result.gamestates_scanned == 3
+        assert result.series_scanned == 2
+        assert [m.category for m in result.movers] == ["planetJobs", "ships"]
+        assert result.summary.startswith("Found 2 significant category move(s)")
+
+    async def test_missing_save(self) -> None:
+        with pytest.raises(ValueError, match="not found"):
+            await run_category_movers_scan("missing", client=MockClient())
+
+
+class TestBuildCategorySeries:
+    def test_omits_all_zero_series(self) -> None:
+        income_expenses = _income_expenses(
+            [{"planetJobs": {"energy": 1.0, "minerals": 0.0}}],
+            [{}],
+        )
+
+        dates, flows = build_category_series(income_expenses, "save")
+
+        assert len(dates) == 1
+        assert flows == {"income": {"planetJobs": {"energy": [1.0]}}, "expenses": {}}
+
+
+class TestRankDropCategories:
+    def test_ranks_adverse_moves_of_the_dropped_resource(self) -> None:
+        flows = _flows(
+            {
+                "planetJobs": {"energy": [100.0, 90.0, 80.0, 40.0]},
+                "colonies": {"energy": [10.0, 10.0, 10.0, 30.0]},
+                "planetMiners": {"minerals": [50.0, 0.0, 0.0, 0.0]},
+            },
+            {
+                "ships": {"energy": [20.0, 30.0, 30.0, 45.0]},
+                "colonies": {"energy": [0.0, 0.0, 0.0, 5.0]},
+            },
+        )
+
+        assert rank_drop_categories(DATES, flows, _drop()) == ["planetJobs", "ships"]
+        assert rank_drop_categories(DATES, flows, _drop(), top=1) == ["planetJobs"]
+
+    def test_unknown_dates(self) -> None:
+        assert rank_drop_categories(DATES, _flows({}, {}), _drop(end="d9")) is None
+
+
+class TestContributorsAgree:
+    def test_leading_contributor_must_be_expected(self) -> None:
+        expected = ["planetJobs", "ships"]
+
+        assert contributors_agree(
+            expected,
+            [_contributor("edicts", 2), _contributor("ships", 1)],
+        )
+        assert not contributors_agree(
+            expected,
+            [_contributor("edicts", 1), _contributor("ships", 2)],
+        )
+        assert not contributors_agree(expected, [])
+
+    def test_nothing_to_contradict(self) -> None:
+        assert contributors_agree([], [_contributor("edicts", 1)])
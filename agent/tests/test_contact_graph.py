@@ -0,0 +1,214 @@
+import random
+import time
+from typing import Any
+
+from agent.graphql_client import GetNeighborData
+from agent.neighbor.contact_graph import (
+    UNREACHABLE,
+    ContactGraph,
+    EdgeKind,
+    bordering_clusters,
+    build_contact_findings,
+    build_contact_graph,
+    build_graph,
+    connected_components,
+    hops_from,
+    latest_contact_findings,
+)
+from agent.neighbor.distance_matrix import DistanceMatrix, compute_distance_matrix
+
+BORDER = int(EdgeKind.BORDER)
+CONTACT = int(EdgeKind.CONTACT)
+
+
+def _graph(
+    size: int,
+    edges: dict[tuple[int, int], int],
+    player: int | None = 0,
+) -> ContactGraph:
+    return build_graph(
+        [str(node) for node in range(size)],
+        [f"Empire {node}" for node in range(size)],
+        edges,
+        player,
+    )
+
+
+def _relation(
+    target: str,
+    *,
+    contact: bool = True,
+    border_range: float | None = None,
+) -> dict[str, Any]:
+    return {
+        "targetCountryId": target,
+        "targetEmpireName": f"Empire {target}",
+        "opinion": 0.0,
+        "trust": None,
+        "threat": None,
+        "isHostile": False,
+        "borderRange": border_range,
+        "hasContact": contact,
+        "hasCommunications": contact,
+        "opinionModifiers": [],
+    }
+
+
+def _neighbor_data(relations: list[dict[str, Any]]) -> GetNeighborData:
+    return GetNeighborData.model_validate(
+        {
+            "save": {
+                "gamestates": [
+                    {
+                        "date": "2200-01-01T00:00:00Z",
+                        "playerEmpire": {
+                            "countryId": "0",
+                            "name": "Player",
+                            "ownedPlanetIds": [],
+                            "ownedPlanetCount": 0,
+                        },
+                        "empires": [],
+                        "diplomaticRelations": relations,
+                        "allPlanetCoordinates": [],
+                    },
+                ],
+            },
+        },
+    )
+
+
+def _distances(points: dict[str, tuple[float, float]]) -> DistanceMatrix:
+    return compute_distance_matrix(
+        {country_id: [point] for country_id, point in points.items()},
+        {country_id: f"Empire {country_id}" for country_id in points},
+    )
+
+
+class TestBuildGraph:
+    def test_packs_edges_in_both_directions(self) -> None:
+        graph = _graph(3, {(0, 1): BORDER, (1, 2): CONTACT | BORDER})
+
+        assert list(graph.offsets) == [0, 1, 3, 4]
+        assert sorted(graph.neighbors(1)) == [0, 2]
+        assert list(graph.neighbors(0, EdgeKind.CONTACT)) == []
+        assert graph.edge_kind(2, 1) == EdgeKind.CONTACT | EdgeKind.BORDER
+        assert graph.edge_kind(0, 2) == EdgeKind(0)
+
+
+class TestGraphSearch:
+    def test_components_largest_first(self) -> None:
+        graph = _graph(6, {(0, 1): BORDER, (1, 2): BORDER, (4, 5): CONTACT})
+
+        assert [sorted(c) for c in connected_components(graph)] == [
+            [0, 1, 2],
+            [4, 5],
+            [3],
+        ]
+
+    def test_hops(self) -> None:
+        graph = _graph(5, {(0, 1): BORDER, (1, 2): BORDER, (2, 3): CONTACT})
+
+        assert list(hops_from(graph, 0)) == [0, 1, 2, 3, UNREACHABLE]
+        assert list(hops_from(graph, 0, EdgeKind.BORDER))[3] == UNREACHABLE
+
+    def test_bordering_clusters_can_exclude_a_node(self) -> None:
+        graph = _graph(4, {(0, 1): BORDER, (0, 2): BORDER, (2, 3): BORDER})
+
+        assert [sorted(c) for c in bordering_clusters(graph)] == [[0, 1, 2, 3]]
+        assert [sorted(c) for c in bordering_clusters(graph, excluded=0)] == [[2, 3]]
+
+    def test_hundreds_of_empires_are_fast(self) -> None:
+        rng = random.Random(5)
+        size = 500
+        edges = {
+            (a, b): BORDER
+            for a in range(size)
+            for b in rng.sample(range(a + 1, size + a + 1), 4)
+            if b < size
+        }
+        graph = _graph(size, edges)
+
+        start = time.perf_counter()
+        connected_components(graph)
+        hops_from(graph, 0)
+        bordering_clusters(graph, excluded=0)
+
+        assert time.perf_counter() - start < 1.0
+
+
+class TestBuildContactGraph:
+    def test_combines_relations_and_planet_proximity(self) -> None:
+        data = _neighbor_data(
+            [_relation("1", border_range=10.0), _relation("2", contact=False)],
+        )
+        assert data.save is not None
+        distances = _distances({"1": (0.0, 0.0), "2": (30.0, 0.0), "3": (500.0, 0.0)})
+
+        graph = build_contact_graph(data.save.gamestates[0], distances)
+
+        assert graph.country_ids == ["1", "2", "3", "0"]
+        player = graph.country_ids.index("0")
+        assert graph.edge_kind(player, 0) == (
+            EdgeKind.CONTACT | EdgeKind.COMMUNICATIONS | EdgeKind.BORDER
+        )
+        assert graph.edge_kind(player, 1) == EdgeKind(0)
+        assert graph.edge_kind(0, 1) == EdgeKind.BORDER
+        assert list(graph.neighbors(2)) == []
+
+    def test_player_borders_come_from_border_range_only(self) -> None:
+        data = _neighbor_data(
+            [_relation("1", border_range=30.0), _relation("2", border_range=5.0)],
+        )
+        assert data.save is not None
+        distances = _distances({"0": (0.0, 0.0), "1": (1.0, 0.0), "2": (900.0, 0.0)})
+
+        graph = build_contact_graph(data.save.gamestates[0], distances)
+
+        player = graph.country_ids.index("0")
+        one, two = graph.country_ids.index("1"), graph.country_ids.index("2")
+        assert not graph.edge_kind(player, one) & EdgeKind.BORDER
+        assert graph.edge_kind(player, two) & EdgeKind.BORDER
+
+
+class TestContactFindings:
+    def test_rival_bloc_on_player_border(self) -> None:
+        graph = _graph(
+            5,
+            {
+                (0, 1): BORDER | CONTACT,
+                (1, 2): BORDER,
+                (2, 3): BORDER,
+                (0, 4): CONTACT,
+            },
+        )
+
+        findings = build_contact_findings(graph)
+
+        assert [f.finding_type for f in findings] == ["rival_bloc"]
+        assert "Empire 1, Empire 2, Empire 3" in findings[0].description
+
+    def test_bloc_away_from_player_is_ignored(self) -> None:
+        graph = _graph(5, {(1, 2): BORDER, (2, 3): BORDER, (3, 4): BORDER})
+
+        assert build_contact_findings(graph) == []
+
+    def test_uncontacted_border_neighbor(self) -> None:
+        graph = _graph(3, {(0, 1): BORDER, (0, 2): BORDER | CONTACT})
+
+        findings = build_contact_findings(graph)
+
+        assert [f.finding_type for f in findings] == ["uncontacted_neighbor"]
+        assert findings[0].description.startswith("Empire 1")
+
+    def test_no_player(self) -> None:
+        graph = _graph(2, {(0, 1): BORDER}, player=None)
+
+        assert build_contact_findings(graph) == []
+
+    def test_latest_gamestate_findings(self) -> None:
+        data = _neighbor_data([_relation("1", border_range=0.0)])
+        distances = _distances({"1": (0.0, 0.0), "2": (5.0, 0.0), "3": (10.0, 0.0)})
+
+        findings = latest_contact_findings(data, "save", distances)
+
+        assert [f.finding_type for f in findings] == ["rival_bloc"]
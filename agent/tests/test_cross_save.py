@@ -0,0 +1,270 @@
+import asyncio
+import math
+from typing import Any, override
+
+import pytest
+
+from agent.analysis_config import RESOURCE_FIELDS
+from agent.cross_save import (
+    StackedSeries,
+    compute_bands,
+    find_underperformance,
+    fleet_gamestate_keys,
+    percentile,
+    percentile_rank,
+    run_cross_save_comparison,
+    stream_balance_totals,
+)
+from agent.graphql_client import GetBalanceTotals, GetDates, ListSavesSaves
+from agent.models import PercentileBand
+
+from .conftest import MockClient
+
+
+def _columns(energy: list[float]) -> dict[str, list[float]]:
+    return {
+        resource: energy if resource == "energy" else [10.0] * len(energy)
+        for resource in RESOURCE_FIELDS
+    }
+
+
+def _totals(years: list[int], energy: list[float]) -> GetBalanceTotals:
+    gamestates: list[dict[str, Any]] = [
+        {
+            "date": f"{year}-01-01T00:00:00Z",
+            "budget": {
+                "totals": {
+                    "balance": {
+                        **dict.fromkeys(RESOURCE_FIELDS, 10.0),
+                        "energy": value,
+                    },
+                },
+            },
+        }
+        for year, value in zip(years, energy, strict=True)
+    ]
+    return GetBalanceTotals.model_validate({"save": {"gamestates": gamestates}})
+
+
+def _band(
+    year: int,
+    current_percentile: float,
+    resource: str = "energy",
+) -> PercentileBand:
+    return PercentileBand(
+        resource=resource,
+        year=year,
+        fleet_saves=5,
+        band=[0.0] * 5,
+        fleet_median=50.0,
+        current=1.0,
+        current_percentile=current_percentile,
+    )
+
+
+class TestStackedSeries:
+    def test_averages_snapshots_per_year(self) -> None:
+        stacked = StackedSeries(max_saves=2, max_years=10)
+        dates = ["2200-01-01", "2200-07-01", "2203-01-01", "2250-01-01"]
+
+        row = stacked.add("save", dates, _columns([10.0, 20.0, 30.0, 40.0]))
+
+        energy = RESOURCE_FIELDS.index("energy")
+        assert stacked.value(row, energy, 0) == 15.0
+        assert math.isnan(stacked.value(row, energy, 1))
+        assert stacked.value(row, energy, 3) == 30.0
+
+    def test_memory_is_preallocated(self) -> None:
+        stacked = StackedSeries(max_saves=3, max_years=20, bin_years=2)
+
+        assert len(stacked.values) == 3 * len(RESOURCE_FIELDS) * 10
+        stacked.add("a", ["2201-01-01"], _columns([1.0]))
+        stacked.add("b", ["2201-01-01"], _columns([1.0]))
+        stacked.add("c", ["2201-01-01"], _columns([1.0]))
+        with pytest.raises(ValueError, match="full"):
+            stacked.add("d", ["2201-01-01"], _columns([1.0]))
+
+    def test_column_excludes_row_and_gaps(self) -> None:
+        stacked = StackedSeries(max_saves=3, max_years=5)
+        stacked.add("a", ["2200-01-01"], _columns([3.0]))
+        stacked.add("b", ["2200-01-01"], _columns([1.0]))
+        stacked.add("c", ["2201-01-01"], _columns([2.0]))
+
+        assert stacked.column(RESOURCE_FIELDS.index("energy"), 0, excluded=0) == [1.0]
+
+
+class TestPercentiles:
+    def test_percentile_interpolates(self) -> None:
+        values = [0.0, 10.0, 20.0, 30.0, 40.0]
+
+        assert percentile(values, 50) == 20.0
+        assert percentile(values, 10) == 4.0
+        assert percentile([5.0], 90) == 5.0
+
+    def test_percentile_rank(self) -> None:
+        assert percentile_rank([1.0, 2.0, 3.0, 4.0], 2.5) == 50.0
+        assert percentile_rank([1.0, 2.0], 0.0) == 0.0
+        assert percentile_rank([5.0, 5.0, 5.0], 5.0) == 50.0
+
+
+class TestComputeBands:
+    def test_bands_cover_current_save(self) -> None:
+        stacked = StackedSeries(max_saves=7, max_years=5)
+        current = stacked.add(
+            "current",
+            ["2200-01-01", "2201-01-01"],
+            _columns([1.0, 60.0]),
+        )
+        for value in (10.0, 20.0, 30.0, 40.0, 50.0):
+            stacked.add(str(value), ["2200-01-01"], _columns([value]))
+
+        bands = [b for b in compute_bands(stacked, current) if b.resource == "energy"]
+
+        assert [b.year for b in bands] == [2200]
+        assert bands[0].fleet_saves == 5
+        assert bands[0].fleet_median == 30.0
+        assert bands[0].current_percentile == 0.0
+
+    def test_needs_minimum_fleet(self) -> None:
+        stacked = StackedSeries(max_saves=2, max_years=5)
+        current = stacked.add("current", ["2200-01-01"], _columns([1.0]))
+        stacked.add("other", ["2200-01-01"], _columns([2.0]))
+
+        assert compute_bands(stacked, current) == []
+
+
+class TestFindUnderperformance:
+    def test_merges_consecutive_years(self) -> None:
+        bands = [
+            _band(2200, 0.0),
+            _band(2201, 5.0),
+            _band(2202, 50.0),
+            _band(2203, 0.0),
+            _band(2200, 0.0, resource="minerals"),
+        ]
+
+        periods = find_underperformance(bands)
+
+        assert [(p.resource, p.start_year, p.end_year) for p in periods] == [
+            ("energy", 2203, 2203),
+            ("minerals", 2200, 2200),
+            ("energy", 2200, 2201),
+        ]
+        assert periods[-1].mean_percentile == 2.5
+
+    def test_gap_splits_period(self) -> None:
+        periods = find_underperformance([_band(2200, 0.0), _band(2205, 0.0)])
+
+        assert len(periods) == 2
+
+
+class TestStreamBalanceTotals:
+    async def test_bounds_concurrent_fetches(self) -> None:
+        active = 0
+        peak = 0
+
+        class SlowClient(MockClient):
+            @override
+            async def get_balance_totals(
+                self,
+                filename: str,
+                **kwargs: object,
+            ) -> GetBalanceTotals:
+                nonlocal active, peak
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.001)
+                return _totals([2200], [1.0])
+
+        received: list[str] = []
+        async for filename, _ in stream_balance_totals(
+            SlowClient(),
+            [str(i) for i in range(10)],
+            concurrency=3,
+        ):
+            received.append(filename)
+            active -= 1
+
+        assert sorted(received, key=int) == [str(i) for i in range(10)]
+        assert peak <= 3
+
+    async def test_closing_early_awaits_cancelled_fetches(self) -> None:
+        started: list[asyncio.Task[object]] = []
+
+        class HangingClient(MockClient):
+            @override
+            async def get_balance_totals(
+                self,
+                filename: str,
+                **kwargs: object,
+            ) -> GetBalanceTotals:
+                if filename != "0":
+                    task = asyncio.current_task()
+                    assert task is not None
+                    started.append(task)
+                    await asyncio.Event().wait()
+                return _totals([2200], [1.0])
+
+        stream = stream_balance_totals(HangingClient(), ["0", "1", "2"])
+        async for _ in stream:
+            break
+        await stream.aclose()
+
+        assert len(started) == 2
+        assert all(task.done() for task in started)
+
+
+class TestRunCrossSaveComparison:
+    async def test_flags_underperforming_years(self) -> None:
+        years = [2200, 2201, 2202]
+        totals = {
+            f"fleet{i}": _totals(years, [50.0 + i, 60.0 + i, 70.0 + i])
+            for i in range(6)
+        }
+        totals["current"] = _totals(years, [55.0, 10.0, 5.0])
+        client = MockClient(
+            saves=[ListSavesSaves(filename=name, name=name) for name in totals],
+            balance_totals=totals,
+        )
+
+        result = await run_cross_save_comparison("current", client=client)
+
+        assert result.saves_compared == 6
+        assert result.saves_skipped == 0
+        assert [
+            (p.resource, p.start_year, p.end_year) for p in result.underperformance
+        ] == [("energy", 2201, 2202)]
+        assert "energy in 2201-2202" in result.summary
+
+    async def test_skips_saves_beyond_budget(self) -> None:
+        totals = {f"s{i}": _totals([2200], [float(i)]) for i in range(5)}
+        client = MockClient(
+            saves=[ListSavesSaves(filename=name, name=name) for name in totals],
+            balance_totals=totals,
+        )
+
+        result = await run_cross_save_comparison("s0", client=client, max_saves=3)
+
+        assert result.saves_compared == 2
+        assert result.saves_skipped == 2
+
+    async def test_missing_save(self) -> None:
+        with pytest.raises(ValueError, match="not found"):
+            await run_cross_save_comparison("missing", client=MockClient())
+
+
+class TestFleetGamestateKeys:
+    async def test_keys_compared_save_dates(self) -> None:
+        dates = GetDates.model_validate(
+            {"save": {"gamestates": [{"date": "2200-01-01T00:00:00Z"}]}},
+        )
+        client = MockClient(
+            saves=[ListSavesSaves(filename=name, name=name) for name in "abc"],
+            dates=dict.fromkeys("abc", dates),
+        )
+
+        assert await fleet_gamestate_keys(client, "b", max_saves=2) == [
+            "skipped:1",
+            "b:2200-01-01 00:00:00+00:00",
+            "a:2200-01-01 00:00:00+00:00",
+        ]
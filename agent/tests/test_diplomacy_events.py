@@ -0,0 +1,163 @@
+from typing import Any
+
+import pytest
+
+from agent.graphql_client import GetNeighborData
+from agent.neighbor import DiplomaticEventType
+from agent.neighbor.diplomacy_events import (
+    DiplomacyEventLog,
+    DiplomacySnapshot,
+    RelationState,
+    build_diplomacy_event_log,
+    create_diplomacy_toolset,
+    diff_snapshots,
+)
+
+
+def _snapshot(
+    relations: dict[str, tuple[float | None, bool]],
+    modifiers: dict[tuple[str, str], float] | None = None,
+) -> DiplomacySnapshot:
+    return DiplomacySnapshot(
+        relations={
+            ("0", target): RelationState(f"Empire {target}", opinion, hostile)
+            for target, (opinion, hostile) in relations.items()
+        },
+        modifiers={
+            ("0", target, modifier): value
+            for (target, modifier), value in (modifiers or {}).items()
+        },
+    )
+
+
+def _relation(
+    target: str,
+    opinion: float,
+    modifiers: list[tuple[str, float]],
+    *,
+    hostile: bool = False,
+) -> dict[str, Any]:
+    return {
+        "targetCountryId": target,
+        "targetEmpireName": f"Empire {target}",
+        "opinion": opinion,
+        "trust": None,
+        "threat": None,
+        "isHostile": hostile,
+        "borderRange": None,
+        "hasContact": True,
+        "hasCommunications": True,
+        "opinionModifiers": [
+            {"modifierType": modifier_type, "value": value}
+            for modifier_type, value in modifiers
+        ],
+    }
+
+
+def _neighbor_data(relations: list[list[dict[str, Any]]]) -> GetNeighborData:
+    player: dict[str, Any] = {
+        "countryId": "0",
+        "name": "Player",
+        "ownedPlanetIds": [],
+        "ownedPlanetCount": 0,
+    }
+    return GetNeighborData.model_validate(
+        {
+            "save": {
+                "gamestates": [
+                    {
+                        "date": f"22{index:02d}-01-01T00:00:00Z",
+                        "playerEmpire": player,
+                        "empires": [],
+                        "diplomaticRelations": gamestate_relations,
+                        "allPlanetCoordinates": [],
+                    }
+                    for index, gamestate_relations in enumerate(relations)
+                ],
+            },
+        },
+    )
+
+
+class TestDiffSnapshots:
+    def test_hostility_flip_and_opinion_swing(self) -> None:
+        events = diff_snapshots(
+            "d1",
+            _snapshot({"1": (50.0, False), "2": (10.0, False)}),
+            _snapshot({"1": (-20.0, True), "2": (15.0, False)}),
+        )
+
+        assert [(e.target_country_id, e.event_type) for e in events] == [
+            ("1", DiplomaticEventType.HOSTILITY_CHANGED),
+            ("1", DiplomaticEventType.OPINION_SWING),
+        ]
+        assert events[0].is_hostile is True
+        assert (events[1].before, events[1].after) == (50.0, -20.0)
+
+    def test_modifiers_added_and_removed(self) -> None:
+        events = diff_snapshots(
+            "d1",
+            _snapshot({"1": (0.0, False)}, {("1", "opinion_trade"): 20.0}),
+            _snapshot({"1": (0.0, False)}, {("1", "opinion_border_friction"): -30.0}),
+        )
+
+        assert [(e.event_type, e.modifier_type) for e in events] == [
+            (DiplomaticEventType.MODIFIER_ADDED, "opinion_border_friction"),
+            (DiplomaticEventType.MODIFIER_REMOVED, "opinion_trade"),
+        ]
+        assert events[0].after == -30.0
+        assert events[1].before == 20.0
+        assert events[1].target_name == "Empire 1"
+
+    def test_unchanged_relations_log_nothing(self) -> None:
+        snapshot = _snapshot({"1": (10.0, False)}, {("1", "opinion_trade"): 20.0})
+
+        assert diff_snapshots("d1", snapshot, snapshot) == []
+
+
+class TestDiplomacyEventLog:
+    def test_appends_incrementally(self) -> None:
+        log = DiplomacyEventLog()
+
+        assert log.append("d0", _snapshot({"1": (50.0, False)})) == []
+        added = log.append("d1", _snapshot({"1": (0.0, False)}))
+
+        assert len(added) == 1
+        assert log.events == added
+        assert log.last_date == "d1"
+
+    def test_rejects_out_of_order_gamestates(self) -> None:
+        log = DiplomacyEventLog()
+        log.append("d1", _snapshot({}))
+
+        with pytest.raises(ValueError, match="not after"):
+            log.append("d0", _snapshot({}))
+
+    def test_query_filters_newest_first(self) -> None:
+        log = build_diplomacy_event_log(
+            _neighbor_data(
+                [
+                    [_relation("1", 50.0, []), _relation("2", 0.0, [])],
+                    [_relation("1", 0.0, []), _relation("2", 0.0, [("pact", 10.0)])],
+                    [_relation("1", 0.0, [], hostile=True), _relation("2", 30.0, [])],
+                ],
+            ),
+        )
+
+        assert [
+            (e.date[:4], e.event_type) for e in log.query(target_country_id="1")
+        ] == [
+            ("2202", DiplomaticEventType.HOSTILITY_CHANGED),
+            ("2201", DiplomaticEventType.OPINION_SWING),
+        ]
+        assert len(log.query(since="2202")) == 3
+        assert len(log.query(limit=1)) == 1
+        removed = log.query(event_types=[DiplomaticEventType.MODIFIER_REMOVED])
+        assert [e.modifier_type for e in removed] == ["pact"]
+
+
+class TestDiplomacyToolset:
+    def test_exposes_query_tool(self) -> None:
+        toolset = create_diplomacy_toolset(DiplomacyEventLog())
+
+        assert list(toolset.tools) == ["query_diplomatic_events"]
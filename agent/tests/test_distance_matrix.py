@@ -0,0 +1,202 @@
+import math
+import random
+from typing import Any
+
+import pytest
+
+from agent.graphql_client import GetNeighborData
+from agent.neighbor.distance_matrix import (
+    DistanceMatrixCache,
+    PlanetGrid,
+    compute_distance_matrix,
+    create_distance_toolset,
+    latest_distance_matrix,
+    run_distance_matrix_analysis,
+)
+
+from .conftest import MockClient
+
+type Point = tuple[float, float]
+
+
+def _brute_force(a: list[Point], b: list[Point]) -> float:
+    return min(math.dist(p, q) for p in a for q in b)
+
+
+def _empire(country_id: str, planet_ids: list[int]) -> dict[str, Any]:
+    return {
+        "countryId": country_id,
+        "name": f"Empire {country_id}",
+        "ownedPlanetIds": planet_ids,
+        "ownedPlanetCount": len(planet_ids),
+        "militaryPower": None,
+        "economyPower": None,
+        "techPower": None,
+    }
+
+
+def _neighbor_data(dates: list[str]) -> GetNeighborData:
+    coordinates: dict[int, Point] = {
+        1: (0.0, 0.0),
+        2: (10.0, 0.0),
+        3: (13.0, 4.0),
+        4: (100.0, 100.0),
+        5: (40.0, 0.0),
+    }
+    player: dict[str, Any] = {
+        "countryId": "0",
+        "name": "Player",
+        "ownedPlanetIds": [1, 2],
+        "ownedPlanetCount": 2,
+    }
+    return GetNeighborData.model_validate(
+        {
+            "save": {
+                "gamestates": [
+                    {
+                        "date": date,
+                        "playerEmpire": player,
+                        "empires": [
+                            _empire("0", [1, 2]),
+                            _empire("1", [3, 4]),
+                            _empire("2", [5]),
+                            _empire("3", []),
+                        ],
+                        "diplomaticRelations": [],
+                        "allPlanetCoordinates": [
+                            {"planetId": planet_id, "x": x, "y": y}
+                            for planet_id, (x, y) in coordinates.items()
+                        ],
+                    }
+                    for date in dates
+                ],
+            },
+        },
+    )
+
+
+class TestPlanetGrid:
+    def test_matches_brute_force(self) -> None:
+        rng = random.Random(7)
+        planets = [(rng.uniform(-500, 500), rng.uniform(-500, 500)) for _ in range(50)]
+        grid = PlanetGrid(planets, cell_size=40.0)
+
+        for _ in range(100):
+            point = (rng.uniform(-900, 900), rng.uniform(-900, 900))
+            assert grid.nearest_distance(point) == pytest.approx(
+                _brute_force([point], planets),
+            )
+
+    def test_limit_is_returned_when_nothing_is_closer(self) -> None:
+        grid = PlanetGrid([(100.0, 0.0)], cell_size=10.0)
+
+        assert grid.nearest_distance((0.0, 0.0), limit=50.0) == 50.0
+
+    def test_requires_planets(self) -> None:
+        with pytest.raises(ValueError, match="at least one planet"):
+            PlanetGrid([], cell_size=1.0)
+
+
+class TestComputeDistanceMatrix:
+    def test_matches_brute_force(self) -> None:
+        rng = random.Random(3)
+        empire_planets: dict[str, list[Point]] = {}
+        for country in range(12):
+            cx, cy = rng.uniform(-500, 500), rng.uniform(-500, 500)
+            empire_planets[str(country)] = [
+                (cx + rng.gauss(0, 30), cy + rng.gauss(0, 30))
+                for _ in range(rng.randint(1, 15))
+            ]
+
+        matrix = compute_distance_matrix(empire_planets, {})
+
+        for row, a in enumerate(matrix.country_ids):
+            assert matrix.distances[row][row] == 0.0
+            for column, b in enumerate(matrix.country_ids):
+                if row != column:
+                    assert matrix.distances[row][column] == pytest.approx(
+                        _brute_force(empire_planets[a], empire_planets[b]),
+                    )
+
+    def test_skips_empires_without_planets(self) -> None:
+        matrix = compute_distance_matrix(
+            {"0": [(0.0, 0.0)], "1": [], "2": [(3.0, 4.0)]},
+            {"0": "Player"},
+        )
+
+        assert matrix.country_ids == ["0", "2"]
+        assert matrix.names == ["Player", "2"]
+        assert matrix.distances == [[0.0, 5.0], [5.0, 0.0]]
+
+    def test_nearest_and_closest_pairs(self) -> None:
+        matrix = compute_distance_matrix(
+            {"0": [(0.0, 0.0)], "1": [(10.0, 0.0)], "2": [(13.0, 4.0)]},
+            {},
+        )
+
+        assert [d.other_country_id for d in matrix.nearest("0")] == ["1", "2"]
+        assert matrix.nearest("9") == []
+        closest = matrix.closest_pairs(limit=1)[0]
+        assert (closest.country_id, closest.other_country_id) == ("1", "2")
+        assert closest.min_distance == 5.0
+
+
+class TestDistanceMatrixCache:
+    def test_reuses_matrix_per_gamestate(self) -> None:
+        cache = DistanceMatrixCache()
+        data = _neighbor_data(["2200-01-01T00:00:00Z"])
+
+        first = latest_distance_matrix(data, "save", cache)
+        second = latest_distance_matrix(data, "save", cache)
+
+        assert first is second
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache = DistanceMatrixCache(max_size=1)
+
+        latest_distance_matrix(_neighbor_data(["2200-01-01T00:00:00Z"]), "a", cache)
+        latest_distance_matrix(_neighbor_data(["2200-01-01T00:00:00Z"]), "b", cache)
+        latest_distance_matrix(_neighbor_data(["2200-01-01T00:00:00Z"]), "a", cache)
+
+        assert cache.misses == 3
+
+    def test_player_is_counted_once(self) -> None:
+        matrix = latest_distance_matrix(
+            _neighbor_data(["2200-01-01T00:00:00Z"]),
+            "save",
+            DistanceMatrixCache(),
+        )
+
+        assert matrix.country_ids == ["0", "1", "2"]
+        assert matrix.names[0] == "Player"
+
+
+class TestDistanceToolset:
+    def test_exposes_distance_tool(self) -> None:
+        matrix = compute_distance_matrix({}, {})
+
+        toolset = create_distance_toolset(matrix)
+
+        assert list(toolset.tools) == ["get_empire_distances"]
+
+
+class TestRunDistanceMatrixAnalysis:
+    async def test_uses_latest_gamestate(self) -> None:
+        data = _neighbor_data(["2200-01-01T00:00:00Z", "2210-01-01T00:00:00Z"])
+        client = MockClient(neighbor_data={"save": data})
+
+        result = await run_distance_matrix_analysis(
+            "save",
+            client=client,
+            cache=DistanceMatrixCache(),
+        )
+
+        assert result.date.startswith("2210-01-01")
+        assert result.country_ids == ["0", "1", "2"]
+        assert result.closest_pairs[0].min_distance == 5.0
+        assert "Player and Empire 1" in result.summary
+
+    async def test_missing_save(self) -> None:
+        with pytest.raises(ValueError, match="No gamestates"):
+            await run_distance_matrix_analysis("missing", client=MockClient())
@@ -0,0 +1,131 @@
+import pytest
+
+from agent.drop_detection import (
+    compute_drop,
+    detect_sudden_drops,
+    drops_agree,
+    scan_drop_history,
+)
+
+
+class TestComputeDrop:
+    def test_drop_above_threshold(self) -> None:
+        drop = compute_drop("energy", "2200.01.01", "2200.04.01", 100.0, 60.0)
+        assert drop is not None
+        assert drop.drop_percent == 40.0
+        assert drop.drop_absolute == 40.0
+
+    def test_drop_at_threshold(self) -> None:
+        assert compute_drop("energy", "a", "b", 100.0, 70.0) is not None
+
+    def test_drop_below_threshold(self) -> None:
+        assert compute_drop("energy", "a", "b", 100.0, 80.0) is None
+
+    def test_increase_is_not_a_drop(self) -> None:
+        assert compute_drop("energy", "a", "b", 100.0, 150.0) is None
+
+    def test_negative_to_more_negative_is_not_a_drop(self) -> None:
+        assert compute_drop("energy", "a", "b", -100.0, -130.0) is None
+
+    def test_near_zero_baseline_is_skipped(self) -> None:
+        assert compute_drop("energy", "a", "b", 0.001, -10.0) is None
+
+    def test_positive_to_negative(self) -> None:
+        drop = compute_drop("energy", "a", "b", 100.0, -50.0)
+        assert drop is not None
+        assert drop.drop_percent == 150.0
+
+
+class TestDetectSuddenDrops:
+    def test_compares_consecutive_snapshots(self) -> None:
+        drops = detect_sudden_drops(
+            [
+                ("d1", {"energy": 100.0, "alloys": 50.0}),
+                ("d2", {"energy": 50.0, "alloys": 50.0}),
+                ("d3", {"energy": 50.0, "alloys": 10.0}),
+            ],
+            resources=["energy", "alloys"],
+        )
+
+        assert [(d.resource, d.start_date, d.end_date) for d in drops] == [
+            ("energy", "d1", "d2"),
+            ("alloys", "d2", "d3"),
+        ]
+
+    def test_missing_resources_count_as_zero(self) -> None:
+        drops = detect_sudden_drops(
+            [("d1", {"energy": 100.0}), ("d2", {})],
+            resources=["energy", "alloys"],
+        )
+        assert [d.resource for d in drops] == ["energy"]
+
+    def test_single_snapshot_has_no_drops(self) -> None:
+        assert detect_sudden_drops([("d1", {"energy": 100.0})]) == []
+
+
+class TestDropsAgree:
+    def test_same_resources_agree(self) -> None:
+        expected = detect_sudden_drops(
+            [("d1", {"energy": 100.0}), ("d2", {"energy": 10.0})],
+        )
+        actual = detect_sudden_drops(
+            [("x1", {"energy": 100.0}), ("x2", {"energy": 50.0})],
+        )
+        assert drops_agree(expected, actual)
+
+    def test_different_resources_disagree(self) -> None:
+        expected = detect_sudden_drops(
+            [("d1", {"energy": 100.0}), ("d2", {"energy": 10.0})],
+        )
+        assert not drops_agree(expected, [])
+
+
+HISTORY_DATES = ["d0", "d1", "d2", "d3", "d4", "d5"]
+
+
+class TestScanDropHistory:
+    def test_finds_drops_anywhere_in_history(self) -> None:
+        columns = {"energy": [100.0, 100.0, 50.0, 50.0, 50.0, 50.0]}
+
+        drops = scan_drop_history(HISTORY_DATES, columns)
+
+        assert [(d.start_date, d.end_date) for d in drops] == [("d1", "d2")]
+
+    def test_ranks_strongest_first(self) -> None:
+        columns = {
+            "energy": [100.0, 60.0, 60.0, 60.0, 60.0, 60.0],
+            "alloys": [100.0, 100.0, 100.0, 100.0, 10.0, 10.0],
+        }
+
+        drops = scan_drop_history(HISTORY_DATES, columns)
+
+        assert [d.resource for d in drops] == ["alloys", "energy"]
+
+    def test_overlapping_windows_report_one_drop(self) -> None:
+        columns = {"energy": [100.0, 100.0, 40.0, 40.0, 40.0, 40.0]}
+
+        drops = scan_drop_history(HISTORY_DATES, columns, windows=(1, 2, 3))
+
+        assert len(drops) == 1
+        assert drops[0].drop_percent == 60.0
+
+    def test_wider_window_catches_gradual_decline(self) -> None:
+        columns = {"energy": [100.0, 80.0, 64.0, 51.2, 51.2, 51.2]}
+
+        assert scan_drop_history(HISTORY_DATES, columns) == []
+        drops = scan_drop_history(HISTORY_DATES, columns, windows=(3,))
+        assert [(d.start_date, d.end_date) for d in drops] == [("d0", "d3")]
+
+    def test_separate_drops_of_one_resource_are_kept(self) -> None:
+        columns = {"energy": [100.0, 50.0, 100.0, 100.0, 40.0, 40.0]}
+
+        drops = scan_drop_history(HISTORY_DATES, columns)
+
+        assert [(d.start_date, d.end_date) for d in drops] == [
+            ("d3", "d4"),
+            ("d0", "d1"),
+        ]
+
+    def test_rejects_empty_window(self) -> None:
+        with pytest.raises(ValueError, match="at least 1"):
+            scan_drop_history(HISTORY_DATES, {}, windows=(0,))
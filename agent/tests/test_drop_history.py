@@ -0,0 +1,86 @@
+import time
+from typing import Any
+
+import pytest
+
+from agent.analysis_config import RESOURCE_FIELDS
+from agent.drop_detection import scan_drop_history
+from agent.drop_history import build_resource_columns, run_drop_history_scan
+from agent.graphql_client import GetBalanceTotals
+
+from .conftest import MockClient
+
+
+def _balance_totals(energy: list[float | None]) -> GetBalanceTotals:
+    gamestates: list[dict[str, Any]] = [
+        {
+            "date": f"22{index:02d}-01-01T00:00:00Z",
+            "budget": {
+                "totals": {
+                    "balance": {
+                        **dict.fromkeys(RESOURCE_FIELDS, 10.0),
+                        "energy": value,
+                    },
+                },
+            },
+        }
+        for index, value in enumerate(energy)
+    ]
+    # Out of order on purpose: columns follow the dates
+    return GetBalanceTotals.model_validate({"save": {"gamestates": gamestates[::-1]}})
+
+
+class TestBuildResourceColumns:
+    def test_sorts_by_date_and_fills_nulls(self) -> None:
+        dates, columns = build_resource_columns(
+            _balance_totals([100.0, None, 50.0]),
+            "save",
+        )
+
+        assert dates == sorted(dates)
+        assert columns["energy"] == [100.0, 0.0, 50.0]
+        assert columns["minerals"] == [10.0, 10.0, 10.0]
+
+    def test_missing_save(self) -> None:
+        with pytest.raises(ValueError, match="not found"):
+            build_resource_columns(GetBalanceTotals(save=None), "missing")
+
+
+class TestRunDropHistoryScan:
+    async def test_scans_every_gamestate(self) -> None:
+        client = MockClient(
+            balance_totals={"save": _balance_totals([100.0, 90.0, 30.0, 30.0])},
+        )
+
+        result = await run_drop_history_scan("save", client=client)
+
+        assert result.gamestates_scanned == 4
+        assert [d.resource for d in result.drops] == ["energy"]
+        assert result.summary.startswith("Detected 1 sudden drop(s) across 4")
+
+    async def test_empty_history(self) -> None:
+        client = MockClient(balance_totals={"save": _balance_totals([])})
+
+        result = await run_drop_history_scan("save", client=client)
+
+        assert result.drops == []
+        assert result.history_start == ""
+
+
+class TestScanPerformance:
+    def test_thousands_of_gamestates_well_under_a_second(self) -> None:
+        count = 5000
+        dates = [str(index) for index in range(count)]
+        columns = {
+            resource: [
+                100.0 if (index + offset) % 97 else 20.0 for index in range(count)
+            ]
+            for offset, resource in enumerate(RESOURCE_FIELDS)
+        }
+
+        started = time.perf_counter()
+        drops = scan_drop_history(dates, columns, windows=(1, 4))
+        elapsed = time.perf_counter() - started
+
+        assert drops
+        assert elapsed < 0.5
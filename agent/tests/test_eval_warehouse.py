@@ -0,0 +1,228 @@
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pydantic_evals.evaluators import EvaluationResult
+from pydantic_evals.evaluators.spec import EvaluatorSpec
+from pydantic_evals.reporting import EvaluationReport, ReportCase, ReportCaseFailure
+
+from agent.evals.warehouse import (
+    EvalRunSummary,
+    EvalWarehouse,
+    find_regressions,
+    percentile,
+)
+
+
+def _assertion(name: str, value: bool) -> EvaluationResult[bool]:
+    return EvaluationResult(
+        name=name,
+        value=value,
+        reason=None,
+        source=EvaluatorSpec(name=name, arguments=None),
+    )
+
+
+def _create_case(
+    name: str,
+    duration: float,
+    assertions: dict[str, bool],
+    metrics: dict[str, float | int] | None = None,
+) -> ReportCase[Any, Any, Any]:
+    return ReportCase(
+        name=name,
+        inputs={},
+        metadata=None,
+        expected_output=None,
+        output=None,
+        metrics=metrics if metrics is not None else {},
+        attributes={},
+        scores={},
+        labels={},
+        assertions={k: _assertion(k, v) for k, v in assertions.items()},
+        task_duration=duration,
+        total_duration=duration + 0.1,
+    )
+
+
+def _create_report(
+    cases: list[ReportCase[Any, Any, Any]],
+    failures: list[ReportCaseFailure[Any, Any, Any]] | None = None,
+) -> EvaluationReport[Any, Any, Any]:
+    return EvaluationReport(
+        name="sandbox_gpt-5.2",
+        cases=cases,
+        failures=failures if failures is not None else [],
+    )
+
+
+def _create_summary(**overrides: Any) -> EvalRunSummary:
+    values: dict[str, Any] = {
+        "run_id": 1,
+        "dataset": "sandbox",
+        "model": "test-model",
+        "experiment": "sandbox_test",
+        "created_at": "2026-01-01T00:00:00+00:00",
+        "case_count": 2,
+        "failure_count": 0,
+        "p50_latency": 10.0,
+        "p95_latency": 20.0,
+        "mean_input_tokens": 1000.0,
+        "mean_output_tokens": 500.0,
+        "mean_tool_calls": 2.0,
+        "pass_rate": 1.0,
+    }
+    values.update(overrides)
+    return EvalRunSummary(**values)
+
+
+@pytest.fixture
+def warehouse(tmp_path: Path) -> Iterator[EvalWarehouse]:
+    store = EvalWarehouse(tmp_path / "evals.sqlite3")
+    yield store
+    store.close()
+
+
+class TestPercentile:
+    def test_empty_values(self) -> None:
+        assert percentile([], 50) == 0.0
+
+    def test_single_value(self) -> None:
+        assert percentile([3.0], 95) == 3.0
+
+    def test_interpolates_between_values(self) -> None:
+        assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+
+    def test_high_percentile_approaches_max(self) -> None:
+        assert percentile([1.0, 2.0, 3.0], 100) == 3.0
+
+
+class TestEvalWarehouse:
+    def test_records_cases_and_summarizes(self, warehouse: EvalWarehouse) -> None:
+        report = _create_report(
+            [
+                _create_case(
+                    "a",
+                    10.0,
+                    {"x": True, "y": True},
+                    {"input_tokens": 1000, "output_tokens": 200, "requests": 3},
+                ),
+                _create_case(
+                    "b",
+                    20.0,
+                    {"x": True, "y": False},
+                    {"input_tokens": 3000, "output_tokens": 400, "tool_calls": 4},
+                ),
+            ],
+        )
+
+        run_id = warehouse.record_report(report, dataset="sandbox", model="m")
+        summary = warehouse.summarize_run(run_id)
+
+        assert summary.case_count == 2
+        assert summary.failure_count == 0
+        assert summary.p50_latency == 15.0
+        assert summary.mean_input_tokens == 2000.0
+        assert summary.mean_output_tokens == 300.0
+        assert summary.mean_tool_calls == 2.0
+        assert summary.pass_rate == 0.75
+
+    def test_failures_count_as_zero_pass_rate(self, warehouse: EvalWarehouse) -> None:
+        failure: ReportCaseFailure[Any, Any, Any] = ReportCaseFailure(
+            name="broken",
+            inputs={},
+            metadata=None,
+            expected_output=None,
+            error_message="boom",
+            error_stacktrace="",
+        )
+        report = _create_report([_create_case("a", 5.0, {"x": True})], [failure])
+
+        run_id = warehouse.record_report(report, dataset="sandbox", model="m")
+        summary = warehouse.summarize_run(run_id)
+
+        assert summary.case_count == 2
+        assert summary.failure_count == 1
+        assert summary.pass_rate == 0.5
+        assert summary.p50_latency == 5.0
+
+    def test_latest_run_ids_newest_first(self, warehouse: EvalWarehouse) -> None:
+        report = _create_report([_create_case("a", 1.0, {})])
+        first = warehouse.record_report(report, dataset="sandbox", model="m")
+        second = warehouse.record_report(report, dataset="sandbox", model="m")
+        warehouse.record_report(report, dataset="sandbox", model="other")
+
+        assert warehouse.latest_run_ids("sandbox", "m") == [second, first]
+
+    def test_summarize_unknown_run_raises(self, warehouse: EvalWarehouse) -> None:
+        with pytest.raises(KeyError):
+            warehouse.summarize_run(999)
+
+    def test_persists_across_connections(self, tmp_path: Path) -> None:
+        path = tmp_path / "nested" / "evals.sqlite3"
+        first = EvalWarehouse(path)
+        run_id = first.record_report(
+            _create_report([_create_case("a", 1.0, {"x": True})]),
+            dataset="sandbox",
+            model="m",
+        )
+        first.close()
+
+        second = EvalWarehouse(path)
+        assert second.summarize_run(run_id).pass_rate == 1.0
+        second.close()
+
+
+class TestFindRegressions:
+    def test_no_regressions_for_identical_runs(self) -> None:
+        summary = _create_summary()
+        assert find_regressions(summary, summary) == []
+
+    def test_flags_latency_regression(self) -> None:
+        baseline = _create_summary()
+        candidate = _create_summary(p95_latency=30.0)
+
+        regressions = find_regressions(baseline, candidate)
+
+        assert [r.metric for r in regressions] == ["p95_latency"]
+        assert regressions[0].change_percent == 50.0
+
+    def test_latency_within_tolerance_is_ok(self) -> None:
+        baseline = _create_summary()
+        candidate = _create_summary(p50_latency=11.0)
+
+        assert find_regressions(baseline, candidate) == []
+
+    def test_flags_token_regression(self) -> None:
+        baseline = _create_summary()
+        candidate = _create_summary(mean_input_tokens=1500.0)
+
+        regressions = find_regressions(baseline, candidate)
+
+        assert [r.metric for r in regressions] == ["mean_input_tokens"]
+
+    def test_flags_pass_rate_drop(self) -> None:
+        baseline = _create_summary()
+        candidate = _create_summary(pass_rate=0.5)
+
+        regressions = find_regressions(baseline, candidate)
+
+        assert [r.metric for r in regressions] == ["pass_rate"]
+
+    def test_pass_rate_tolerance(self) -> None:
+        baseline = _create_summary()
+        candidate = _create_summary(pass_rate=0.95)
+
+        assert find_regressions(baseline, candidate, pass_rate_tolerance=0.1) == []
+
+    def test_improvements_are_not_regressions(self) -> None:
+        baseline = _create_summary()
+        candidate = _create_summary(
+            p50_latency=1.0,
+            p95_latency=2.0,
+            mean_input_tokens=10.0,
+            pass_rate=1.0,
+        )
+
+        assert find_regressions(baseline, candidate) == []
@@ -0,0 +1,166 @@
+import math
+import random
+import time
+from datetime import date, timedelta
+from typing import Any
+
+import pytest
+
+from agent.analysis_config import RESOURCE_FIELDS
+from agent.forecast import (
+    create_forecast_toolset,
+    days_until_zero,
+    fetch_optional_depletion_forecasts,
+    fit_ewma,
+    fit_linear,
+    fit_piecewise,
+    forecast_depletion,
+    run_depletion_forecast,
+)
+from agent.graphql_client import GetBalanceTotals
+from agent.models import ForecastModel
+
+from .conftest import MockClient
+
+START = date(2250, 1, 1)
+MONTH_DAYS = 30
+
+
+def _dates(count: int) -> list[str]:
+    return [(START + timedelta(days=MONTH_DAYS * i)).isoformat() for i in range(count)]
+
+
+def _times(count: int) -> list[float]:
+    return [float(MONTH_DAYS * (i - count + 1)) for i in range(count)]
+
+
+class TestTrendFits:
+    def test_linear_recovers_line(self) -> None:
+        times = _times(10)
+        fit = fit_linear(times, {"energy": [50.0 - 0.5 * t for t in times]})["energy"]
+
+        assert fit.slope == pytest.approx(-0.5)
+        assert fit.level == pytest.approx(50.0)
+        assert fit.residual_std == pytest.approx(0.0, abs=1e-9)
+
+    def test_ewma_tracks_trend(self) -> None:
+        times = _times(60)
+        fit = fit_ewma(times, {"energy": [100.0 + 0.1 * t for t in times]})["energy"]
+
+        assert fit.slope == pytest.approx(0.1, rel=0.05)
+        assert fit.level == pytest.approx(100.0, abs=2.0)
+
+    def test_piecewise_projects_last_segment(self) -> None:
+        times = _times(20)
+        values = [100.0] * 12 + [100.0 - 2.0 * i for i in range(1, 9)]
+
+        fit = fit_piecewise(times, {"energy": values})["energy"]
+        linear = fit_linear(times, {"energy": values})["energy"]
+
+        assert fit.slope == pytest.approx(-2.0 / MONTH_DAYS)
+        assert fit.level == pytest.approx(84.0)
+        assert fit.residual_std < linear.residual_std
+
+    def test_piecewise_without_split_matches_linear(self) -> None:
+        times = _times(5)
+        values = [1.0, 2.0, 4.0, 3.0, 5.0]
+
+        fit = fit_piecewise(times, {"energy": values}, min_segment=3)["energy"]
+        linear = fit_linear(times, {"energy": values})["energy"]
+
+        assert fit.slope == pytest.approx(linear.slope)
+        assert fit.residual_std == pytest.approx(linear.residual_std)
+
+    def test_days_until_zero(self) -> None:
+        assert days_until_zero(100.0, -2.0) == 50.0
+        assert days_until_zero(100.0, 1.0) is None
+        assert days_until_zero(-5.0, -1.0) is None
+
+
+class TestForecastDepletion:
+    def test_projects_crossing_with_interval(self) -> None:
+        rng = random.Random(2)
+        columns = {
+            "energy": [200.0 - 3.0 * i + rng.gauss(0, 2) for i in range(24)],
+            "minerals": [50.0 + rng.gauss(0, 2) for _ in range(24)],
+        }
+
+        forecasts = forecast_depletion(_dates(24), columns)
+
+        assert [f.resource for f in forecasts] == ["energy"]
+        forecast = forecasts[0]
+        crossing = date.fromisoformat(forecast.zero_crossing_date)
+        # 200 - 3 * i reaches zero about 43 months after the first snapshot
+        expected = START + timedelta(days=MONTH_DAYS * 200 / 3)
+        assert abs((crossing - expected).days) < 90
+        assert forecast.earliest_crossing_date <= forecast.zero_crossing_date
+        assert forecast.zero_crossing_date <= forecast.latest_crossing_date
+        assert set(forecast.model_crossing_dates) == set(ForecastModel)
+
+    def test_skips_negative_and_distant_crossings(self) -> None:
+        columns = {
+            "energy": [-10.0 - i for i in range(12)],
+            "minerals": [1000.0 - 0.01 * i for i in range(12)],
+        }
+
+        assert forecast_depletion(_dates(12), columns, horizon_years=20.0) == []
+
+    def test_uses_trailing_window(self) -> None:
+        columns = {"energy": [100.0 - 50.0 * i for i in range(10)] + [500.0] * 10}
+
+        assert forecast_depletion(_dates(20), columns, window=10) == []
+
+    def test_needs_two_snapshots(self) -> None:
+        assert forecast_depletion(_dates(1), {"energy": [10.0]}) == []
+
+    def test_every_resource_is_fast(self) -> None:
+        rng = random.Random(4)
+        columns = {
+            resource: [rng.uniform(-50, 50) + math.sin(i) for i in range(500)]
+            for resource in RESOURCE_FIELDS
+        }
+
+        start = time.perf_counter()
+        forecast_depletion(_dates(500), columns)
+
+        assert time.perf_counter() - start < 0.5
+
+
+class TestForecastToolset:
+    def test_exposes_forecast_tool(self) -> None:
+        toolset = create_forecast_toolset([])
+
+        assert list(toolset.tools) == ["get_depletion_forecast"]
+
+
+class TestRunDepletionForecast:
+    async def test_builds_result(self) -> None:
+        gamestates: list[dict[str, Any]] = [
+            {
+                "date": f"{day}T00:00:00Z",
+                "budget": {
+                    "totals": {
+                        "balance": {
+                            **dict.fromkeys(RESOURCE_FIELDS, 10.0),
+                            "energy": 100.0 - 10.0 * index,
+                        },
+                    },
+                },
+            }
+            for index, day in enumerate(_dates(8))
+        ]
+        totals = GetBalanceTotals.model_validate({"save": {"gamestates": gamestates}})
+        client = MockClient(balance_totals={"save": totals})
+
+        result = await run_depletion_forecast("save", client=client)
+
+        assert result.gamestates_used == 8
+        assert [f.resource for f in result.forecasts] == ["energy"]
+        assert result.summary.startswith("1 resource(s) projected")
+
+    async def test_missing_save(self) -> None:
+        with pytest.raises(ValueError, match="not found"):
+            await run_depletion_forecast("missing", client=MockClient())
+
+    async def test_optional_forecasts_tolerate_failure(self) -> None:
+        assert await fetch_optional_depletion_forecasts(MockClient(), "missing") == []
@@ -0,0 +1,246 @@
+import asyncio
+import json
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, cast
+
+import httpx
+import pytest
+
+from agent.codegen_plugins import find_operation_documents
+from agent.graphql_batching import BatchingClient
+from agent.graphql_client import GetDates
+from agent.graphql_client import client as client_module
+from agent.graphql_client.client import PERSISTED_QUERY_HASHES
+from agent.graphql_client.exceptions import (
+    GraphQLClientGraphQLMultiError,
+    GraphQLClientHttpError,
+    GraphQLClientInvalidResponseError,
+)
+
+DAYS = {"a.sav": 1, "b.sav": 2, "c.sav": 3}
+
+
+def _result(operation: dict[str, Any]) -> dict[str, Any]:
+    if operation["operationName"] == "ListSaves":
+        return {"data": {"saves": []}}
+    filename = operation["variables"]["filename"]
+    if filename not in DAYS:
+        return {"data": None, "errors": [{"message": "not found"}]}
+    date = f"2200-01-0{DAYS[filename]}T00:00:00Z"
+    return {"data": {"save": {"gamestates": [{"date": date}]}}}
+
+
+def _persisted_query_error(code: str) -> dict[str, Any]:
+    return {"errors": [{"message": code, "extensions": {"code": code}}]}
+
+
+class _Server:
+    def __init__(
+        self,
+        status_code: int = 200,
+        drop_results: int = 0,
+        *,
+        persisted_queries: bool = True,
+        miss_status_code: int | None = None,
+    ) -> None:
+        super().__init__()
+        self.batches: list[list[dict[str, Any]] | None] = []
+        self.status_code = status_code
+        # Status of a response holding a persisted query miss, like Apollo's 404
+        self.miss_status_code = miss_status_code
+        self.drop_results = drop_results
+        self.known_hashes: set[str] | None = set() if persisted_queries else None
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if self.status_code >= 500:
+            return httpx.Response(self.status_code, text="Internal Server Error")
+        body = json.loads(request.content)
+        if isinstance(body, list):
+            batch = cast("list[dict[str, Any]]", body)
+            self.batches.append(batch)
+            results = [self._respond(operation) for operation in batch]
+            content: object = results[self.drop_results :]
+        else:
+            self.batches.append(None)
+            content = self._respond(cast("dict[str, Any]", body))
+        status_code = self.status_code
+        if self.miss_status_code is not None and "PERSISTED_QUERY" in json.dumps(
+            content,
+        ):
+            status_code = self.miss_status_code
+        return httpx.Response(status_code, json=content)
+
+    def _respond(self, operation: dict[str, Any]) -> dict[str, Any]:
+        persisted = operation.get("extensions", {}).get("persistedQuery")
+        if persisted is not None:
+            if self.known_hashes is None:
+                return _persisted_query_error("PERSISTED_QUERY_NOT_SUPPORTED")
+            query_hash = persisted["sha256Hash"]
+            if "query" in operation:
+                assert sha256(operation["query"].encode()).hexdigest() == query_hash
+                self.known_hashes.add(query_hash)
+            elif query_hash not in self.known_hashes:
+                return _persisted_query_error("PERSISTED_QUERY_NOT_FOUND")
+        return _result(operation)
+
+    def client(
+        self,
+        max_batch_size: int = 32,
+        *,
+        persisted_queries: bool | None = None,
+    ) -> BatchingClient:
+        if persisted_queries is None:
+            persisted_queries = self.known_hashes is not None
+        return BatchingClient(
+            url="http://graphql/graphql",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(self)),
+            window_seconds=0.001,
+            max_batch_size=max_batch_size,
+            persisted_queries=persisted_queries,
+        )
+
+
+async def _get_dates(client: BatchingClient, filenames: list[str]) -> list[GetDates]:
+    return await asyncio.gather(*(client.get_dates(name) for name in filenames))
+
+
+class TestBatchingClient:
+    async def test_concurrent_operations_share_one_request(self) -> None:
+        server = _Server(persisted_queries=False)
+        client = server.client()
+
+        results = await _get_dates(client, ["a.sav", "b.sav", "c.sav"])
+
+        assert len(server.batches) == 1
+        assert [op["variables"]["filename"] for op in server.batches[0] or []] == [
+            "a.sav",
+            "b.sav",
+            "c.sav",
+        ]
+        assert [r.save.gamestates[0].date.day for r in results if r.save] == [1, 2, 3]
+        assert client.stats.operations == 3
+        assert client.stats.http_requests == 1
+
+    async def test_single_operation_is_sent_unbatched(self) -> None:
+        server = _Server(persisted_queries=False)
+        client = server.client()
+
+        await client.get_dates("a.sav")
+
+        assert server.batches == [None]
+
+    async def test_full_batch_is_sent_without_waiting(self) -> None:
+        server = _Server(persisted_queries=False)
+        client = server.client(max_batch_size=2)
+
+        await _get_dates(client, ["a.sav", "b.sav", "c.sav"])
+
+        assert [len(batch or [None]) for batch in server.batches] == [2, 1]
+        assert client.stats.max_batch_size == 2
+
+    async def test_operation_errors_stay_with_their_caller(self) -> None:
+        server = _Server(persisted_queries=False)
+        client = server.client()
+
+        ok, missing = await asyncio.gather(
+            client.get_dates("a.sav"),
+            client.get_dates("missing.sav"),
+            return_exceptions=True,
+        )
+
+        assert isinstance(ok, GetDates)
+        assert isinstance(missing, GraphQLClientGraphQLMultiError)
+
+    async def test_http_error_reaches_every_caller(self) -> None:
+        client = _Server(500, persisted_queries=False).client()
+
+        results = await asyncio.gather(
+            client.get_dates("a.sav"),
+            client.get_dates("b.sav"),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, GraphQLClientHttpError) for r in results)
+
+    async def test_mismatched_result_count_is_invalid(self) -> None:
+        client = _Server(drop_results=1, persisted_queries=False).client()
+
+        with pytest.raises(GraphQLClientInvalidResponseError):
+            await _get_dates(client, ["a.sav", "b.sav"])
+
+
+class TestPersistedQueries:
+    async def test_unknown_query_is_resent_with_text_once(self) -> None:
+        server = _Server()
+        client = server.client()
+
+        await client.get_dates("a.sav")
+        await client.get_dates("b.sav")
+
+        assert server.batches == [None, None, None]
+        assert client.stats.persisted_query_misses == 1
+        assert client.stats.http_requests == 3
+        assert server.known_hashes == {PERSISTED_QUERY_HASHES["GetDates"]}
+
+    async def test_only_missed_operations_are_resent(self) -> None:
+        server = _Server()
+        client = server.client()
+        await client.get_dates("a.sav")
+
+        results = await asyncio.gather(
+            client.get_dates("a.sav"),
+            client.list_saves(),
+            return_exceptions=True,
+        )
+
+        assert isinstance(results[0], GetDates)
+        assert client.stats.persisted_query_misses == 2
+        assert [len(batch or [None]) for batch in server.batches] == [1, 1, 2, 1]
+
+    async def test_miss_in_failed_batch_is_resent(self) -> None:
+        server = _Server(miss_status_code=404)
+        client = server.client()
+        await client.get_dates("a.sav")
+
+        dates, saves = await asyncio.gather(
+            client.get_dates("b.sav"),
+            client.list_saves(),
+        )
+
+        assert isinstance(dates, GetDates)
+        assert saves.saves == []
+        assert client.stats.persisted_query_misses == 2
+        assert [len(batch or [None]) for batch in server.batches] == [1, 1, 2, 1]
+
+    async def test_unsupported_server_disables_persisted_queries(self) -> None:
+        server = _Server(persisted_queries=False)
+        client = server.client(persisted_queries=True)
+
+        await client.get_dates("a.sav")
+        await client.get_dates("b.sav")
+
+        assert not client.persisted_queries
+        assert client.stats.http_requests == 3
+
+    def test_hashes_cover_every_operation(self) -> None:
+        operations = {
+            "ListSaves",
+            "GetBalanceTotals",
+            "GetDates",
+            "GetBudget",
+            "GetEmpirePower",
+            "GetGamestateIds",
+            "GetIncomeExpenses",
+            "GetNeighborData",
+        }
+        assert set(PERSISTED_QUERY_HASHES) == operations
+
+    def test_hashes_match_generated_query_documents(self) -> None:
+        code = Path(client_module.__file__).read_text()
+        documents = find_operation_documents(code)
+
+        assert {
+            name: sha256(query.encode()).hexdigest()
+            for name, query in documents.items()
+        } == PERSISTED_QUERY_HASHES
@@ -0,0 +1,132 @@
+import asyncio
+import json
+from typing import override
+
+import httpx
+import pytest
+
+from agent.graphql_client import Client, GetBudget
+from agent.graphql_coalescing import (
+    CoalescingClient,
+    CoalescingSession,
+    CoalescingStats,
+)
+
+from .conftest import MockClient
+
+
+class _SlowClient(MockClient):
+    def __init__(self, error: Exception | None = None) -> None:
+        super().__init__()
+        self.budget_calls: list[str] = []
+        self.release = asyncio.Event()
+        self.error = error
+
+    @override
+    async def get_budget(self, filename: str, **kwargs: object) -> GetBudget:
+        self.budget_calls.append(filename)
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return await super().get_budget(filename, **kwargs)
+
+
+async def _gather_budgets(
+    client: CoalescingClient,
+    inner: _SlowClient,
+    filenames: list[str],
+) -> list[GetBudget]:
+    tasks = [asyncio.ensure_future(client.get_budget(name)) for name in filenames]
+    await asyncio.sleep(0)
+    inner.release.set()
+    return await asyncio.gather(*tasks)
+
+
+class TestCoalescingClient:
+    async def test_concurrent_identical_calls_share_one_request(self) -> None:
+        inner = _SlowClient()
+        stats = CoalescingStats()
+        client = CoalescingClient(inner, stats)
+
+        results = await _gather_budgets(client, inner, ["a.sav", "a.sav", "a.sav"])
+
+        assert inner.budget_calls == ["a.sav"]
+        assert results[0] is results[1] is results[2]
+        assert stats.operations["get_budget"].hits == 2
+        assert stats.operations["get_budget"].misses == 1
+
+    async def test_different_arguments_are_not_coalesced(self) -> None:
+        inner = _SlowClient()
+        client = CoalescingClient(inner, CoalescingStats())
+
+        await _gather_budgets(client, inner, ["a.sav", "b.sav"])
+
+        assert inner.budget_calls == ["a.sav", "b.sav"]
+
+    async def test_sequential_calls_are_not_cached(self) -> None:
+        inner = _SlowClient()
+        inner.release.set()
+        stats = CoalescingStats()
+        client = CoalescingClient(inner, stats)
+
+        await client.get_budget("a.sav")
+        await client.get_budget("a.sav")
+
+        assert inner.budget_calls == ["a.sav", "a.sav"]
+        assert stats.operations["get_budget"].hits == 0
+
+    async def test_error_reaches_every_waiter(self) -> None:
+        inner = _SlowClient(error=RuntimeError("boom"))
+        client = CoalescingClient(inner, CoalescingStats())
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await _gather_budgets(client, inner, ["a.sav", "a.sav"])
+        assert inner.budget_calls == ["a.sav"]
+
+        inner.error = None
+        await client.get_budget("a.sav")
+        assert inner.budget_calls == ["a.sav", "a.sav"]
+
+    async def test_cancelled_waiter_does_not_cancel_shared_request(self) -> None:
+        inner = _SlowClient()
+        client = CoalescingClient(inner, CoalescingStats())
+
+        first = asyncio.ensure_future(client.get_budget("a.sav"))
+        second = asyncio.ensure_future(client.get_budget("a.sav"))
+        await asyncio.sleep(0)
+        first.cancel()
+        inner.release.set()
+
+        assert isinstance(await second, GetBudget)
+        assert first.cancelled()
+
+
+class TestCoalescingSession:
+    async def test_concurrent_identical_executes_share_one_request(self) -> None:
+        requests: list[object] = []
+        release = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(json.loads(request.content)["variables"])
+            await release.wait()
+            return httpx.Response(200, json={"data": {"save": None}})
+
+        client = Client(
+            url="http://graphql/graphql",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        stats = CoalescingStats()
+        async with CoalescingSession(client, stats) as session:
+            tasks = [
+                asyncio.ensure_future(
+                    session.execute("query Q { save }", "Q", {"filename": name}),
+                )
+                for name in ("a.sav", "a.sav", "b.sav")
+            ]
+            await asyncio.sleep(0.01)
+            release.set()
+            responses = await asyncio.gather(*tasks)
+
+        assert requests == [{"filename": "a.sav"}, {"filename": "b.sav"}]
+        assert responses[0] is responses[1]
+        assert stats.operations["execute:Q"].hits == 1
@@ -0,0 +1,140 @@
+import json
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+from agent.analysis_config import RESOURCE_FIELDS
+from agent.graphql_client import Client
+from agent.local_store import LocalStore, LocalStoreClient, LocalStoreStats
+
+
+class _Server:
+    def __init__(self, dates: dict[str, list[str]]) -> None:
+        super().__init__()
+        self.dates = dates
+        self.operations: list[str] = []
+        self.offline = False
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if self.offline:
+            raise httpx.ConnectError("unreachable", request=request)
+        body = json.loads(request.content)
+        operation = body["operationName"]
+        self.operations.append(operation)
+        if operation == "ListSaves":
+            saves = [{"filename": f, "name": f.upper()} for f in self.dates]
+            return httpx.Response(200, json={"data": {"saves": saves}})
+        dates = self.dates.get(body["variables"]["filename"])
+        if dates is None:
+            return httpx.Response(200, json={"data": {"save": None}})
+        gamestates = [self._gamestate(operation, i, d) for i, d in enumerate(dates)]
+        return httpx.Response(200, json={"data": {"save": {"gamestates": gamestates}}})
+
+    def _gamestate(self, operation: str, index: int, date: str) -> dict[str, Any]:
+        if operation == "GetGamestateIds":
+            return {"gamestateId": index + 1, "date": date}
+        if operation == "GetDates":
+            return {"date": date}
+        balance = dict.fromkeys(RESOURCE_FIELDS, float(index))
+        return {"date": date, "budget": {"totals": {"balance": balance}}}
+
+
+def _client(
+    server: _Server,
+    path: Path,
+    source: str = "http://graphql/graphql",
+) -> LocalStoreClient:
+    client = Client(
+        url=source,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(server)),
+    )
+    return LocalStoreClient(client, LocalStore(path, source), LocalStoreStats())
+
+
+DATES = ["2200-01-01T00:00:00Z", "2200-02-01T00:00:00Z"]
+
+
+class TestLocalStoreClient:
+    async def test_repeated_reads_come_from_disk(self, tmp_path: Path) -> None:
+        server = _Server({"a.sav": DATES})
+        path = tmp_path / "store.sqlite3"
+        async with _client(server, path) as client:
+            first = await client.get_balance_totals("a.sav")
+        async with _client(server, path) as client:
+            second = await client.get_balance_totals("a.sav")
+            stats = client.stats
+
+        assert second == first
+        assert server.operations == [
+            "GetGamestateIds",
+            "GetBalanceTotals",
+            "GetGamestateIds",
+        ]
+        assert (stats.hits, stats.misses) == (1, 0)
+
+    async def test_syncs_only_new_gamestates(self, tmp_path: Path) -> None:
+        server = _Server({"a.sav": DATES[:1]})
+        async with _client(server, tmp_path / "store.sqlite3") as client:
+            await client.get_balance_totals("a.sav")
+            server.dates["a.sav"] = DATES
+            result = await client.get_balance_totals("a.sav")
+            stats = client.stats
+
+        assert result.save is not None
+        assert len(result.save.gamestates) == 2
+        assert (stats.misses, stats.gamestates_synced) == (2, 2)
+
+    async def test_serves_store_when_offline(self, tmp_path: Path) -> None:
+        server = _Server({"a.sav": DATES})
+        async with _client(server, tmp_path / "store.sqlite3") as client:
+            saves = await client.list_saves()
+            online = await client.get_balance_totals("a.sav")
+            server.offline = True
+
+            assert await client.list_saves() == saves
+            assert await client.get_balance_totals("a.sav") == online
+            dates = await client.get_dates("a.sav")
+            assert dates.save is not None
+            assert len(dates.save.gamestates) == 2
+            assert client.stats.offline_hits == 3
+            with pytest.raises(httpx.ConnectError):
+                await client.get_balance_totals("b.sav")
+
+    async def test_missing_save_skips_full_query(self, tmp_path: Path) -> None:
+        server = _Server({})
+        async with _client(server, tmp_path / "store.sqlite3") as client:
+            result = await client.get_balance_totals("missing.sav")
+
+        assert result.save is None
+        assert server.operations == ["GetGamestateIds"]
+
+    async def test_servers_do_not_share_rows(self, tmp_path: Path) -> None:
+        server = _Server({"a.sav": DATES})
+        path = tmp_path / "store.sqlite3"
+        async with _client(server, path, "http://prod/graphql") as client:
+            await client.get_balance_totals("a.sav")
+        async with _client(server, path, "http://evals/graphql") as client:
+            await client.get_balance_totals("a.sav")
+
+        assert server.operations.count("GetBalanceTotals") == 2
+
+    async def test_execute_is_mirrored_by_query_text(self, tmp_path: Path) -> None:
+        server = _Server({"a.sav": DATES})
+        query = "query Pruned($filename: String!) { save { gamestates { date } } }"
+        async with _client(server, tmp_path / "store.sqlite3") as client:
+            variables = {"filename": "a.sav"}
+            first = client.get_data(await client.execute(query, "Pruned", variables))
+            second = client.get_data(await client.execute(query, "Pruned", variables))
+            await client.execute(query + " ", "Pruned", variables)
+
+        assert second == first
+        assert len(second["save"]["gamestates"]) == 2
+        assert server.operations == [
+            "GetGamestateIds",
+            "Pruned",
+            "GetGamestateIds",
+            "GetGamestateIds",
+            "Pruned",
+        ]
@@ -11,28 +11,23 @@ from agent.neighbor_single.prompts import (
 
 
 class TestBuildSystemPrompt:
-    def test_contains_graphql_url(self) -> None:
-        url = "http://localhost:4000/graphql"
-        prompt = build_system_prompt(url)
-        assert url in prompt
+    def test_contains_preloaded_data_layout(self) -> None:
+        prompt = build_system_prompt()
 
-    def test_contains_graphql_query(self) -> None:
-        prompt = build_system_prompt("http://example.com")
-
-        assert "GetNeighborData" in prompt
-        assert "playerEmpire" in prompt
-        assert "ownedPlanetIds" in prompt
-        assert "diplomaticRelations" in prompt
-        assert "allPlanetCoordinates" in prompt
+        assert "SANDBOX_DATA" in prompt
+        assert "player_empire" in prompt
+        assert "owned_planet_ids" in prompt
+        assert "diplomatic_relations" in prompt
+        assert "planet_coordinates" in prompt
 
     def test_contains_workflow_instructions(self) -> None:
-        prompt = build_system_prompt("http://example.com")
+        prompt = build_system_prompt()
 
         assert "Workflow" in prompt
         assert "run_python_code" in prompt
 
     def test_contains_distance_algorithm(self) -> None:
-        prompt = build_system_prompt("http://example.com")
+        prompt = build_system_prompt()
 
         assert "min_distance" in prompt
         assert "sqrt" in prompt
@@ -40,7 +35,7 @@ class TestBuildSystemPrompt:
         assert "target_planet_ids" in prompt
 
     def test_contains_finding_types(self) -> None:
-        prompt = build_system_prompt("http://example.com")
+        prompt = build_system_prompt()
 
         assert "hostile_neighbor" in prompt
         assert "genocidal_reputation" in prompt
@@ -48,22 +43,22 @@ class TestBuildSystemPrompt:
         assert "high_threat" in prompt
 
     def test_contains_finding_thresholds(self) -> None:
-        prompt = build_system_prompt("http://example.com")
+        prompt = build_system_prompt()
 
-        assert "isHostile=true" in prompt
+        assert "is_hostile=true" in prompt
         assert "-50" in prompt
         assert "50" in prompt
         assert "genocidal" in prompt
 
     def test_contains_finding_severities(self) -> None:
-        prompt = build_system_prompt("http://example.com")
+        prompt = build_system_prompt()
 
         assert "CRITICAL" in prompt
         assert "WARNING" in prompt
         assert "INFO" in prompt
 
     def test_contains_output_format(self) -> None:
-        prompt = build_system_prompt("http://example.com")
+        prompt = build_system_prompt()
 
         assert "neighbors" in prompt
         assert "key_findings" in prompt
@@ -73,54 +68,44 @@ class TestBuildSystemPrompt:
         assert "player_empire_name" in prompt
 
     def test_contains_critical_rules(self) -> None:
-        prompt = build_system_prompt("http://example.com")
+        prompt = build_system_prompt()
 
         assert "CRITICAL" in prompt
         assert "JSON" in prompt
 
-    def test_contains_httpx_instruction(self) -> None:
-        prompt = build_system_prompt("http://example.com")
-        assert "httpx" in prompt
+    def test_forbids_http_requests(self) -> None:
+        prompt = build_system_prompt()
+        assert "Do not make HTTP requests" in prompt
 
 
 class TestBuildAnalysisPrompt:
     def test_contains_save_filename(self) -> None:
-        prompt = build_analysis_prompt("my-empire.sav", "http://example.com")
+        prompt = build_analysis_prompt("my-empire.sav")
         assert "my-empire.sav" in prompt
 
-    def test_contains_graphql_url(self) -> None:
-        url = "http://localhost:4000/graphql"
-        prompt = build_analysis_prompt("test.sav", url)
-        assert url in prompt
-
     def test_contains_analysis_instructions(self) -> None:
-        prompt = build_analysis_prompt("test.sav", "http://example.com")
+        prompt = build_analysis_prompt("test.sav")
 
         assert "neighbor" in prompt.lower()
         assert "JSON" in prompt
 
 
 class TestBuildNeighborDetectionSystemPrompt:
-    def test_contains_graphql_url(self) -> None:
-        url = "http://localhost:4000/graphql"
-        prompt = build_neighbor_detection_system_prompt(url)
-        assert url in prompt
+    def test_contains_preloaded_data_layout(self) -> None:
+        prompt = build_neighbor_detection_system_prompt()
 
-    def test_contains_graphql_query(self) -> None:
-        prompt = build_neighbor_detection_system_prompt("http://example.com")
-
-        assert "GetNeighborData" in prompt
-        assert "playerEmpire" in prompt
-        assert "ownedPlanetIds" in prompt
-        assert "allPlanetCoordinates" in prompt
+        assert "SANDBOX_DATA" in prompt
+        assert "player_empire" in prompt
+        assert "owned_planet_ids" in prompt
+        assert "planet_coordinates" in prompt
 
     def test_contains_workflow_instructions(self) -> None:
-        prompt = build_neighbor_detection_system_prompt("http://example.com")
+        prompt = build_neighbor_detection_system_prompt()
 
         assert "run_python_code" in prompt
 
     def test_contains_distance_calculation(self) -> None:
-        prompt = build_neighbor_detection_system_prompt("http://example.com")
+        prompt = build_neighbor_detection_system_prompt()
 
         assert "min_distance" in prompt
         assert "sqrt" in prompt
@@ -128,7 +113,7 @@ class TestBuildNeighborDetectionSystemPrompt:
         assert "target_planet_ids" in prompt
 
     def test_contains_output_format(self) -> None:
-        prompt = build_neighbor_detection_system_prompt("http://example.com")
+        prompt = build_neighbor_detection_system_prompt()
 
         assert "detected_neighbors" in prompt
         assert "save_filename" in prompt
@@ -137,30 +122,20 @@ class TestBuildNeighborDetectionSystemPrompt:
 
 class TestBuildNeighborDetectionPrompt:
     def test_contains_save_filename(self) -> None:
-        prompt = build_neighbor_detection_prompt("my-empire.sav", "http://example.com")
+        prompt = build_neighbor_detection_prompt("my-empire.sav")
         assert "my-empire.sav" in prompt
 
-    def test_contains_graphql_url(self) -> None:
-        url = "http://localhost:4000/graphql"
-        prompt = build_neighbor_detection_prompt("test.sav", url)
-        assert url in prompt
-
 
 class TestBuildOpinionAnalysisSystemPrompt:
-    def test_contains_graphql_url(self) -> None:
-        url = "http://localhost:4000/graphql"
-        prompt = build_opinion_analysis_system_prompt(url)
-        assert url in prompt
+    def test_contains_preloaded_data_layout(self) -> None:
+        prompt = build_opinion_analysis_system_prompt()
 
-    def test_contains_graphql_query(self) -> None:
-        prompt = build_opinion_analysis_system_prompt("http://example.com")
-
-        assert "GetDiplomaticData" in prompt
-        assert "diplomaticRelations" in prompt
-        assert "opinionModifiers" in prompt
+        assert "SANDBOX_DATA" in prompt
+        assert "diplomatic_relations" in prompt
+        assert "opinion_modifiers" in prompt
 
     def test_contains_finding_types(self) -> None:
-        prompt = build_opinion_analysis_system_prompt("http://example.com")
+        prompt = build_opinion_analysis_system_prompt()
 
         assert "hostile_neighbor" in prompt
         assert "genocidal_reputation" in prompt
@@ -168,15 +143,15 @@ class TestBuildOpinionAnalysisSystemPrompt:
         assert "high_threat" in prompt
 
     def test_contains_finding_thresholds(self) -> None:
-        prompt = build_opinion_analysis_system_prompt("http://example.com")
+        prompt = build_opinion_analysis_system_prompt()
 
-        assert "isHostile=true" in prompt
+        assert "is_hostile=true" in prompt
         assert "-50" in prompt
         assert "50" in prompt
         assert "genocidal" in prompt
 
     def test_contains_output_format(self) -> None:
-        prompt = build_opinion_analysis_system_prompt("http://example.com")
+        prompt = build_opinion_analysis_system_prompt()
 
         assert "findings" in prompt
         assert "opinion_modifiers" in prompt
@@ -189,7 +164,6 @@ class TestBuildOpinionAnalysisPrompt:
             "my-empire.sav",
             "1",
             "Test Empire",
-            "http://example.com",
         )
         assert "my-empire.sav" in prompt
 
@@ -198,12 +172,6 @@ class TestBuildOpinionAnalysisPrompt:
             "test.sav",
             "42",
             "Blorg Commonality",
-            "http://example.com",
         )
         assert "Blorg Commonality" in prompt
         assert "42" in prompt
-
-    def test_contains_graphql_url(self) -> None:
-        url = "http://localhost:4000/graphql"
-        prompt = build_opinion_analysis_prompt("test.sav", "1", "Empire", url)
-        assert url in prompt
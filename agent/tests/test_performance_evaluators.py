@@ -0,0 +1,226 @@
+from datetime import UTC, datetime
+from typing import Any
+from unittest.mock import MagicMock, PropertyMock
+
+from pydantic_evals.evaluators import EvaluationReason
+from pydantic_evals.otel import SpanNode, SpanTree
+
+from agent.evals.evaluators.performance import (
+    MaxDuration,
+    PromptCacheHitRate,
+    SandboxExecutionBudget,
+    TokenBudget,
+    ToolCallBudget,
+    performance_evaluators,
+)
+
+
+def _create_span(
+    span_id: int,
+    name: str,
+    attributes: dict[str, Any],
+) -> SpanNode:
+    timestamp = datetime(2026, 1, 1, tzinfo=UTC)
+    return SpanNode(
+        name=name,
+        trace_id=1,
+        span_id=span_id,
+        parent_span_id=None,
+        start_timestamp=timestamp,
+        end_timestamp=timestamp,
+        attributes=attributes,
+    )
+
+
+def _create_tool_span(span_id: int, tool_name: str) -> SpanNode:
+    return _create_span(
+        span_id,
+        "running tool",
+        {
+            "gen_ai.tool.name": tool_name,
+            "logfire.msg": f"running tool: {tool_name}",
+        },
+    )
+
+
+def _create_span_tree(spans: list[SpanNode]) -> SpanTree:
+    tree = SpanTree()
+    tree.add_spans(spans)
+    return tree
+
+
+def _create_mock_context(
+    duration: float = 1.0,
+    metrics: dict[str, float | int] | None = None,
+    span_tree: SpanTree | None = None,
+) -> MagicMock:
+    ctx: MagicMock = MagicMock()
+    ctx.duration = duration
+    ctx.metrics = metrics if metrics is not None else {}
+    ctx.span_tree = span_tree if span_tree is not None else SpanTree()
+    return ctx
+
+
+def _create_unrecorded_context() -> MagicMock:
+    ctx: MagicMock = MagicMock()
+    type(ctx).span_tree = PropertyMock(
+        side_effect=RuntimeError("logfire not configured"),
+    )
+    return ctx
+
+
+class TestMaxDuration:
+    def test_within_budget(self) -> None:
+        result = MaxDuration(max_seconds=10.0).evaluate(_create_mock_context(5.0))
+        assert result.value is True
+
+    def test_exceeds_budget(self) -> None:
+        result = MaxDuration(max_seconds=10.0).evaluate(_create_mock_context(12.5))
+        assert result.value is False
+        assert result.reason is not None
+        assert "12.5s" in result.reason
+
+
+class TestTokenBudget:
+    def test_within_budget(self) -> None:
+        ctx = _create_mock_context(
+            metrics={"input_tokens": 1000, "output_tokens": 100},
+        )
+        result = TokenBudget(max_input_tokens=2000, max_output_tokens=200).evaluate(ctx)
+        assert result.value is True
+
+    def test_input_tokens_exceeded(self) -> None:
+        ctx = _create_mock_context(metrics={"input_tokens": 3000})
+        result = TokenBudget(max_input_tokens=2000).evaluate(ctx)
+        assert result.value is False
+        assert result.reason is not None
+        assert "input" in result.reason
+
+    def test_output_tokens_exceeded(self) -> None:
+        ctx = _create_mock_context(metrics={"output_tokens": 300})
+        result = TokenBudget(max_output_tokens=200).evaluate(ctx)
+        assert result.value is False
+        assert result.reason is not None
+        assert "output" in result.reason
+
+    def test_missing_metrics_count_as_zero(self) -> None:
+        result = TokenBudget(max_input_tokens=0, max_output_tokens=0).evaluate(
+            _create_mock_context(),
+        )
+        assert result.value is True
+
+
+class TestToolCallBudget:
+    def test_counts_tool_calls_and_ignores_other_spans(self) -> None:
+        tree = _create_span_tree(
+            [
+                _create_tool_span(1, "get_budget"),
+                _create_tool_span(2, "run_python_code"),
+                _create_span(3, "chat gpt-5.2", {"gen_ai.request.model": "gpt-5.2"}),
+                _create_span(
+                    4,
+                    "running output function",
+                    {
+                        "gen_ai.tool.name": "final_result",
+                        "logfire.msg": "running output function: final_result",
+                    },
+                ),
+            ],
+        )
+
+        result = ToolCallBudget(max_tool_calls=2).evaluate(
+            _create_mock_context(span_tree=tree),
+        )
+
+        assert isinstance(result, dict)
+        assert result["tool_calls"] == 2
+        budget = result["tool_call_budget"]
+        assert isinstance(budget, EvaluationReason)
+        assert budget.value is True
+
+    def test_exceeds_budget(self) -> None:
+        tree = _create_span_tree(
+            [_create_tool_span(i, "get_budget") for i in range(1, 5)],
+        )
+
+        result = ToolCallBudget(max_tool_calls=3).evaluate(
+            _create_mock_context(span_tree=tree),
+        )
+
+        assert isinstance(result, dict)
+        budget = result["tool_call_budget"]
+        assert isinstance(budget, EvaluationReason)
+        assert budget.value is False
+
+    def test_fails_without_span_tree(self) -> None:
+        result = ToolCallBudget(max_tool_calls=3).evaluate(
+            _create_unrecorded_context(),
+        )
+
+        assert isinstance(result, dict)
+        assert "tool_calls" not in result
+        budget = result["tool_call_budget"]
+        assert isinstance(budget, EvaluationReason)
+        assert budget.value is False
+
+
+class TestSandboxExecutionBudget:
+    def test_counts_only_sandbox_executions(self) -> None:
+        tree = _create_span_tree(
+            [
+                _create_tool_span(1, "run_python_code"),
+                _create_tool_span(2, "run_python_code"),
+                _create_tool_span(3, "get_budget"),
+            ],
+        )
+
+        result = SandboxExecutionBudget(max_executions=1).evaluate(
+            _create_mock_context(span_tree=tree),
+        )
+
+        assert isinstance(result, dict)
+        assert result["sandbox_executions"] == 2
+        budget = result["sandbox_execution_budget"]
+        assert isinstance(budget, EvaluationReason)
+        assert budget.value is False
+
+
+class TestPromptCacheHitRate:
+    def test_reports_share_of_cached_input_tokens(self) -> None:
+        ctx = _create_mock_context(
+            metrics={"input_tokens": 4000, "cache_read_tokens": 3000},
+        )
+
+        result = PromptCacheHitRate().evaluate(ctx)
+
+        assert result == {"prompt_cache_hit_rate": 0.75}
+
+    def test_without_requests(self) -> None:
+        result = PromptCacheHitRate().evaluate(_create_mock_context())
+        assert result == {"prompt_cache_hit_rate": 0.0}
+
+
+class TestPerformanceEvaluators:
+    def test_without_sandbox_budget(self) -> None:
+        evaluators = performance_evaluators(
+            max_seconds=60.0,
+            max_input_tokens=1000,
+            max_output_tokens=100,
+            max_tool_calls=5,
+        )
+        assert [type(e) for e in evaluators] == [
+            MaxDuration,
+            TokenBudget,
+            ToolCallBudget,
+            PromptCacheHitRate,
+        ]
+
+    def test_with_sandbox_budget(self) -> None:
+        evaluators = performance_evaluators(
+            max_seconds=60.0,
+            max_input_tokens=1000,
+            max_output_tokens=100,
+            max_tool_calls=5,
+            max_sandbox_executions=3,
+        )
+        assert isinstance(evaluators[-1], SandboxExecutionBudget)
@@ -0,0 +1,208 @@
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+from graphql import build_schema, parse, validate
+
+from agent.models import SuddenDrop
+from agent.planet_drilldown import (
+    PlanetBalance,
+    build_planet_profits_query,
+    drill_down_drop,
+    fetch_planet_profits,
+    parse_planet_profits,
+    rank_planet_impacts,
+)
+from agent.root_cause_multi.orchestrator import (
+    fetch_drop_planet_profits,
+    planet_drilldown,
+)
+
+SCHEMA = build_schema(
+    (Path(__file__).parents[2] / "graphql" / "schema.graphql").read_text(),
+)
+DROP = SuddenDrop(
+    resource="energy",
+    start_date="2200-01-01 00:00:00+00:00",
+    end_date="2200-02-01 00:00:00+00:00",
+    start_value=100.0,
+    end_value=40.0,
+    drop_percent=60.0,
+    drop_absolute=60.0,
+)
+
+
+def _planet(planet_id: int, income: float, expenses: float) -> dict[str, Any]:
+    return {
+        "planetId": planet_id,
+        "planetName": f"Planet {planet_id}",
+        "profits": {
+            "income": {"energy": income},
+            "expenses": {"energy": expenses},
+            "balance": {"energy": income - expenses},
+        },
+    }
+
+
+def _balance(balance: float) -> PlanetBalance:
+    return PlanetBalance(planet_name="", income=balance, expenses=0.0, balance=balance)
+
+
+class _Executor:
+    def __init__(self, data: dict[str, Any]) -> None:
+        super().__init__()
+        self.data = data
+        self.queries: list[str] = []
+
+    async def execute(
+        self,
+        query: str,
+        operation_name: str | None = None,
+        variables: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        self.queries.append(query)
+        return httpx.Response(200, json={"data": self.data})
+
+    def get_data(self, response: httpx.Response) -> dict[str, Any]:
+        data: dict[str, Any] = response.json()["data"]
+        return data
+
+
+class TestBuildPlanetProfitsQuery:
+    def test_validates_against_schema(self) -> None:
+        assert (
+            validate(SCHEMA, parse(build_planet_profits_query(("energy", "alloys"))))
+            == []
+        )
+
+    def test_rejects_unknown_resource(self) -> None:
+        with pytest.raises(ValueError, match="Unknown budget resource"):
+            build_planet_profits_query(("energy", "gold"))
+
+
+class TestParsePlanetProfits:
+    def test_keeps_only_requested_dates(self) -> None:
+        data: dict[str, Any] = {
+            "save": {
+                "gamestates": [
+                    {"date": f"2200-0{month}-01T00:00:00.000Z", "planets": []}
+                    for month in range(1, 4)
+                ],
+            },
+        }
+
+        profits = parse_planet_profits(data, ["energy"], {date(2200, 2, 1)})
+
+        assert list(profits["energy"]) == [date(2200, 2, 1)]
+
+    def test_null_entries_read_as_zero(self) -> None:
+        planet = _planet(1, 5.0, 0.0)
+        planet["profits"]["expenses"] = None
+        data = {
+            "save": {
+                "gamestates": [{"date": "2200-01-01T00:00:00Z", "planets": [planet]}],
+            },
+        }
+
+        profits = parse_planet_profits(data, ["energy"], {date(2200, 1, 1)})
+
+        assert profits["energy"][date(2200, 1, 1)][1].expenses == 0.0
+
+
+class TestRankPlanetImpacts:
+    def test_ranks_largest_declines_only(self) -> None:
+        before = {1: _balance(10.0), 2: _balance(50.0), 3: _balance(5.0)}
+        after = {1: _balance(4.0), 2: _balance(20.0), 3: _balance(8.0)}
+
+        impacts = rank_planet_impacts(before, after)
+
+        assert [(i.planet_id, i.change_absolute, i.rank) for i in impacts] == [
+            (2, 30.0, 1),
+            (1, 6.0, 2),
+        ]
+
+    def test_lost_planet_counts_its_whole_balance(self) -> None:
+        impacts = rank_planet_impacts({7: _balance(12.0)}, {})
+
+        assert impacts[0].after_balance == 0.0
+        assert impacts[0].change_absolute == 12.0
+
+    def test_hundreds_of_planets(self) -> None:
+        before = {planet_id: _balance(100.0) for planet_id in range(50_000)}
+        after = {planet_id: _balance(100.0 - planet_id % 97) for planet_id in before}
+
+        started = time.perf_counter()
+        impacts = rank_planet_impacts(before, after, top_k=3)
+
+        assert time.perf_counter() - started < 1.0
+        assert [i.change_absolute for i in impacts] == [96.0, 96.0, 96.0]
+
+
+class TestDrillDownDrop:
+    async def test_compares_the_drop_dates(self) -> None:
+        executor = _Executor(
+            {
+                "save": {
+                    "gamestates": [
+                        {
+                            "date": "2200-01-01T00:00:00.000Z",
+                            "planets": [_planet(1, 60.0, 10.0), _planet(2, 50.0, 0.0)],
+                        },
+                        {
+                            "date": "2200-02-01T00:00:00.000Z",
+                            "planets": [_planet(1, 30.0, 20.0), _planet(2, 50.0, 0.0)],
+                        },
+                    ],
+                },
+            },
+        )
+
+        profits = await fetch_planet_profits(executor, "save", [DROP])
+        result = drill_down_drop(profits, DROP)
+
+        assert result.planets_compared == 2
+        (planet,) = result.top_planets
+        assert planet.planet_name == "Planet 1"
+        assert planet.change_absolute == 40.0
+        assert planet.income_change == -30.0
+        assert planet.expenses_change == 10.0
+        assert "energy" in executor.queries[0]
+        assert "minerals" not in executor.queries[0]
+
+    async def test_one_query_serves_every_drop(self) -> None:
+        executor = _Executor({"save": {"gamestates": []}})
+        drops = [DROP, DROP.model_copy(update={"resource": "alloys"})]
+
+        profits = await fetch_planet_profits(executor, "save", drops)
+
+        assert len(executor.queries) == 1
+        assert "alloys" in executor.queries[0]
+        assert set(profits) == {"energy", "alloys"}
+
+    async def test_no_budget_drops_skip_the_query(self) -> None:
+        executor = _Executor({})
+        drop = DROP.model_copy(update={"resource": "unity_total"})
+
+        assert await fetch_planet_profits(executor, "save", [drop]) == {}
+        assert executor.queries == []
+
+    def test_missing_gamestate(self) -> None:
+        with pytest.raises(ValueError, match="No energy profits on 2200-01-01"):
+            drill_down_drop({"energy": {}}, DROP)
+
+
+class TestOrchestratorDrillDown:
+    async def test_failed_fetch_leaves_drops_without_drilldown(self) -> None:
+        executor = _Executor({"save": {"gamestates": [{"date": "bad"}]}})
+
+        profits = await fetch_drop_planet_profits(executor, "save", [DROP])
+
+        assert profits is None
+        assert planet_drilldown(profits, DROP) is None
+
+    def test_missing_gamestate_yields_none(self) -> None:
+        assert planet_drilldown({"energy": {}}, DROP) is None
@@ -0,0 +1,177 @@
+import math
+import time
+from typing import Any
+
+import pytest
+
+from agent.graphql_client import GetEmpirePower
+from agent.models import PowerMetric
+from agent.power_trends import (
+    PowerMatrix,
+    build_power_matrix,
+    compute_power_trends,
+    find_outpacing_events,
+    rank_empires,
+    run_power_trends_analysis,
+)
+
+from .conftest import MockClient
+
+
+def _empire(
+    country_id: str,
+    military: float | None,
+    *,
+    player: bool = False,
+) -> dict[str, Any]:
+    return {
+        "countryId": country_id,
+        "name": f"Empire {country_id}",
+        "isPlayer": player,
+        "militaryPower": military,
+        "economyPower": 10.0,
+        "techPower": 10.0,
+    }
+
+
+def _power(gamestates: list[list[dict[str, Any]]]) -> GetEmpirePower:
+    return GetEmpirePower.model_validate(
+        {
+            "save": {
+                "gamestates": [
+                    {"date": f"22{index:02d}-01-01T00:00:00Z", "empires": empires}
+                    for index, empires in enumerate(gamestates)
+                ],
+            },
+        },
+    )
+
+
+def _matrix(military: dict[str, list[float]], player: str | None = "0") -> PowerMatrix:
+    country_ids = list(military)
+    length = len(next(iter(military.values())))
+    return PowerMatrix(
+        dates=[f"d{index}" for index in range(length)],
+        country_ids=country_ids,
+        names=[f"Empire {c}" for c in country_ids],
+        player_index=country_ids.index(player) if player is not None else None,
+        values={
+            PowerMetric.MILITARY: list(military.values()),
+            PowerMetric.ECONOMY: [[math.nan] * length for _ in country_ids],
+            PowerMetric.TECH: [[math.nan] * length for _ in country_ids],
+        },
+    )
+
+
+class TestBuildPowerMatrix:
+    def test_missing_empires_and_values_are_nan(self) -> None:
+        power = _power(
+            [
+                [_empire("0", 10.0, player=True)],
+                [_empire("0", 12.0, player=True), _empire("1", None)],
+            ],
+        )
+
+        matrix = build_power_matrix(power, "save")
+
+        assert matrix.country_ids == ["0", "1"]
+        assert matrix.player_index == 0
+        military = matrix.values[PowerMetric.MILITARY]
+        assert military[0] == [10.0, 12.0]
+        assert all(math.isnan(v) for v in military[1])
+
+    def test_missing_save(self) -> None:
+        with pytest.raises(ValueError, match="not found"):
+            build_power_matrix(GetEmpirePower(save=None), "missing")
+
+
+class TestRankEmpires:
+    def test_strongest_first_and_absent_unranked(self) -> None:
+        assert rank_empires([[5.0], [math.nan], [9.0]], 0) == [2, None, 1]
+
+
+class TestComputePowerTrends:
+    def test_growth_and_rank_change(self) -> None:
+        matrix = _matrix({"0": [100.0, 110.0, 120.0], "1": [50.0, 100.0, 200.0]})
+
+        trends = compute_power_trends(matrix, window=2)
+
+        military = [t for t in trends if t.metric == PowerMetric.MILITARY]
+        assert [(t.country_id, t.current_rank, t.rank_change) for t in military] == [
+            ("1", 1, 1),
+            ("0", 2, -1),
+        ]
+        assert military[0].recent_growth_percent == 300.0
+        assert military[1].is_player
+
+    def test_total_growth_starts_at_first_value(self) -> None:
+        matrix = _matrix({"0": [math.nan, 20.0, 30.0, 40.0]})
+
+        (trend, *_) = compute_power_trends(matrix, window=1)
+
+        assert trend.total_growth_percent == 100.0
+        assert trend.recent_growth_percent == pytest.approx(100 / 3)
+
+    def test_rejects_empty_window(self) -> None:
+        with pytest.raises(ValueError, match="at least 1"):
+            compute_power_trends(_matrix({"0": [1.0]}), window=0)
+
+
+class TestFindOutpacingEvents:
+    def test_reports_each_crossing_newest_first(self) -> None:
+        matrix = _matrix(
+            {
+                "0": [100.0, 100.0, 100.0, 100.0, 100.0],
+                "1": [50.0, 150.0, 90.0, 120.0, 130.0],
+                "2": [200.0, 210.0, 220.0, 230.0, 240.0],
+            },
+        )
+
+        events = find_outpacing_events(matrix)
+
+        assert [(e.date, e.country_id) for e in events] == [("d3", "1"), ("d1", "1")]
+        assert events[0].rival_value == 120.0
+        assert events[0].player_value == 100.0
+
+    def test_gaps_are_not_crossings(self) -> None:
+        matrix = _matrix({"0": [100.0, 100.0], "1": [math.nan, 150.0]})
+
+        assert find_outpacing_events(matrix) == []
+
+    def test_without_player(self) -> None:
+        assert find_outpacing_events(_matrix({"0": [1.0]}, player=None)) == []
+
+    def test_galaxy_of_fifty_empires_over_a_thousand_dates(self) -> None:
+        military = {
+            str(empire): [
+                float((empire * 37 + date * (empire + 1)) % 1000)
+                for date in range(1000)
+            ]
+            for empire in range(50)
+        }
+        matrix = _matrix(military)
+
+        started = time.perf_counter()
+        compute_power_trends(matrix)
+        events = find_outpacing_events(matrix)
+
+        assert time.perf_counter() - started < 1.0
+        assert events
+
+
+class TestRunPowerTrendsAnalysis:
+    async def test_builds_result(self) -> None:
+        power = _power(
+            [
+                [_empire("0", 100.0, player=True), _empire("1", 50.0)],
+                [_empire("0", 100.0, player=True), _empire("1", 150.0)],
+            ],
+        )
+        client = MockClient(empire_power={"save": power})
+
+        result = await run_power_trends_analysis("save", client=client)
+
+        assert result.empires_tracked == 2
+        assert result.player_country_id == "0"
+        assert len(result.outpacing_events) == 1
+        assert "military #2" in result.summary
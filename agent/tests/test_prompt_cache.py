@@ -0,0 +1,57 @@
+from pydantic_ai import Agent
+from pydantic_ai.models.test import TestModel
+from pydantic_ai.usage import RequestUsage
+
+from agent.constants import (
+    PromptCacheStats,
+    PromptCacheTrackingModel,
+    create_prompt_cache_settings,
+)
+
+
+class TestCreatePromptCacheSettings:
+    def test_anthropic_marks_static_prefix(self) -> None:
+        settings = create_prompt_cache_settings(
+            "anthropic:claude-haiku-4-5-20251001",
+            "root_cause_agent",
+        )
+
+        assert settings == {
+            "anthropic_cache_instructions": True,
+            "anthropic_cache_tool_definitions": True,
+        }
+
+    def test_openai_uses_agent_kind_as_cache_key(self) -> None:
+        settings = create_prompt_cache_settings(
+            "openai-responses:gpt-5-nano-2025-08-07",
+            "root_cause_agent",
+        )
+
+        assert settings == {"openai_prompt_cache_key": "root_cause_agent"}
+
+
+class TestPromptCacheStats:
+    def test_hit_rate(self) -> None:
+        stats = PromptCacheStats()
+
+        stats.record(RequestUsage(input_tokens=1000, cache_write_tokens=1000))
+        stats.record(RequestUsage(input_tokens=1000, cache_read_tokens=900))
+
+        assert stats.requests == 2
+        assert stats.cache_write_tokens == 1000
+        assert stats.hit_rate == 0.45
+
+    def test_hit_rate_without_requests(self) -> None:
+        assert PromptCacheStats().hit_rate == 0.0
+
+
+class TestPromptCacheTrackingModel:
+    async def test_records_every_request(self) -> None:
+        stats = PromptCacheStats()
+        agent = Agent(PromptCacheTrackingModel(TestModel(), stats))
+
+        await agent.run("first")
+        await agent.run("second")
+
+        assert stats.requests == 2
+        assert stats.input_tokens > 0
@@ -0,0 +1,195 @@
+import asyncio
+
+import httpx
+import pytest
+from pydantic_ai import Agent
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from agent.rate_limit import (
+    RateLimitedModel,
+    RateLimiter,
+    RateLimits,
+    TokenBucket,
+    retry_after_seconds,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        super().__init__()
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+class _ResponseError(Exception):
+    def __init__(self, response: httpx.Response) -> None:
+        super().__init__("rate limited")
+        self.response = response
+
+
+def _rate_limit_error(headers: dict[str, str]) -> ModelHTTPError:
+    error = ModelHTTPError(429, "model")
+    error.__cause__ = _ResponseError(httpx.Response(429, headers=headers))
+    return error
+
+
+def _create_limiter(
+    clock: FakeClock,
+    requests_per_minute: int = 60,
+    tokens_per_minute: int = 6000,
+) -> RateLimiter:
+    return RateLimiter(
+        RateLimits(requests_per_minute, tokens_per_minute),
+        clock=clock,
+        sleep=clock.sleep,
+    )
+
+
+class TestTokenBucket:
+    def test_refills_per_minute(self) -> None:
+        clock = FakeClock()
+        bucket = TokenBucket(60, clock)
+
+        bucket.consume(60)
+        assert bucket.wait_time(30) == 30.0
+
+        clock.now = 30.0
+        assert bucket.wait_time(30) == 0.0
+
+    def test_oversized_amount_waits_for_full_bucket(self) -> None:
+        clock = FakeClock()
+        bucket = TokenBucket(60, clock)
+
+        bucket.consume(30)
+
+        assert bucket.wait_time(1000) == 30.0
+
+
+class TestRateLimiter:
+    async def test_waits_for_request_capacity(self) -> None:
+        clock = FakeClock()
+        limiter = _create_limiter(clock, requests_per_minute=2)
+
+        for _ in range(3):
+            await limiter.acquire(0)
+
+        assert clock.sleeps == [30.0]
+        assert limiter.stats.requests == 3
+        assert limiter.stats.delayed_requests == 1
+        assert limiter.stats.total_wait_seconds == 30.0
+
+    async def test_waits_for_token_capacity(self) -> None:
+        clock = FakeClock()
+        limiter = _create_limiter(clock, tokens_per_minute=600)
+
+        await limiter.acquire(600)
+        await limiter.acquire(100)
+
+        assert clock.sleeps == [10.0]
+
+    async def test_settled_debt_delays_next_request(self) -> None:
+        clock = FakeClock()
+        limiter = _create_limiter(clock, tokens_per_minute=600)
+
+        await limiter.acquire(100)
+        limiter.settle(reserved=100, used=700)
+        await limiter.acquire(0)
+
+        assert clock.sleeps == [10.0]
+
+    async def test_admits_in_arrival_order(self) -> None:
+        clock = FakeClock()
+        limiter = _create_limiter(clock, tokens_per_minute=600)
+        admitted: list[str] = []
+
+        async def request(name: str, tokens: int) -> None:
+            await limiter.acquire(tokens)
+            admitted.append(name)
+
+        await limiter.acquire(600)
+        await asyncio.gather(request("large", 600), request("small", 1))
+
+        assert admitted == ["large", "small"]
+        assert limiter.stats.max_queue_depth == 2
+        assert limiter.stats.queue_depth == 0
+
+    async def test_uncontended_requests_are_not_delayed(self) -> None:
+        limiter = RateLimiter(
+            RateLimits(requests_per_minute=100, tokens_per_minute=100_000),
+        )
+
+        for _ in range(5):
+            await limiter.acquire(10)
+
+        assert limiter.stats.delayed_requests == 0
+        assert limiter.stats.total_wait_seconds == 0.0
+
+    async def test_pause_holds_requests_back(self) -> None:
+        clock = FakeClock()
+        limiter = _create_limiter(clock)
+
+        limiter.pause(5.0)
+        await limiter.acquire(0)
+
+        assert clock.sleeps == [5.0]
+        assert limiter.stats.rate_limited_responses == 1
+
+
+class TestRetryAfterSeconds:
+    def test_seconds(self) -> None:
+        assert retry_after_seconds(_rate_limit_error({"retry-after": "3"})) == 3.0
+
+    def test_milliseconds_take_precedence(self) -> None:
+        error = _rate_limit_error({"retry-after": "3", "retry-after-ms": "1500"})
+        assert retry_after_seconds(error) == 1.5
+
+    def test_past_http_date(self) -> None:
+        error = _rate_limit_error({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        assert retry_after_seconds(error) == 0.0
+
+    def test_missing_header(self) -> None:
+        assert retry_after_seconds(_rate_limit_error({})) is None
+        assert retry_after_seconds(ModelHTTPError(429, "model")) is None
+
+
+class TestRateLimitedModel:
+    async def test_retries_after_rate_limit(self) -> None:
+        clock = FakeClock()
+        limiter = _create_limiter(clock)
+        calls: list[int] = []
+
+        def respond(_messages: list[ModelMessage], _info: AgentInfo) -> ModelResponse:
+            calls.append(len(calls))
+            if len(calls) == 1:
+                raise _rate_limit_error({"retry-after": "7"})
+            return ModelResponse(parts=[TextPart("done")])
+
+        agent = Agent(RateLimitedModel(FunctionModel(respond), limiter))
+        result = await agent.run("hello")
+
+        assert result.output == "done"
+        assert len(calls) == 2
+        assert clock.sleeps == [7.0]
+        assert limiter.stats.rate_limited_responses == 1
+
+    async def test_other_errors_are_not_retried(self) -> None:
+        limiter = _create_limiter(FakeClock())
+
+        def respond(_messages: list[ModelMessage], _info: AgentInfo) -> ModelResponse:
+            raise ModelHTTPError(500, "model")
+
+        agent = Agent(RateLimitedModel(FunctionModel(respond), limiter))
+
+        with pytest.raises(ModelHTTPError):
+            await agent.run("hello")
+        assert limiter.stats.requests == 1
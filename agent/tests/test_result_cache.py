@@ -0,0 +1,189 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from agent.cli import build_analysis_prompts, is_cacheable
+from agent.models import (
+    MultiAgentAnalysisResult,
+    SuddenDrop,
+    SuddenDropAnalysisResult,
+    SuddenDropWithRootCause,
+)
+from agent.neighbor import NeighborAnalysisResult
+from agent.result_cache import ResultCache, build_cache_key
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        super().__init__()
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _create_drop_result(summary: str = "No drops") -> SuddenDropAnalysisResult:
+    return SuddenDropAnalysisResult(
+        save_filename="test.sav",
+        analysis_period_start="2200-01-01",
+        analysis_period_end="2200-04-01",
+        datapoints_analyzed=4,
+        drop_threshold_percent=30.0,
+        sudden_drops=[],
+        summary=summary,
+    )
+
+
+def _create_multi_result(analysis_error: str | None) -> MultiAgentAnalysisResult:
+    drop = SuddenDrop(
+        resource="energy",
+        start_date="2200-01-01",
+        end_date="2200-04-01",
+        start_value=100.0,
+        end_value=50.0,
+        drop_percent=50.0,
+        drop_absolute=50.0,
+    )
+    return MultiAgentAnalysisResult(
+        save_filename="test.sav",
+        analysis_period_start="2200-01-01",
+        analysis_period_end="2200-04-01",
+        datapoints_analyzed=4,
+        drop_threshold_percent=30.0,
+        drops_with_root_causes=[
+            SuddenDropWithRootCause(
+                drop=drop,
+                root_cause=None,
+                analysis_error=analysis_error,
+            ),
+        ],
+        total_drops_detected=1,
+        successful_root_cause_analyses=0,
+        summary="Test result",
+    )
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(tmp_path: Path, clock: FakeClock) -> Iterator[ResultCache]:
+    store = ResultCache(
+        tmp_path / "cache.sqlite3",
+        ttl_seconds=60.0,
+        max_entries=2,
+        clock=clock,
+    )
+    yield store
+    store.close()
+
+
+class TestBuildCacheKey:
+    def test_stable_for_same_inputs(self) -> None:
+        first = build_cache_key("sandbox", "m", ["sys", "user"], ["2200", "2201"])
+        second = build_cache_key("sandbox", "m", ["sys", "user"], ["2201", "2200"])
+        assert first == second
+
+    def test_changes_with_prompt(self) -> None:
+        first = build_cache_key("sandbox", "m", ["sys", "user"], ["2200"])
+        second = build_cache_key("sandbox", "m", ["sys v2", "user"], ["2200"])
+        assert first != second
+
+    def test_prompt_boundaries_matter(self) -> None:
+        first = build_cache_key("sandbox", "m", ["ab", "c"], ["2200"])
+        second = build_cache_key("sandbox", "m", ["a", "bc"], ["2200"])
+        assert first != second
+
+    def test_changes_with_new_gamestate(self) -> None:
+        first = build_cache_key("sandbox", "m", ["sys"], ["2200"])
+        second = build_cache_key("sandbox", "m", ["sys"], ["2200", "2201"])
+        assert first != second
+
+    def test_changes_with_model_and_type(self) -> None:
+        base = build_cache_key("sandbox", "m", ["sys"], ["2200"])
+        assert base != build_cache_key("sandbox", "other", ["sys"], ["2200"])
+        assert base != build_cache_key("native-budget", "m", ["sys"], ["2200"])
+
+
+class TestResultCache:
+    def test_round_trip(self, cache: ResultCache) -> None:
+        cache.put("key", _create_drop_result())
+
+        result = cache.get("key", SuddenDropAnalysisResult)
+
+        assert result == _create_drop_result()
+
+    def test_missing_key(self, cache: ResultCache) -> None:
+        assert cache.get("missing", SuddenDropAnalysisResult) is None
+
+    def test_wrong_result_type_is_a_miss(self, cache: ResultCache) -> None:
+        cache.put("key", _create_drop_result())
+
+        assert cache.get("key", NeighborAnalysisResult) is None
+
+    def test_expired_entries_are_dropped(
+        self,
+        cache: ResultCache,
+        clock: FakeClock,
+    ) -> None:
+        cache.put("key", _create_drop_result())
+        clock.now += 61.0
+
+        assert cache.get("key", SuddenDropAnalysisResult) is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(
+        self,
+        cache: ResultCache,
+        clock: FakeClock,
+    ) -> None:
+        cache.put("a", _create_drop_result("a"))
+        clock.now += 1
+        cache.put("b", _create_drop_result("b"))
+        clock.now += 1
+        cache.get("a", SuddenDropAnalysisResult)
+        clock.now += 1
+        cache.put("c", _create_drop_result("c"))
+
+        assert len(cache) == 2
+        assert cache.get("a", SuddenDropAnalysisResult) is not None
+        assert cache.get("b", SuddenDropAnalysisResult) is None
+        assert cache.get("c", SuddenDropAnalysisResult) is not None
+
+    def test_put_replaces_existing_entry(self, cache: ResultCache) -> None:
+        cache.put("key", _create_drop_result("old"))
+        cache.put("key", _create_drop_result("new"))
+
+        result = cache.get("key", SuddenDropAnalysisResult)
+
+        assert result is not None
+        assert result.summary == "new"
+        assert len(cache) == 1
+
+    def test_persists_across_connections(self, tmp_path: Path) -> None:
+        path = tmp_path / "cache.sqlite3"
+        first = ResultCache(path)
+        first.put("key", _create_drop_result())
+        first.close()
+
+        second = ResultCache(path)
+        assert second.get("key", SuddenDropAnalysisResult) is not None
+        second.close()
+
+
+class TestAnalysisPrompts:
+    def test_includes_save_filename(self) -> None:
+        prompts = build_analysis_prompts("sandbox", "my_save")
+        assert any("my_save" in prompt for prompt in prompts)
+
+    def test_unknown_analysis_type(self) -> None:
+        with pytest.raises(ValueError, match="Unknown analysis type"):
+            build_analysis_prompts("unknown", "my_save")
+
+    def test_partial_failures_are_not_cacheable(self) -> None:
+        assert is_cacheable(_create_drop_result())
+        assert is_cacheable(_create_multi_result(analysis_error=None))
+        assert not is_cacheable(_create_multi_result(analysis_error="boom"))
@@ -7,46 +7,41 @@ from agent.root_cause_multi.root_cause_prompts import (
 
 
 class TestBuildRootCauseSystemPrompt:
-    def test_contains_graphql_url(self) -> None:
-        url = "http://localhost:4000/graphql"
-        prompt = build_root_cause_system_prompt(url)
-        assert url in prompt
-
     def test_contains_task_description(self) -> None:
-        prompt = build_root_cause_system_prompt("http://example.com")
+        prompt = build_root_cause_system_prompt()
 
         assert "root cause" in prompt.lower()
         assert "TOP 3" in prompt
 
     def test_contains_workflow(self) -> None:
-        prompt = build_root_cause_system_prompt("http://example.com")
+        prompt = build_root_cause_system_prompt()
 
         assert "Workflow" in prompt
         assert "run_python_code" in prompt
 
-    def test_contains_income_expenses_query(self) -> None:
-        prompt = build_root_cause_system_prompt("http://example.com")
+    def test_contains_preloaded_data_layout(self) -> None:
+        prompt = build_root_cause_system_prompt()
 
-        assert "GetIncomeExpenses" in prompt
+        assert "SANDBOX_DATA" in prompt
         assert "income" in prompt
         assert "expenses" in prompt
 
     def test_contains_budget_categories(self) -> None:
-        prompt = build_root_cause_system_prompt("http://example.com")
+        prompt = build_root_cause_system_prompt()
 
         assert len(BUDGET_CATEGORIES) > 0
         for category in BUDGET_CATEGORIES[:5]:
             assert category in prompt
 
     def test_contains_analysis_algorithm(self) -> None:
-        prompt = build_root_cause_system_prompt("http://example.com")
+        prompt = build_root_cause_system_prompt()
 
         assert "income_decreased" in prompt
         assert "expenses_increased" in prompt
         assert "impact" in prompt
 
     def test_contains_output_format(self) -> None:
-        prompt = build_root_cause_system_prompt("http://example.com")
+        prompt = build_root_cause_system_prompt()
 
         assert "top_contributors" in prompt
         assert "contributor_type" in prompt
@@ -54,11 +49,11 @@ class TestBuildRootCauseSystemPrompt:
         assert "explanation" in prompt
 
     def test_contains_critical_rules(self) -> None:
-        prompt = build_root_cause_system_prompt("http://example.com")
+        prompt = build_root_cause_system_prompt()
 
         assert "CRITICAL" in prompt
         assert "JSON" in prompt
-        assert "httpx" in prompt
+        assert "Do not make HTTP requests" in prompt
 
 
 class TestBuildRootCauseAnalysisPrompt:
@@ -67,7 +62,6 @@ class TestBuildRootCauseAnalysisPrompt:
         prompt = build_root_cause_analysis_prompt(
             drop,
             "test.sav",
-            "http://example.com",
         )
         assert "energy" in prompt
 
@@ -76,7 +70,6 @@ class TestBuildRootCauseAnalysisPrompt:
         prompt = build_root_cause_analysis_prompt(
             drop,
             "my-empire.sav",
-            "http://example.com",
         )
         assert "my-empire.sav" in prompt
 
@@ -85,7 +78,6 @@ class TestBuildRootCauseAnalysisPrompt:
         prompt = build_root_cause_analysis_prompt(
             drop,
             "test.sav",
-            "http://example.com",
         )
 
         assert drop.start_date in prompt
@@ -96,23 +88,15 @@ class TestBuildRootCauseAnalysisPrompt:
         prompt = build_root_cause_analysis_prompt(
             drop,
             "test.sav",
-            "http://example.com",
         )
 
         assert f"{drop.drop_percent:.1f}%" in prompt
 
-    def test_contains_graphql_url(self) -> None:
-        drop = _create_sample_drop("energy")
-        url = "http://localhost:4000/graphql"
-        prompt = build_root_cause_analysis_prompt(drop, "test.sav", url)
-        assert url in prompt
-
     def test_contains_instructions(self) -> None:
         drop = _create_sample_drop("energy")
         prompt = build_root_cause_analysis_prompt(
             drop,
             "test.sav",
-            "http://example.com",
         )
 
         assert "income" in prompt.lower()
@@ -0,0 +1,179 @@
+from typing import Any
+
+import pytest
+
+from agent.analysis_config import BUDGET_CATEGORIES, RESOURCE_FIELDS
+from agent.graphql_client import (
+    GetBudget,
+    GetIncomeExpenses,
+    GetNeighborData,
+)
+from agent.sandbox_data import (
+    SANDBOX_DATA_VARIABLE,
+    build_budget_columns,
+    fetch_budget_data,
+    fetch_neighbor_data,
+    render_preload,
+)
+
+from .conftest import MockClient
+
+DATES = ["2200-01-01T00:00:00Z", "2200-04-01T00:00:00Z"]
+
+
+def _budget_section(category: str, energy: float) -> dict[str, Any]:
+    section: dict[str, Any] = dict.fromkeys(BUDGET_CATEGORIES)
+    section[category] = {**dict.fromkeys(RESOURCE_FIELDS), "energy": energy}
+    return section
+
+
+def _create_budget(energy: list[float]) -> GetBudget:
+    return GetBudget.model_validate(
+        {
+            "save": {
+                "gamestates": [
+                    {
+                        "date": date,
+                        "budget": {"balance": _budget_section("ships", value)},
+                    }
+                    for date, value in zip(DATES, energy, strict=True)
+                ],
+            },
+        },
+    )
+
+
+def _create_income_expenses(upkeep: list[float]) -> GetIncomeExpenses:
+    return GetIncomeExpenses.model_validate(
+        {
+            "save": {
+                "gamestates": [
+                    {
+                        "date": date,
+                        "budget": {
+                            "income": dict.fromkeys(BUDGET_CATEGORIES),
+                            "expenses": _budget_section("ships", value),
+                        },
+                    }
+                    for date, value in zip(DATES, upkeep, strict=True)
+                ],
+            },
+        },
+    )
+
+
+def _create_neighbor_data() -> GetNeighborData:
+    empire = {
+        "countryId": "0",
+        "name": "Player",
+        "ownedPlanetIds": [1, 2],
+        "ownedPlanetCount": 2,
+    }
+    return GetNeighborData.model_validate(
+        {
+            "save": {
+                "gamestates": [
+                    {
+                        "date": date,
+                        "playerEmpire": empire,
+                        "empires": [
+                            {
+                                **empire,
+                                "militaryPower": 1.0,
+                                "economyPower": None,
+                                "techPower": None,
+                            },
+                        ],
+                        "diplomaticRelations": [],
+                        "allPlanetCoordinates": [
+                            {"planetId": 1, "x": 0.0, "y": 1.0},
+                            {"planetId": 2, "x": 2.0, "y": 3.0},
+                        ],
+                    }
+                    for date in DATES
+                ],
+            },
+        },
+    )
+
+
+class TestBuildBudgetColumns:
+    def test_pivots_rows_into_columns(self) -> None:
+        columns = build_budget_columns(
+            [
+                {"ships": {"energy": -5.0, "alloys": None}, "edicts": None},
+                {"ships": {"energy": -6.0, "alloys": None}, "edicts": None},
+            ],
+        )
+
+        assert columns == {"ships": {"energy": [-5.0, -6.0]}}
+
+    def test_zero_in_some_rows_is_kept(self) -> None:
+        columns = build_budget_columns(
+            [{"ships": {"energy": 0.0}}, {"ships": {"energy": 3.0}}],
+        )
+
+        assert columns == {"ships": {"energy": [0.0, 3.0]}}
+
+
+class TestFetchBudgetData:
+    async def test_merges_balance_income_and_expenses(self) -> None:
+        client = MockClient(
+            budgets={"test.sav": _create_budget([10.0, 4.0])},
+            income_expenses={"test.sav": _create_income_expenses([1.0, 2.0])},
+        )
+
+        data = await fetch_budget_data(client, "test.sav")
+
+        budget = data["budget"]
+        assert data["save_filename"] == "test.sav"
+        assert len(budget["dates"]) == 2
+        assert budget["balance"] == {"ships": {"energy": [10.0, 4.0]}}
+        assert budget["income"] == {}
+        assert budget["expenses"] == {"ships": {"energy": [1.0, 2.0]}}
+
+    async def test_limits_datapoints(self) -> None:
+        client = MockClient(
+            budgets={"test.sav": _create_budget([10.0, 4.0])},
+            income_expenses={"test.sav": _create_income_expenses([1.0, 2.0])},
+        )
+
+        data = await fetch_budget_data(client, "test.sav", datapoints=1)
+
+        assert data["budget"]["balance"] == {"ships": {"energy": [4.0]}}
+
+    async def test_missing_save(self, empty_mock_client: MockClient) -> None:
+        with pytest.raises(ValueError, match="not found"):
+            await fetch_budget_data(empty_mock_client, "missing.sav")
+
+
+class TestFetchNeighborData:
+    async def test_uses_latest_gamestate_in_columns(self) -> None:
+        client = MockClient(neighbor_data={"test.sav": _create_neighbor_data()})
+
+        data = await fetch_neighbor_data(client, "test.sav")
+
+        neighbors = data["neighbors"]
+        assert neighbors["date"].startswith("2200-04-01")
+        assert neighbors["player_empire"]["owned_planet_ids"] == [1, 2]
+        assert neighbors["empires"]["military_power"] == [1.0]
+        assert neighbors["diplomatic_relations"]["is_hostile"] == []
+        assert neighbors["planet_coordinates"] == {
+            "planet_id": [1, 2],
+            "x": [0.0, 2.0],
+            "y": [1.0, 3.0],
+        }
+
+    async def test_missing_save(self, empty_mock_client: MockClient) -> None:
+        with pytest.raises(ValueError, match="No gamestates"):
+            await fetch_neighbor_data(empty_mock_client, "missing.sav")
+
+
+class TestRenderPreload:
+    def test_defines_sandbox_data(self) -> None:
+        data = {"save_filename": "it's.sav", "budget": {"dates": ["2200"]}}
+        namespace: dict[str, object] = {}
+
+        exec(render_preload(data), namespace)
+
+        assert namespace[SANDBOX_DATA_VARIABLE] == data
@@ -9,80 +9,71 @@ from agent.sandbox.prompts import (
 
 
 class TestBuildSystemPrompt:
-    def test_contains_graphql_url(self) -> None:
-        url = "http://localhost:4000/graphql"
-        prompt = build_system_prompt(url)
-        assert url in prompt
+    def test_contains_preloaded_data_layout(self) -> None:
+        prompt = build_system_prompt()
+
+        assert "SANDBOX_DATA" in prompt
+        assert '"balance"' in prompt
+        assert '"income"' in prompt
+        assert '"expenses"' in prompt
 
     def test_contains_workflow_instructions(self) -> None:
-        prompt = build_system_prompt("http://example.com")
+        prompt = build_system_prompt()
 
         assert "Workflow" in prompt
         assert "run_python_code" in prompt
 
-    def test_contains_graphql_queries(self) -> None:
-        prompt = build_system_prompt("http://example.com")
-
-        assert "GetDates" in prompt
-        assert "GetBudget" in prompt
-        assert "query" in prompt
-
     def test_contains_budget_category_fields(self) -> None:
-        prompt = build_system_prompt("http://example.com")
+        prompt = build_system_prompt()
 
         for category in BUDGET_CATEGORIES[:5]:
             assert category in prompt
 
     def test_contains_resource_fields(self) -> None:
-        prompt = build_system_prompt("http://example.com")
+        prompt = build_system_prompt()
 
         for resource in RESOURCE_FIELDS[:5]:
             assert resource in prompt
 
     def test_contains_drop_threshold(self) -> None:
-        prompt = build_system_prompt("http://example.com")
+        prompt = build_system_prompt()
         assert f"{DROP_THRESHOLD_PERCENT}%" in prompt
 
     def test_contains_analysis_datapoints(self) -> None:
-        prompt = build_system_prompt("http://example.com")
+        prompt = build_system_prompt()
         assert str(ANALYSIS_DATAPOINTS) in prompt
 
     def test_contains_output_format(self) -> None:
-        prompt = build_system_prompt("http://example.com")
+        prompt = build_system_prompt()
 
         assert "sudden_drops" in prompt
         assert "save_filename" in prompt
         assert "summary" in prompt
 
     def test_contains_critical_rules(self) -> None:
-        prompt = build_system_prompt("http://example.com")
+        prompt = build_system_prompt()
 
         assert "CRITICAL" in prompt
         assert "JSON" in prompt
 
-    def test_contains_httpx_instruction(self) -> None:
-        prompt = build_system_prompt("http://example.com")
-        assert "httpx" in prompt
+    def test_forbids_http_requests(self) -> None:
+        prompt = build_system_prompt()
+        assert "Do not make HTTP requests" in prompt
 
 
 class TestBuildAnalysisPrompt:
     def test_contains_save_filename(self) -> None:
-        prompt = build_analysis_prompt("my-empire.sav", "http://example.com")
+        prompt = build_analysis_prompt("my-empire.sav")
         assert "my-empire.sav" in prompt
 
-    def test_contains_graphql_url(self) -> None:
-        url = "http://localhost:4000/graphql"
-        prompt = build_analysis_prompt("test.sav", url)
-        assert url in prompt
-
     def test_contains_analysis_instructions(self) -> None:
-        prompt = build_analysis_prompt("test.sav", "http://example.com")
+        prompt = build_analysis_prompt("test.sav")
 
         assert str(ANALYSIS_DATAPOINTS) in prompt
         assert f"{DROP_THRESHOLD_PERCENT}%" in prompt
 
     def test_contains_json_instruction(self) -> None:
-        prompt = build_analysis_prompt("test.sav", "http://example.com")
+        prompt = build_analysis_prompt("test.sav")
         assert "JSON" in prompt
 
 
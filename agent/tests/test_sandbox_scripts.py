@@ -0,0 +1,223 @@
+import io
+import json
+from contextlib import redirect_stdout
+from typing import Any
+
+import pytest
+
+from agent.analysis_config import BUDGET_CATEGORIES, RESOURCE_FIELDS
+from agent.sandbox_data import SandboxData, render_preload
+from agent.sandbox_scripts import (
+    RUN_SANDBOX_SCRIPT_TOOL,
+    SCRIPTS,
+    build_host_params,
+    build_script_prompt_section,
+    render_script,
+)
+from agent.sandbox_scripts.contributor_ranking import rank_contributors
+from agent.sandbox_scripts.drop_detection import find_drops, sum_resources
+from agent.sandbox_scripts.neighbor_distances import detect_findings, min_distance
+
+
+def _run_rendered(
+    script_name: str,
+    params: dict[str, Any],
+    data: SandboxData,
+) -> dict[str, Any]:
+    code = render_preload(data) + render_script(script_name, params)
+    output = io.StringIO()
+    with redirect_stdout(output):
+        exec(compile(code, script_name, "exec"), {"__name__": "sandbox"})
+    return json.loads(output.getvalue())
+
+
+class TestRegistry:
+    def test_scripts_are_versioned(self) -> None:
+        for script in SCRIPTS.values():
+            assert script.version >= 1
+            assert script.description
+
+    def test_render_script_calls_main(self) -> None:
+        code = render_script("drop_detection", {"top_n": 2})
+
+        assert code.startswith("# drop_detection v2\n")
+        assert code.splitlines()[-1] == (
+            "print(_json.dumps(main(_json.loads('{\"top_n\": 2}'), SANDBOX_DATA)))"
+        )
+        compile(code, "drop_detection", "exec")
+
+    def test_host_params_include_config(self) -> None:
+        params = build_host_params()
+
+        assert params["resource_fields"] == RESOURCE_FIELDS
+        assert params["budget_categories"] == BUDGET_CATEGORIES
+
+    def test_prompt_section_lists_requested_scripts(self) -> None:
+        section = build_script_prompt_section(["neighbor_distances"])
+
+        assert RUN_SANDBOX_SCRIPT_TOOL in section
+        assert "`neighbor_distances` (v2)" in section
+        assert "drop_detection" not in section
+
+
+class TestDropDetectionScript:
+    def test_sum_resources_skips_empty_categories(self) -> None:
+        balance = {
+            "ships": {"energy": [-5.0, -6.0]},
+            "colonies": {"energy": [20.0, 22.0]},
+        }
+
+        totals = sum_resources(balance, 1, ["energy", "minerals"])
+
+        assert totals == {"energy": 16.0, "minerals": 0.0}
+
+    def test_find_drops(self) -> None:
+        snapshots = [
+            ("2200.01.01", {"energy": 100.0, "minerals": -10.0}),
+            ("2200.04.01", {"energy": 50.0, "minerals": -20.0}),
+        ]
+
+        drops = find_drops(snapshots, ["energy", "minerals"], 30.0)
+
+        assert [d["resource"] for d in drops] == ["energy"]
+        assert drops[0]["drop_percent"] == 50.0
+
+    def test_main_end_to_end(self) -> None:
+        data: SandboxData = {
+            "save_filename": "test",
+            "budget": {
+                "dates": ["2200.01.01", "2200.04.01", "2200.07.01"],
+                "balance": {"ships": {"energy": [100.0, 100.0, 40.0]}},
+                "income": {},
+                "expenses": {},
+            },
+        }
+
+        result = _run_rendered(
+            "drop_detection",
+            {**build_host_params(), "resource_fields": ["energy"]},
+            data,
+        )
+
+        assert result["datapoints_analyzed"] == 3
+        assert result["summary"] == "Found 1 sudden drop(s): energy"
+        assert result["sudden_drops"][0]["start_date"] == "2200.04.01"
+
+
+class TestContributorRankingScript:
+    def test_ranks_by_absolute_change(self) -> None:
+        budget = {
+            "income": {"planetJobs": {"energy": [100.0, 80.0]}},
+            "expenses": {
+                "ships": {"energy": [10.0, 50.0]},
+                "starbases": {"energy": [5.0, 6.0]},
+            },
+        }
+
+        top = rank_contributors(
+            budget,
+            0,
+            1,
+            "energy",
+            ["planetJobs", "ships", "starbases", "armies"],
+            2,
+        )
+
+        assert [(c["category"], c["contributor_type"], c["rank"]) for c in top] == [
+            ("ships", "expenses_increased", 1),
+            ("planetJobs", "income_decreased", 2),
+        ]
+
+    def test_main_rejects_unknown_dates(self) -> None:
+        data: SandboxData = {
+            "save_filename": "test",
+            "budget": {
+                "dates": ["2200.01.01"],
+                "balance": {},
+                "income": {},
+                "expenses": {},
+            },
+        }
+
+        with pytest.raises(
+            ValueError,
+            match=r"No preloaded snapshot for date\(s\): 2200.04.01",
+        ):
+            _run_rendered(
+                "contributor_ranking",
+                {
+                    **build_host_params(),
+                    "resource": "energy",
+                    "start_date": "2200.01.01",
+                    "end_date": "2200.04.01",
+                },
+                data,
+            )
+
+
+class TestNeighborDistancesScript:
+    def test_min_distance(self) -> None:
+        assert min_distance([(0.0, 0.0)], [(3.0, 4.0), (6.0, 8.0)]) == 5.0
+        assert min_distance([], [(1.0, 1.0)]) == float("inf")
+
+    def test_detect_findings(self) -> None:
+        findings = detect_findings(
+            [
+                {
+                    "name": "Blorg",
+                    "min_distance": 10.0,
+                    "is_hostile": True,
+                    "opinion": -80.0,
+                    "threat": None,
+                    "opinion_modifiers": [
+                        {"modifier_type": "opinion_genocidal", "value": -100},
+                    ],
+                },
+            ],
+        )
+
+        assert [(f["finding_type"], f["severity"]) for f in findings] == [
+            ("hostile_neighbor", "critical"),
+            ("genocidal_reputation", "warning"),
+            ("low_opinion", "warning"),
+        ]
+
+    def test_main_end_to_end(self) -> None:
+        data: SandboxData = {
+            "save_filename": "test",
+            "neighbors": {
+                "date": "2250.01.01",
+                "player_empire": {
+                    "country_id": "0",
+                    "name": "Player",
+                    "owned_planet_ids": [1],
+                    "owned_planet_count": 1,
+                },
+                "empires": {
+                    "country_id": ["0", "1", "2"],
+                    "name": ["Player", "Far", "Near"],
+                    "owned_planet_ids": [[1], [2], [3]],
+                    "owned_planet_count": [1, 1, 1],
+                },
+                "diplomatic_relations": {
+                    "target_country_id": ["2"],
+                    "opinion": [10.0],
+                    "trust": [0.0],
+                    "threat": [0.0],
+                    "is_hostile": [False],
+                    "opinion_modifiers": [[]],
+                },
+                "planet_coordinates": {
+                    "planet_id": [1, 2, 3],
+                    "x": [0.0, 100.0, 0.0],
+                    "y": [0.0, 0.0, 10.0],
+                },
+            },
+        }
+
+        result = _run_rendered("neighbor_distances", build_host_params(), data)
+
+        assert result["save_filename"] == "test"
+        assert [n["name"] for n in result["neighbors"]] == ["Near", "Far"]
+        assert result["neighbors"][0]["opinion"] == 10.0
+        assert result["neighbors"][1]["opinion"] is None
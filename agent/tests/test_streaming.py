@@ -0,0 +1,268 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator
+
+import pytest
+
+from agent.cli import AnalysisEvent, print_result, render_stream
+from agent.models import (
+    DropAnalyzedEvent,
+    DropDetectionEvent,
+    MultiAgentAnalysisCompleteEvent,
+    SuddenDrop,
+    SuddenDropAnalysisResult,
+    SuddenDropWithRootCause,
+)
+from agent.neighbor import FindingSeverity
+from agent.neighbor_multi import (
+    DetectedNeighbor,
+    NeighborDetectionEvent,
+    NeighborDetectionResult,
+    OpinionAnalysisResult,
+)
+from agent.neighbor_multi import orchestrator as neighbor_orchestrator
+from agent.neighbor_multi.models import NeighborFinding
+from agent.neighbor_multi.orchestrator import (
+    NeighborAnalysisCompleteEvent,
+    build_neighbor_analysis_result,
+    build_neighbor_info,
+    run_neighbor_multi_agent_orchestration,
+)
+from agent.root_cause_multi import orchestrator as root_cause_orchestrator
+from agent.root_cause_multi.orchestrator import (
+    build_multi_agent_result,
+    run_root_cause_multi_agent_orchestration,
+)
+
+
+def _create_drop(resource: str) -> SuddenDrop:
+    return SuddenDrop(
+        resource=resource,
+        start_date="2200-01-01",
+        end_date="2200-04-01",
+        start_value=100.0,
+        end_value=50.0,
+        drop_percent=50.0,
+        drop_absolute=50.0,
+    )
+
+
+def _create_detection(drops: list[SuddenDrop]) -> SuddenDropAnalysisResult:
+    return SuddenDropAnalysisResult(
+        save_filename="test",
+        analysis_period_start="2200-01-01",
+        analysis_period_end="2200-10-01",
+        datapoints_analyzed=4,
+        drop_threshold_percent=30.0,
+        sudden_drops=drops,
+        summary="",
+    )
+
+
+def _create_neighbor_detection() -> NeighborDetectionResult:
+    return NeighborDetectionResult(
+        save_filename="test",
+        analysis_date="2250-01-01",
+        player_empire_name="Player",
+        player_owned_planets=5,
+        detected_neighbors=[
+            DetectedNeighbor(
+                country_id="1",
+                name="Blorg",
+                min_distance=12.5,
+                owned_planet_count=3,
+            ),
+        ],
+    )
+
+
+async def _events(*events: AnalysisEvent) -> AsyncIterator[AnalysisEvent]:
+    for event in events:
+        yield event
+
+
+def _create_root_cause_events() -> list[AnalysisEvent]:
+    drop = SuddenDropWithRootCause(
+        drop=_create_drop("energy"),
+        root_cause=None,
+        analysis_error="timeout",
+    )
+    detection = _create_detection([drop.drop])
+    return [
+        DropDetectionEvent(detection=detection),
+        DropAnalyzedEvent(drop=drop),
+        MultiAgentAnalysisCompleteEvent(
+            result=build_multi_agent_result("test", detection, [drop]),
+        ),
+    ]
+
+
+class TestBuildMultiAgentResult:
+    def test_summarizes_analyzed_drops(self) -> None:
+        drop = SuddenDropWithRootCause(
+            drop=_create_drop("energy"),
+            root_cause=None,
+            analysis_error="timeout",
+        )
+
+        result = build_multi_agent_result(
+            "test",
+            _create_detection([drop.drop]),
+            [drop],
+        )
+
+        assert result.total_drops_detected == 1
+        assert result.successful_root_cause_analyses == 0
+        assert "Resources affected: energy" in result.summary
+
+    def test_no_drops(self) -> None:
+        result = build_multi_agent_result("test", _create_detection([]), [])
+        assert "No drops to analyze." in result.summary
+
+
+class TestBuildNeighborInfo:
+    def test_without_opinion_result(self) -> None:
+        detection = _create_neighbor_detection()
+
+        info, findings = build_neighbor_info(detection.detected_neighbors[0], None)
+
+        assert info.name == "Blorg"
+        assert info.opinion is None
+        assert findings == []
+
+    def test_with_opinion_result(self) -> None:
+        detection = _create_neighbor_detection()
+        opinion = OpinionAnalysisResult(
+            country_id="1",
+            name="Blorg",
+            opinion=-50.0,
+            trust=0.0,
+            threat=20.0,
+            is_hostile=True,
+            opinion_modifiers=[],
+            findings=[
+                NeighborFinding(
+                    finding_type="hostile",
+                    description="Blorg is hostile",
+                    severity=FindingSeverity.CRITICAL,
+                ),
+            ],
+        )
+
+        info, findings = build_neighbor_info(detection.detected_neighbors[0], opinion)
+        result = build_neighbor_analysis_result(detection, [info], findings)
+
+        assert info.is_hostile is True
+        assert [f.finding_type for f in findings] == ["hostile"]
+        assert "1 hostile neighbor" in result.summary
+
+
+class TestRenderStream:
+    async def test_raw_emits_ndjson(self, capsys: pytest.CaptureFixture[str]) -> None:
+        events = _create_root_cause_events()
+
+        result = await render_stream(_events(*events), raw=True)
+
+        lines = capsys.readouterr().out.splitlines()
+        assert [json.loads(line)["event"] for line in lines] == [
+            "detection",
+            "drop_analyzed",
+            "complete",
+        ]
+        assert result.summary.startswith("Detected 1 sudden drop(s).")
+
+    async def test_formatted_output_is_incremental(
+        self,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        events = _create_root_cause_events()
+
+        await render_stream(_events(*events))
+
+        out = capsys.readouterr().out
+        assert out.index("Detected 1 sudden drop(s).") < out.index("[energy]")
+        assert out.index("[energy]") < out.index("Summary:")
+
+    async def test_neighbor_detection_renders_header(
+        self,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        with pytest.raises(RuntimeError, match="without a result"):
+            await render_stream(
+                _events(NeighborDetectionEvent(detection=_create_neighbor_detection())),
+            )
+
+        out = capsys.readouterr().out
+        assert "Player: Player" in out
+        assert "NEAREST NEIGHBORS" in out
+
+
+class _ServerStream:
+    """Stand-in for an orchestration stream suspended inside an MCP server context."""
+
+    def __init__(self, *events: AnalysisEvent) -> None:
+        super().__init__()
+        self.events = events
+        self.exit_task: asyncio.Task[object] | None = None
+
+    async def __call__(self, *args: object) -> AsyncIterator[AnalysisEvent]:
+        # MCP sessions hold an anyio task group, which must exit on the task
+        # that entered it
+        try:
+            for event in self.events:
+                yield event
+        finally:
+            self.exit_task = asyncio.current_task()
+
+
+class TestRunOrchestration:
+    async def test_root_cause_stream_closed_on_early_return(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        events = _create_root_cause_events()
+        stream = _ServerStream(events[-1], events[0])
+        monkeypatch.setattr(
+            root_cause_orchestrator,
+            "stream_root_cause_multi_agent_orchestration",
+            stream,
+        )
+
+        result = await run_root_cause_multi_agent_orchestration("test")
+
+        assert result.save_filename == "test"
+        assert stream.exit_task is asyncio.current_task()
+
+    async def test_neighbor_stream_closed_on_early_return(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        detection = _create_neighbor_detection()
+        complete = NeighborAnalysisCompleteEvent(
+            result=build_neighbor_analysis_result(detection, [], []),
+        )
+        stream = _ServerStream(complete, NeighborDetectionEvent(detection=detection))
+        monkeypatch.setattr(
+            neighbor_orchestrator,
+            "stream_neighbor_multi_agent_orchestration",
+            stream,
+        )
+
+        await run_neighbor_multi_agent_orchestration("test")
+
+        assert stream.exit_task is asyncio.current_task()
+
+
+class TestPrintResult:
+    def test_cached_streaming_result_is_single_event(
+        self,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        complete = _create_root_cause_events()[-1]
+        assert isinstance(complete, MultiAgentAnalysisCompleteEvent)
+
+        print_result("root-cause-multi", complete.result, raw=True)
+
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])["event"] == "complete"
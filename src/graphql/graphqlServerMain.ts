@@ -107,6 +107,7 @@ const runGraphQLServer = async (logger: Logger) => {
     schema,
     plugins,
     cache,
+    allowBatchedHttpRequests: true,
   })
 
   await server.start()
@@ -84,6 +84,7 @@ const runTestGraphQLServer = async () => {
     },
     plugins,
     cache,
+    allowBatchedHttpRequests: true,
   })
 
   const { port } = getServerConfig()